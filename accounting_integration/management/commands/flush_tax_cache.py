@@ -0,0 +1,25 @@
+"""
+Flush cached Classic tax data (customer tax items/rates and item tax links).
+
+Tax data is cached per process for TAX_CACHE_TTL seconds. Run this after
+changing tax rates, tax regions or tax links in Classic so the change applies
+right away; every server process clears its cache on its next tax lookup.
+
+Usage:
+    python manage.py flush_tax_cache
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from accounting_integration.services.tax_applicability import flush_tax_cache
+
+
+class Command(BaseCommand):
+    help = "Flush cached Classic tax data in every server process"
+
+    def handle(self, *args, **options):
+        flush_tax_cache(all_processes=True)
+        self.stdout.write(
+            self.style.SUCCESS(f"OK: tax cache flushed ({settings.TAX_CACHE_FLUSH_FILE} touched).")
+        )
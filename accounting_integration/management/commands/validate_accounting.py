@@ -7,9 +7,10 @@ Usage:
 
 import os
 
-from django.conf import settings
 from django.core.management.base import BaseCommand, CommandError
 
+from accounting_integration.router import accounting_is_configured
+
 
 REQUIRED_ENV_VARS = (
     "ACCOUNTING_DB_NAME",
@@ -24,11 +25,8 @@ class Command(BaseCommand):
     help = "Validate Classic Accounting integration setup"
 
     def handle(self, *args, **options):
-        accounting_db = (settings.DATABASES or {}).get("accounting") or {}
-        engine = accounting_db.get("ENGINE", "")
-
         # If we're not configured for the real Classic DB, fail fast and loud.
-        if engine != "django.db.backends.postgresql":
+        if not accounting_is_configured():
             raise CommandError(
                 "Classic Accounting DB is not configured. "
                 "Set env vars: "
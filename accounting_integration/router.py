@@ -2,6 +2,19 @@
 Database router for directing accounting_integration queries to the accounting database.
 """
 
+from django.conf import settings
+
+
+def accounting_is_configured() -> bool:
+    """
+    Return True when Classic Accounting DB is configured for real use.
+
+    In tests/CI/dev without Classic env vars, we configure a placeholder SQLite
+    DB for the alias; in that case we must not attempt to query Classic tables.
+    """
+    accounting_db = (settings.DATABASES or {}).get("accounting") or {}
+    return accounting_db.get("ENGINE") == "django.db.backends.postgresql"
+
 
 class AccountingRouter:
     """
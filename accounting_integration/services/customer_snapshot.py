@@ -0,0 +1,222 @@
+"""
+Customer snapshots: a Classic customer plus its best BILLTO address.
+
+Work order screens and PDFs need the same few customer fields. Instead of an
+``Org`` query followed by an ``OrgAddress`` query per customer, snapshots for
+any number of customers are read with one LEFT JOIN query and cached per
+process:
+
+- Entries younger than ``CUSTOMER_SNAPSHOT_TTL`` seconds are served as is.
+- Older entries are revalidated with one light query on ``moddate`` (org and
+  address); unchanged customers are kept, changed ones are re-read. Customers
+  without any ``moddate`` are always re-read.
+- Writes made through this app call ``invalidate_customer_snapshots``.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+
+from django.conf import settings
+from django.db.models import F, FilteredRelation, Max, Q
+
+from accounting_integration.models import Org
+
+_cache: Dict[int, tuple] = {}  # org_id -> (CustomerSnapshot, fetched_at monotonic)
+_lock = threading.Lock()
+
+
+def _billto():
+    # A new instance per query: Django binds a FilteredRelation to the query using it
+    return FilteredRelation("orgaddress", condition=Q(orgaddress__addresstype="BILLTO"))
+
+
+@dataclass(frozen=True)
+class CustomerSnapshot:
+    org_id: int
+    name: str
+    phone: str
+    contact: str
+    email: str
+    taxable: Optional[bool]
+    def_sales_rep_id: str
+    address_line1: str
+    address_line2: str
+    city: str
+    state: str
+    zip: str
+    moddate: Optional[datetime]
+
+    def as_customer_dict(self) -> dict:
+        """Fields used by the work order customer selector/editor."""
+        return {
+            "org_id": self.org_id,
+            "name": self.name,
+            "phone": self.phone,
+            "contact": self.contact,
+            "email": self.email,
+            "taxable": self.taxable,
+            "address_line1": self.address_line1,
+            "address_line2": self.address_line2,
+            "city": self.city,
+            "state": self.state,
+            "zip": self.zip,
+        }
+
+    def as_pdf_context(self) -> dict:
+        """``customer_*`` fields of the work order PDF template."""
+        return {
+            "customer_name": self.name,
+            "customer_phone": self.phone,
+            "customer_contact": self.contact,
+            "customer_email": self.email,
+            "customer_address": self.address_line1,
+            "customer_city": self.city,
+            "customer_state": self.state,
+            "customer_zip": self.zip,
+        }
+
+
+def _ttl() -> int:
+    return getattr(settings, "CUSTOMER_SNAPSHOT_TTL", 60)
+
+
+def _version(org_moddate, address_moddate):
+    stamps = [stamp for stamp in (org_moddate, address_moddate) if stamp is not None]
+    return max(stamps) if stamps else None
+
+
+def _fetch(org_ids, using: str) -> Dict[int, CustomerSnapshot]:
+    """Read orgs and their best BILLTO address in one LEFT JOIN query."""
+    rows = (
+        Org.objects.using(using)
+        .filter(org_id__in=org_ids)
+        .annotate(billto=_billto())
+        .values(
+            "org_id", "orgname", "phone1", "contact1", "email", "taxable",
+            "def_sales_rep_id", "moddate",
+            "billto__streetone", "billto__streettwo", "billto__txtcity",
+            "billto__txtstate", "billto__txtzip", "billto__moddate",
+        )
+        # Default address first, then the newest
+        .order_by(
+            "org_id",
+            F("billto__is_default").desc(nulls_last=True),
+            F("billto__gen_addr_id").desc(nulls_last=True),
+        )
+    )
+    snapshots: Dict[int, CustomerSnapshot] = {}
+    for row in rows:
+        if row["org_id"] in snapshots:
+            # Any BILLTO change counts, as in _unchanged()
+            current = snapshots[row["org_id"]]
+            version = _version(current.moddate, row["billto__moddate"])
+            if version != current.moddate:
+                snapshots[row["org_id"]] = replace(current, moddate=version)
+            continue
+        snapshots[row["org_id"]] = CustomerSnapshot(
+            org_id=row["org_id"],
+            name=row["orgname"] or "",
+            phone=row["phone1"] or "",
+            contact=row["contact1"] or "",
+            email=row["email"] or "",
+            taxable=row["taxable"],
+            def_sales_rep_id=row["def_sales_rep_id"] or "",
+            address_line1=row["billto__streetone"] or "",
+            address_line2=row["billto__streettwo"] or "",
+            city=row["billto__txtcity"] or "",
+            state=row["billto__txtstate"] or "",
+            zip=row["billto__txtzip"] or "",
+            moddate=_version(row["moddate"], row["billto__moddate"]),
+        )
+    return snapshots
+
+
+def _unchanged(snapshots: Dict[int, CustomerSnapshot], using: str) -> set:
+    """Org IDs whose org/address moddate still matches the cached snapshot."""
+    candidates = {org_id for org_id, snapshot in snapshots.items() if snapshot.moddate is not None}
+    if not candidates:
+        return set()
+    rows = (
+        Org.objects.using(using)
+        .filter(org_id__in=candidates)
+        .annotate(billto=_billto())
+        .values("org_id", "moddate")
+        .annotate(address_moddate=Max("billto__moddate"))
+    )
+    return {
+        row["org_id"]
+        for row in rows
+        if _version(row["moddate"], row["address_moddate"]) == snapshots[row["org_id"]].moddate
+    }
+
+
+def get_customer_snapshots(
+    org_ids: Iterable[int], using: str = "accounting"
+) -> Dict[int, CustomerSnapshot]:
+    """
+    Return {org_id: CustomerSnapshot} for the given Classic customers.
+
+    Unknown org IDs are left out. At most two queries run, however many
+    customers are requested.
+    """
+    wanted = {int(org_id) for org_id in org_ids if org_id}
+    if not wanted:
+        return {}
+
+    now = time.monotonic()
+    ttl = _ttl()
+    result: Dict[int, CustomerSnapshot] = {}
+    stale: Dict[int, CustomerSnapshot] = {}
+    with _lock:
+        for org_id in wanted:
+            entry = _cache.get(org_id)
+            if entry is None:
+                continue
+            snapshot, fetched_at = entry
+            if now - fetched_at < ttl:
+                result[org_id] = snapshot
+            else:
+                stale[org_id] = snapshot
+
+    revalidated = _unchanged(stale, using) if stale else set()
+    for org_id in revalidated:
+        result[org_id] = stale[org_id]
+    missing = wanted - result.keys()
+    fetched = _fetch(missing, using) if missing else {}
+    result.update(fetched)
+
+    with _lock:
+        for org_id in revalidated:
+            _cache[org_id] = (stale[org_id], now)
+        for org_id, snapshot in fetched.items():
+            _cache[org_id] = (snapshot, now)
+        for org_id in missing - fetched.keys():
+            _cache.pop(org_id, None)
+    return result
+
+
+def load_customer_snapshots(
+    org_ids: Iterable[int], using: str = "accounting"
+) -> Dict[int, CustomerSnapshot]:
+    """Read snapshots straight from Classic (one query), bypassing the cache."""
+    wanted = {int(org_id) for org_id in org_ids if org_id}
+    return _fetch(wanted, using) if wanted else {}
+
+
+def get_customer_snapshot(org_id: int, using: str = "accounting") -> Optional[CustomerSnapshot]:
+    """Snapshot for one customer, or None when it does not exist."""
+    return get_customer_snapshots([org_id], using).get(int(org_id)) if org_id else None
+
+
+def invalidate_customer_snapshots(*org_ids: int) -> None:
+    """Drop cached snapshots (all of them when called without IDs)."""
+    with _lock:
+        if not org_ids:
+            _cache.clear()
+        for org_id in org_ids:
+            _cache.pop(int(org_id), None)
@@ -187,7 +187,10 @@ def ensure_discount_tax_links(discount_item, customer_org, using="accounting"):
             )
 
     if to_create:
+        from accounting_integration.services.tax_applicability import invalidate_item_tax_links
+
         ItmItemLink.objects.using(using).bulk_create(to_create)
+        invalidate_item_tax_links(discount_item.itemid, using=using)
         logger.info(
             f"Created {len(to_create)} TAX link(s) for discount item "
             f"{discount_item.itemnumber}"
@@ -1,39 +1,131 @@
+"""
+Which sales tax items apply to a Classic customer, and at what rate.
+
+A customer's tax context (taxable flag, selected SALESTAX items, summed rate)
+comes from its ``OrgItemLink`` TAX links, or from the company default tax
+regions when it has none. Item TAX links (``ItmItemLink``) decide which of
+those taxes apply to each invoice line.
+
+Both are cached per process so the work order editor, the totals preview and
+invoice creation do not re-read them on every call:
+
+- Entries expire after ``TAX_CACHE_TTL`` seconds (0 disables the cache).
+- ``flush_tax_cache()`` clears this process. The ``flush_tax_cache``
+  management command touches ``TAX_CACHE_FLUSH_FILE``; every process clears
+  its cache when it sees the file change.
+- Writes made through this app call ``invalidate_item_tax_links``.
+"""
+
 from __future__ import annotations
 
+import os
+import threading
+import time
+from dataclasses import dataclass
 from decimal import Decimal
-from typing import List, Tuple
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from django.conf import settings
 
 from accounting_integration.models import (
     IncIncomeSettings,
     IncIncomeSettingsDefTaxRegions,
+    ItmItemLink,
     ItmItems,
     Org,
     OrgItemLink,
 )
 
+_cache: Dict[tuple, tuple] = {}  # key -> (value, fetched_at monotonic)
+_lock = threading.Lock()
+_flush_seen = None  # TAX_CACHE_FLUSH_FILE mtime when this process last checked
 
-def get_customer_selected_tax_items(
-    customer_org: Org, using: str = "accounting"
-) -> List[ItmItems]:
-    customer_links = (
-        OrgItemLink.objects.using(using)
-        .filter(orgid=customer_org, linktype="TAX", exempt=False)
-        .select_related("itemid", "itemid__itemtypecode")
-        .order_by("id")
-    )
+_DEFAULT_REGIONS = "default-regions"
+
+
+@dataclass(frozen=True)
+class TaxContext:
+    org_id: int
+    found: bool
+    taxable: Optional[bool]
+    selected_tax_items: Tuple[ItmItems, ...]
+    rate: Decimal
+    exempt: bool
+
+
+def _ttl() -> int:
+    return getattr(settings, "TAX_CACHE_TTL", 300)
+
+
+def _flush_file() -> Optional[Path]:
+    path = getattr(settings, "TAX_CACHE_FLUSH_FILE", None)
+    return Path(path) if path else None
+
+
+def _flush_mtime() -> Optional[float]:
+    path = _flush_file()
+    if path is None:
+        return None
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+def _check_flush() -> None:
+    """Clear the cache when another process requested a flush."""
+    global _flush_seen
+
+    mtime = _flush_mtime()
+    if mtime != _flush_seen:
+        with _lock:
+            _cache.clear()
+            _flush_seen = mtime
+
+
+def _cached(key: tuple, loader):
+    ttl = _ttl()
+    if ttl <= 0:
+        return loader()
+    _check_flush()
+    now = time.monotonic()
+    with _lock:
+        entry = _cache.get(key)
+    if entry is not None and now - entry[1] < ttl:
+        return entry[0]
+    value = loader()
+    with _lock:
+        _cache[key] = (value, now)
+    return value
+
+
+def flush_tax_cache(*, all_processes: bool = False) -> None:
+    """Drop every cached tax context and item link (in every process when asked)."""
+    global _flush_seen
+
+    if all_processes:
+        path = _flush_file()
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.touch()
+    with _lock:
+        _cache.clear()
+        _flush_seen = _flush_mtime()
+
+
+def invalidate_item_tax_links(*item_ids: int, using: str = "accounting") -> None:
+    """Forget cached TAX links of items whose links were just written."""
+    with _lock:
+        for item_id in item_ids:
+            _cache.pop((using, "item-links", int(item_id)), None)
 
-    if customer_links.exists():
-        return [
-            link.itemid
-            for link in customer_links
-            if link.itemid.itemtypecode.itemtypecode == "SALESTAX"
-            and link.itemid.active
-        ]
 
+def _load_default_tax_items(using: str) -> Tuple[ItmItems, ...]:
     try:
         inc_settings = IncIncomeSettings.objects.using(using).first()
         if not inc_settings:
-            return []
+            return ()
 
         default_tax_regions = (
             IncIncomeSettingsDefTaxRegions.objects.using(using)
@@ -42,34 +134,112 @@ def get_customer_selected_tax_items(
             .order_by("order_seq")
         )
 
-        return [
+        return tuple(
             region.tax_item
             for region in default_tax_regions
             if region.tax_item.itemtypecode.itemtypecode == "SALESTAX"
             and region.tax_item.active
-        ]
+        )
     except Exception:
-        return []
+        return ()
+
+
+def _selected_tax_items(org_id: int, using: str) -> Tuple[ItmItems, ...]:
+    # One query: an empty list means "no links", so no separate exists()
+    customer_links = list(
+        OrgItemLink.objects.using(using)
+        .filter(orgid_id=org_id, linktype="TAX", exempt=False)
+        .select_related("itemid", "itemid__itemtypecode")
+        .order_by("id")
+    )
+
+    if customer_links:
+        return tuple(
+            link.itemid
+            for link in customer_links
+            if link.itemid.itemtypecode.itemtypecode == "SALESTAX"
+            and link.itemid.active
+        )
+
+    return _cached((using, _DEFAULT_REGIONS), lambda: _load_default_tax_items(using))
+
+
+def _load_tax_context(org_id: int, using: str) -> TaxContext:
+    taxable_rows = list(Org.objects.using(using).filter(org_id=org_id).values_list("taxable", flat=True)[:1])
+    if not taxable_rows:
+        return TaxContext(org_id, False, None, (), Decimal("0.00"), True)
+
+    taxable = taxable_rows[0]
+    tax_items = _selected_tax_items(org_id, using)
+    if taxable is False or not tax_items:
+        return TaxContext(org_id, True, taxable, tax_items, Decimal("0.00"), True)
+
+    rate = sum(item.price for item in tax_items)
+    rate = Decimal(str(rate)).quantize(Decimal("0.0001"))
+    return TaxContext(org_id, True, taxable, tax_items, rate, False)
+
+
+def get_tax_context(customer_org_id: int, using: str = "accounting") -> TaxContext:
+    """Cached tax context of one customer (see module docstring)."""
+    org_id = int(customer_org_id)
+    return _cached((using, "customer", org_id), lambda: _load_tax_context(org_id, using))
+
+
+def get_customer_selected_tax_items(
+    customer_org: Org, using: str = "accounting"
+) -> List[ItmItems]:
+    return list(get_tax_context(customer_org.org_id, using=using).selected_tax_items)
 
 
 def get_effective_tax_rate(
     customer_org_id: int, using: str = "accounting"
 ) -> Tuple[Decimal, bool]:
     try:
-        org = Org.objects.using(using).filter(org_id=customer_org_id).first()
+        context = get_tax_context(customer_org_id, using=using)
     except Exception:
         return Decimal("0.00"), True
+    return context.rate, context.exempt
 
-    if not org:
-        return Decimal("0.00"), True
 
-    if org.taxable is False:
-        return Decimal("0.00"), True
+def get_item_tax_links(
+    item_ids: Iterable[int], using: str = "accounting"
+) -> Dict[int, Tuple[bool, FrozenSet[int]]]:
+    """
+    {item_id: (has TAX links, non-exempt linked tax item IDs)} for items.
 
-    tax_items = get_customer_selected_tax_items(org, using=using)
-    if not tax_items:
-        return Decimal("0.00"), True
+    Cached items are served as is; the rest are read in one query.
+    """
+    item_ids = {int(item_id) for item_id in item_ids}
+    result: Dict[int, Tuple[bool, FrozenSet[int]]] = {}
+    ttl = _ttl()
+    if ttl > 0:
+        _check_flush()
+        now = time.monotonic()
+        with _lock:
+            for item_id in item_ids:
+                entry = _cache.get((using, "item-links", item_id))
+                if entry is not None and now - entry[1] < ttl:
+                    result[item_id] = entry[0]
 
-    rate = sum(item.price for item in tax_items)
-    rate = Decimal(str(rate)).quantize(Decimal("0.0001"))
-    return rate, False
+    missing = item_ids - result.keys()
+    if missing:
+        has_links = {item_id: False for item_id in missing}
+        non_exempt: Dict[int, set] = {item_id: set() for item_id in missing}
+        links = (
+            ItmItemLink.objects.using(using)
+            .filter(parentitemid_id__in=missing, linktype="TAX")
+            .values_list("parentitemid_id", "childitemid_id", "exempt")
+        )
+        for parent_id, child_id, exempt in links:
+            has_links[parent_id] = True
+            if not exempt:
+                non_exempt[parent_id].add(child_id)
+
+        now = time.monotonic()
+        with _lock:
+            for item_id in missing:
+                value = (has_links[item_id], frozenset(non_exempt[item_id]))
+                result[item_id] = value
+                if ttl > 0:
+                    _cache[(using, "item-links", item_id)] = (value, now)
+    return result
@@ -1,8 +1,11 @@
 from dataclasses import dataclass
 from typing import Dict, Iterable, List, Set
 
-from accounting_integration.models import ItmItemLink, ItmItems, Org
-from accounting_integration.services.tax_applicability import get_customer_selected_tax_items
+from accounting_integration.models import ItmItems, Org
+from accounting_integration.services.tax_applicability import (
+    get_customer_selected_tax_items,
+    get_item_tax_links,
+)
 
 
 @dataclass(frozen=True)
@@ -25,24 +28,12 @@ def load_item_tax_link_map(
     if not item_ids:
         return {}
 
-    links = (
-        ItmItemLink.objects.using(using)
-        .filter(parentitemid_id__in=item_ids, linktype="TAX")
-        .values_list("parentitemid_id", "childitemid_id", "exempt")
-    )
-
-    has_links_map: Dict[int, bool] = {item_id: False for item_id in item_ids}
-    non_exempt_map: Dict[int, Set[int]] = {item_id: set() for item_id in item_ids}
-
-    for parent_id, child_id, exempt in links:
-        has_links_map[parent_id] = True
-        if not exempt and child_id in selected_tax_ids:
-            non_exempt_map[parent_id].add(child_id)
-
+    # Cached per item; only the intersection with the selected taxes varies
+    links = get_item_tax_links(item_ids, using=using)
     return {
         item_id: ItemTaxLinkInfo(
-            has_links=has_links_map[item_id],
-            non_exempt_tax_ids=non_exempt_map[item_id],
+            has_links=has_links,
+            non_exempt_tax_ids=set(non_exempt_ids & selected_tax_ids),
         )
-        for item_id in item_ids
+        for item_id, (has_links, non_exempt_ids) in links.items()
     }
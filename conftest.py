@@ -59,6 +59,17 @@ def disable_classic_accounting_in_tests(settings):
     settings.DATABASES["accounting"] = db
 
 
+@pytest.fixture(autouse=True)
+def disable_import_worker_in_tests(settings):
+    """
+    Keep queued imports in the test transaction.
+
+    The background worker thread uses its own DB connection and would not see
+    uncommitted test data; tests run the queue explicitly instead.
+    """
+    settings.IMPORT_WORKER_ENABLED = False
+
+
 @pytest.fixture
 def api_client():
     """Return a Django test client."""
@@ -96,3 +107,22 @@ def job(db, calendar):
         status='uncompleted'
     )
 
+
+
+@pytest.fixture(autouse=True)
+def isolate_workorder_pdf_cache(settings, tmp_path):
+    """Keep rendered work order PDFs out of the project's cache directory."""
+    settings.WORKORDER_PDF_CACHE_DIR = str(tmp_path / "workorder_pdfs")
+    # Render inline: no worker processes in the test run
+    settings.PDF_RENDER_WORKERS = 0
+
+
+@pytest.fixture(autouse=True)
+def isolate_accounting_caches(settings, tmp_path):
+    """Per-test Classic data (sqlite fixtures reuse IDs) must not leak through process caches."""
+    from accounting_integration.services.customer_snapshot import invalidate_customer_snapshots
+    from accounting_integration.services.tax_applicability import flush_tax_cache
+
+    settings.TAX_CACHE_FLUSH_FILE = str(tmp_path / "tax_cache.flush")
+    flush_tax_cache()
+    invalidate_customer_snapshots()
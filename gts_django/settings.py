@@ -158,6 +158,71 @@ CACHES = {
 # Calendar events cache TTL (seconds) - can be overridden in environment
 CALENDAR_EVENTS_CACHE_TTL = int(os.getenv('CALENDAR_EVENTS_CACHE_TTL', '30'))
 
+# Rolling materialization horizon for "forever" recurring series.
+# RECURRENCE_HORIZON_WEEKS: how far ahead occurrences are stored as real jobs.
+# RECURRENCE_HORIZON_SCHEDULER_INTERVAL: seconds between in-process maintainer
+# runs when serving via serve.py (0 disables the thread; use the
+# maintain_recurrence_horizon management command from a scheduled task instead).
+RECURRENCE_HORIZON_WEEKS = int(os.getenv('RECURRENCE_HORIZON_WEEKS', '8'))
+RECURRENCE_HORIZON_SCHEDULER_INTERVAL = int(os.getenv('RECURRENCE_HORIZON_SCHEDULER_INTERVAL', '0'))
+
+# Background import worker (ICS/JSON uploads are queued as ImportBatch rows).
+# IMPORT_WORKER_ENABLED: run the worker thread inside the web process; when off,
+# run the process_imports management command from a scheduled task instead.
+# IMPORT_WORKER_POLL_INTERVAL: seconds between queue checks when not woken.
+IMPORT_WORKER_ENABLED = os.getenv('IMPORT_WORKER_ENABLED', 'True').lower() in ('1', 'true', 'yes', 'on')
+IMPORT_WORKER_POLL_INTERVAL = int(os.getenv('IMPORT_WORKER_POLL_INTERVAL', '30'))
+
+# Rendered work order PDF cache (content-addressed files on disk).
+# WORKORDER_PDF_CACHE_DIR: where rendered PDFs are kept.
+# WORKORDER_PDF_CACHE_MAX_MB: size bound; least recently served PDFs are
+# evicted past it (0 disables the cache).
+WORKORDER_PDF_CACHE_DIR = os.getenv('WORKORDER_PDF_CACHE_DIR', str(BASE_DIR / 'cache' / 'workorder_pdfs'))
+WORKORDER_PDF_CACHE_MAX_MB = int(os.getenv('WORKORDER_PDF_CACHE_MAX_MB', '200'))
+
+# Work order PDF rendering pool (WeasyPrint runs in separate processes).
+# PDF_RENDER_WORKERS: worker processes (0 renders inline in the request thread).
+# PDF_RENDER_QUEUE_SIZE: renders allowed to be pending at once before prints
+# get a 503 "try again" response.
+# PDF_RENDER_TIMEOUT: seconds a print request waits for its render.
+# Workers are spawned and re-import the entry script, so it must be
+# import-safe (see serve.py's __main__ guard).
+PDF_RENDER_WORKERS = int(os.getenv('PDF_RENDER_WORKERS', '2'))
+PDF_RENDER_QUEUE_SIZE = int(os.getenv('PDF_RENDER_QUEUE_SIZE', '8'))
+PDF_RENDER_TIMEOUT = int(os.getenv('PDF_RENDER_TIMEOUT', '30'))
+# PDF_BATCH_RENDER_TIMEOUT: seconds a merged batch export waits for its render
+# (ZIP exports wait up to PDF_RENDER_TIMEOUT per work order).
+PDF_BATCH_RENDER_TIMEOUT = int(os.getenv('PDF_BATCH_RENDER_TIMEOUT', '120'))
+# PDF_WARMUP: at startup, spawn the render workers and load WeasyPrint, the
+# work order stylesheet and fonts (renders one throwaway PDF). Enable it for
+# the server process; it is wasted work for one-off management commands.
+PDF_WARMUP = os.getenv('PDF_WARMUP', 'False').lower() in ('1', 'true', 'yes', 'on')
+
+# Classic customer snapshots (org + BILLTO address) cached per process.
+# CUSTOMER_SNAPSHOT_TTL: seconds before a cached customer is revalidated
+# against Classic's moddate columns.
+CUSTOMER_SNAPSHOT_TTL = int(os.getenv('CUSTOMER_SNAPSHOT_TTL', '60'))
+
+# Local search index of Classic customers (typeahead + duplicate detection).
+# CUSTOMER_INDEX_SYNC_INTERVAL: seconds between in-process incremental syncs
+# when serving via serve.py (0 disables the thread; use the
+# sync_customer_index management command from a scheduled task instead).
+CUSTOMER_INDEX_SYNC_INTERVAL = int(os.getenv('CUSTOMER_INDEX_SYNC_INTERVAL', '300'))
+
+# Classic tax contexts (customer tax items + rate) and item tax links cached per process.
+# TAX_CACHE_TTL: seconds before cached tax data is re-read (0 disables the cache).
+# TAX_CACHE_FLUSH_FILE: touched by the flush_tax_cache command; every process
+# clears its cache when the file changes.
+TAX_CACHE_TTL = int(os.getenv('TAX_CACHE_TTL', '300'))
+TAX_CACHE_FLUSH_FILE = os.getenv('TAX_CACHE_FLUSH_FILE', str(BASE_DIR / 'cache' / 'tax_cache.flush'))
+
+# Work order number allocation.
+# WORK_ORDER_NUMBER_BLOCK_SIZE: numbers each server process reserves at once.
+# 1 (default) allocates one number per work order with no gaps. Larger values
+# avoid locking the sequence row on every create, but numbers reserved by a
+# process that restarts are skipped.
+WORK_ORDER_NUMBER_BLOCK_SIZE = int(os.getenv('WORK_ORDER_NUMBER_BLOCK_SIZE', '1'))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -385,3 +450,14 @@ SESSION_COOKIE_SAMESITE = 'Lax'  # Default value
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY', '')
 OPENAI_MODEL = 'gpt-4o-mini'  # Cost-effective model for text extraction
 AI_PARSING_ENABLED = True  # Can be toggled on/off
+
+# Batch description parsing (calendar imports)
+# AI_PARSER_CLIENT: dotted path of the parser backend; use
+#   'rental_scheduler.utils.ai_parser.StubDescriptionClient' to parse locally without network.
+# AI_PARSER_MAX_WORKERS: concurrent requests in flight.
+# AI_PARSER_PACK_SIZE: descriptions sent together in one request.
+# AI_PARSER_REQUESTS_PER_MINUTE: client-side rate limit across all workers (0 disables).
+AI_PARSER_CLIENT = os.getenv('AI_PARSER_CLIENT', 'rental_scheduler.utils.ai_parser.OpenAIDescriptionClient')
+AI_PARSER_MAX_WORKERS = int(os.getenv('AI_PARSER_MAX_WORKERS', '4'))
+AI_PARSER_PACK_SIZE = int(os.getenv('AI_PARSER_PACK_SIZE', '10'))
+AI_PARSER_REQUESTS_PER_MINUTE = int(os.getenv('AI_PARSER_REQUESTS_PER_MINUTE', '60'))
@@ -5,7 +5,9 @@ from .models import (
     WorkOrderV2,
     WorkOrderLineV2,
     StatusChange,
+    ImportBatch,
     WorkOrderNumberSequence,
+    ArchivedJob,
 )
 
 # Register your models here.
@@ -192,3 +194,37 @@ class StatusChangeAdmin(admin.ModelAdmin):
     def get_queryset(self, request):
         """Return status changes with related data"""
         return super().get_queryset(request).select_related('job__calendar', 'changed_by')
+
+
+@admin.register(ImportBatch)
+class ImportBatchAdmin(admin.ModelAdmin):
+    """Admin configuration for ImportBatch model"""
+    list_display = ['batch_id', 'source', 'filename', 'calendar', 'status', 'imported_count', 'error_count', 'created_at']
+    list_filter = ['source', 'status', 'created_at']
+    search_fields = ['batch_id', 'filename']
+    ordering = ['-created_at']
+    readonly_fields = [
+        'batch_id', 'processed_count', 'imported_count', 'skipped_count', 'error_count',
+        'error_details', 'first_start_dt', 'last_start_dt', 'revert_started_at', 'reverted_at',
+        'reverted_count', 'created_at', 'started_at', 'finished_at', 'updated_at',
+    ]
+
+    def get_queryset(self, request):
+        """Return batches without loading the stored upload"""
+        return super().get_queryset(request).defer('payload').select_related('calendar')
+
+
+@admin.register(ArchivedJob)
+class ArchivedJobAdmin(admin.ModelAdmin):
+    """Read-only admin for jobs moved to the archive by archive_jobs"""
+    list_display = ['original_id', 'business_name', 'contact_name', 'calendar_name', 'start_dt', 'status', 'reason', 'archived_at']
+    list_filter = ['reason', 'status', 'archived_at']
+    search_fields = ['original_id', 'business_name', 'contact_name', 'phone']
+    ordering = ['-archived_at']
+    date_hierarchy = 'archived_at'
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,28 @@
+import logging
+import multiprocessing
+import threading
+
+from django.apps import AppConfig
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class RentalSchedulerConfig(AppConfig):
+    name = "rental_scheduler"
+
+    def ready(self):
+        # Opt-in: pay WeasyPrint's import, stylesheet and font loading cost at
+        # startup instead of on the first work order print
+        # (never in a spawned render worker, so workers do not start pools of their own)
+        if getattr(settings, "PDF_WARMUP", False) and multiprocessing.parent_process() is None:
+            threading.Thread(target=_warm_up_pdf_renderer, name="pdf-warmup", daemon=True).start()
+
+
+def _warm_up_pdf_renderer():
+    from rental_scheduler.utils.pdf_renderer import warm_up
+
+    try:
+        warm_up()
+    except Exception:
+        logger.exception("PDF renderer warm-up failed")
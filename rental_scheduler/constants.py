@@ -31,6 +31,33 @@ MAX_JOB_SPAN_DAYS = 365
 MAX_MULTI_DAY_EXPANSION_DAYS = 120
 """Maximum days to expand for multi-day job events in calendar API response."""
 
+FOREVER_HORIZON_WEEKS = 8
+"""Default number of weeks of each forever series kept materialized as real Job rows."""
+
+IMPORT_BATCH_SIZE = 500
+"""Number of imported jobs validated and inserted together in one bulk_create."""
+
+REVERT_CHUNK_SIZE = 500
+"""Number of jobs deleted per transaction when an import is reverted."""
+
+ARCHIVE_DELETED_AFTER_DAYS = 30
+"""Soft-deleted jobs untouched for this many days are moved to the archive."""
+
+ARCHIVE_COMPLETED_AFTER_DAYS = 730
+"""Completed jobs that ended this many days ago are moved to the archive."""
+
+ARCHIVE_CHUNK_SIZE = 500
+"""Number of jobs moved to the archive per transaction."""
+
+WORKORDER_PDF_TEMPLATE_VERSION = 1
+"""Bump when work order PDF output changes without a template edit (CSS, fonts, WeasyPrint upgrade)."""
+
+WORKORDER_PDF_BATCH_MAX = 200
+"""Most work orders one batch PDF export request may include."""
+
+CUSTOMER_INDEX_SYNC_BATCH = 500
+"""Classic customers read and upserted per batch when syncing the local customer index."""
+
 
 # =============================================================================
 # UX WARNING THRESHOLDS (Client-side prompts)
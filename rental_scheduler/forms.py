@@ -251,6 +251,16 @@ class CalendarImportForm(forms.Form):
         })
     )
     
+    sync_existing = forms.BooleanField(
+        required=False,
+        initial=False,
+        label='Sync with earlier imports of this calendar',
+        help_text='Match events by their calendar UID: unchanged events are skipped, changed events are updated in place and only new events are added.',
+        widget=forms.CheckboxInput(attrs={
+            'class': 'rounded border-gray-300 text-blue-600 focus:ring-blue-500'
+        })
+    )
+    
     def clean_ics_file(self):
         """Validate the uploaded file"""
         ics_file = self.cleaned_data.get('ics_file')
@@ -272,10 +282,10 @@ class JobImportForm(forms.Form):
     
     json_file = forms.FileField(
         label='JSON Export File',
-        help_text='Upload a .json file exported from this application.',
+        help_text='Upload a .json or .ndjson file (optionally .gz compressed) exported from this application.',
         widget=forms.FileInput(attrs={
             'class': 'block w-full text-sm text-gray-900 border border-gray-300 rounded-lg cursor-pointer bg-gray-50 focus:outline-none focus:border-blue-500',
-            'accept': '.json'
+            'accept': '.json,.ndjson,.gz'
         })
     )
     
@@ -294,39 +304,38 @@ class JobImportForm(forms.Form):
         
         if json_file:
             # Check file extension
-            if not json_file.name.endswith('.json'):
-                raise ValidationError('File must have a .json extension.')
+            if not json_file.name.endswith(('.json', '.ndjson', '.json.gz', '.ndjson.gz')):
+                raise ValidationError('File must have a .json or .ndjson extension (optionally .gz compressed).')
             
             # Check file size (limit to 50MB)
             if json_file.size > 50 * 1024 * 1024:
                 raise ValidationError('File size must be less than 50MB.')
             
-            # Try to parse JSON to validate structure
+            # Read only up to the first job to validate the structure;
+            # the import itself streams the rest
+            import gzip
+            import json
+            from .utils.json_import import iter_export_jobs
+            
+            header = {}
             try:
-                json_file.seek(0)
-                content = json_file.read()
-                json_file.seek(0)  # Reset for later reading
-                
-                import json
-                data = json.loads(content)
-                
-                # Validate basic structure
-                if not isinstance(data, dict):
-                    raise ValidationError('Invalid JSON structure: root must be an object.')
-                
-                if 'version' not in data:
-                    raise ValidationError('Invalid export file: missing version field.')
-                
-                if 'jobs' not in data:
-                    raise ValidationError('Invalid export file: missing jobs array.')
-                
-                if not isinstance(data['jobs'], list):
-                    raise ValidationError('Invalid export file: jobs must be an array.')
-                
+                jobs = iter_export_jobs(json_file, header)
+                next(jobs, None)
+                if 'version' not in header:
+                    # Header fields may follow the jobs array in hand-edited files
+                    for _ in jobs:
+                        pass
             except json.JSONDecodeError as e:
                 raise ValidationError(f'Invalid JSON file: {str(e)}')
             except UnicodeDecodeError:
                 raise ValidationError('File encoding error. Please ensure the file is UTF-8 encoded.')
+            except (gzip.BadGzipFile, EOFError):
+                raise ValidationError('Invalid gzip file.')
+            finally:
+                json_file.seek(0)  # Reset for later reading
+            
+            if 'version' not in header:
+                raise ValidationError('Invalid export file: missing version field.')
         
         return json_file
 
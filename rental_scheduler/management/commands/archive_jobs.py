@@ -0,0 +1,130 @@
+"""
+Management command to move long-deleted and long-completed jobs to the archive.
+
+Soft-deleted jobs are never removed by the scheduler itself, so the jobs table
+and its indexes keep growing. This command copies them (with their call
+reminders and status history) into ArchivedJob and removes them from the jobs
+table. Archived jobs stay readable from the job detail views.
+
+Usage:
+    python manage.py archive_jobs --dry-run                  # Preview what would be archived
+    python manage.py archive_jobs                            # Archive with the default cutoffs
+    python manage.py archive_jobs --deleted-days 90          # Keep deleted jobs for 90 days
+    python manage.py archive_jobs --completed-days 365       # Archive jobs completed over a year ago
+    python manage.py archive_jobs --keep-completed           # Only archive deleted jobs
+    python manage.py archive_jobs --chunk-size 1000          # Rows moved per transaction
+
+Jobs are moved in bounded chunks, each in its own short transaction, so the
+command can be stopped and re-run at any time. The calendar cache is bumped
+once at the end. See rental_scheduler/utils/archive.py for which rows qualify.
+"""
+
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from rental_scheduler.constants import (
+    ARCHIVE_CHUNK_SIZE,
+    ARCHIVE_COMPLETED_AFTER_DAYS,
+    ARCHIVE_DELETED_AFTER_DAYS,
+)
+from rental_scheduler.models import Job, deferred_calendar_cache_invalidation
+from rental_scheduler.utils.archive import archivable_jobs_filter, archive_jobs_chunk
+
+
+class Command(BaseCommand):
+    help = 'Move long-deleted and long-completed jobs out of the jobs table into the archive'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--deleted-days',
+            type=int,
+            default=ARCHIVE_DELETED_AFTER_DAYS,
+            help=f'Archive soft-deleted jobs untouched for this many days. Default: {ARCHIVE_DELETED_AFTER_DAYS}.'
+        )
+        parser.add_argument(
+            '--completed-days',
+            type=int,
+            default=ARCHIVE_COMPLETED_AFTER_DAYS,
+            help=f'Archive completed jobs that ended this many days ago. Default: {ARCHIVE_COMPLETED_AFTER_DAYS}.'
+        )
+        parser.add_argument(
+            '--keep-completed',
+            action='store_true',
+            help='Do not archive completed jobs, only deleted ones.'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=ARCHIVE_CHUNK_SIZE,
+            help=f'Number of jobs moved per transaction. Default: {ARCHIVE_CHUNK_SIZE}.'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Preview what would be archived without changing anything.'
+        )
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        deleted_before = now - timedelta(days=options['deleted_days'])
+        completed_before = None if options['keep_completed'] else now - timedelta(days=options['completed_days'])
+        chunk_size = max(1, options['chunk_size'])
+        dry_run = options['dry_run']
+
+        self.stdout.write("\n" + "=" * 70)
+        self.stdout.write(self.style.SUCCESS("ARCHIVE JOBS"))
+        self.stdout.write("=" * 70)
+        self.stdout.write(f"Deleted before: {deleted_before:%Y-%m-%d}")
+        self.stdout.write(f"Completed before: {f'{completed_before:%Y-%m-%d}' if completed_before else 'kept'}")
+        self.stdout.write(f"Chunk size: {chunk_size}")
+        self.stdout.write(f"Dry run: {dry_run}")
+        self.stdout.write("-" * 70 + "\n")
+
+        candidates = archivable_jobs_filter(deleted_before, completed_before)
+        queryset = Job.objects.filter(candidates)
+
+        if dry_run:
+            # Parents of dead series only qualify once their instances are gone
+            eligible = queryset.count()
+            self.stdout.write("\n" + "=" * 70)
+            self.stdout.write("SUMMARY")
+            self.stdout.write("=" * 70)
+            self.stdout.write(self.style.WARNING(
+                f"Jobs that would be archived: at least {eligible} (dry run, no changes made)"
+            ))
+            self.stdout.write("=" * 70 + "\n")
+            if eligible:
+                self.stdout.write(self.style.WARNING("\nRun without --dry-run to actually archive the jobs."))
+            return
+
+        totals = {'jobs': 0, 'call_reminders': 0, 'status_changes': 0}
+        started = time.perf_counter()
+        with deferred_calendar_cache_invalidation():
+            while True:
+                chunk = list(queryset.order_by('pk').values_list('pk', flat=True)[:chunk_size])
+                if not chunk:
+                    break
+                moved = archive_jobs_chunk(chunk, candidates)
+                if not moved['jobs']:
+                    # Everything selected changed under us; re-select
+                    continue
+                for key, value in moved.items():
+                    totals[key] += value
+                elapsed = time.perf_counter() - started
+                rate = totals['jobs'] / elapsed if elapsed else 0
+                self.stdout.write(f"  Archived {totals['jobs']} jobs ({rate:.0f} rows/s)")
+        elapsed = time.perf_counter() - started
+
+        # Summary
+        self.stdout.write("\n" + "=" * 70)
+        self.stdout.write("SUMMARY")
+        self.stdout.write("=" * 70)
+        self.stdout.write(self.style.SUCCESS(f"Jobs archived: {totals['jobs']}"))
+        self.stdout.write(f"Call reminders archived: {totals['call_reminders']}")
+        self.stdout.write(f"Status changes archived: {totals['status_changes']}")
+        if elapsed and totals['jobs']:
+            self.stdout.write(f"Elapsed: {elapsed:.2f}s ({totals['jobs'] / elapsed:.0f} rows/s)")
+        self.stdout.write("=" * 70 + "\n")
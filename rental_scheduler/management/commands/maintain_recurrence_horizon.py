@@ -0,0 +1,63 @@
+"""
+Management command to keep the next N weeks of every "forever" recurring series
+materialized as real Job rows.
+
+Run it from a scheduled task (or enable the in-process scheduler with
+RECURRENCE_HORIZON_SCHEDULER_INTERVAL when serving via serve.py). Beyond the
+horizon, occurrences are still generated virtually.
+
+Usage:
+    python manage.py maintain_recurrence_horizon --dry-run     # Preview the work
+    python manage.py maintain_recurrence_horizon               # Extend and trim the horizon
+    python manage.py maintain_recurrence_horizon --weeks 12    # Custom horizon (weeks)
+
+"""
+
+from django.core.management.base import BaseCommand
+
+from rental_scheduler.utils.horizon import get_horizon_weeks, maintain_recurrence_horizon
+
+
+class Command(BaseCommand):
+    help = 'Materialize the next N weeks of forever recurring series and trim stale horizon rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--weeks',
+            type=int,
+            default=None,
+            help='Number of weeks ahead to keep materialized. Default: RECURRENCE_HORIZON_WEEKS setting.'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Preview what would be created and trimmed without writing.'
+        )
+
+    def handle(self, *args, **options):
+        weeks = options['weeks'] if options['weeks'] is not None else get_horizon_weeks()
+        dry_run = options['dry_run']
+
+        self.stdout.write("\n" + "=" * 70)
+        self.stdout.write(self.style.SUCCESS("MAINTAIN RECURRENCE HORIZON"))
+        self.stdout.write("=" * 70)
+        self.stdout.write(f"Horizon: {weeks} weeks")
+        self.stdout.write(f"Dry run: {dry_run}")
+        self.stdout.write("-" * 70 + "\n")
+
+        stats = maintain_recurrence_horizon(weeks=weeks, dry_run=dry_run)
+
+        self.stdout.write("\n" + "=" * 70)
+        self.stdout.write("SUMMARY")
+        self.stdout.write("=" * 70)
+        self.stdout.write(f"Horizon end: {stats['horizon_end']}")
+        self.stdout.write(f"Forever series: {stats['series']}")
+
+        if dry_run:
+            self.stdout.write(self.style.WARNING(f"Instances that would be created: {stats['created']}"))
+            self.stdout.write(self.style.WARNING(f"Instances that would be trimmed: {stats['trimmed']}"))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Instances created: {stats['created']}"))
+            self.stdout.write(self.style.SUCCESS(f"Instances trimmed: {stats['trimmed']}"))
+
+        self.stdout.write("=" * 70 + "\n")
@@ -0,0 +1,54 @@
+"""
+Management command to run queued ICS/JSON imports.
+
+Imports are normally processed by the in-process worker thread. Run this
+from a scheduled task when IMPORT_WORKER_ENABLED is off, or to drain the
+queue by hand.
+
+Usage:
+    python manage.py process_imports              # Drain the queue
+    python manage.py process_imports --max 1      # Process a single batch
+
+"""
+
+from django.core.management.base import BaseCommand
+
+from rental_scheduler.models import ImportBatch
+from rental_scheduler.utils.import_runner import process_import_queue
+
+
+class Command(BaseCommand):
+    help = 'Process queued calendar/JSON imports'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--max',
+            type=int,
+            default=None,
+            help='Maximum number of batches to process. Default: all queued batches.'
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write("\n" + "=" * 70)
+        self.stdout.write(self.style.SUCCESS("PROCESS IMPORTS"))
+        self.stdout.write("=" * 70)
+        queued = ImportBatch.objects.filter(status=ImportBatch.STATUS_QUEUED).count()
+        self.stdout.write(f"Queued batches: {queued}")
+        self.stdout.write("-" * 70 + "\n")
+
+        processed = process_import_queue(max_batches=options['max'])
+
+        self.stdout.write("\n" + "=" * 70)
+        self.stdout.write("SUMMARY")
+        self.stdout.write("=" * 70)
+        self.stdout.write(self.style.SUCCESS(f"Batches processed: {len(processed)}"))
+        for batch in processed:
+            line = (
+                f"{batch.batch_id} ({batch.filename}): {batch.status}, {batch.imported_count} imported, "
+                f"{batch.skipped_count} skipped, {batch.error_count} errors"
+            )
+            if batch.status == ImportBatch.STATUS_FAILED:
+                self.stdout.write(self.style.WARNING(f"{line} - {batch.message}"))
+            else:
+                self.stdout.write(line)
+        self.stdout.write("=" * 70 + "\n")
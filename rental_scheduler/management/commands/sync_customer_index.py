@@ -0,0 +1,56 @@
+"""
+Management command to sync the local Classic customer index.
+
+Customer typeahead and duplicate detection read the local index instead of
+Classic Accounting. serve.py keeps it fresh with an in-process thread
+(CUSTOMER_INDEX_SYNC_INTERVAL); run this from a scheduled task when the thread
+is off, or with --full now and then to re-read every customer.
+
+Usage:
+    python manage.py sync_customer_index           # Changed customers only
+    python manage.py sync_customer_index --full    # Re-read every customer
+
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounting_integration.router import accounting_is_configured
+from rental_scheduler.models import ClassicCustomer
+from rental_scheduler.utils.customer_index import sync_customer_index
+
+
+class Command(BaseCommand):
+    help = 'Sync the local search index of Classic Accounting customers'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Re-read every customer instead of only the ones changed since the last sync.'
+        )
+
+    def handle(self, *args, **options):
+        if not accounting_is_configured():
+            raise CommandError("Classic Accounting is not configured (ACCOUNTING_DB_NAME).")
+
+        self.stdout.write("\n" + "=" * 70)
+        self.stdout.write(self.style.SUCCESS("SYNC CUSTOMER INDEX"))
+        self.stdout.write("=" * 70)
+        self.stdout.write(f"Indexed customers: {ClassicCustomer.objects.count()}")
+        self.stdout.write(f"Full sync: {options['full']}")
+        self.stdout.write("-" * 70 + "\n")
+
+        started = time.perf_counter()
+        stats = sync_customer_index(full=options['full'])
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write("\n" + "=" * 70)
+        self.stdout.write("SUMMARY")
+        self.stdout.write("=" * 70)
+        self.stdout.write(f"Classic customers: {stats['customers']}")
+        self.stdout.write(self.style.SUCCESS(f"Customers updated: {stats['updated']}"))
+        self.stdout.write(self.style.SUCCESS(f"Customers removed: {stats['deleted']}"))
+        self.stdout.write(f"Elapsed: {elapsed:.2f}s")
+        self.stdout.write("=" * 70 + "\n")
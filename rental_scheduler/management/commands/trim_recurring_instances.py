@@ -9,14 +9,24 @@ Usage:
     python manage.py trim_recurring_instances                  # Actually delete instances
     python manage.py trim_recurring_instances --horizon 2      # Custom horizon (years)
     python manage.py trim_recurring_instances --convert-to-forever  # Also convert series to forever mode
+    python manage.py trim_recurring_instances --chunk-size 1000     # Rows deleted per transaction
+
+Excess instances for all series are found with one window-function query and
+deleted in bounded chunks, each in its own short transaction, so large cleanups
+never hold locks on the jobs table for long. The calendar cache is bumped once
+at the end instead of once per deleted row.
 
 """
 
-from datetime import date, timedelta
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta
+
 from django.core.management.base import BaseCommand
-from django.db import transaction
+from django.db import connection, transaction
 from django.utils import timezone
-from rental_scheduler.models import Job
+
+from rental_scheduler.models import CallReminder, Job, deferred_calendar_cache_invalidation
 
 
 class Command(BaseCommand):
@@ -45,12 +55,56 @@ class Command(BaseCommand):
             default=24,
             help='Only process series with at least this many instances. Default: 24.'
         )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=500,
+            help='Number of instances deleted per transaction. Default: 500.'
+        )
+
+    def find_excess_instances(self, horizon_date, min_instances):
+        """
+        Return (instance_id, parent_id, series_size) rows for every uncompleted
+        instance beyond the horizon in a series with at least min_instances
+        active instances, using one window-function query.
+        """
+        job_table = connection.ops.quote_name(Job._meta.db_table)
+        # Instances starting on or after the local midnight after the horizon date
+        cutoff = timezone.make_aware(
+            datetime.combine(horizon_date + timedelta(days=1), datetime.min.time())
+        )
+        sql = f"""
+            SELECT id, recurrence_parent_id, series_size
+            FROM (
+                SELECT
+                    inst.id,
+                    inst.recurrence_parent_id,
+                    inst.status,
+                    inst.recurrence_original_start,
+                    COUNT(*) OVER (PARTITION BY inst.recurrence_parent_id) AS series_size
+                FROM {job_table} inst
+                JOIN {job_table} parent ON parent.id = inst.recurrence_parent_id
+                WHERE inst.is_deleted = %s
+                  AND parent.is_deleted = %s
+                  AND parent.recurrence_parent_id IS NULL
+                  AND parent.recurrence_rule IS NOT NULL
+                  AND parent.status <> %s
+            ) ranked
+            WHERE series_size >= %s
+              AND status = %s
+              AND recurrence_original_start >= %s
+            ORDER BY recurrence_parent_id, id
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [False, False, 'canceled', min_instances, 'uncompleted', cutoff])
+            return cursor.fetchall()
 
     def handle(self, *args, **options):
         horizon_years = options['horizon']
         dry_run = options['dry_run']
         convert_to_forever = options['convert_to_forever']
         min_instances = options['min_instances']
+        chunk_size = max(1, options['chunk_size'])
 
         horizon_date = date.today() + timedelta(days=horizon_years * 365)
         
@@ -60,58 +114,55 @@ class Command(BaseCommand):
         self.stdout.write(f"Horizon: {horizon_years} years ({horizon_date})")
         self.stdout.write(f"Minimum instances to process: {min_instances}")
         self.stdout.write(f"Convert to forever: {convert_to_forever}")
+        self.stdout.write(f"Chunk size: {chunk_size}")
         self.stdout.write(f"Dry run: {dry_run}")
         self.stdout.write("-" * 70 + "\n")
 
-        # Find recurring parents with instances beyond the horizon
-        parents_with_future_instances = Job.objects.filter(
-            recurrence_rule__isnull=False,
-            recurrence_parent__isnull=True,  # Only parents
-            is_deleted=False,
-        ).exclude(
-            status='canceled'
-        ).prefetch_related('recurrence_instances')
-
-        total_trimmed = 0
-        total_series_affected = 0
-        total_converted = 0
-
-        for parent in parents_with_future_instances:
-            # Count all instances
-            all_instances = parent.recurrence_instances.filter(is_deleted=False)
-            total_count = all_instances.count()
-
-            if total_count < min_instances:
-                continue
+        rows = self.find_excess_instances(horizon_date, min_instances)
+        excess_ids = [row[0] for row in rows]
+        excess_by_parent = Counter(row[1] for row in rows)
+        series_sizes = {row[1]: row[2] for row in rows}
+        parents = Job.objects.only('id', 'business_name', 'contact_name').in_bulk(list(excess_by_parent))
 
-            # Find instances beyond horizon that are uncompleted
-            future_instances = all_instances.filter(
-                recurrence_original_start__date__gt=horizon_date,
-                status='uncompleted'
-            )
-            future_count = future_instances.count()
-
-            if future_count == 0:
-                continue
-
-            total_series_affected += 1
-            
+        for parent_id, future_count in excess_by_parent.items():
+            parent = parents[parent_id]
             self.stdout.write(f"\nSeries: {parent.business_name or parent.contact_name or f'Job #{parent.id}'}")
             self.stdout.write(f"  Parent ID: {parent.id}")
-            self.stdout.write(f"  Total instances: {total_count}")
+            self.stdout.write(f"  Total instances: {series_sizes[parent_id]}")
             self.stdout.write(f"  Instances beyond {horizon_date}: {future_count}")
-            
-            if dry_run:
-                self.stdout.write(self.style.WARNING(f"  [DRY RUN] Would delete {future_count} instances"))
-            else:
-                # Delete future uncompleted instances
-                with transaction.atomic():
-                    deleted_count, _ = future_instances.delete()
-                    total_trimmed += deleted_count
-                    self.stdout.write(self.style.SUCCESS(f"  Deleted {deleted_count} instances"))
-
-                    # Optionally convert to forever mode
-                    if convert_to_forever:
+
+        total_series_affected = len(excess_by_parent)
+        total_trimmed = 0
+        total_converted = 0
+        elapsed = 0.0
+
+        if dry_run:
+            if excess_ids:
+                self.stdout.write(self.style.WARNING(
+                    f"\n[DRY RUN] Would delete {len(excess_ids)} instances "
+                    f"in {-(-len(excess_ids) // chunk_size)} chunks"
+                ))
+        else:
+            started = time.perf_counter()
+            with deferred_calendar_cache_invalidation():
+                for offset in range(0, len(excess_ids), chunk_size):
+                    chunk = excess_ids[offset:offset + chunk_size]
+                    # Short transaction per chunk: locks are released between chunks
+                    with transaction.atomic():
+                        _, deleted_by_model = Job.objects.filter(pk__in=chunk).delete()
+                    deleted = deleted_by_model.get(Job._meta.label, 0)
+                    total_trimmed += deleted
+                    elapsed = time.perf_counter() - started
+                    rate = total_trimmed / elapsed if elapsed else 0
+                    self.stdout.write(
+                        f"  Deleted {total_trimmed}/{len(excess_ids)} instances "
+                        f"({deleted_by_model.get(CallReminder._meta.label, 0)} reminders in this chunk, "
+                        f"{rate:.0f} rows/s)"
+                    )
+
+                # Optionally convert to forever mode
+                if convert_to_forever:
+                    for parent in Job.objects.filter(pk__in=list(excess_by_parent)):
                         rule = parent.recurrence_rule or {}
                         if rule.get('end') != 'never':
                             rule['end'] = 'never'
@@ -121,7 +172,7 @@ class Command(BaseCommand):
                             parent.end_recurrence_date = None
                             parent.save(update_fields=['recurrence_rule', 'end_recurrence_date'])
                             total_converted += 1
-                            self.stdout.write(self.style.SUCCESS(f"  Converted to forever mode"))
+            elapsed = time.perf_counter() - started
 
         # Summary
         self.stdout.write("\n" + "=" * 70)
@@ -130,9 +181,11 @@ class Command(BaseCommand):
         self.stdout.write(f"Series affected: {total_series_affected}")
         
         if dry_run:
-            self.stdout.write(self.style.WARNING(f"Instances that would be deleted: (dry run, no changes made)"))
+            self.stdout.write(self.style.WARNING(f"Instances that would be deleted: {len(excess_ids)} (dry run, no changes made)"))
         else:
             self.stdout.write(self.style.SUCCESS(f"Instances deleted: {total_trimmed}"))
+            if elapsed:
+                self.stdout.write(f"Elapsed: {elapsed:.2f}s ({total_trimmed / elapsed:.0f} rows/s)")
             if convert_to_forever:
                 self.stdout.write(self.style.SUCCESS(f"Series converted to forever: {total_converted}"))
 
@@ -142,7 +195,3 @@ class Command(BaseCommand):
             self.stdout.write(self.style.WARNING(
                 "\nRun without --dry-run to actually delete the instances."
             ))
-
-
-
-
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.5 on 2026-10-18 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rental_scheduler', '0048_remove_workorder_rental_sche_wo_numb_276885_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='recurrence_auto_materialized',
+            field=models.BooleanField(default=False, help_text='Instance was created by the horizon maintainer and has not been edited since'),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='recurrence_materialized_from',
+            field=models.DateField(blank=True, help_text='First date of the window in which every occurrence of this forever series is stored', null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='recurrence_materialized_until',
+            field=models.DateField(blank=True, help_text='Last date of the window in which every occurrence of this forever series is stored', null=True),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Enforce one Job row per occurrence of a recurring series.
+#
+# Check-then-insert materialization could create duplicate rows under
+# concurrent clicks. Existing duplicates are detached (recurrence_original_start
+# cleared) before the constraint is added; the kept row prefers an active one.
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def detach_duplicate_occurrences(apps, schema_editor):
+    """Keep one row per (parent, original start); detach the rest"""
+    Job = apps.get_model('rental_scheduler', 'Job')
+
+    duplicates = (
+        Job.objects.filter(
+            recurrence_parent__isnull=False,
+            recurrence_original_start__isnull=False,
+        )
+        .values('recurrence_parent_id', 'recurrence_original_start')
+        .annotate(row_count=Count('id'))
+        .filter(row_count__gt=1)
+    )
+
+    detached_count = 0
+    for duplicate in duplicates:
+        ids = list(
+            Job.objects.filter(
+                recurrence_parent_id=duplicate['recurrence_parent_id'],
+                recurrence_original_start=duplicate['recurrence_original_start'],
+            ).order_by('is_deleted', 'id').values_list('id', flat=True)
+        )
+        detached_count += Job.objects.filter(id__in=ids[1:]).update(recurrence_original_start=None)
+
+    if detached_count > 0:
+        print(f"Detached {detached_count} duplicate recurring occurrence rows")
+
+
+def reverse_detach(apps, schema_editor):
+    # Nothing to reverse - duplicates stay detached
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rental_scheduler', '0049_job_recurrence_horizon'),
+    ]
+
+    operations = [
+        migrations.RunPython(detach_duplicate_occurrences, reverse_detach),
+        migrations.AddConstraint(
+            model_name='job',
+            constraint=models.UniqueConstraint(condition=models.Q(('recurrence_parent__isnull', False)), fields=('recurrence_parent', 'recurrence_original_start'), name='job_unique_recurrence_occurrence'),
+        ),
+    ]
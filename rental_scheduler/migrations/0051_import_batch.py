@@ -0,0 +1,46 @@
+# Generated by Django 5.2.5 on 2026-10-18 21:10
+
+import django.db.models.deletion
+import rental_scheduler.models
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rental_scheduler', '0050_job_unique_recurrence_occurrence'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportBatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('batch_id', models.CharField(default=rental_scheduler.models.new_import_batch_id, help_text='UUID stamped on imported jobs as Job.import_batch_id', max_length=36, unique=True)),
+                ('source', models.CharField(choices=[('ics', 'ICS calendar file'), ('json', 'JSON export')], help_text='Type of file being imported', max_length=10)),
+                ('filename', models.CharField(blank=True, help_text='Name of the uploaded file', max_length=255)),
+                ('options', models.JSONField(blank=True, default=dict, help_text='Import options chosen on the upload form')),
+                ('payload', models.BinaryField(blank=True, help_text='Uploaded file contents (cleared once the import finishes)', null=True)),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed')], db_index=True, default='queued', help_text='Current state of the import', max_length=20)),
+                ('processed_count', models.PositiveIntegerField(default=0)),
+                ('imported_count', models.PositiveIntegerField(default=0)),
+                ('skipped_count', models.PositiveIntegerField(default=0)),
+                ('error_count', models.PositiveIntegerField(default=0)),
+                ('error_details', models.JSONField(blank=True, default=list, help_text='First error messages reported by the import')),
+                ('message', models.TextField(blank=True, help_text='Failure reason or warning for the whole import')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('calendar', models.ForeignKey(blank=True, help_text='Calendar the jobs are imported into', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='import_batches', to='rental_scheduler.calendar')),
+                ('created_by', models.ForeignKey(blank=True, help_text='User who uploaded the file', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='import_batches', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Import Batch',
+                'verbose_name_plural': 'Import Batches',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
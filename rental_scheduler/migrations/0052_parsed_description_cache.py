@@ -0,0 +1,27 @@
+# Generated by Django 5.2.5 on 2026-10-18 21:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rental_scheduler', '0051_import_batch'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ParsedDescriptionCache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(help_text='SHA-256 of the normalized description, model and prompt version', max_length=64, unique=True)),
+                ('model_name', models.CharField(blank=True, help_text='Parser model that produced the result', max_length=100)),
+                ('result', models.JSONField(help_text='Extracted fields (trailer_color, trailer_serial, ...)')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Parsed Description Cache Entry',
+                'verbose_name_plural': 'Parsed Description Cache',
+            },
+        ),
+    ]
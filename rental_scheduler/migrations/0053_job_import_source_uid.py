@@ -0,0 +1,39 @@
+# Generated by Django 5.2.5 on 2026-10-18 21:17
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rental_scheduler', '0052_parsed_description_cache'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='importbatch',
+            name='unchanged_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='importbatch',
+            name='updated_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='import_content_hash',
+            field=models.CharField(blank=True, default='', help_text='Hash of the source event content at the last import (unchanged events are skipped)', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='import_source_uid',
+            field=models.CharField(blank=True, help_text='Source event key (ICS UID, plus RECURRENCE-ID for overrides) used to sync re-imports', max_length=255, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('import_source_uid__isnull', False)), fields=['calendar', 'import_source_uid'], name='job_import_uid_idx'),
+        ),
+    ]
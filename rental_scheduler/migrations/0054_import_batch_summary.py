@@ -0,0 +1,102 @@
+# Generated by Django 5.2.5 on 2026-10-18 21:24
+
+from django.db import migrations, models
+from django.db.models import Count, Max, Min
+
+
+def backfill_import_batches(apps, schema_editor):
+    """
+    Summarize existing imports into ImportBatch rows.
+
+    Imports made before the import queue existed only live on
+    Job.import_batch_id; they get a completed 'legacy' batch. Queued batches
+    get their start date range filled in.
+    """
+    Job = apps.get_model('rental_scheduler', 'Job')
+    ImportBatch = apps.get_model('rental_scheduler', 'ImportBatch')
+
+    summaries = (
+        Job.objects.filter(import_batch_id__isnull=False)
+        .values('import_batch_id')
+        .annotate(
+            count=Count('id'),
+            target_calendar_id=Min('calendar_id'),
+            first_start=Min('start_dt'),
+            last_start=Max('start_dt'),
+            imported_at=Min('created_at'),
+        )
+    )
+    known = dict(ImportBatch.objects.values_list('batch_id', 'pk'))
+
+    created_count = 0
+    for summary in summaries:
+        batch_pk = known.get(summary['import_batch_id'])
+        if batch_pk is not None:
+            ImportBatch.objects.filter(pk=batch_pk).update(
+                first_start_dt=summary['first_start'],
+                last_start_dt=summary['last_start'],
+            )
+            continue
+        batch = ImportBatch.objects.create(
+            batch_id=summary['import_batch_id'],
+            source='legacy',
+            calendar_id=summary['target_calendar_id'],
+            status='completed',
+            processed_count=summary['count'],
+            imported_count=summary['count'],
+            first_start_dt=summary['first_start'],
+            last_start_dt=summary['last_start'],
+            finished_at=summary['imported_at'],
+        )
+        # created_at is auto_now_add; keep the original import time instead
+        ImportBatch.objects.filter(pk=batch.pk).update(created_at=summary['imported_at'])
+        created_count += 1
+
+    if created_count > 0:
+        print(f"Backfilled {created_count} import batches from existing jobs")
+
+
+def reverse_backfill(apps, schema_editor):
+    ImportBatch = apps.get_model('rental_scheduler', 'ImportBatch')
+    ImportBatch.objects.filter(source='legacy').delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rental_scheduler', '0053_job_import_source_uid'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='importbatch',
+            name='first_start_dt',
+            field=models.DateTimeField(blank=True, help_text='Earliest start of the imported jobs (recorded when the import finishes)', null=True),
+        ),
+        migrations.AddField(
+            model_name='importbatch',
+            name='last_start_dt',
+            field=models.DateTimeField(blank=True, help_text='Latest start of the imported jobs (recorded when the import finishes)', null=True),
+        ),
+        migrations.AddField(
+            model_name='importbatch',
+            name='revert_started_at',
+            field=models.DateTimeField(blank=True, help_text='When a revert of this import was started (set while it is in progress)', null=True),
+        ),
+        migrations.AddField(
+            model_name='importbatch',
+            name='reverted_at',
+            field=models.DateTimeField(blank=True, db_index=True, help_text='When the revert finished; reverted imports are hidden from the history', null=True),
+        ),
+        migrations.AddField(
+            model_name='importbatch',
+            name='reverted_count',
+            field=models.PositiveIntegerField(default=0, help_text='Jobs deleted so far by the revert'),
+        ),
+        migrations.AlterField(
+            model_name='importbatch',
+            name='source',
+            field=models.CharField(choices=[('ics', 'ICS calendar file'), ('json', 'JSON export'), ('legacy', 'Earlier import')], help_text='Type of file being imported', max_length=10),
+        ),
+        migrations.RunPython(backfill_import_batches, reverse_backfill),
+    ]
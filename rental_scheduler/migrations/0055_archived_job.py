@@ -0,0 +1,41 @@
+# Generated by Django 5.2.5 on 2026-10-18 21:32
+
+import django.db.models.deletion
+import rental_scheduler.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rental_scheduler', '0054_import_batch_summary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('original_id', models.PositiveIntegerField(help_text='Primary key the job had in the Job table', unique=True)),
+                ('calendar_name', models.CharField(blank=True, help_text='Calendar name at archive time', max_length=100)),
+                ('business_name', models.CharField(blank=True, max_length=255)),
+                ('contact_name', models.CharField(blank=True, max_length=255)),
+                ('phone', models.CharField(blank=True, max_length=20)),
+                ('start_dt', models.DateTimeField(blank=True, null=True)),
+                ('end_dt', models.DateTimeField(blank=True, null=True)),
+                ('status', models.CharField(blank=True, max_length=20)),
+                ('reason', models.CharField(choices=[('deleted', 'Deleted'), ('completed', 'Completed')], help_text='Why the job was archived', max_length=20)),
+                ('job_data', models.JSONField(encoder=rental_scheduler.models.ArchiveJSONEncoder, help_text='Every Job column at archive time')),
+                ('call_reminders', models.JSONField(blank=True, default=list, encoder=rental_scheduler.models.ArchiveJSONEncoder, help_text='Call reminders that were linked to the job')),
+                ('status_changes', models.JSONField(blank=True, default=list, encoder=rental_scheduler.models.ArchiveJSONEncoder, help_text='Status change history of the job')),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('calendar', models.ForeignKey(blank=True, help_text='Calendar the job belonged to', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_jobs', to='rental_scheduler.calendar')),
+            ],
+            options={
+                'verbose_name': 'Archived Job',
+                'verbose_name_plural': 'Archived Jobs',
+                'ordering': ['-archived_at'],
+                'indexes': [models.Index(fields=['calendar', 'start_dt'], name='archivedjob_cal_start_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 5.2.5 on 2026-10-18 21:51
+
+from django.db import migrations, models, transaction
+
+TRIGRAM_INDEXES = (
+    ("classiccustomer_search_trgm", "search_text"),
+    ("classiccustomer_name_trgm", "name_normalized"),
+    ("classiccustomer_street_trgm", "street_normalized"),
+)
+
+
+def create_trigram_indexes(apps, schema_editor):
+    """Trigram indexes serve the index's substring searches (PostgreSQL only)."""
+    connection = schema_editor.connection
+    if connection.vendor != "postgresql":
+        return
+    try:
+        with transaction.atomic(using=connection.alias):
+            schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    except Exception:
+        # No privilege to install pg_trgm: searches still work, as scans of a small table
+        return
+    for name, column in TRIGRAM_INDEXES:
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {name} ON rental_scheduler_classiccustomer "
+            f"USING gin ({column} gin_trgm_ops)"
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name, _column in TRIGRAM_INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rental_scheduler', '0055_archived_job'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClassicCustomer',
+            fields=[
+                ('org_id', models.BigIntegerField(help_text='Classic Accounting Org.org_id', primary_key=True, serialize=False)),
+                ('name', models.CharField(blank=True, max_length=60)),
+                ('phone', models.CharField(blank=True, max_length=45)),
+                ('contact', models.CharField(blank=True, max_length=45)),
+                ('email', models.CharField(blank=True, max_length=300)),
+                ('taxable', models.BooleanField(blank=True, null=True)),
+                ('address_line1', models.CharField(blank=True, max_length=60)),
+                ('address_line2', models.CharField(blank=True, max_length=60)),
+                ('city', models.CharField(blank=True, max_length=60)),
+                ('state', models.CharField(blank=True, max_length=25)),
+                ('zip', models.CharField(blank=True, max_length=45)),
+                ('name_normalized', models.CharField(blank=True, db_index=True, max_length=60)),
+                ('phone_digits', models.CharField(blank=True, db_index=True, max_length=45)),
+                ('zip_digits', models.CharField(blank=True, db_index=True, max_length=45)),
+                ('street_normalized', models.CharField(blank=True, db_index=True, max_length=60)),
+                ('search_text', models.TextField(blank=True, help_text='Lowercased name, contact, email and phone for typeahead')),
+                ('classic_version', models.DateTimeField(blank=True, db_index=True, help_text='Newest Classic moddate/createdate of the org and its BILLTO addresses', null=True)),
+                ('synced_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Classic Customer (index)',
+                'verbose_name_plural': 'Classic Customers (index)',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.5 on 2026-10-18 22:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rental_scheduler', '0056_classic_customer'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClassicCustomerIndexState',
+            fields=[
+                ('id', models.PositiveSmallIntegerField(default=1, editable=False, primary_key=True, serialize=False)),
+                ('completed_at', models.DateTimeField(blank=True, help_text='When the last sync finished', null=True)),
+                ('customers', models.PositiveIntegerField(default=0, help_text='Classic customers indexed by the last finished sync')),
+            ],
+            options={
+                'verbose_name': 'Classic Customer Index State',
+                'verbose_name_plural': 'Classic Customer Index State',
+            },
+        ),
+    ]
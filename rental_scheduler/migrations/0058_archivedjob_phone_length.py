@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-18 22:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rental_scheduler', '0057_classic_customer_index_state'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='archivedjob',
+            name='phone',
+            field=models.CharField(blank=True, max_length=25),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-18 22:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rental_scheduler', '0058_archivedjob_phone_length'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='classiccustomerindexstate',
+            name='classic_watermark',
+            field=models.DateTimeField(blank=True, help_text='Newest Classic moddate/createdate seen when the last finished sync started', null=True),
+        ),
+    ]
@@ -1,9 +1,13 @@
-from django.db import models, transaction
+from django.db import IntegrityError, models, transaction
 from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
 from django.core.validators import RegexValidator
 from datetime import datetime, date
+import json
+import threading
 import uuid
 import os
+from contextlib import contextmanager
 from django.core.files.storage import FileSystemStorage
 import logging
 from django.utils import timezone
@@ -92,6 +96,9 @@ class Job(models.Model):
         ('canceled', 'Canceled'),
     ]
     
+    # True only on read-only jobs rebuilt by ArchivedJob.as_job()
+    is_archived = False
+    
     # Repeat type choices for recurring jobs
     REPEAT_CHOICES = [
         ('none', 'None'),
@@ -230,6 +237,20 @@ class Job(models.Model):
         null=True,
         help_text="Date after which no more recurrences should be generated"
     )
+    recurrence_materialized_from = models.DateField(
+        blank=True,
+        null=True,
+        help_text="First date of the window in which every occurrence of this forever series is stored"
+    )
+    recurrence_materialized_until = models.DateField(
+        blank=True,
+        null=True,
+        help_text="Last date of the window in which every occurrence of this forever series is stored"
+    )
+    recurrence_auto_materialized = models.BooleanField(
+        default=False,
+        help_text="Instance was created by the horizon maintainer and has not been edited since"
+    )
     
     # Job details
     notes = models.TextField(
@@ -303,6 +324,18 @@ class Job(models.Model):
         db_index=True,
         help_text="UUID for batch import tracking - allows reverting imports"
     )
+    import_source_uid = models.CharField(
+        max_length=255,
+        blank=True,
+        null=True,
+        help_text="Source event key (ICS UID, plus RECURRENCE-ID for overrides) used to sync re-imports"
+    )
+    import_content_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        default='',
+        help_text="Hash of the source event content at the last import (unchanged events are skipped)"
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -317,6 +350,12 @@ class Job(models.Model):
             models.Index(fields=['is_deleted']),
             models.Index(fields=['repeat_type']),
             models.Index(fields=['recurrence_parent', 'recurrence_original_start'], name='job_recur_idx'),
+            # Re-import sync lookups: jobs of a calendar by source event key
+            models.Index(
+                fields=['calendar', 'import_source_uid'],
+                name='job_import_uid_idx',
+                condition=models.Q(import_source_uid__isnull=False),
+            ),
             # Partial index for calendar feed overlap filter (is_deleted=False)
             # Covers: jobs.filter(is_deleted=False, start_dt__lt=X, end_dt__gte=Y)
             models.Index(
@@ -331,6 +370,15 @@ class Job(models.Model):
                 condition=models.Q(is_deleted=False),
             ),
         ]
+        constraints = [
+            # One row per occurrence of a series (soft-deleted rows included,
+            # since they suppress their virtual occurrence)
+            models.UniqueConstraint(
+                fields=['recurrence_parent', 'recurrence_original_start'],
+                name='job_unique_recurrence_occurrence',
+                condition=models.Q(recurrence_parent__isnull=False),
+            ),
+        ]
     
     def __str__(self):
         """String representation of the job"""
@@ -604,11 +652,69 @@ class Job(models.Model):
             fields_to_update=fields_to_update
         )
     
+    # Parent fields mirrored onto horizon-materialized instances. A change to any
+    # of them releases the series horizon so stale copies are never shown.
+    HORIZON_TRACKED_FIELDS = (
+        'calendar_id', 'status', 'business_name', 'contact_name', 'phone',
+        'address_line1', 'address_line2', 'city', 'state', 'postal_code',
+        'start_dt', 'end_dt', 'all_day', 'has_call_reminder',
+        'call_reminder_weeks_prior', 'notes', 'repair_notes', 'trailer_color',
+        'trailer_serial', 'trailer_details', 'quote', 'trailer_color_overwrite',
+        'quote_text', 'is_deleted', 'created_by_id', 'end_recurrence_date',
+    )
+
+    # Horizon snapshot of the loaded (or last saved) row; None for new jobs
+    _original_horizon_state = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._original_horizon_state = instance._horizon_state()
+        return instance
+
+    def _horizon_state(self):
+        """
+        Snapshot of the fields horizon instances are copied from.
+
+        Only recurring parents are tracked. Reads ``__dict__`` directly so
+        deferred fields are never loaded just to take the snapshot.
+        """
+        rule = self.__dict__.get('recurrence_rule')
+        if not rule or self.__dict__.get('recurrence_parent_id') is not None:
+            return None
+        values = tuple(self.__dict__.get(name) for name in self.HORIZON_TRACKED_FIELDS)
+        # The rule dict is mutated in place by callers, so compare a serialized copy
+        return values + (json.dumps(rule, sort_keys=True, default=str),)
+
     def save(self, *args, **kwargs):
         """Save the job with validation"""
         self.full_clean()
+
+        if self.pk and self.__dict__.get('recurrence_auto_materialized'):
+            # Any saved edit makes a horizon instance user-owned, so it is never trimmed
+            self.recurrence_auto_materialized = False
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | {'recurrence_auto_materialized'}
+
+        if kwargs.get('update_fields') is not None:
+            # The .ics feed ETag follows updated_at, so partial saves bump it too
+            kwargs['update_fields'] = set(kwargs['update_fields']) | {'updated_at'}
+
+        horizon_state = self._horizon_state()
+        release_horizon = (
+            self.pk is not None
+            and self._original_horizon_state is not None
+            and horizon_state != self._original_horizon_state
+        )
+
         super().save(*args, **kwargs)
 
+        if release_horizon:
+            from rental_scheduler.utils.horizon import release_series_horizon
+            release_series_horizon(self)
+        self._original_horizon_state = horizon_state
+
 
 class CallReminder(models.Model):
     """
@@ -669,12 +775,30 @@ class CallReminder(models.Model):
 
 
 
+# This process's reserved block of work order numbers (block allocation mode)
+_number_block_lock = threading.Lock()
+_number_block = None
+
+
+def _release_number_block():
+    """Forget this process's reserved work order numbers."""
+    global _number_block
+
+    with _number_block_lock:
+        _number_block = None
+
+
 class WorkOrderNumberSequence(models.Model):
     """
     Concurrency-safe Work Order number allocator.
 
     Singleton-style (pk=1). Allocation must happen inside a transaction and use
     select_for_update to avoid duplicates under concurrent requests.
+
+    With ``WORK_ORDER_NUMBER_BLOCK_SIZE`` > 1 each process reserves a block of
+    numbers with one locked update and hands them out from memory. A block
+    reserved in a transaction that rolls back is discarded; the unique
+    constraint on ``WorkOrderV2.number`` catches any remaining overlap.
     """
 
     id = models.PositiveSmallIntegerField(primary_key=True, default=1, editable=False)
@@ -704,27 +828,51 @@ class WorkOrderNumberSequence(models.Model):
         return obj
 
     @classmethod
-    def allocate_work_order_number(cls):
+    def reserve(cls, count=1):
+        """Take ``count`` consecutive numbers from the sequence; returns the first."""
         with transaction.atomic():
             seq, _created = cls.objects.select_for_update().get_or_create(
                 pk=1,
                 defaults={"start_number": 1, "next_number": 1},
             )
             number = seq.next_number
-            seq.next_number = number + 1
-            seq.save(update_fields=["next_number"])
+            # update() skips full_clean()'s primary key uniqueness query
+            cls.objects.filter(pk=1).update(next_number=number + count, updated_at=timezone.now())
+            return number
+
+    @classmethod
+    def allocate_work_order_number(cls):
+        from django.conf import settings
+
+        block_size = getattr(settings, "WORK_ORDER_NUMBER_BLOCK_SIZE", 1)
+        if block_size <= 1:
+            return cls.reserve(1)
+
+        global _number_block
+
+        with _number_block_lock:
+            block = _number_block
+            # Only trust blocks whose reservation was committed
+            if block is None or not block["committed"] or block["next"] >= block["end"]:
+                first = cls.reserve(block_size)
+                block = {"next": first, "end": first + block_size, "committed": False}
+                _number_block = block
+                transaction.on_commit(lambda block=block: block.update(committed=True))
+            number = block["next"]
+            block["next"] += 1
             return number
 
     @classmethod
     def advance_past(cls, number):
-        with transaction.atomic():
-            seq, _ = cls.objects.select_for_update().get_or_create(
+        """Make sure the sequence never hands out ``number`` (manually set numbers)."""
+        advanced = cls.objects.filter(pk=1, next_number__lte=number).update(
+            next_number=number + 1, updated_at=timezone.now(),
+        )
+        if not advanced:
+            cls.objects.get_or_create(
                 pk=1,
-                defaults={"start_number": 1, "next_number": 1},
+                defaults={"start_number": 1, "next_number": number + 1},
             )
-            if seq.next_number <= number:
-                seq.next_number = number + 1
-                seq.save(update_fields=["next_number"])
 
     def save(self, *args, **kwargs):
         self.pk = 1
@@ -733,7 +881,10 @@ class WorkOrderNumberSequence(models.Model):
             self.next_number = self.start_number
 
         self.full_clean()
-        return super().save(*args, **kwargs)
+        result = super().save(*args, **kwargs)
+        # Edited numbering applies right away in this process
+        _release_number_block()
+        return result
 
 
 class WorkOrderV2(models.Model):
@@ -751,6 +902,9 @@ class WorkOrderV2(models.Model):
         (DISCOUNT_TYPE_PERCENT, "Percent (%)"),
     )
 
+    # Retries when an allocated number collides with a manually set one
+    NUMBER_ALLOCATION_ATTEMPTS = 5
+
     job = models.OneToOneField(
         "Job",
         on_delete=models.CASCADE,
@@ -833,10 +987,9 @@ class WorkOrderV2(models.Model):
 
         # Classic Accounting validation (only when configured for the real external DB)
         if self.customer_org_id:
-            from django.conf import settings
+            from accounting_integration.router import accounting_is_configured
 
-            accounting_db = (settings.DATABASES or {}).get("accounting") or {}
-            if accounting_db.get("ENGINE") == "django.db.backends.postgresql":
+            if accounting_is_configured():
                 from accounting_integration.models import Org
 
                 try:
@@ -847,12 +1000,13 @@ class WorkOrderV2(models.Model):
                 if not exists:
                     raise ValidationError({"customer_org_id": "Customer does not exist in Classic Accounting."})
 
-    def recalculate_totals(self, *, save: bool = False, tax_rate=None):
-        line_items = (
-            WorkOrderLineV2.objects.filter(work_order_id=self.pk).only("qty", "price")
-            if self.pk
-            else []
-        )
+    def recalculate_totals(self, *, save: bool = False, tax_rate=None, line_items=None):
+        if line_items is None:
+            line_items = (
+                WorkOrderLineV2.objects.filter(work_order_id=self.pk).only("qty", "price")
+                if self.pk
+                else []
+            )
         effective_rate = tax_rate if tax_rate is not None else self.tax_rate_snapshot
         subtotal, discount_amount, tax_amount, total = compute_work_order_totals(
             line_items=line_items,
@@ -877,31 +1031,160 @@ class WorkOrderV2(models.Model):
                 total=total,
             )
 
+    def set_lines(self, lines) -> dict:
+        """
+        Replace this work order's lines with ``lines`` in one pass.
+
+        ``lines`` is a list of dicts with ``itemid``, ``qty``, ``price`` and
+        optional ``itemnumber_snapshot`` / ``description_snapshot``, in display
+        order. Existing lines are matched by position: changed ones are updated
+        in place, extra incoming lines are inserted and leftover existing lines
+        are deleted, each as one bulk query. Items are validated against
+        Classic Accounting in a single query and totals are recalculated once.
+
+        Unlike saving lines one by one (``WorkOrderLineV2.save()`` validates
+        and recalculates totals per row), the cost does not grow with the
+        square of the line count.
+
+        Returns:
+            Dict with 'created', 'updated' and 'deleted' counts
+
+        Raises:
+            ValidationError: A line is invalid or an item does not exist in
+                Classic Accounting (nothing is written)
+        """
+        from rental_scheduler.utils.work_orders import quantize_money
+
+        incoming = []
+        errors = []
+        for index, line in enumerate(lines, start=1):
+            obj = WorkOrderLineV2(
+                work_order=self,
+                itemid=line["itemid"],
+                qty=line["qty"],
+                price=line["price"],
+                itemnumber_snapshot=line.get("itemnumber_snapshot", ""),
+                description_snapshot=line.get("description_snapshot", ""),
+            )
+            if obj.qty is not None and obj.price is not None:
+                obj.amount = quantize_money(obj.qty * obj.price)
+            try:
+                obj.clean_fields(exclude=["work_order"])
+                obj.clean_values()
+            except ValidationError as e:
+                errors.append(f"Line {index}: {'; '.join(e.messages)}")
+            incoming.append(obj)
+        if errors:
+            raise ValidationError({"lines": " ".join(errors)})
+
+        try:
+            missing = missing_classic_item_ids(obj.itemid for obj in incoming)
+        except Exception as e:
+            raise ValidationError({"lines": f"Unable to validate Classic items: {e}"})
+        if missing:
+            raise ValidationError({"lines": f"Items not found in Classic Accounting: {sorted(missing)}"})
+
+        with transaction.atomic():
+            existing = list(
+                WorkOrderLineV2.objects.select_for_update()
+                .filter(work_order_id=self.pk)
+                .order_by("created_at", "pk")
+            )
+            now = timezone.now()
+            to_update = []
+            for current, obj in zip(existing, incoming):
+                changed = False
+                for field in WorkOrderLineV2.LINE_VALUE_FIELDS:
+                    value = getattr(obj, field)
+                    if getattr(current, field) != value:
+                        setattr(current, field, value)
+                        changed = True
+                if changed:
+                    current.updated_at = now
+                    to_update.append(current)
+
+            to_create = incoming[len(existing):]
+            to_delete = [current.pk for current in existing[len(incoming):]]
+
+            if to_update:
+                WorkOrderLineV2.objects.bulk_update(
+                    to_update, [*WorkOrderLineV2.LINE_VALUE_FIELDS, "updated_at"]
+                )
+            if to_create:
+                WorkOrderLineV2.objects.bulk_create(to_create)
+            if to_delete:
+                WorkOrderLineV2.objects.filter(pk__in=to_delete).delete()
+
+            self.recalculate_totals(save=True, line_items=incoming)
+
+        # Bulk writes bypass the line signals
+        from rental_scheduler.utils.pdf_cache import invalidate_work_order_pdfs
+
+        invalidate_work_order_pdfs(self.pk)
+
+        return {"created": len(to_create), "updated": len(to_update), "deleted": len(to_delete)}
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._original_number = self.number
 
     def save(self, *args, **kwargs):
         creating = self._state.adding
+        allocated = creating and not self.number
 
-        if creating and not self.number:
+        if allocated:
             self.number = WorkOrderNumberSequence.allocate_work_order_number()
 
-        if self.number and WorkOrderV2.objects.filter(number=self.number).exclude(pk=self.pk).exists():
-            raise ValidationError({"number": f"Work order number {self.number} is already in use."})
-
         self.discount_value = quantize_money(self.discount_value)
 
-        self.full_clean()
-        result = super().save(*args, **kwargs)
-
-        if creating or self.number != self._original_number:
+        # Number uniqueness is left to the DB constraint (no pre-query)
+        self.full_clean(validate_unique=False)
+        self.validate_unique(exclude=["number"])
+
+        for attempt in range(self.NUMBER_ALLOCATION_ATTEMPTS):
+            try:
+                with transaction.atomic():
+                    result = super().save(*args, **kwargs)
+                break
+            except IntegrityError:
+                if not WorkOrderV2.objects.filter(number=self.number).exclude(pk=self.pk).exists():
+                    raise
+                if not allocated or attempt == self.NUMBER_ALLOCATION_ATTEMPTS - 1:
+                    raise ValidationError({"number": f"Work order number {self.number} is already in use."})
+                # Taken by a manually numbered work order; draw the next one
+                self.number = WorkOrderNumberSequence.allocate_work_order_number()
+
+        # Allocated numbers are already behind the sequence
+        if not allocated and (creating or self.number != self._original_number):
             WorkOrderNumberSequence.advance_past(self.number)
         self._original_number = self.number
 
         return result
 
 
+def missing_classic_item_ids(itemids) -> set:
+    """
+    Return the item IDs that do not exist in Classic Accounting.
+
+    One ``itemid__in`` query for the whole set. Returns an empty set when the
+    Classic database is not configured for real use (tests/dev).
+    """
+    from accounting_integration.router import accounting_is_configured
+
+    requested = {itemid for itemid in itemids if itemid}
+    if not requested or not accounting_is_configured():
+        return set()
+
+    from accounting_integration.models import ItmItems
+
+    found = set(
+        ItmItems.objects.using("accounting")
+        .filter(itemid__in=requested)
+        .values_list("itemid", flat=True)
+    )
+    return requested - found
+
+
 class WorkOrderLineV2(models.Model):
     """Work Order line item (v2), linked to Classic Accounting items."""
 
@@ -933,31 +1216,32 @@ class WorkOrderLineV2(models.Model):
             models.CheckConstraint(condition=models.Q(amount__gte=0), name="workorderlinev2_amount_gte_0"),
         ]
 
+    # Fields compared and written by WorkOrderV2.set_lines()
+    LINE_VALUE_FIELDS = ("itemid", "itemnumber_snapshot", "description_snapshot", "qty", "price", "amount")
+
     def __str__(self):
         return f"Item {self.itemid} - Qty {self.qty} @ {self.price}"
 
-    def clean(self):
-        super().clean()
+    def clean_values(self):
+        """Local qty/price checks (no Classic Accounting lookup)."""
         if self.qty is not None and self.qty <= 0:
             raise ValidationError({"qty": "Quantity must be greater than zero."})
         if self.price is not None and self.price < 0:
             raise ValidationError({"price": "Price cannot be negative."})
 
+    def clean(self):
+        super().clean()
+        self.clean_values()
+
         # Classic Accounting item existence validation (only when configured)
         if self.itemid:
-            from django.conf import settings
-
-            accounting_db = (settings.DATABASES or {}).get("accounting") or {}
-            if accounting_db.get("ENGINE") == "django.db.backends.postgresql":
-                from accounting_integration.models import ItmItems
+            try:
+                missing = missing_classic_item_ids([self.itemid])
+            except Exception as e:
+                raise ValidationError({"itemid": f"Unable to validate Classic item: {e}"})
 
-                try:
-                    exists = ItmItems.objects.using("accounting").filter(itemid=self.itemid).exists()
-                except Exception as e:
-                    raise ValidationError({"itemid": f"Unable to validate Classic item: {e}"})
-
-                if not exists:
-                    raise ValidationError({"itemid": "Item does not exist in Classic Accounting."})
+            if missing:
+                raise ValidationError({"itemid": "Item does not exist in Classic Accounting."})
 
     def save(self, *args, **kwargs):
         # Compute server-side amount (ignore client)
@@ -1053,6 +1337,375 @@ class StatusChange(models.Model):
         super().save(*args, **kwargs)
 
 
+def new_import_batch_id():
+    """Default batch_id for ImportBatch (string form of a UUID4)"""
+    return str(uuid.uuid4())
+
+
+class ImportBatch(models.Model):
+    """
+    ImportBatch model for queued job imports (.ics or JSON uploads).
+    The uploaded file is stored with the batch and processed by the background
+    import worker; row counts and errors are updated as the import progresses.
+    """
+    SOURCE_ICS = 'ics'
+    SOURCE_JSON = 'json'
+    SOURCE_LEGACY = 'legacy'
+    SOURCE_CHOICES = [
+        (SOURCE_ICS, 'ICS calendar file'),
+        (SOURCE_JSON, 'JSON export'),
+        (SOURCE_LEGACY, 'Earlier import'),
+    ]
+
+    STATUS_QUEUED = 'queued'
+    STATUS_RUNNING = 'running'
+    STATUS_COMPLETED = 'completed'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, 'Queued'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_COMPLETED, 'Completed'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    batch_id = models.CharField(
+        max_length=36,
+        unique=True,
+        default=new_import_batch_id,
+        help_text="UUID stamped on imported jobs as Job.import_batch_id"
+    )
+    source = models.CharField(
+        max_length=10,
+        choices=SOURCE_CHOICES,
+        help_text="Type of file being imported"
+    )
+    filename = models.CharField(
+        max_length=255,
+        blank=True,
+        help_text="Name of the uploaded file"
+    )
+    calendar = models.ForeignKey(
+        Calendar,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='import_batches',
+        help_text="Calendar the jobs are imported into"
+    )
+    options = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Import options chosen on the upload form"
+    )
+    payload = models.BinaryField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Uploaded file contents (cleared once the import finishes)"
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default=STATUS_QUEUED,
+        db_index=True,
+        help_text="Current state of the import"
+    )
+    processed_count = models.PositiveIntegerField(default=0)
+    imported_count = models.PositiveIntegerField(default=0)
+    skipped_count = models.PositiveIntegerField(default=0)
+    error_count = models.PositiveIntegerField(default=0)
+    updated_count = models.PositiveIntegerField(default=0)
+    unchanged_count = models.PositiveIntegerField(default=0)
+    error_details = models.JSONField(
+        default=list,
+        blank=True,
+        help_text="First error messages reported by the import"
+    )
+    message = models.TextField(
+        blank=True,
+        help_text="Failure reason or warning for the whole import"
+    )
+    first_start_dt = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Earliest start of the imported jobs (recorded when the import finishes)"
+    )
+    last_start_dt = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Latest start of the imported jobs (recorded when the import finishes)"
+    )
+    revert_started_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When a revert of this import was started (set while it is in progress)"
+    )
+    reverted_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        db_index=True,
+        help_text="When the revert finished; reverted imports are hidden from the history"
+    )
+    reverted_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Jobs deleted so far by the revert"
+    )
+    created_by = models.ForeignKey(
+        'auth.User',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='import_batches',
+        help_text="User who uploaded the file"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Import Batch"
+        verbose_name_plural = "Import Batches"
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.get_source_display()} import {self.batch_id} ({self.status})"
+
+    @property
+    def is_finished(self):
+        """Whether the worker is done with this batch"""
+        return self.status in (self.STATUS_COMPLETED, self.STATUS_FAILED)
+
+    @property
+    def is_reverting(self):
+        """Whether a revert was started but has not finished (it can be resumed)"""
+        return self.revert_started_at is not None and self.reverted_at is None
+
+
+class ParsedDescriptionCache(models.Model):
+    """
+    Persistent cache of AI description parse results.
+    Keyed by a hash of the normalized description text, the model name and
+    the prompt version, so identical descriptions and re-imports are parsed once.
+    """
+    key = models.CharField(
+        max_length=64,
+        unique=True,
+        help_text="SHA-256 of the normalized description, model and prompt version"
+    )
+    model_name = models.CharField(
+        max_length=100,
+        blank=True,
+        help_text="Parser model that produced the result"
+    )
+    result = models.JSONField(
+        help_text="Extracted fields (trailer_color, trailer_serial, ...)"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Parsed Description Cache Entry"
+        verbose_name_plural = "Parsed Description Cache"
+
+    def __str__(self):
+        return f"{self.model_name}:{self.key[:12]}"
+
+
+class ArchiveJSONEncoder(DjangoJSONEncoder):
+    """DjangoJSONEncoder that keeps full microsecond precision on datetimes"""
+
+    def default(self, o):
+        if isinstance(o, datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+class ArchivedJob(models.Model):
+    """
+    ArchivedJob model holding jobs moved out of the hot Job table.
+    Long-deleted and long-completed jobs are archived by the archive_jobs
+    command together with their call reminders and status history, so the Job
+    table and its partial indexes only hold rows the scheduler still uses.
+    Archived rows are read-only.
+    """
+    REASON_DELETED = 'deleted'
+    REASON_COMPLETED = 'completed'
+    REASON_CHOICES = [
+        (REASON_DELETED, 'Deleted'),
+        (REASON_COMPLETED, 'Completed'),
+    ]
+
+    original_id = models.PositiveIntegerField(
+        unique=True,
+        help_text="Primary key the job had in the Job table"
+    )
+    calendar = models.ForeignKey(
+        Calendar,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='archived_jobs',
+        help_text="Calendar the job belonged to"
+    )
+    calendar_name = models.CharField(
+        max_length=100,
+        blank=True,
+        help_text="Calendar name at archive time"
+    )
+    business_name = models.CharField(max_length=255, blank=True)
+    contact_name = models.CharField(max_length=255, blank=True)
+    phone = models.CharField(max_length=Job._meta.get_field('phone').max_length, blank=True)
+    start_dt = models.DateTimeField(null=True, blank=True)
+    end_dt = models.DateTimeField(null=True, blank=True)
+    status = models.CharField(max_length=20, blank=True)
+    reason = models.CharField(
+        max_length=20,
+        choices=REASON_CHOICES,
+        help_text="Why the job was archived"
+    )
+    job_data = models.JSONField(
+        encoder=ArchiveJSONEncoder,
+        help_text="Every Job column at archive time"
+    )
+    call_reminders = models.JSONField(
+        encoder=ArchiveJSONEncoder,
+        default=list,
+        blank=True,
+        help_text="Call reminders that were linked to the job"
+    )
+    status_changes = models.JSONField(
+        encoder=ArchiveJSONEncoder,
+        default=list,
+        blank=True,
+        help_text="Status change history of the job"
+    )
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Archived Job"
+        verbose_name_plural = "Archived Jobs"
+        ordering = ['-archived_at']
+        indexes = [
+            models.Index(fields=['calendar', 'start_dt'], name='archivedjob_cal_start_idx'),
+        ]
+
+    def __str__(self):
+        return f"Archived job {self.original_id}: {self.business_name or self.contact_name}"
+
+    def as_job(self):
+        """
+        Rebuild an unsaved Job from the archived columns for read-only display.
+        Columns added to Job after archiving keep their defaults.
+        """
+        values = {}
+        for field in Job._meta.concrete_fields:
+            if field.attname in self.job_data:
+                values[field.attname] = field.to_python(self.job_data[field.attname])
+        job = Job(**values)
+        job.is_archived = True
+        return job
+
+
+class ClassicCustomer(models.Model):
+    """
+    ClassicCustomer model mirroring a Classic Accounting customer locally.
+    One row per Classic ``CUST`` org with its best BILLTO address and
+    normalized search columns, kept in sync by
+    ``rental_scheduler.utils.customer_index``. Customer typeahead and duplicate
+    detection read it instead of the remote Classic tables.
+    """
+    org_id = models.BigIntegerField(
+        primary_key=True,
+        help_text="Classic Accounting Org.org_id"
+    )
+    name = models.CharField(max_length=60, blank=True)
+    phone = models.CharField(max_length=45, blank=True)
+    contact = models.CharField(max_length=45, blank=True)
+    email = models.CharField(max_length=300, blank=True)
+    taxable = models.BooleanField(null=True, blank=True)
+    address_line1 = models.CharField(max_length=60, blank=True)
+    address_line2 = models.CharField(max_length=60, blank=True)
+    city = models.CharField(max_length=60, blank=True)
+    state = models.CharField(max_length=25, blank=True)
+    zip = models.CharField(max_length=45, blank=True)
+
+    # Normalized search columns
+    name_normalized = models.CharField(max_length=60, blank=True, db_index=True)
+    phone_digits = models.CharField(max_length=45, blank=True, db_index=True)
+    zip_digits = models.CharField(max_length=45, blank=True, db_index=True)
+    street_normalized = models.CharField(max_length=60, blank=True, db_index=True)
+    search_text = models.TextField(
+        blank=True,
+        help_text="Lowercased name, contact, email and phone for typeahead"
+    )
+
+    classic_version = models.DateTimeField(
+        null=True,
+        blank=True,
+        db_index=True,
+        help_text="Newest Classic moddate/createdate of the org and its BILLTO addresses"
+    )
+    synced_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Classic Customer (index)"
+        verbose_name_plural = "Classic Customers (index)"
+        ordering = ['name']
+
+    def __str__(self):
+        return f"{self.name} ({self.org_id})"
+
+    def as_customer_dict(self):
+        """Same fields as CustomerSnapshot.as_customer_dict()."""
+        return {
+            "org_id": self.org_id,
+            "name": self.name,
+            "phone": self.phone,
+            "contact": self.contact,
+            "email": self.email,
+            "taxable": self.taxable,
+            "address_line1": self.address_line1,
+            "address_line2": self.address_line2,
+            "city": self.city,
+            "state": self.state,
+            "zip": self.zip,
+        }
+
+
+
+class ClassicCustomerIndexState(models.Model):
+    """
+    Singleton row recording the last complete customer index sync.
+
+    The index only replaces Classic queries once a sync has run to the end:
+    a first sync that is still running (or died partway) leaves customers
+    missing from ``ClassicCustomer``.
+    """
+
+    id = models.PositiveSmallIntegerField(primary_key=True, default=1, editable=False)
+
+    completed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When the last sync finished"
+    )
+    customers = models.PositiveIntegerField(
+        default=0,
+        help_text="Classic customers indexed by the last finished sync"
+    )
+    classic_watermark = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Newest Classic moddate/createdate seen when the last finished sync started"
+    )
+
+    class Meta:
+        verbose_name = "Classic Customer Index State"
+        verbose_name_plural = "Classic Customer Index State"
+
+    def __str__(self):
+        return f"Customer index synced: {self.completed_at or 'never'}"
+
 # Placeholder functions for migration compatibility
 def get_license_upload_path(instance, filename):
     """Placeholder function for migration compatibility"""
@@ -1097,12 +1750,41 @@ from django.db.models.signals import post_save, post_delete
 
 CALENDAR_EVENTS_VERSION_KEY = 'calendar_events_version'
 
+_cache_invalidation_state = threading.local()
+
+
+@contextmanager
+def deferred_calendar_cache_invalidation():
+    """
+    Collapse cache invalidations inside the block into a single bump on exit.
+
+    Bulk operations (chunked deletes, imports) would otherwise bump the
+    version once per row through the post_save/post_delete signals. Nesting is
+    supported; only the outermost block bumps, and only if something changed.
+    """
+    depth = getattr(_cache_invalidation_state, 'depth', 0)
+    if depth == 0:
+        _cache_invalidation_state.pending = False
+    _cache_invalidation_state.depth = depth + 1
+    try:
+        yield
+    finally:
+        _cache_invalidation_state.depth = depth
+        if depth == 0 and _cache_invalidation_state.pending:
+            _cache_invalidation_state.pending = False
+            invalidate_calendar_events_cache()
+
 
 def invalidate_calendar_events_cache(**kwargs):
     """
     Bump the calendar events cache version, invalidating all cached responses.
     Called on any Job or CallReminder save/delete.
     """
+    if getattr(_cache_invalidation_state, 'depth', 0):
+        # Inside deferred_calendar_cache_invalidation(): bump once on exit
+        _cache_invalidation_state.pending = True
+        return
+
     from django.core.cache import cache
     try:
         # Increment version counter (or set to 1 if doesn't exist)
@@ -1128,6 +1810,25 @@ def invalidate_cache_on_job_delete(sender, instance, **kwargs):
     invalidate_calendar_events_cache()
 
 
+# Connect signals for work orders (rendered PDF cache)
+@receiver(post_save, sender=WorkOrderV2)
+@receiver(post_delete, sender=WorkOrderV2)
+def invalidate_pdf_cache_on_work_order_change(sender, instance, **kwargs):
+    """Drop cached PDFs when a work order is saved or deleted."""
+    from rental_scheduler.utils.pdf_cache import invalidate_work_order_pdfs
+
+    invalidate_work_order_pdfs(instance.pk)
+
+
+@receiver(post_save, sender=WorkOrderLineV2)
+@receiver(post_delete, sender=WorkOrderLineV2)
+def invalidate_pdf_cache_on_work_order_line_change(sender, instance, **kwargs):
+    """Drop cached PDFs when a work order line is saved or deleted."""
+    from rental_scheduler.utils.pdf_cache import invalidate_work_order_pdfs
+
+    invalidate_work_order_pdfs(instance.work_order_id)
+
+
 # Connect signals for CallReminder
 @receiver(post_save, sender=CallReminder)
 def invalidate_cache_on_callreminder_save(sender, instance, **kwargs):
@@ -211,6 +211,20 @@
         return GTS.urls.interpolate(template, { pk: pk });
     };
 
+    /**
+     * Get import batch status URL (polled by the import pages)
+     * @param {string} batchId - ImportBatch.batch_id
+     * @returns {string}
+     */
+    GTS.urls.importBatchStatus = function(batchId) {
+        var template = GTS.urls.importBatchStatusTemplate;
+        if (!template) {
+            console.error('[GTS.urls] importBatchStatusTemplate not configured');
+            return '';
+        }
+        return GTS.urls.interpolate(template, { batch_id: batchId });
+    };
+
     /**
      * Get job call reminder update URL
      * @param {string|number} jobId
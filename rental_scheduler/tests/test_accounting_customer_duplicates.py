@@ -19,7 +19,7 @@ def classic_accounting_db(settings, monkeypatch, tmp_path):
     }
     connections.databases["accounting"] = settings.DATABASES["accounting"]
     connections["accounting"].close()
-    monkeypatch.setattr(views_module, "_accounting_is_configured", lambda: True)
+    monkeypatch.setattr(views_module, "accounting_is_configured", lambda: True)
 
     conn = connections["accounting"]
     with conn.cursor() as cursor:
@@ -0,0 +1,107 @@
+"""
+Tests for batched, cached AI description parsing.
+"""
+import threading
+
+import pytest
+
+from rental_scheduler.models import ParsedDescriptionCache
+from rental_scheduler.utils.ai_parser import (
+    StubDescriptionClient,
+    parse_description_batch,
+    parse_description_with_ai,
+)
+from rental_scheduler.utils.ics_import import import_ics_events
+
+
+class CountingStubClient(StubDescriptionClient):
+    """Stub backend that records every request it receives"""
+
+    def __init__(self, fail_packs_larger_than=None):
+        self.requests = []
+        self.fail_packs_larger_than = fail_packs_larger_than
+        self._lock = threading.Lock()
+
+    def parse_many(self, descriptions):
+        with self._lock:
+            self.requests.append(list(descriptions))
+        if self.fail_packs_larger_than and len(descriptions) > self.fail_packs_larger_than:
+            raise ValueError("pack too large")
+        return super().parse_many(descriptions)
+
+
+@pytest.fixture
+def ai_enabled(settings):
+    settings.AI_PARSING_ENABLED = True
+    settings.AI_PARSER_CLIENT = "rental_scheduler.utils.ai_parser.StubDescriptionClient"
+    settings.AI_PARSER_REQUESTS_PER_MINUTE = 0
+
+
+@pytest.mark.django_db
+def test_batch_packs_unique_descriptions_and_preserves_order(ai_enabled):
+    client = CountingStubClient()
+    descriptions = [f"Fix lights quote $1{i}0" for i in range(7)]
+    descriptions += [descriptions[0], "Fix   lights quote $100", "", None]
+
+    results = parse_description_batch(descriptions, client=client, pack_size=3, max_workers=2)
+
+    assert sorted(len(pack) for pack in client.requests) == [1, 3, 3]
+    assert [r["quote"] for r in results[:7]] == [f"1{i}0" for i in range(7)]
+    assert results[7] == results[0]
+    # Whitespace-only differences share the cached result
+    assert results[8]["quote"] == "100"
+    assert results[9]["unparsed_notes"] == ""
+    assert results[10]["quote"] is None
+    assert ParsedDescriptionCache.objects.count() == 7
+
+
+@pytest.mark.django_db
+def test_cached_descriptions_cost_no_requests(ai_enabled):
+    client = CountingStubClient()
+    parse_description_batch(["Roof leak $250"], client=client)
+
+    again = CountingStubClient()
+    result = parse_description_batch(["Roof leak $250"], client=again)
+
+    assert again.requests == []
+    assert result[0]["quote"] == "250"
+    assert parse_description_with_ai("Roof leak $250")["quote"] == "250"
+
+
+@pytest.mark.django_db
+def test_failed_pack_is_retried_one_by_one(ai_enabled):
+    client = CountingStubClient(fail_packs_larger_than=1)
+
+    results = parse_description_batch(["A $1", "B $2"], client=client, pack_size=5)
+
+    assert [len(pack) for pack in client.requests] == [2, 1, 1]
+    assert [r["quote"] for r in results] == ["1", "2"]
+
+
+@pytest.mark.django_db
+def test_disabled_parsing_returns_raw_description(settings):
+    settings.AI_PARSING_ENABLED = False
+    client = CountingStubClient()
+
+    result = parse_description_batch(["Brakes $90"], client=client)
+
+    assert client.requests == []
+    assert result[0]["unparsed_notes"] == "Brakes $90"
+    assert not ParsedDescriptionCache.objects.exists()
+
+
+@pytest.mark.django_db
+def test_ics_import_applies_batch_parsing(ai_enabled, calendar):
+    ics = (
+        "BEGIN:VCALENDAR\r\n"
+        "BEGIN:VEVENT\r\nSUMMARY:Smith\r\nDTSTART:20250303T090000\r\nDTEND:20250303T100000\r\n"
+        "DESCRIPTION:Rewire lights $1\\,200\r\nEND:VEVENT\r\n"
+        "END:VCALENDAR\r\n"
+    ).encode()
+
+    result = import_ics_events(ics.splitlines(keepends=True), calendar, batch_id="ai-batch")
+
+    assert result["imported"] == 1
+    job = calendar.jobs.get()
+    assert job.quote == "1200"
+    assert job.notes == "Rewire lights"
@@ -0,0 +1,125 @@
+"""
+Tests for moving old deleted/completed jobs into the archive.
+"""
+from datetime import datetime, timedelta
+from io import StringIO
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from rental_scheduler.models import (
+    CALENDAR_EVENTS_VERSION_KEY,
+    ArchivedJob,
+    CallReminder,
+    Job,
+    StatusChange,
+    WorkOrderV2,
+)
+from rental_scheduler.utils.recurrence import materialize_occurrence
+
+
+def _job(calendar, name, *, days_ago=800, **fields):
+    start = timezone.now() - timedelta(days=days_ago)
+    return Job.objects.create(
+        calendar=calendar, business_name=name, start_dt=start, end_dt=start + timedelta(hours=1), **fields
+    )
+
+
+def _age(*jobs, days=60):
+    Job.objects.filter(pk__in=[job.pk for job in jobs]).update(updated_at=timezone.now() - timedelta(days=days))
+
+
+@pytest.mark.django_db
+def test_archive_moves_old_rows_with_history_and_keeps_live_ones(calendar):
+    old_deleted = _job(calendar, "Old deleted", is_deleted=True)
+    recent_deleted = _job(calendar, "Recent deleted", is_deleted=True)
+    completed = _job(calendar, "Completed", status="uncompleted")
+    completed.status = "completed"
+    completed.save()  # records a StatusChange
+    CallReminder.objects.create(job=completed, calendar=calendar, reminder_date=completed.start_dt.date())
+    with_work_order = _job(calendar, "Invoiced", status="completed")
+    WorkOrderV2.objects.create(job=with_work_order)
+    recent_completed = _job(calendar, "Recent", days_ago=10, status="completed")
+
+    forever = _job(calendar, "Forever", recurrence_rule={"type": "weekly", "interval": 1, "end": "never"})
+    tombstone, _ = materialize_occurrence(forever, forever.start_dt + timedelta(weeks=1))
+    tombstone.is_deleted = True
+    tombstone.save()
+
+    dead_parent = _job(calendar, "Dead series", is_deleted=True)
+    dead_parent.create_recurrence_rule(recurrence_type="weekly", interval=1, count=3)
+    dead_parent.generate_recurring_instances()
+    dead_parent.recurrence_instances.update(is_deleted=True)
+
+    _age(old_deleted, tombstone, dead_parent, *dead_parent.recurrence_instances.all())
+    cache.set(CALENDAR_EVENTS_VERSION_KEY, 1, timeout=None)
+
+    out = StringIO()
+    call_command("archive_jobs", "--chunk-size", "2", stdout=out)
+
+    archived_ids = set(ArchivedJob.objects.values_list("original_id", flat=True))
+    assert {old_deleted.pk, completed.pk, dead_parent.pk} <= archived_ids
+    assert len(archived_ids) == 6  # plus the three dead-series instances
+    assert not Job.objects.filter(pk__in=archived_ids).exists()
+    assert Job.objects.filter(
+        pk__in=[recent_deleted.pk, with_work_order.pk, recent_completed.pk, forever.pk, tombstone.pk]
+    ).count() == 5
+    assert cache.get(CALENDAR_EVENTS_VERSION_KEY) == 2
+
+    archived = ArchivedJob.objects.get(original_id=completed.pk)
+    assert archived.reason == ArchivedJob.REASON_COMPLETED
+    assert archived.calendar_name == calendar.name
+    assert len(archived.call_reminders) == 1
+    assert archived.status_changes[0]["new_status"] == "completed"
+    assert not StatusChange.objects.filter(job_id=completed.pk).exists()
+    assert "Jobs archived: 6" in out.getvalue()
+
+
+@pytest.mark.django_db
+def test_archive_dry_run_changes_nothing(calendar):
+    job = _job(calendar, "Old deleted", is_deleted=True)
+    _age(job)
+
+    out = StringIO()
+    call_command("archive_jobs", "--dry-run", stdout=out)
+
+    assert Job.objects.filter(pk=job.pk).exists()
+    assert not ArchivedJob.objects.exists()
+    assert "at least 1" in out.getvalue()
+
+
+@pytest.mark.django_db
+def test_archived_job_is_readable_from_detail_views(api_client, calendar):
+    job = _job(calendar, "Archived Co", status="completed", contact_name="Pat", repair_notes="New tires")
+    call_command("archive_jobs", stdout=StringIO())
+    assert not Job.objects.filter(pk=job.pk).exists()
+
+    data = api_client.get(reverse("rental_scheduler:job_detail_api", args=[job.pk])).json()
+    assert data["is_archived"] is True
+    assert data["business_name"] == "Archived Co"
+    assert data["repair_notes"] == "New tires"
+    assert data["calendar_name"] == calendar.name
+    assert data["start_dt"] == job.start_dt.isoformat()
+
+    calendar.delete()
+    page = api_client.get(reverse("rental_scheduler:job_detail_partial", args=[job.pk]))
+    assert page.status_code == 200
+    assert "Archived (read-only)" in page.content.decode()
+    assert calendar.name in page.content.decode()
+
+    assert api_client.get(reverse("rental_scheduler:job_detail_api", args=[999999])).status_code == 404
+
+
+@pytest.mark.django_db
+def test_archive_keeps_full_length_phone(calendar):
+    phone = "+1 (615) 555-1234 x123456"
+    assert len(phone) == Job._meta.get_field("phone").max_length
+    job = _job(calendar, "Long phone", is_deleted=True, phone=phone)
+    _age(job)
+
+    call_command("archive_jobs", stdout=StringIO())
+
+    assert ArchivedJob.objects.get(original_id=job.pk).phone == phone
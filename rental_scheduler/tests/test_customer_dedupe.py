@@ -0,0 +1,105 @@
+import difflib
+
+import pytest
+
+from rental_scheduler.utils.customer_dedupe import CustomerBlockingIndex, score_duplicates
+
+
+def _customer(org_id, name, phone="", address_line1="", city="", state="", zip_code=""):
+    return {
+        "org_id": org_id, "name": name, "phone": phone, "contact": "", "email": "",
+        "address_line1": address_line1, "address_line2": "", "city": city, "state": state, "zip": zip_code,
+    }
+
+
+@pytest.fixture
+def blocking_index():
+    customers = [
+        _customer(1, "Acme Transport", "615-555-1234", "123 Main St", "Nashville", "TN", "37201"),
+        _customer(2, "Acme", "", "9 Elm St", "Berlin", "OH", "44610"),
+        _customer(3, "Beta Barns", "1 (330) 555-0199", "4 Oak Ave", "Berlin", "OH", "44610"),
+        _customer(4, "Zephyr Logistics (2)", "555-0199"),
+    ]
+    customers += [_customer(100 + i, f"Unrelated Company {i}", f"800-000-{i:04d}") for i in range(500)]
+    return CustomerBlockingIndex(customers)
+
+
+def test_blocking_index_only_returns_customers_sharing_a_block(blocking_index):
+    ids = lambda rows: {row["org_id"] for row in rows}
+
+    # Phone block: last 7 digits, whatever the formatting (4 has no area code)
+    assert ids(blocking_index.candidates(phone_tail="3305550199")) == {3, 4}
+    # Street block: normalized street line
+    assert ids(blocking_index.candidates(street="123 main st")) == {1}
+    # Name block: similar names and contained names, not the 500 unrelated ones
+    assert ids(blocking_index.candidates(normalized_name="acme transportation")) == {1, 2}
+    assert ids(blocking_index.candidates(normalized_name="zephyr logistic")) == {4}
+
+
+def test_name_block_finds_names_contained_mid_string():
+    from rental_scheduler.utils.customer_index import normalize_name
+
+    long_names = [
+        _customer(1, "The Acme Trailer Rental Company of Ohio"),
+        _customer(2, "Yoder Smith Farms and Sons Lumber LLC"),
+    ]
+    index = CustomerBlockingIndex(long_names + [_customer(100 + i, f"Unrelated Company {i}") for i in range(500)])
+
+    for name, org_id in (("Acme", 1), ("Smith", 2), ("Lumber", 2)):
+        candidates = index.candidates(normalized_name=normalize_name(name))
+        assert org_id in {row["org_id"] for row in candidates}
+        assert [row["org_id"] for row in score_duplicates({"name": name}, candidates)] == [org_id]
+
+    # The other way round: an existing short name inside the new, longer one
+    index.add(_customer(3, "Lumber"))
+    candidates = index.candidates(normalized_name="yoder lumber and supply")
+    assert 3 in {row["org_id"] for row in candidates}
+
+
+def test_scorer_matches_reference_scores(blocking_index):
+    target = {
+        "name": "Acme Transportation", "phone": "(615) 555-1234",
+        "address_line1": "123 Main St", "city": "Nashville", "state": "TN", "zip": "37201",
+    }
+    results = score_duplicates(target, blocking_index.candidates(
+        normalized_name="acme transportation", phone_tail="6155551234", street="123 main st",
+    ))
+
+    assert [row["org_id"] for row in results] == [1, 2]
+    assert results[0]["match_reasons"] == ["phone", "name", "address"]
+    assert results[1]["match_reasons"] == ["name"]
+    expected = difflib.SequenceMatcher(None, "acme transportation", "acme transport").ratio()
+    assert results[0]["name_score"] == round(expected, 3)
+    assert results[0]["score"] == round(1.2 + 0.9 + 0.5 + expected * 0.5, 3)
+
+
+@pytest.mark.django_db
+def test_blocking_index_follows_customer_index_changes():
+    from rental_scheduler.models import ClassicCustomer
+    from rental_scheduler.utils.customer_dedupe import get_blocking_index, reset_blocking_index
+
+    reset_blocking_index()
+    ClassicCustomer.objects.create(org_id=1, name="Acme Transport", phone="615-555-1234")
+    first = get_blocking_index()
+    assert get_blocking_index() is first
+
+    # New rows are applied in place
+    ClassicCustomer.objects.create(org_id=2, name="Beta Barns", phone="330-555-0199")
+    assert get_blocking_index() is first
+    assert len(first) == 2
+
+    # Removals rebuild
+    ClassicCustomer.objects.filter(org_id=1).delete()
+    rebuilt = get_blocking_index()
+    assert rebuilt is not first
+    assert len(rebuilt) == 1
+    reset_blocking_index()
+
+
+def test_blocking_index_replaces_and_removes_entries(blocking_index):
+    blocking_index.add(_customer(1, "Acme Transport", "615-555-9999", "5 New Rd"))
+    assert blocking_index.candidates(phone_tail="6155551234") == []
+    assert [row["org_id"] for row in blocking_index.candidates(street="5 new rd")] == [1]
+
+    blocking_index.remove(1)
+    assert {row["org_id"] for row in blocking_index.candidates(normalized_name="acme transport")} == {2}
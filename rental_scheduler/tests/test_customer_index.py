@@ -0,0 +1,148 @@
+import json
+from datetime import timedelta
+
+import pytest
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from rental_scheduler.tests.test_accounting_customer_duplicates import (  # noqa: F401
+    _seed_customer,
+    classic_accounting_db,
+)
+
+
+def _seed_two():
+    acme = _seed_customer(
+        name="Acme Transport", phone="615-555-1234", address_line1="123 Main St",
+        city="Nashville", state="TN", zip_code="37201",
+    )
+    beta = _seed_customer(
+        name="Beta Barns", phone="330-555-0199", address_line1="9 Side Rd",
+        city="Berlin", state="OH", zip_code="44610",
+    )
+    return acme, beta
+
+
+@pytest.mark.django_db(databases=["default", "accounting"])
+def test_customer_search_is_served_from_synced_index(api_client, classic_accounting_db):
+    from rental_scheduler.models import ClassicCustomer
+    from rental_scheduler.utils.customer_index import sync_customer_index
+
+    acme, beta = _seed_two()
+    stats = sync_customer_index()
+    assert stats == {"customers": 2, "updated": 2, "deleted": 0}
+    assert ClassicCustomer.objects.get(org_id=acme.org_id).phone_digits == "6155551234"
+
+    url = reverse("rental_scheduler:accounting_customers_search")
+    with CaptureQueriesContext(connections["accounting"]) as queries:
+        by_name = api_client.get(url, {"q": "acme"}).json()["results"]
+        by_phone = api_client.get(url, {"q": "(330) 555"}).json()["results"]
+    assert len(queries) == 0
+
+    assert [row["org_id"] for row in by_name] == [acme.org_id]
+    assert [row["org_id"] for row in by_phone] == [beta.org_id]
+
+
+@pytest.mark.django_db(databases=["default", "accounting"])
+def test_incremental_sync_picks_up_changes_and_removals(classic_accounting_db):
+    from accounting_integration.models import Org, OrgAddress
+    from rental_scheduler.models import ClassicCustomer
+    from rental_scheduler.utils.customer_index import sync_customer_index
+
+    acme, beta = _seed_two()
+    sync_customer_index()
+    # Only the newest customer (at the watermark) is re-read
+    assert sync_customer_index()["updated"] == 1
+
+    later = timezone.now() + timedelta(minutes=5)
+    Org.objects.using("accounting").filter(org_id=acme.org_id).update(orgname="Acme Freight", moddate=later)
+    OrgAddress.objects.using("accounting").filter(orgid=beta).delete()
+    Org.objects.using("accounting").filter(org_id=beta.org_id).delete()
+
+    stats = sync_customer_index()
+    assert stats == {"customers": 1, "updated": 1, "deleted": 1}
+    assert ClassicCustomer.objects.get().name_normalized == "acme freight"
+
+
+@pytest.mark.django_db(databases=["default", "accounting"])
+def test_duplicate_check_uses_index_without_classic_queries(api_client, classic_accounting_db):
+    from rental_scheduler.utils.customer_index import sync_customer_index
+    from rental_scheduler.views import _find_possible_customer_duplicates
+
+    acme, _beta = _seed_two()
+    sync_customer_index()
+
+    with CaptureQueriesContext(connections["accounting"]) as queries:
+        duplicates = _find_possible_customer_duplicates(
+            {"name": "Acme Transportation", "phone": "(615) 555-1234", "address_line1": "123 Main St",
+             "city": "Nashville", "state": "TN", "zip": "37201"}
+        )
+    assert len(queries) == 0
+    assert duplicates[0]["org_id"] == acme.org_id
+    assert set(duplicates[0]["match_reasons"]) == {"phone", "name", "address"}
+
+    # Customers created through the app are indexed right away
+    resp = api_client.post(
+        reverse("rental_scheduler:accounting_customers_create"),
+        data=json.dumps({"name": "Gamma Grain", "phone": "555-010-2000", "allow_duplicate": True}),
+        content_type="application/json",
+    )
+    assert resp.status_code == 200
+    results = api_client.get(reverse("rental_scheduler:accounting_customers_search"), {"q": "gamma"}).json()["results"]
+    assert [row["org_id"] for row in results] == [resp.json()["org_id"]]
+
+
+@pytest.mark.django_db(databases=["default", "accounting"])
+def test_index_is_not_ready_until_a_sync_completes(api_client, classic_accounting_db, monkeypatch):
+    from accounting_integration.services import customer_snapshot
+    from rental_scheduler.models import ClassicCustomer
+    from rental_scheduler.utils import customer_index
+
+    _seed_two()
+    monkeypatch.setattr(customer_index, "CUSTOMER_INDEX_SYNC_BATCH", 1)
+    load = customer_snapshot.load_customer_snapshots
+    calls = []
+
+    def dies_after_first_chunk(org_ids, using):
+        calls.append(org_ids)
+        if len(calls) > 1:
+            raise RuntimeError("connection lost")
+        return load(org_ids, using)
+
+    monkeypatch.setattr(customer_snapshot, "load_customer_snapshots", dies_after_first_chunk)
+    with pytest.raises(RuntimeError):
+        customer_index.sync_customer_index()
+    assert ClassicCustomer.objects.count() == 1
+    assert not customer_index.customer_index_ready()
+
+    # Still served from Classic, so both customers are found
+    url = reverse("rental_scheduler:accounting_customers_search")
+    assert len(api_client.get(url, {"q": "a"}).json()["results"]) == 2
+
+    monkeypatch.setattr(customer_snapshot, "load_customer_snapshots", load)
+    customer_index.sync_customer_index()
+    assert customer_index.customer_index_ready()
+
+
+@pytest.mark.django_db(databases=["default", "accounting"])
+def test_in_app_refresh_does_not_hide_unsynced_classic_edits(classic_accounting_db):
+    from accounting_integration.models import Org
+    from rental_scheduler.models import ClassicCustomer
+    from rental_scheduler.utils.customer_index import refresh_customer_index, sync_customer_index
+
+    acme, beta = _seed_two()
+    sync_customer_index()
+
+    # Edited in Classic, not synced yet
+    later = timezone.now() + timedelta(minutes=5)
+    Org.objects.using("accounting").filter(org_id=acme.org_id).update(orgname="Acme Freight", moddate=later)
+    # Then edited through the app, which stamps a newer moddate and refreshes the row
+    Org.objects.using("accounting").filter(org_id=beta.org_id).update(
+        orgname="Beta Barns LLC", moddate=later + timedelta(minutes=1),
+    )
+    refresh_customer_index(beta.org_id)
+
+    sync_customer_index()
+    assert ClassicCustomer.objects.get(org_id=acme.org_id).name == "Acme Freight"
@@ -0,0 +1,74 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from rental_scheduler.tests.test_accounting_customer_duplicates import (  # noqa: F401
+    _seed_customer,
+    classic_accounting_db,
+)
+
+
+@pytest.fixture
+def snapshots():
+    from accounting_integration.services import customer_snapshot
+
+    customer_snapshot.invalidate_customer_snapshots()
+    yield customer_snapshot
+    customer_snapshot.invalidate_customer_snapshots()
+
+
+@pytest.mark.django_db(databases=["default", "accounting"])
+def test_customer_snapshots_load_many_customers_in_one_query(classic_accounting_db, snapshots):
+    from accounting_integration.models import OrgAddress
+
+    first = _seed_customer(
+        name="Acme Farms", phone="555-0100", address_line1="1 Main St", city="Berlin", state="OH", zip_code="44610",
+    )
+    second = _seed_customer(
+        name="Beta Barns", phone="555-0200", address_line1="2 Side Rd", city="Walnut Creek", state="OH", zip_code="44687",
+    )
+    # A newer default address wins over the seeded one
+    OrgAddress.objects.using("accounting").filter(orgid=second).update(is_default=False)
+    OrgAddress.objects.using("accounting").create(
+        addresstype="BILLTO", active=True, streetone="9 New Ln", txtcity="Sugarcreek", txtstate="OH",
+        txtzip="44681", createdate=timezone.now(), is_default=True, orgid=second,
+    )
+
+    with CaptureQueriesContext(connections["accounting"]) as queries:
+        result = snapshots.get_customer_snapshots([first.org_id, second.org_id, 999999])
+    assert len(queries) == 1
+
+    assert set(result) == {first.org_id, second.org_id}
+    assert result[first.org_id].as_pdf_context()["customer_address"] == "1 Main St"
+    assert result[second.org_id].address_line1 == "9 New Ln"
+    assert result[second.org_id].as_customer_dict()["city"] == "Sugarcreek"
+
+    with CaptureQueriesContext(connections["accounting"]) as queries:
+        snapshots.get_customer_snapshots([first.org_id, second.org_id])
+    assert len(queries) == 0
+
+
+@pytest.mark.django_db(databases=["default", "accounting"])
+def test_customer_snapshots_revalidate_on_moddate_after_ttl(classic_accounting_db, snapshots, settings):
+    from accounting_integration.models import Org
+
+    settings.CUSTOMER_SNAPSHOT_TTL = 0
+    org = _seed_customer(
+        name="Acme Farms", phone="555-0100", address_line1="1 Main St", city="Berlin", state="OH", zip_code="44610",
+    )
+    stamp = timezone.now()
+    Org.objects.using("accounting").filter(org_id=org.org_id).update(moddate=stamp)
+    assert snapshots.get_customer_snapshot(org.org_id).name == "Acme Farms"
+
+    # Same moddate: the cached snapshot is kept after a one-row check
+    Org.objects.using("accounting").filter(org_id=org.org_id).update(orgname="Renamed quietly")
+    with CaptureQueriesContext(connections["accounting"]) as queries:
+        assert snapshots.get_customer_snapshot(org.org_id).name == "Acme Farms"
+    assert len(queries) == 1
+
+    # Newer moddate: re-read
+    Org.objects.using("accounting").filter(org_id=org.org_id).update(moddate=stamp + timedelta(minutes=1))
+    assert snapshots.get_customer_snapshot(org.org_id).name == "Renamed quietly"
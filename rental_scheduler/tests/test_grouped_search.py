@@ -665,3 +665,79 @@ class TestSeriesOccurrencesEndpoint:
         assert content.count(f'data-series-id="{parent.id}"') == 2, \
             "Both headers should reference the same parent ID"
 
+
+
+@pytest.mark.django_db
+class TestSeriesCollapseBatching:
+    """Parent resolution and match counts are batched per page."""
+
+    def test_instance_parents_resolved_in_one_query(self, calendar, django_assert_num_queries):
+        """Instances whose parents aren't on the page load all parents in a single query."""
+        from rental_scheduler.views import _build_series_collapsed_rows
+
+        now = timezone.now()
+        instances = []
+        for i in range(3):
+            parent = Job.objects.create(
+                calendar=calendar,
+                business_name=f"Batch Parent {i}",
+                start_dt=now - timedelta(days=90),
+                end_dt=now - timedelta(days=90, hours=-1),
+                all_day=False,
+                status="uncompleted",
+                recurrence_rule={"type": "weekly", "interval": 1, "end": "never"},
+            )
+            instances.append(Job.objects.create(
+                calendar=calendar,
+                business_name=f"Batch Parent {i}",
+                start_dt=now + timedelta(days=7 + i),
+                end_dt=now + timedelta(days=7 + i, hours=1),
+                all_day=False,
+                status="uncompleted",
+                recurrence_parent=parent,
+                recurrence_original_start=now + timedelta(days=7 + i),
+            ))
+
+        job_list = list(Job.objects.select_related("calendar").filter(pk__in=[j.pk for j in instances]))
+
+        with django_assert_num_queries(1):
+            collapsed = _build_series_collapsed_rows(job_list, now, date_filter="future")
+            for job in job_list:
+                # Parent is cached on the instance; no lazy load
+                assert job.recurrence_parent.calendar.name == calendar.name
+
+        headers = [row["series"] for row in collapsed["upcoming"] if row["type"] == "series"]
+        assert len(headers) == 3
+        assert all(h["is_forever"] for h in headers)
+
+    def test_search_match_count_spans_all_pages(self, api_client, calendar):
+        """Match counts are aggregated over the whole result set, not just the current page."""
+        now = timezone.now()
+        parent = Job.objects.create(
+            calendar=calendar,
+            business_name="ManyPages Series",
+            start_dt=now + timedelta(days=1),
+            end_dt=now + timedelta(days=1, hours=1),
+            all_day=False,
+            status="uncompleted",
+            recurrence_rule={"type": "daily", "interval": 1, "end": "never"},
+        )
+        for i in range(1, 30):
+            Job.objects.create(
+                calendar=calendar,
+                business_name="ManyPages Series",
+                start_dt=now + timedelta(days=1 + i),
+                end_dt=now + timedelta(days=1 + i, hours=1),
+                all_day=False,
+                status="uncompleted",
+                recurrence_parent=parent,
+                recurrence_original_start=now + timedelta(days=1 + i),
+            )
+
+        url = reverse("rental_scheduler:job_list_table_partial")
+        response = api_client.get(url, {"search": "ManyPages", "date_filter": "future"})
+
+        assert response.status_code == 200
+        content = response.content.decode("utf-8")
+        assert f'data-series-id="{parent.id}"' in content
+        assert 'data-match-count="30"' in content
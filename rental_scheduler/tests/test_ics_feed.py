@@ -0,0 +1,120 @@
+"""
+Tests for the subscribable per-calendar .ics feed.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from icalendar import Calendar as ICalendar
+
+from rental_scheduler.models import Job
+from rental_scheduler.utils.recurrence import materialize_occurrence
+
+
+@pytest.fixture
+def forever_parent(calendar):
+    tz = timezone.get_current_timezone()
+    start = timezone.make_aware(datetime(2026, 3, 2, 10, 0), tz)  # Monday
+    return Job.objects.create(
+        calendar=calendar,
+        business_name="Weekly Forever",
+        start_dt=start,
+        end_dt=start + timedelta(hours=1),
+        status="uncompleted",
+        recurrence_rule={"type": "weekly", "interval": 1, "end": "never"},
+    )
+
+
+def _feed(response):
+    return ICalendar.from_ical(b"".join(response.streaming_content))
+
+
+def _events(feed):
+    return [component for component in feed.walk("VEVENT")]
+
+
+@pytest.mark.django_db
+def test_feed_sends_forever_series_as_rrule_with_overrides(api_client, calendar, forever_parent):
+    week = timedelta(weeks=1)
+    materialize_occurrence(forever_parent, forever_parent.start_dt + week)  # untouched
+    moved, _ = materialize_occurrence(forever_parent, forever_parent.start_dt + 2 * week)
+    moved.start_dt += timedelta(hours=3)
+    moved.end_dt += timedelta(hours=3)
+    moved.save()
+    deleted, _ = materialize_occurrence(forever_parent, forever_parent.start_dt + 3 * week)
+    deleted.is_deleted = True
+    deleted.save()
+
+    finite = Job.objects.create(
+        calendar=calendar, business_name="Monthly", status="uncompleted",
+        start_dt=forever_parent.start_dt, end_dt=forever_parent.end_dt,
+    )
+    finite.create_recurrence_rule(recurrence_type="monthly", interval=1, count=2)
+    finite.generate_recurring_instances()
+    Job.objects.create(
+        calendar=calendar, business_name="Canceled", status="canceled",
+        start_dt=forever_parent.start_dt, end_dt=forever_parent.end_dt,
+    )
+
+    response = api_client.get(reverse("rental_scheduler:calendar_ics_feed", args=[calendar.pk]))
+
+    assert response.status_code == 200
+    assert response.streaming
+    assert response["Content-Type"].startswith("text/calendar")
+    feed = _feed(response)
+    assert str(feed["X-WR-CALNAME"]) == calendar.name
+    events = _events(feed)
+    series = [event for event in events if str(event["SUMMARY"]) == "Weekly Forever"]
+    assert len(series) == 2
+    parent_event = next(event for event in series if "RRULE" in event)
+    override = next(event for event in series if "RECURRENCE-ID" in event)
+    assert parent_event["RRULE"]["FREQ"] == ["WEEKLY"]
+    assert parent_event["EXDATE"].dts[0].dt == deleted.recurrence_original_start
+    assert str(override["UID"]) == str(parent_event["UID"])
+    assert override["RECURRENCE-ID"].dt == moved.recurrence_original_start
+    assert override["DTSTART"].dt == moved.start_dt
+    assert len([event for event in events if str(event["SUMMARY"]) == "Monthly"]) == 3
+    assert not [event for event in events if str(event["SUMMARY"]) == "Canceled"]
+
+
+@pytest.mark.django_db
+def test_feed_revalidates_with_etag_until_data_changes(api_client, calendar, forever_parent, django_assert_num_queries):
+    url = reverse("rental_scheduler:calendar_ics_feed", args=[calendar.pk])
+    first = api_client.get(url)
+    b"".join(first.streaming_content)
+    etag = first["ETag"]
+    assert first["Last-Modified"]
+
+    with django_assert_num_queries(1):
+        cached = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert cached.status_code == 304
+
+    forever_parent.business_name = "Renamed"
+    forever_parent.save()
+    changed = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert changed.status_code == 200
+    assert changed["ETag"] != etag
+    assert b"Renamed" in b"".join(changed.streaming_content)
+
+
+@pytest.mark.django_db
+def test_feed_etag_follows_database_writes_from_other_processes(api_client, calendar, forever_parent):
+    from django.core.cache import cache
+
+    from rental_scheduler.models import Calendar
+
+    url = reverse("rental_scheduler:calendar_ics_feed", args=[calendar.pk])
+    other = Calendar.objects.create(name="Other")
+    other_etag = api_client.get(reverse("rental_scheduler:calendar_ics_feed", args=[other.pk]))["ETag"]
+    etag = api_client.get(url)["ETag"]
+
+    # A write from another process: no signal reaches this process's cache
+    cache.clear()
+    assert api_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+    Job.objects.filter(pk=forever_parent.pk).update(is_deleted=True, updated_at=timezone.now())
+    assert api_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    # Per calendar: the other feed is unchanged
+    other_url = reverse("rental_scheduler:calendar_ics_feed", args=[other.pk])
+    assert api_client.get(other_url, HTTP_IF_NONE_MATCH=other_etag).status_code == 304
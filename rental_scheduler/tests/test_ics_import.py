@@ -0,0 +1,131 @@
+"""
+Tests for the streaming .ics import pipeline.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+
+from rental_scheduler.models import CALENDAR_EVENTS_VERSION_KEY, Job
+from rental_scheduler.utils.ics_import import import_ics_events, iter_vevent_blocks
+from rental_scheduler.utils.import_runner import process_import_queue
+
+
+def _vevent(uid, day, summary, extra=''):
+    start = datetime(2025, 3, 3, 9, 0) + timedelta(days=day)
+    end = start + timedelta(hours=2)
+    return (
+        "BEGIN:VEVENT\r\n"
+        f"UID:{uid}\r\n"
+        f"SUMMARY:{summary}\r\n"
+        f"DTSTART:{start:%Y%m%dT%H%M%S}\r\n"
+        f"DTEND:{end:%Y%m%dT%H%M%S}\r\n"
+        "DESCRIPTION:Replace brake\r\n"
+        "  lights\r\n"
+        f"{extra}"
+        "END:VEVENT\r\n"
+    )
+
+
+def _ics(*events):
+    body = "".join(events)
+    return f"BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//Test//EN\r\n{body}END:VCALENDAR\r\n".encode()
+
+
+@pytest.mark.django_db
+def test_import_inserts_in_batches_with_one_cache_bump_each(calendar):
+    events = [_vevent(f"evt-{i}", i, f"Customer {i} 740-501-90{i:02d}") for i in range(7)]
+    events.append(
+        "BEGIN:VEVENT\r\nUID:no-dates\r\nSUMMARY:Broken\r\nEND:VEVENT\r\n"
+    )
+    events.append(_vevent("backwards", 0, "Backwards").replace("DTEND:20250303T110000", "DTEND:20250302T110000"))
+    content = _ics(*events)
+
+    cache.set(CALENDAR_EVENTS_VERSION_KEY, 1, timeout=None)
+    progress = []
+    result = import_ics_events(
+        content.splitlines(keepends=True),
+        calendar,
+        batch_id="batch-1",
+        use_ai_parsing=False,
+        batch_size=3,
+        progress=lambda r: progress.append((r['processed'], r['imported'])),
+    )
+
+    assert result['processed'] == 9
+    assert result['imported'] == 7
+    assert result['skipped'] == 1
+    assert result['errors_count'] == 1
+    assert [p[1] for p in progress] == [3, 6, 7]
+    assert cache.get(CALENDAR_EVENTS_VERSION_KEY) == 4
+
+    jobs = Job.objects.filter(import_batch_id="batch-1").order_by("start_dt")
+    assert jobs.count() == 7
+    first = jobs.first()
+    assert first.business_name == "Customer 0"
+    assert first.phone == "740-501-9000"
+    assert first.notes == "Replace brake lights"
+
+
+def test_iter_vevent_blocks_streams_one_event_at_a_time():
+    content = _ics(_vevent("a", 0, "A"), _vevent("b", 1, "B"))
+    blocks = iter_vevent_blocks(iter(content.splitlines(keepends=True)))
+
+    first = next(blocks)
+    assert first.startswith(b"BEGIN:VEVENT") and b"UID:a" in first
+    assert b"UID:b" in next(blocks)
+    assert next(blocks, None) is None
+
+
+@pytest.mark.django_db
+def test_calendar_import_view_uses_pipeline(api_client, calendar):
+    upload = SimpleUploadedFile(
+        "export.ics",
+        _ics(_vevent("x", 0, "Smith Trailers"), _vevent("y", 1, "Jones Farm")),
+        content_type="text/calendar",
+    )
+
+    response = api_client.post(reverse("rental_scheduler:calendar_import"), {
+        "ics_file": upload,
+        "calendar": calendar.id,
+    })
+
+    assert response.status_code == 302
+    process_import_queue()
+    assert Job.objects.filter(calendar=calendar, import_batch_id__isnull=False).count() == 2
+
+
+@pytest.mark.django_db
+def test_sync_import_skips_unchanged_updates_changed_and_inserts_new(calendar):
+    original = _ics(_vevent("a", 0, "Alpha"), _vevent("b", 1, "Bravo"), _vevent("c", 2, "Charlie"))
+    import_ics_events(original.splitlines(keepends=True), calendar, batch_id="first", use_ai_parsing=False)
+    alpha = Job.objects.get(import_source_uid="a")
+    alpha.status = "completed"
+    alpha.save()
+    Job.objects.filter(import_source_uid="c").update(is_deleted=True)
+
+    resync = _ics(
+        _vevent("a", 0, "Alpha Renamed"),
+        _vevent("b", 1, "Bravo"),
+        _vevent("c", 2, "Charlie moved").replace("DTSTART:20250305", "DTSTART:20250306"),
+        _vevent("d", 3, "Delta"),
+        _vevent("d", 3, "Delta"),  # duplicate UID in the same file
+    )
+    result = import_ics_events(
+        resync.splitlines(keepends=True), calendar, batch_id="second", use_ai_parsing=False, upsert=True,
+    )
+
+    assert (result["imported"], result["updated"], result["unchanged"]) == (1, 1, 3)
+    assert Job.objects.filter(calendar=calendar).count() == 4
+    alpha.refresh_from_db()
+    assert alpha.business_name == "Alpha Renamed"
+    assert alpha.status == "completed"  # status set in the app is kept
+    assert alpha.import_batch_id == "first"
+    assert Job.objects.get(import_source_uid="d").import_batch_id == "second"
+
+    again = import_ics_events(
+        resync.splitlines(keepends=True), calendar, batch_id="third", use_ai_parsing=False, upsert=True,
+    )
+    assert (again["imported"], again["updated"]) == (0, 0)
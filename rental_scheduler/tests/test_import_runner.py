@@ -0,0 +1,178 @@
+"""
+Tests for the background import queue (ImportBatch + worker).
+"""
+import json
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from rental_scheduler.models import CALENDAR_EVENTS_VERSION_KEY, ImportBatch, Job
+from rental_scheduler.utils.import_runner import (
+    claim_next_batch,
+    enqueue_import,
+    process_import_queue,
+    revert_import_batch,
+)
+
+ICS = (
+    b"BEGIN:VCALENDAR\r\nVERSION:2.0\r\n"
+    b"BEGIN:VEVENT\r\nUID:one\r\nSUMMARY:Smith Trailers\r\n"
+    b"DTSTART:20250303T090000\r\nDTEND:20250303T110000\r\nEND:VEVENT\r\n"
+    b"BEGIN:VEVENT\r\nUID:two\r\nSUMMARY:No dates\r\nEND:VEVENT\r\n"
+    b"END:VCALENDAR\r\n"
+)
+
+
+def _json_export():
+    return json.dumps({
+        "version": "1.0",
+        "jobs": [
+            {
+                "business_name": "Series",
+                "start_dt": "2025-03-03T09:00:00+00:00",
+                "end_dt": "2025-03-03T10:00:00+00:00",
+                "recurrence_rule": {"type": "weekly", "interval": 1, "count": 2},
+                "_is_recurring_parent": True,
+                "_temp_id": "parent_0",
+            },
+            {
+                "business_name": "Series",
+                "start_dt": "2025-03-10T09:00:00+00:00",
+                "end_dt": "2025-03-10T10:00:00+00:00",
+                "recurrence_original_start": "2025-03-10T09:00:00+00:00",
+                "_is_recurring_instance": True,
+                "_parent_temp_id": "parent_0",
+            },
+        ],
+    }).encode()
+
+
+@pytest.mark.django_db
+def test_ics_upload_is_queued_and_processed_with_progress(api_client, calendar):
+    upload = SimpleUploadedFile("export.ics", ICS, content_type="text/calendar")
+    response = api_client.post(reverse("rental_scheduler:calendar_import"), {
+        "ics_file": upload,
+        "calendar": calendar.id,
+        "use_ai_parsing": "",
+    })
+
+    batch = ImportBatch.objects.get()
+    assert response.status_code == 302
+    assert response["Location"].endswith(f"?batch={batch.batch_id}")
+    assert batch.status == ImportBatch.STATUS_QUEUED
+    assert batch.options == {"use_ai_parsing": False, "upsert": False}
+    assert not Job.objects.exists()
+
+    status_url = reverse("rental_scheduler:import_batch_status", args=[batch.batch_id])
+    assert api_client.get(status_url).json()["finished"] is False
+
+    assert len(process_import_queue()) == 1
+
+    data = api_client.get(status_url).json()
+    assert data["status"] == "completed"
+    assert data["finished"] is True
+    assert (data["processed"], data["imported"], data["skipped"]) == (2, 1, 1)
+    assert data["error_details"]
+    batch.refresh_from_db()
+    assert batch.payload is None
+    assert Job.objects.get().import_batch_id == batch.batch_id
+
+    page = api_client.get(response["Location"])
+    assert b'id="import-progress"' in page.content
+
+
+@pytest.mark.django_db
+def test_json_upload_links_recurring_instances(calendar):
+    upload = SimpleUploadedFile("export.json", _json_export(), content_type="application/json")
+    batch = enqueue_import(ImportBatch.SOURCE_JSON, upload, calendar)
+
+    process_import_queue()
+
+    batch.refresh_from_db()
+    assert batch.status == ImportBatch.STATUS_COMPLETED
+    assert batch.imported_count == 2
+    parent = Job.objects.get(recurrence_rule__isnull=False, recurrence_parent__isnull=True)
+    assert Job.objects.filter(recurrence_parent=parent).count() == 1
+
+
+@pytest.mark.django_db
+def test_invalid_json_marks_batch_failed(calendar):
+    upload = SimpleUploadedFile("broken.json", b"{not json", content_type="application/json")
+    batch = enqueue_import(ImportBatch.SOURCE_JSON, upload, calendar)
+
+    out = StringIO()
+    call_command("process_imports", stdout=out)
+
+    batch.refresh_from_db()
+    assert batch.status == ImportBatch.STATUS_FAILED
+    assert batch.message.startswith("Invalid JSON file")
+    assert "Batches processed: 1" in out.getvalue()
+
+
+@pytest.mark.django_db
+def test_claim_skips_running_and_fails_stale_batches(calendar):
+    upload = SimpleUploadedFile("export.ics", ICS, content_type="text/calendar")
+    first = enqueue_import(ImportBatch.SOURCE_ICS, upload, calendar)
+    second = enqueue_import(ImportBatch.SOURCE_ICS, upload, calendar)
+
+    assert claim_next_batch().pk == first.pk
+    assert claim_next_batch().pk == second.pk
+    assert claim_next_batch() is None
+
+    ImportBatch.objects.filter(pk=first.pk).update(updated_at=timezone.now() - timedelta(hours=1))
+    process_import_queue()
+
+    first.refresh_from_db()
+    second.refresh_from_db()
+    assert first.status == ImportBatch.STATUS_FAILED
+    assert "interrupted" in first.message
+    assert second.status == ImportBatch.STATUS_RUNNING
+
+
+@pytest.mark.django_db
+def test_history_lists_batch_summaries_and_revert_is_chunked(api_client, calendar, django_assert_max_num_queries):
+    upload = SimpleUploadedFile("export.json", _json_export(), content_type="application/json")
+    batch = enqueue_import(ImportBatch.SOURCE_JSON, upload, calendar)
+    process_import_queue()
+    batch.refresh_from_db()
+    assert batch.first_start_dt.date().isoformat() == "2025-03-03"
+    assert batch.last_start_dt.date().isoformat() == "2025-03-10"
+
+    with django_assert_max_num_queries(3):
+        page = api_client.get(reverse("rental_scheduler:import_history"))
+    assert batch.batch_id in page.content.decode()
+    assert "2 events" in page.content.decode()
+
+    cache.set(CALENDAR_EVENTS_VERSION_KEY, 5, timeout=None)
+    deleted = revert_import_batch(batch, chunk_size=1)
+
+    assert deleted == 2
+    assert not Job.objects.filter(import_batch_id=batch.batch_id).exists()
+    assert cache.get(CALENDAR_EVENTS_VERSION_KEY) == 6
+    batch.refresh_from_db()
+    assert batch.reverted_count == 2
+    assert batch.reverted_at is not None
+    assert batch.batch_id not in api_client.get(reverse("rental_scheduler:import_history")).content.decode()
+
+
+@pytest.mark.django_db
+def test_interrupted_revert_resumes_from_view(api_client, calendar):
+    upload = SimpleUploadedFile("export.ics", ICS, content_type="text/calendar")
+    batch = enqueue_import(ImportBatch.SOURCE_ICS, upload, calendar, options={"use_ai_parsing": False})
+    process_import_queue()
+    # Simulate a revert that stopped after deleting one job
+    ImportBatch.objects.filter(pk=batch.pk).update(revert_started_at=timezone.now(), reverted_count=1)
+
+    page = api_client.get(reverse("rental_scheduler:import_history"))
+    assert "Resume Revert" in page.content.decode()
+
+    response = api_client.post(reverse("rental_scheduler:revert_import", args=[batch.batch_id]), follow=True)
+
+    assert "2 job(s) deleted" in response.content.decode()
+    assert not Job.objects.filter(import_batch_id=batch.batch_id).exists()
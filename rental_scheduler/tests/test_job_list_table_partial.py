@@ -1004,4 +1004,92 @@ def test_htmx_chunk_uses_unified_job_sections(api_client, calendar):
     
     # If the recurring series is on this page, it should have series header
     if 'Chunked Recurring' in content:
-        assert 'series-header-row' in content, "Recurring series should be collapsed in HTMX chunks"
\ No newline at end of file
+        assert 'series-header-row' in content, "Recurring series should be collapsed in HTMX chunks"
+
+@pytest.mark.django_db
+def test_series_collapsed_in_sql_before_pagination(api_client, calendar):
+    """
+    A long series occupies a single row in the paginated result set, so the first
+    page holds distinct rows instead of one header plus hidden instances.
+    """
+    now = timezone.now()
+
+    parent = Job.objects.create(
+        calendar=calendar,
+        business_name="Daily Series",
+        start_dt=now + timedelta(hours=1),
+        end_dt=now + timedelta(hours=2),
+        all_day=False,
+        status="uncompleted",
+        recurrence_rule={'type': 'daily', 'interval': 1, 'count': 40},
+    )
+    for i in range(1, 41):
+        Job.objects.create(
+            calendar=calendar,
+            business_name="Daily Series",
+            start_dt=now + timedelta(days=i, hours=1),
+            end_dt=now + timedelta(days=i, hours=2),
+            all_day=False,
+            status="uncompleted",
+            recurrence_parent=parent,
+            recurrence_original_start=now + timedelta(days=i, hours=1),
+        )
+    for i in range(3):
+        Job.objects.create(
+            calendar=calendar,
+            business_name=f"Standalone {i}",
+            start_dt=now + timedelta(days=30 + i),
+            end_dt=now + timedelta(days=30 + i, hours=1),
+            all_day=False,
+            status="uncompleted",
+        )
+
+    url = reverse("rental_scheduler:job_list_table_partial")
+    response = api_client.get(url, {"date_filter": "future", "search": "Series Standalone"})
+
+    assert response.status_code == 200
+    context = response.context
+    assert context["jobs"].paginator.count == 4
+
+    content = response.content.decode("utf-8")
+    assert content.count(f'data-series-id="{parent.id}"') == 1
+    assert 'data-match-count="41"' in content
+    for i in range(3):
+        assert f"Standalone {i}" in content
+
+
+@pytest.mark.django_db
+def test_series_collapse_can_fall_back_to_python(api_client, calendar, monkeypatch):
+    """With SQL collapsing disabled, every occurrence is paginated (legacy behavior)."""
+    from rental_scheduler.views import JobListView
+
+    monkeypatch.setattr(JobListView, "collapse_series_in_db", False)
+    now = timezone.now()
+
+    parent = Job.objects.create(
+        calendar=calendar,
+        business_name="Fallback Series",
+        start_dt=now + timedelta(hours=1),
+        end_dt=now + timedelta(hours=2),
+        all_day=False,
+        status="uncompleted",
+        recurrence_rule={'type': 'weekly', 'interval': 1, 'count': 2},
+    )
+    for i in range(1, 3):
+        Job.objects.create(
+            calendar=calendar,
+            business_name="Fallback Series",
+            start_dt=now + timedelta(weeks=i, hours=1),
+            end_dt=now + timedelta(weeks=i, hours=2),
+            all_day=False,
+            status="uncompleted",
+            recurrence_parent=parent,
+            recurrence_original_start=now + timedelta(weeks=i, hours=1),
+        )
+
+    url = reverse("rental_scheduler:job_list_table_partial")
+    response = api_client.get(url, {"date_filter": "future"})
+
+    assert response.status_code == 200
+    assert response.context["jobs"].paginator.count == 3
+    assert response.content.decode("utf-8").count(f'data-series-id="{parent.id}"') == 1
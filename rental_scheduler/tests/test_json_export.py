@@ -0,0 +1,92 @@
+"""
+Tests for the streaming JSON/NDJSON job export.
+"""
+import gzip
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+
+from rental_scheduler.models import Calendar, Job
+from rental_scheduler.utils.json_import import import_jobs_from_json
+
+
+@pytest.fixture
+def series(calendar):
+    tz = timezone.get_current_timezone()
+    start = timezone.make_aware(datetime(2025, 3, 3, 9, 0), tz)
+    parent = Job.objects.create(
+        calendar=calendar,
+        business_name="Weekly Series",
+        start_dt=start,
+        end_dt=start + timedelta(hours=1),
+        status="uncompleted",
+    )
+    parent.create_recurrence_rule(recurrence_type="weekly", interval=1, count=3)
+    parent.generate_recurring_instances()
+    # An edited instance moved before its parent must still link back to it
+    first = parent.recurrence_instances.order_by("start_dt").first()
+    first.start_dt = start - timedelta(days=2)
+    first.end_dt = first.start_dt + timedelta(hours=1)
+    first.save()
+    return parent
+
+
+def _content(response):
+    return b"".join(response.streaming_content)
+
+
+@pytest.mark.django_db
+def test_json_export_streams_and_round_trips(api_client, calendar, series):
+    Job.objects.create(
+        calendar=calendar,
+        business_name="Deleted",
+        start_dt=series.start_dt,
+        end_dt=series.end_dt,
+        is_deleted=True,
+    )
+
+    response = api_client.get(reverse("rental_scheduler:job_export_calendar", args=[calendar.id]))
+
+    assert response.status_code == 200
+    assert response.streaming
+    assert response["Content-Type"] == "application/json"
+    data = json.loads(_content(response))
+    assert data["version"] == "1.0"
+    assert data["export_source"] == calendar.name
+    assert data["job_count"] == len(data["jobs"]) == 4
+    parent_row = next(row for row in data["jobs"] if row.get("_is_recurring_parent"))
+    assert all(
+        row["_parent_temp_id"] == parent_row["_temp_id"]
+        for row in data["jobs"] if row.get("_is_recurring_instance")
+    )
+
+    target = Calendar.objects.create(name="Target", color="#000000")
+    result = import_jobs_from_json(json.dumps(data), target, batch_id="round-trip")
+    assert result["imported"] == 4
+    imported_parent = Job.objects.get(calendar=target, recurrence_parent__isnull=True)
+    assert imported_parent.recurrence_instances.count() == 3
+
+
+@pytest.mark.django_db
+def test_ndjson_export_with_gzip(api_client, series):
+    response = api_client.get(reverse("rental_scheduler:job_export"), {"format": "ndjson", "gzip": "1"})
+
+    assert response["Content-Type"] == "application/gzip"
+    assert response["Content-Disposition"].endswith('.ndjson.gz"')
+    lines = gzip.decompress(_content(response)).decode("utf-8").splitlines()
+    header = json.loads(lines[0])
+    assert header["format"] == "ndjson"
+    assert header["export_source"] == "all"
+    jobs = [json.loads(line) for line in lines[1:]]
+    assert len(jobs) == 4
+    assert jobs[0]["start_dt"] < jobs[1]["start_dt"]
+
+
+@pytest.mark.django_db
+def test_export_rejects_unknown_format(api_client, series):
+    response = api_client.get(reverse("rental_scheduler:job_export"), {"format": "xml"})
+
+    assert response.status_code == 302
@@ -0,0 +1,97 @@
+"""
+Tests for the incremental, bulk JSON/NDJSON job import.
+"""
+import gzip
+import json
+
+import pytest
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+from rental_scheduler.forms import JobImportForm
+from rental_scheduler.models import CALENDAR_EVENTS_VERSION_KEY, Job
+from rental_scheduler.utils import json_import
+from rental_scheduler.utils.json_import import import_jobs_from_json, iter_export_jobs
+
+
+def _row(name, day, **extra):
+    row = {
+        "business_name": name,
+        "start_dt": f"2025-03-{day:02d}T09:00:00+00:00",
+        "end_dt": f"2025-03-{day:02d}T10:00:00+00:00",
+        "quote": None,
+    }
+    row.update(extra)
+    return row
+
+
+def _series_rows():
+    parent = _row(
+        "Series", 3,
+        recurrence_rule={"type": "weekly", "interval": 1, "count": 3},
+        _is_recurring_parent=True, _temp_id="parent_7",
+    )
+    instances = [
+        _row("Series", day, recurrence_original_start=f"2025-03-{day:02d}T09:00:00+00:00",
+             _is_recurring_instance=True, _parent_temp_id="parent_7")
+        for day in (10, 17)
+    ]
+    # One instance written before its parent, one after
+    return [instances[0], _row("Standalone", 4), parent, instances[1]]
+
+
+def test_iter_export_jobs_reads_json_across_small_buffers(monkeypatch):
+    monkeypatch.setattr(json_import, "READ_CHUNK_SIZE", 5)
+    content = json.dumps({"version": "1.0", "jobs": [{"n": 1}, {"n": 22}], "job_count": 12345})
+    header = {}
+
+    jobs = list(iter_export_jobs(content.encode("utf-8"), header))
+
+    assert jobs == [{"n": 1}, {"n": 22}]
+    assert header == {"version": "1.0", "job_count": 12345}
+
+
+@pytest.mark.django_db
+def test_gzipped_ndjson_import_links_instances_in_bulk(calendar, django_assert_max_num_queries):
+    lines = [json.dumps({"version": "1.0", "format": "ndjson"})]
+    lines += [json.dumps(row) for row in _series_rows()]
+    content = gzip.compress("\n".join(lines).encode("utf-8"))
+    cache.set(CALENDAR_EVENTS_VERSION_KEY, 1, timeout=None)
+    progress = []
+
+    with django_assert_max_num_queries(20):
+        result = import_jobs_from_json(content, calendar, batch_id="bulk", batch_size=2, progress=progress.append)
+
+    assert result["processed"] == result["imported"] == 4
+    assert result["warning"] == ""
+    assert len(progress) == 3
+    parent = Job.objects.get(business_name="Series", recurrence_parent__isnull=True)
+    assert parent.recurrence_instances.count() == 2
+    assert Job.objects.filter(import_batch_id="bulk").count() == 4
+    assert cache.get(CALENDAR_EVENTS_VERSION_KEY) == 3  # one bump per batch
+
+
+@pytest.mark.django_db
+def test_instances_without_parent_are_imported_unlinked(calendar):
+    content = json.dumps({"version": "1.0", "jobs": _series_rows()[:2]})
+
+    result = import_jobs_from_json(content, calendar, batch_id="orphans")
+
+    assert result["imported"] == 2
+    assert "1 recurring instance(s) could not be linked" in result["warning"]
+    assert not Job.objects.filter(recurrence_parent__isnull=False).exists()
+
+
+@pytest.mark.django_db
+def test_form_accepts_ndjson_gz_and_rejects_missing_version(calendar):
+    body = "\n".join(json.dumps(row) for row in [{"version": "1.0", "format": "ndjson"}, _row("A", 3)])
+    upload = SimpleUploadedFile("jobs.ndjson.gz", gzip.compress(body.encode("utf-8")))
+
+    form = JobImportForm(data={"target_calendar": calendar.pk}, files={"json_file": upload})
+    assert form.is_valid(), form.errors
+    assert form.cleaned_data["json_file"].read()[:2] == b"\x1f\x8b"
+
+    upload = SimpleUploadedFile("jobs.json", json.dumps({"jobs": [_row("A", 3)]}).encode("utf-8"))
+    form = JobImportForm(data={"target_calendar": calendar.pk}, files={"json_file": upload})
+    assert not form.is_valid()
+    assert "missing version" in str(form.errors["json_file"])
@@ -7,7 +7,10 @@ from django.utils import timezone
 from rental_scheduler.models import CallReminder, Job
 from rental_scheduler.utils.events import get_call_reminder_sunday
 from rental_scheduler.utils.recurrence import (
+    RecurrenceGenerator,
     compute_occurrence_number,
+    generate_occurrences_for_parents,
+    generate_occurrences_in_window,
     get_recurrence_meta,
 )
 
@@ -473,4 +476,66 @@ def test_job_create_partial_interval_field_populates(calendar, api_client):
     assert 'value="3"' in content
 
 
+@pytest.mark.django_db
+def test_window_generation_matches_stepped_instances(calendar):
+    """
+    Window generation (closed-form / lookup tables) must agree with stepping the
+    series from the parent, including the 5th-weekday fallback and far windows.
+    """
+    tz = timezone.get_current_timezone()
+    rules = [
+        ("daily", 3, datetime(2025, 1, 6, 9, 0), 400),
+        ("weekly", 2, datetime(2025, 1, 6, 9, 0), 200),
+        ("monthly", 1, datetime(2025, 1, 31, 9, 0), 120),  # 5th Friday
+        ("monthly", 2, datetime(2025, 1, 16, 9, 0), 120),  # 3rd Thursday
+        ("yearly", 1, datetime(2026, 12, 31, 9, 0), 30),  # ISO week 53
+    ]
+    parents = []
+    for recurrence_type, interval, start, count in rules:
+        start = timezone.make_aware(start, tz)
+        parent = Job.objects.create(
+            calendar=calendar,
+            business_name=f"{recurrence_type} series",
+            start_dt=start,
+            end_dt=start + timedelta(hours=1),
+            status="uncompleted",
+            recurrence_rule={"type": recurrence_type, "interval": interval, "end": "never"},
+        )
+        stepped = RecurrenceGenerator(parent).generate_instances(max_count=count)
+        last = timezone.localtime(stepped[-1].start_dt).date()
+        window_start = last - timedelta(days=400)
+        expected = [
+            instance.start_dt for instance in stepped
+            if window_start <= timezone.localtime(instance.start_dt).date() <= last
+        ]
+        generated = generate_occurrences_in_window(parent, window_start, last, safety_cap=1000)
+        assert [occ["start_dt"] for occ in generated if not occ["is_parent"]] == expected
+        parents.append(parent)
+
+    window_start = datetime(2027, 3, 1).date()
+    window_end = datetime(2027, 6, 30).date()
+    batch = generate_occurrences_for_parents(parents, window_start, window_end)
+    for parent in parents:
+        single = generate_occurrences_in_window(parent, window_start, window_end)
+        assert batch.get(parent.id, []) == single
+
+
+@pytest.mark.django_db
+def test_window_generation_includes_occurrence_on_window_start(calendar):
+    tz = timezone.get_current_timezone()
+    start = timezone.make_aware(datetime(2025, 1, 6, 10, 0), tz)  # Monday
+    parent = Job.objects.create(
+        calendar=calendar,
+        business_name="Weekly Monday",
+        start_dt=start,
+        end_dt=start + timedelta(hours=1),
+        status="uncompleted",
+        recurrence_rule={"type": "weekly", "interval": 1, "end": "never"},
+    )
+
+    occurrences = generate_occurrences_in_window(
+        parent, datetime(2025, 3, 3).date(), datetime(2025, 3, 10).date()
+    )
 
+    assert [timezone.localtime(occ["start_dt"]).day for occ in occurrences] == [3, 10]
+    assert [occ["occurrence_number"] for occ in occurrences] == [8, 9]
@@ -0,0 +1,169 @@
+"""
+Tests for the rolling materialization horizon of forever recurring series.
+"""
+from datetime import datetime, timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from rental_scheduler.models import CallReminder, Job
+from rental_scheduler.utils.horizon import maintain_recurrence_horizon, uncovered_windows
+
+
+def _make_forever_parent(calendar, start_date, **overrides):
+    tz = timezone.get_current_timezone()
+    start = timezone.make_aware(datetime.combine(start_date, datetime.min.time()) + timedelta(hours=10), tz)
+    fields = {
+        'calendar': calendar,
+        'business_name': 'Weekly Forever',
+        'start_dt': start,
+        'end_dt': start + timedelta(hours=1),
+        'status': 'uncompleted',
+        'recurrence_rule': {'type': 'weekly', 'interval': 1, 'end': 'never'},
+    }
+    fields.update(overrides)
+    return Job.objects.create(**fields)
+
+
+def _feed_events(api_client, calendar, start, end):
+    response = api_client.get(reverse('rental_scheduler:job_calendar_data'), {
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        'calendar': calendar.id,
+    })
+    assert response.status_code == 200
+    return response.json()['events']
+
+
+@pytest.mark.django_db
+class TestMaintainRecurrenceHorizon:
+
+    def test_materializes_next_weeks_and_records_coverage(self, calendar):
+        today = timezone.localdate()
+        parent = _make_forever_parent(calendar, today, has_call_reminder=True, call_reminder_weeks_prior=2)
+
+        stats = maintain_recurrence_horizon(weeks=4, today=today)
+
+        instances = Job.objects.filter(recurrence_parent=parent)
+        assert stats['created'] == 4
+        assert instances.count() == 4
+        assert all(instance.recurrence_auto_materialized for instance in instances)
+        assert CallReminder.objects.filter(job__recurrence_parent=parent).count() == 4
+
+        parent.refresh_from_db()
+        assert parent.recurrence_materialized_from == today
+        assert parent.recurrence_materialized_until == today + timedelta(weeks=4)
+
+        # A second run is a no-op
+        assert maintain_recurrence_horizon(weeks=4, today=today)['created'] == 0
+
+    def test_rolls_forward_and_trims_untouched_past_rows(self, calendar):
+        today = timezone.localdate()
+        parent = _make_forever_parent(calendar, today)
+        maintain_recurrence_horizon(weeks=4, today=today)
+
+        edited = Job.objects.filter(recurrence_parent=parent).order_by('start_dt').first()
+        edited.notes = 'Customer called'
+        edited.save()
+
+        later = today + timedelta(weeks=2)
+        stats = maintain_recurrence_horizon(weeks=4, today=later)
+
+        assert stats['trimmed'] == 0  # the only past row was edited by a user
+        assert stats['created'] == 2
+        edited.refresh_from_db()
+        assert edited.recurrence_auto_materialized is False
+
+        third_run = maintain_recurrence_horizon(weeks=4, today=later + timedelta(weeks=1))
+        assert third_run['trimmed'] == 1
+        assert Job.objects.filter(pk=edited.pk).exists()
+
+    def test_parent_change_releases_horizon(self, calendar):
+        today = timezone.localdate()
+        parent = _make_forever_parent(calendar, today)
+        maintain_recurrence_horizon(weeks=4, today=today)
+
+        parent.business_name = 'Renamed Customer'
+        parent.save()
+
+        parent.refresh_from_db()
+        assert parent.recurrence_materialized_until is None
+        assert not Job.objects.filter(recurrence_parent=parent).exists()
+
+    def test_marker_updates_do_not_release_horizon(self, calendar):
+        today = timezone.localdate()
+        parent = _make_forever_parent(calendar, today)
+        maintain_recurrence_horizon(weeks=4, today=today)
+
+        parent.refresh_from_db()
+        parent.save()
+
+        assert Job.objects.filter(recurrence_parent=parent).count() == 4
+
+    def test_occurrence_materialized_during_a_run_is_not_duplicated(self, calendar, monkeypatch):
+        from rental_scheduler.utils import horizon
+        from rental_scheduler.utils.recurrence import materialize_occurrence
+
+        today = timezone.localdate()
+        parent = _make_forever_parent(calendar, today, has_call_reminder=True, call_reminder_weeks_prior=2)
+        generate = horizon.generate_occurrences_for_parents
+        raced = []
+
+        def generate_then_materialize(*args, **kwargs):
+            # A user opens an occurrence after the run read the stored starts
+            batch = generate(*args, **kwargs)
+            first = next(occ for occ in batch[parent.pk] if not occ.get('is_parent'))
+            raced.append(materialize_occurrence(parent, first['start_dt'])[0])
+            return batch
+
+        monkeypatch.setattr(horizon, 'generate_occurrences_for_parents', generate_then_materialize)
+        stats = maintain_recurrence_horizon(weeks=4, today=today)
+
+        instances = Job.objects.filter(recurrence_parent=parent)
+        assert stats['created'] == 3
+        assert instances.count() == 4
+        assert instances.filter(recurrence_auto_materialized=True).count() == 3
+        assert not Job.objects.get(pk=raced[0].pk).recurrence_auto_materialized
+        assert CallReminder.objects.filter(job__recurrence_parent=parent).count() == 4
+
+    def test_command_dry_run_writes_nothing(self, calendar):
+        parent = _make_forever_parent(calendar, timezone.localdate())
+
+        call_command('maintain_recurrence_horizon', '--weeks', '4', '--dry-run', stdout=StringIO())
+
+        assert not Job.objects.filter(recurrence_parent=parent).exists()
+
+
+@pytest.mark.django_db
+class TestHorizonCalendarFeed:
+
+    def test_feed_serves_horizon_rows_without_duplicating_virtual_events(self, api_client, calendar):
+        today = timezone.localdate()
+        parent = _make_forever_parent(calendar, today)
+        maintain_recurrence_horizon(weeks=4, today=today)
+
+        events = _feed_events(api_client, calendar, today, today + timedelta(weeks=8))
+        horizon_ids = set(Job.objects.filter(recurrence_parent=parent).values_list('id', flat=True))
+        job_events = [e for e in events if e.get('extendedProps', {}).get('type') == 'job']
+        virtual = [e for e in events if e.get('extendedProps', {}).get('type') == 'virtual_job']
+        series_starts = [e['start'] for e in job_events + virtual]
+
+        assert horizon_ids <= {e['extendedProps']['job_id'] for e in job_events}
+        assert len(series_starts) == len(set(series_starts))
+        # Weeks 5-8 are beyond the horizon and still generated virtually
+        assert 3 <= len(virtual) <= 4
+
+    def test_uncovered_windows_splits_around_horizon(self, calendar):
+        today = timezone.localdate()
+        parent = _make_forever_parent(calendar, today)
+        parent.recurrence_materialized_from = today
+        parent.recurrence_materialized_until = today + timedelta(days=10)
+
+        assert uncovered_windows(parent, today + timedelta(days=2), today + timedelta(days=5)) == []
+        assert uncovered_windows(parent, today - timedelta(days=3), today + timedelta(days=12)) == [
+            (today - timedelta(days=3), today - timedelta(days=1)),
+            (today + timedelta(days=11), today + timedelta(days=12)),
+        ]
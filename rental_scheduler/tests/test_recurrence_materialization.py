@@ -0,0 +1,128 @@
+"""
+Tests for race-free and bulk materialization of recurring occurrences.
+"""
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from django.urls import reverse
+from django.utils import timezone
+
+from rental_scheduler.models import CallReminder, Job
+from rental_scheduler.utils.recurrence import (
+    materialize_occurrence,
+    regenerate_recurring_instances,
+)
+
+
+@pytest.fixture
+def forever_parent(calendar):
+    tz = timezone.get_current_timezone()
+    start = timezone.make_aware(datetime(2026, 3, 2, 10, 0), tz)  # Monday
+    return Job.objects.create(
+        calendar=calendar,
+        business_name="Weekly Forever",
+        start_dt=start,
+        end_dt=start + timedelta(hours=1),
+        status="uncompleted",
+        has_call_reminder=True,
+        call_reminder_weeks_prior=2,
+        recurrence_rule={"type": "weekly", "interval": 1, "end": "never"},
+    )
+
+
+@pytest.mark.django_db
+def test_materialize_occurrence_is_insert_or_get(forever_parent):
+    occurrence = forever_parent.start_dt + timedelta(weeks=3)
+
+    first, created = materialize_occurrence(forever_parent, occurrence.isoformat())
+    second, created_again = materialize_occurrence(forever_parent, occurrence)
+
+    assert created is True
+    assert created_again is False
+    assert first.pk == second.pk
+    assert CallReminder.objects.filter(job=first).count() == 1
+
+
+@pytest.mark.django_db
+def test_duplicate_occurrence_rows_are_rejected(forever_parent):
+    occurrence = forever_parent.start_dt + timedelta(weeks=1)
+    materialize_occurrence(forever_parent, occurrence)
+
+    with pytest.raises((IntegrityError, ValidationError)):
+        with transaction.atomic():
+            Job.objects.create(
+                calendar=forever_parent.calendar,
+                business_name="Duplicate",
+                start_dt=occurrence,
+                end_dt=occurrence + timedelta(hours=1),
+                recurrence_parent=forever_parent,
+                recurrence_original_start=occurrence,
+            )
+
+
+@pytest.mark.django_db
+def test_materialize_range_api_bulk_inserts_next_occurrences(api_client, forever_parent):
+    url = reverse("rental_scheduler:materialize_occurrence_range_api")
+    start_date = (forever_parent.start_dt + timedelta(weeks=2)).date().isoformat()
+    existing, _ = materialize_occurrence(forever_parent, forever_parent.start_dt + timedelta(weeks=3))
+
+    response = api_client.post(
+        url,
+        data=json.dumps({"parent_id": forever_parent.id, "start_date": start_date, "count": 5}),
+        content_type="application/json",
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["job_ids"]) == 5
+    assert data["created_count"] == 4
+    assert data["job_ids"][1] == existing.id
+    assert Job.objects.filter(recurrence_parent=forever_parent).count() == 5
+    assert CallReminder.objects.filter(job__recurrence_parent=forever_parent).count() == 5
+
+    end_date = (forever_parent.start_dt + timedelta(weeks=8)).date().isoformat()
+    response = api_client.post(
+        url,
+        data=json.dumps({"parent_id": forever_parent.id, "start_date": start_date, "end_date": end_date}),
+        content_type="application/json",
+    )
+
+    assert response.json()["created_count"] == 2
+    assert Job.objects.filter(recurrence_parent=forever_parent).count() == 7
+
+
+@pytest.mark.django_db
+def test_materialize_range_api_requires_end_or_count(api_client, forever_parent):
+    response = api_client.post(
+        reverse("rental_scheduler:materialize_occurrence_range_api"),
+        data=json.dumps({"parent_id": forever_parent.id, "start_date": "2026-03-09"}),
+        content_type="application/json",
+    )
+
+    assert response.status_code == 400
+
+
+@pytest.mark.django_db
+def test_regenerate_keeps_completed_instances_without_duplicates(calendar):
+    tz = timezone.get_current_timezone()
+    start = timezone.make_aware(datetime(2026, 1, 5, 9, 0), tz)
+    parent = Job.objects.create(
+        calendar=calendar,
+        business_name="Finite weekly",
+        start_dt=start,
+        end_dt=start + timedelta(hours=1),
+        status="uncompleted",
+    )
+    parent.create_recurrence_rule(recurrence_type="weekly", interval=1, count=4)
+    parent.generate_recurring_instances()
+    completed = parent.recurrence_instances.order_by("start_dt").first()
+    completed.status = "completed"
+    completed.save()
+
+    regenerate_recurring_instances(parent)
+
+    assert parent.recurrence_instances.count() == 4
+    assert Job.objects.filter(pk=completed.pk, status="completed").exists()
@@ -0,0 +1,92 @@
+import os
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+
+from accounting_integration.services import tax_applicability
+
+
+def _tax_item(itemid, price):
+    return SimpleNamespace(itemid=itemid, price=Decimal(price))
+
+
+@pytest.fixture
+def loads(monkeypatch):
+    calls = []
+
+    def fake_load(org_id, using):
+        calls.append(org_id)
+        items = (_tax_item(500, "5.5"), _tax_item(501, "1.25"))
+        return tax_applicability.TaxContext(org_id, True, True, items, Decimal("6.7500"), False)
+
+    monkeypatch.setattr(tax_applicability, "_load_tax_context", fake_load)
+    return calls
+
+
+def test_tax_context_is_shared_by_rate_and_selected_items(loads):
+    assert tax_applicability.get_effective_tax_rate(7) == (Decimal("6.7500"), False)
+    items = tax_applicability.get_customer_selected_tax_items(SimpleNamespace(org_id=7))
+
+    assert [item.itemid for item in items] == [500, 501]
+    assert loads == [7]
+
+
+def test_tax_cache_expires_and_can_be_disabled(loads, settings, monkeypatch):
+    tax_applicability.get_tax_context(7)
+    monotonic = tax_applicability.time.monotonic
+    monkeypatch.setattr(tax_applicability.time, "monotonic", lambda: monotonic() + 301)
+    tax_applicability.get_tax_context(7)
+    assert loads == [7, 7]
+
+    settings.TAX_CACHE_TTL = 0
+    tax_applicability.get_tax_context(7)
+    tax_applicability.get_tax_context(7)
+    assert loads == [7, 7, 7, 7]
+
+
+def test_flush_file_clears_cache_in_other_processes(loads, settings):
+    tax_applicability.get_tax_context(7)
+    tax_applicability.get_tax_context(7)
+    assert loads == [7]
+
+    # What the flush_tax_cache command does from another process
+    path = settings.TAX_CACHE_FLUSH_FILE
+    with open(path, "w"):
+        pass
+    os.utime(path, (1, 1))
+
+    tax_applicability.get_tax_context(7)
+    assert loads == [7, 7]
+
+
+def test_item_tax_links_are_cached_per_item_and_invalidated(monkeypatch):
+    queried = []
+
+    class FakeLinks:
+        def using(self, using):
+            return self
+
+        def filter(self, parentitemid_id__in, linktype):
+            queried.append(set(parentitemid_id__in))
+            self.ids = parentitemid_id__in
+            return self
+
+        def values_list(self, *fields):
+            rows = [(10, 500, False), (10, 501, True), (11, 500, False)]
+            return [row for row in rows if row[0] in self.ids]
+
+    monkeypatch.setattr(tax_applicability.ItmItemLink, "objects", FakeLinks())
+    from accounting_integration.tax.context import load_item_tax_link_map
+
+    first = load_item_tax_link_map([10, 12], {500, 501})
+    second = load_item_tax_link_map([10, 11, 12], {501})
+    assert queried == [{10, 12}, {11}]
+    assert first[10].non_exempt_tax_ids == {500}
+    assert first[12].has_links is False
+    assert second[10].non_exempt_tax_ids == set()
+    assert second[11].has_links is True
+
+    tax_applicability.invalidate_item_tax_links(10)
+    load_item_tax_link_map([10, 11], {500})
+    assert queried[-1] == {10}
@@ -0,0 +1,62 @@
+from datetime import datetime, timedelta
+from io import StringIO
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.utils import timezone
+
+from rental_scheduler.models import CALENDAR_EVENTS_VERSION_KEY, CallReminder, Job
+
+
+def _make_series(calendar, count, *, name="Monthly series"):
+    tz = timezone.get_current_timezone()
+    start = timezone.make_aware(datetime(2025, 1, 6, 10, 0), tz)
+    parent = Job.objects.create(
+        calendar=calendar,
+        business_name=name,
+        start_dt=start,
+        end_dt=start + timedelta(hours=1),
+        status="uncompleted",
+        has_call_reminder=True,
+        call_reminder_weeks_prior=2,
+    )
+    parent.create_recurrence_rule(recurrence_type="monthly", interval=1, count=count)
+    parent.generate_recurring_instances()
+    return parent
+
+
+@pytest.mark.django_db
+def test_trim_deletes_excess_instances_in_chunks_with_one_cache_bump(calendar):
+    parent = _make_series(calendar, 120)  # ten years of monthly instances
+    small = _make_series(calendar, 6, name="Too small to trim")
+    horizon_cutoff = timezone.localdate() + timedelta(days=365)
+    expected = Job.objects.filter(
+        recurrence_parent=parent,
+        recurrence_original_start__date__gt=horizon_cutoff,
+    ).count()
+    assert expected > 0
+
+    cache.set(CALENDAR_EVENTS_VERSION_KEY, 10, timeout=None)
+    out = StringIO()
+    call_command("trim_recurring_instances", "--horizon", "1", "--chunk-size", "7", stdout=out)
+
+    remaining = Job.objects.filter(recurrence_parent=parent)
+    assert remaining.count() == 120 - expected
+    assert not remaining.filter(recurrence_original_start__date__gt=horizon_cutoff).exists()
+    assert Job.objects.filter(recurrence_parent=small).count() == 6
+    assert not CallReminder.objects.filter(job__recurrence_parent=parent, job__start_dt__date__gt=horizon_cutoff).exists()
+    assert cache.get(CALENDAR_EVENTS_VERSION_KEY) == 11
+    assert f"Instances deleted: {expected}" in out.getvalue()
+    assert "rows/s" in out.getvalue()
+
+
+@pytest.mark.django_db
+def test_trim_dry_run_keeps_instances(calendar):
+    parent = _make_series(calendar, 60)
+
+    out = StringIO()
+    call_command("trim_recurring_instances", "--horizon", "1", "--dry-run", stdout=out)
+
+    assert Job.objects.filter(recurrence_parent=parent).count() == 60
+    assert "Would delete" in out.getvalue()
@@ -48,3 +48,198 @@ def test_workorder_pdf_contains_work_order_number_in_html(api_client, job):
 
     assert "Work Order" in html
     assert "901" in html
+
+
+@pytest.mark.django_db
+def test_workorder_pdf_serves_repeat_requests_from_cache(api_client, job, monkeypatch):
+    from rental_scheduler.models import WorkOrderLineV2, WorkOrderNumberSequence, WorkOrderV2
+    from rental_scheduler.utils import pdf_renderer
+
+    renders = []
+
+    def fake_write_pdf(html, base_url):
+        renders.append(base_url)
+        return b"%PDF-first" if "first" in html else b"%PDF-second"
+
+    monkeypatch.setattr(pdf_renderer, "write_pdf", fake_write_pdf)
+
+    WorkOrderNumberSequence.get_solo(start_number=950)
+    wo = WorkOrderV2.objects.create(job=job, notes="first")
+    WorkOrderLineV2.objects.create(work_order=wo, itemid=1, qty=1, price=10)
+    url = reverse("rental_scheduler:workorder_pdf", args=[wo.pk])
+
+    first = api_client.get(url)
+    second = api_client.get(url)
+    assert first.content == second.content == b"%PDF-first"
+    assert first["ETag"] == second["ETag"]
+    assert len(renders) == 1
+
+    revalidated = api_client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+    assert revalidated.status_code == 304
+    assert len(renders) == 1
+
+    wo.notes = "second"
+    wo.save()
+    changed = api_client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+    assert changed.status_code == 200
+    assert changed.content == b"%PDF-second"
+    assert changed["ETag"] != first["ETag"]
+    assert len(renders) == 2
+
+
+@pytest.mark.django_db
+def test_workorder_pdf_returns_503_when_render_queue_is_full(api_client, job, settings):
+    from rental_scheduler.models import WorkOrderNumberSequence, WorkOrderV2
+
+    settings.PDF_RENDER_WORKERS = 1
+    settings.PDF_RENDER_QUEUE_SIZE = 0
+
+    WorkOrderNumberSequence.get_solo(start_number=960)
+    wo = WorkOrderV2.objects.create(job=job)
+
+    resp = api_client.get(reverse("rental_scheduler:workorder_pdf", args=[wo.pk]))
+
+    assert resp.status_code == 503
+    assert resp["Retry-After"] == "2"
+
+
+def test_workorder_pdf_cache_evicts_least_recently_used(settings, tmp_path):
+    import os
+
+    from rental_scheduler.utils.pdf_cache import get_cached_pdf, store_pdf
+
+    settings.WORKORDER_PDF_CACHE_MAX_MB = 1
+    half = b"x" * (600 * 1024)
+
+    store_pdf(1, "a", half)
+    os.utime(tmp_path / "workorder_pdfs" / "1-a.pdf", (1, 1))
+    store_pdf(2, "b", half)
+
+    assert get_cached_pdf(1, "a") is None
+    assert get_cached_pdf(2, "b") == half
+
+
+@pytest.mark.django_db
+def test_workorder_pdf_batch_zip_contains_one_pdf_per_work_order(api_client, calendar, monkeypatch):
+    import io
+    import zipfile
+    from datetime import date, timedelta
+
+    from django.utils import timezone
+
+    from rental_scheduler.models import Job, WorkOrderNumberSequence, WorkOrderV2
+    from rental_scheduler.utils import pdf_renderer
+
+    monkeypatch.setattr(pdf_renderer, "write_pdf", lambda html, base_url: b"%PDF-fake")
+
+    WorkOrderNumberSequence.get_solo(start_number=970)
+    for day in (3, 4, 10):
+        job = Job.objects.create(
+            calendar=calendar, business_name=f"Batch {day}",
+            start_dt=timezone.now(), end_dt=timezone.now() + timedelta(hours=1),
+        )
+        WorkOrderV2.objects.create(job=job, date=date(2025, 3, day))
+
+    url = reverse("rental_scheduler:workorder_pdf_batch")
+    resp = api_client.get(url, {"start": "2025-03-03", "end": "2025-03-07", "format": "zip"})
+
+    assert resp.status_code == 200
+    archive = zipfile.ZipFile(io.BytesIO(b"".join(resp.streaming_content)))
+    assert archive.namelist() == ["work-order-970.pdf", "work-order-971.pdf"]
+    assert archive.read("work-order-970.pdf") == b"%PDF-fake"
+
+
+@pytest.mark.django_db
+def test_workorder_pdf_batch_merged_pdf_and_selection_errors(api_client, job, monkeypatch):
+    from rental_scheduler.models import WorkOrderNumberSequence, WorkOrderV2
+    from rental_scheduler.utils import pdf_renderer
+
+    merged = []
+    monkeypatch.setattr(
+        pdf_renderer, "write_merged_pdf",
+        lambda htmls, base_url: merged.append(len(htmls)) or b"%PDF-merged",
+    )
+
+    WorkOrderNumberSequence.get_solo(start_number=980)
+    wo = WorkOrderV2.objects.create(job=job)
+    url = reverse("rental_scheduler:workorder_pdf_batch")
+
+    resp = api_client.get(url, {"ids": str(wo.pk)})
+    assert resp.status_code == 200
+    assert resp.content == b"%PDF-merged"
+    assert merged == [1]
+
+    assert api_client.get(url).status_code == 400
+    assert api_client.get(url, {"ids": "abc"}).status_code == 400
+    assert api_client.get(url, {"ids": str(wo.pk + 1000)}).status_code == 404
+
+
+@pytest.mark.django_db
+def test_workorder_pdf_batch_returns_503_when_render_queue_is_full(api_client, job, settings):
+    from rental_scheduler.models import WorkOrderNumberSequence, WorkOrderV2
+
+    settings.PDF_RENDER_WORKERS = 1
+    settings.PDF_RENDER_QUEUE_SIZE = 0
+
+    WorkOrderNumberSequence.get_solo(start_number=985)
+    wo = WorkOrderV2.objects.create(job=job)
+    url = reverse("rental_scheduler:workorder_pdf_batch")
+
+    for export_format in ("pdf", "zip"):
+        resp = api_client.get(url, {"ids": str(wo.pk), "format": export_format})
+        assert resp.status_code == 503
+        assert resp["Retry-After"] == "2"
+
+
+def test_merged_batch_render_holds_a_queue_slot_until_it_finishes(settings, monkeypatch):
+    from concurrent.futures import Future
+
+    from rental_scheduler.utils import pdf_renderer
+
+    class RunningPool:
+        def submit(self, fn, *args):
+            self.future = Future()
+            self.future.set_running_or_notify_cancel()
+            return self.future
+
+    pool = RunningPool()
+    settings.PDF_RENDER_WORKERS = 1
+    settings.PDF_RENDER_QUEUE_SIZE = 1
+    monkeypatch.setattr(pdf_renderer, "_get_executor", lambda: pool)
+
+    with pytest.raises(pdf_renderer.PdfRenderBusy):
+        pdf_renderer.render_merged_pdf(["<p>1</p>", "<p>2</p>"], "/", timeout=0.01)
+
+    # The timed-out render keeps running and keeps its slot
+    with pytest.raises(pdf_renderer.PdfRenderBusy):
+        pdf_renderer.submit_render(1, "key", "<p>1</p>", "/")
+
+    pool.future.set_result(b"%PDF-merged")
+    assert pdf_renderer._in_flight == {}
+
+
+@pytest.mark.django_db
+def test_workorder_pdf_stylesheet_is_parsed_separately_for_weasyprint(job, monkeypatch):
+    from django.template.loader import render_to_string
+
+    from rental_scheduler.models import WorkOrderNumberSequence, WorkOrderV2
+    from rental_scheduler.utils import pdf_renderer
+
+    WorkOrderNumberSequence.get_solo(start_number=990)
+    wo = WorkOrderV2.objects.create(job=job)
+    context = {"work_order": wo, "lines": []}
+
+    # Browser preview keeps the inline stylesheet; WeasyPrint gets it pre-parsed
+    assert "@page" in render_to_string("rental_scheduler/workorders_v2/workorder_pdf.html", context)
+    assert "@page" not in pdf_renderer.render_pdf_html(context)
+
+    warmed = []
+    monkeypatch.setattr(
+        pdf_renderer, "_init_resources",
+        lambda stylesheet, warmup_html=None: warmed.append((stylesheet, warmup_html)),
+    )
+    pdf_renderer.warm_up()
+
+    stylesheet, warmup_html = warmed[0]
+    assert "@page" in stylesheet
+    assert "Work Order 0" in warmup_html
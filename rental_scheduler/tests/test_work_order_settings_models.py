@@ -38,3 +38,88 @@ def test_editing_wo_number_advances_sequence(job):
 
     seq.refresh_from_db()
     assert seq.next_number == 1010
+
+
+def _other_job(calendar, name):
+    from datetime import timedelta
+
+    from django.utils import timezone
+
+    from rental_scheduler.models import Job
+
+    return Job.objects.create(
+        calendar=calendar,
+        business_name=name,
+        start_dt=timezone.now(),
+        end_dt=timezone.now() + timedelta(hours=1),
+        all_day=False,
+        status="uncompleted",
+    )
+
+
+@pytest.fixture
+def number_blocks(settings):
+    from rental_scheduler.models import _release_number_block
+
+    settings.WORK_ORDER_NUMBER_BLOCK_SIZE = 10
+    _release_number_block()
+    yield
+    _release_number_block()
+
+
+@pytest.mark.django_db
+def test_block_allocation_reserves_numbers_once_per_block(
+    number_blocks, django_assert_num_queries, django_capture_on_commit_callbacks
+):
+    from rental_scheduler.models import WorkOrderNumberSequence
+
+    seq = WorkOrderNumberSequence.get_solo(start_number=100)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        n1 = WorkOrderNumberSequence.allocate_work_order_number()
+    with django_assert_num_queries(0):
+        n2 = WorkOrderNumberSequence.allocate_work_order_number()
+
+    assert (n1, n2) == (100, 101)
+    seq.refresh_from_db()
+    assert seq.next_number == 110
+
+
+@pytest.mark.django_db
+def test_block_allocation_discards_uncommitted_block(number_blocks):
+    from rental_scheduler.models import WorkOrderNumberSequence
+
+    WorkOrderNumberSequence.get_solo(start_number=100)
+
+    # The test transaction never commits, so each block is re-reserved
+    assert WorkOrderNumberSequence.allocate_work_order_number() == 100
+    assert WorkOrderNumberSequence.allocate_work_order_number() == 110
+
+
+@pytest.mark.django_db
+def test_allocated_number_skips_manually_used_number(number_blocks, django_capture_on_commit_callbacks, job):
+    from rental_scheduler.models import WorkOrderNumberSequence, WorkOrderV2
+
+    WorkOrderNumberSequence.get_solo(start_number=1)
+    with django_capture_on_commit_callbacks(execute=True):
+        first = WorkOrderV2.objects.create(job=job)
+
+    # Manual number inside this process's reserved block
+    WorkOrderV2.objects.create(job=_other_job(job.calendar, "Other"), number=2)
+
+    third = WorkOrderV2.objects.create(job=_other_job(job.calendar, "Third"))
+
+    assert (first.number, third.number) == (1, 3)
+
+
+@pytest.mark.django_db
+def test_duplicate_manual_number_is_a_validation_error(job):
+    from django.core.exceptions import ValidationError
+
+    from rental_scheduler.models import WorkOrderV2
+
+    WorkOrderV2.objects.create(job=job, number=50)
+
+    with pytest.raises(ValidationError) as exc:
+        WorkOrderV2.objects.create(job=_other_job(job.calendar, "Other"), number=50)
+    assert "number" in exc.value.message_dict
@@ -64,3 +64,49 @@ def test_work_order_v2_rejects_percent_discount_over_100(job):
     )
     with pytest.raises(ValidationError):
         wo.full_clean()
+
+
+@pytest.mark.django_db
+def test_work_order_v2_set_lines_diffs_against_existing_lines(job):
+    from rental_scheduler.models import WorkOrderLineV2, WorkOrderV2
+
+    wo = WorkOrderV2.objects.create(job=job)
+    wo.set_lines([
+        {"itemid": 1, "qty": Decimal("1.00"), "price": Decimal("10.00")},
+        {"itemid": 2, "qty": Decimal("2.00"), "price": Decimal("5.00")},
+        {"itemid": 3, "qty": Decimal("1.00"), "price": Decimal("1.00")},
+    ])
+    first, second, _ = WorkOrderLineV2.objects.filter(work_order=wo).order_by("created_at", "pk")
+
+    summary = wo.set_lines([
+        {"itemid": 1, "qty": Decimal("1.00"), "price": Decimal("10.00")},
+        {"itemid": 2, "qty": Decimal("3.00"), "price": Decimal("5.00")},
+    ])
+
+    assert summary == {"created": 0, "updated": 1, "deleted": 1}
+    lines = list(WorkOrderLineV2.objects.filter(work_order=wo).order_by("created_at", "pk"))
+    assert [line.pk for line in lines] == [first.pk, second.pk]
+    assert lines[1].amount == Decimal("15.00")
+
+    wo.refresh_from_db()
+    assert wo.subtotal == Decimal("25.00")
+    assert wo.total == Decimal("25.00")
+
+
+@pytest.mark.django_db
+def test_work_order_v2_set_lines_rejects_invalid_line_without_writing(job):
+    from rental_scheduler.models import WorkOrderLineV2, WorkOrderV2
+
+    wo = WorkOrderV2.objects.create(job=job)
+    wo.set_lines([{"itemid": 1, "qty": Decimal("1.00"), "price": Decimal("10.00")}])
+
+    with pytest.raises(ValidationError) as exc:
+        wo.set_lines([
+            {"itemid": 1, "qty": Decimal("1.00"), "price": Decimal("10.00")},
+            {"itemid": 2, "qty": Decimal("0.00"), "price": Decimal("5.00")},
+        ])
+
+    assert "Line 2" in exc.value.message_dict["lines"][0]
+    assert WorkOrderLineV2.objects.filter(work_order=wo).count() == 1
+    wo.refresh_from_db()
+    assert wo.subtotal == Decimal("10.00")
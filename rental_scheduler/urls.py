@@ -21,6 +21,7 @@ from .views import (
     workorder_new,
     workorder_edit,
     workorder_pdf,
+    workorder_pdf_batch,
     workorder_pdf_preview,
     job_create_partial,
     job_detail_partial,
@@ -39,7 +40,9 @@ from .views import (
     import_history,
     revert_import,
     export_jobs,
+    calendar_ics_feed,
     import_jobs_json,
+    import_batch_status,
 )
 from .views_recurring import (
     job_create_api_recurring,
@@ -47,6 +50,7 @@ from .views_recurring import (
     job_cancel_future_api,
     job_delete_api_recurring,
     materialize_occurrence_api,
+    materialize_occurrence_range_api,
     recurrence_preview_occurrences,
     series_occurrences_api,
 )
@@ -72,6 +76,7 @@ urlpatterns = [
     path('api/jobs/<int:pk>/cancel-future/', job_cancel_future_api, name='job_cancel_future_api'),
     path('api/jobs/<int:pk>/delete-recurring/', job_delete_api_recurring, name='job_delete_api_recurring'),
     path('api/recurrence/materialize/', materialize_occurrence_api, name='materialize_occurrence_api'),
+    path('api/recurrence/materialize-range/', materialize_occurrence_range_api, name='materialize_occurrence_range_api'),
     path('api/recurrence/preview/', recurrence_preview_occurrences, name='recurrence_preview_occurrences'),
     path('api/recurrence/series-occurrences/', series_occurrences_api, name='series_occurrences_api'),
     
@@ -88,8 +93,10 @@ urlpatterns = [
     path('jobs/import/history/', import_history, name='import_history'),
     path('jobs/import/<str:batch_id>/revert/', revert_import, name='revert_import'),
     path('jobs/import/json/', import_jobs_json, name='job_import_json'),
+    path('jobs/import/<str:batch_id>/status/', import_batch_status, name='import_batch_status'),
     path('jobs/export/', export_jobs, name='job_export'),
     path('jobs/export/<int:calendar_id>/', export_jobs, name='job_export_calendar'),
+    path('calendars/<int:calendar_id>/feed.ics', calendar_ics_feed, name='calendar_ics_feed'),
     path('jobs/<int:pk>/delete/', JobDeleteView.as_view(), name='job_delete'),
     # Job Modal URLs
     
@@ -109,6 +116,7 @@ urlpatterns = [
     path('workorders/new/', workorder_new, name='workorder_new'),
     path('workorders/<int:pk>/edit/', workorder_edit, name='workorder_edit'),
     # PDF print (v2)
+    path('workorders/pdf/batch/', workorder_pdf_batch, name='workorder_pdf_batch'),
     path('workorders/<int:pk>/pdf/', workorder_pdf, name='workorder_pdf'),
     path('workorders/<int:pk>/pdf/preview/', workorder_pdf_preview, name='workorder_pdf_preview'),
     
@@ -1,71 +1,32 @@
 """
 AI-powered parser for extracting structured data from calendar event descriptions.
 Uses OpenAI GPT models to intelligently parse trailer repair job descriptions.
+
+Descriptions are parsed in batches: identical descriptions are parsed once,
+results are cached in the database (``ParsedDescriptionCache``), and cache
+misses are packed several per request and sent concurrently from a bounded
+thread pool under a client-side rate limit. The backend is pluggable through
+``settings.AI_PARSER_CLIENT``; ``StubDescriptionClient`` parses locally
+without network access (tests, offline imports).
 """
 
+import hashlib
 import logging
 import json
-from decimal import Decimal, InvalidOperation
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 from django.conf import settings
+from django.utils.module_loading import import_string
 
 logger = logging.getLogger(__name__)
 
+PROMPT_VERSION = '2'
+"""Bump when the prompt changes so cached results from the old prompt are not reused."""
 
-def parse_description_with_ai(description_text):
-    """
-    Parse a job description using AI to extract structured fields.
-    
-    Args:
-        description_text (str): The raw description text from calendar event
-        
-    Returns:
-        dict: Extracted fields with keys:
-            - trailer_color (str): Color of the trailer
-            - trailer_serial (str): Serial number or model identifier
-            - trailer_details (str): Specifications like dimensions, features
-            - repair_notes (str): Specific repair work to be done
-            - quote (str or None): Quote amount (can be number or text like "TBD")
-            - unparsed_notes (str): Any text that doesn't fit other categories
-    """
-    
-    # Default fallback structure
-    fallback_result = {
-        'trailer_color': '',
-        'trailer_serial': '',
-        'trailer_details': '',
-        'repair_notes': '',
-        'quote': None,
-        'unparsed_notes': description_text
-    }
-    
-    # Check if description is empty
-    if not description_text or not description_text.strip():
-        return fallback_result
-    
-    # Check if AI parsing is enabled and API key is configured
-    if not getattr(settings, 'AI_PARSING_ENABLED', False):
-        logger.info("AI parsing is disabled in settings")
-        return fallback_result
-        
-    api_key = getattr(settings, 'OPENAI_API_KEY', '')
-    if not api_key:
-        logger.warning("OpenAI API key not configured - falling back to raw description")
-        return fallback_result
-    
-    try:
-        from openai import OpenAI
-        
-        client = OpenAI(api_key=api_key)
-        model = getattr(settings, 'OPENAI_MODEL', 'gpt-4o-mini')
-        
-        # Build the prompt
-        prompt = f"""You are an expert at parsing trailer repair job descriptions. Extract structured information from the following description.
-
-Description:
-{description_text}
-
-Extract and return ONLY a valid JSON object with these exact fields:
-- trailer_color: The color of the trailer (e.g., "PEWTER", "BLACK"). Empty string if not found.
+FIELD_INSTRUCTIONS = """- trailer_color: The color of the trailer (e.g., "PEWTER", "BLACK"). Empty string if not found.
 - trailer_serial: Serial number, model, or identifier (e.g., "UXT 10-12'"). Empty string if not found.
 - trailer_details: Specifications like dimensions, features, equipment (e.g., "W/LADDER RACKS ON ROOF"). Empty string if not found.
 - repair_notes: Specific repair work to be done (e.g., "COMPLETE TRL. INSPECTION", "CHECK WATER LEAKS AT ROOF"). Combine multiple repair items with newlines. Empty string if not found.
@@ -78,86 +39,333 @@ Rules:
 - Be conservative - only extract what you're confident about
 - Put ambiguous text in unparsed_notes
 """
-        
-        logger.debug(f"Sending description to OpenAI for parsing: {description_text[:100]}...")
-        
-        # Call OpenAI API
-        response = client.chat.completions.create(
-            model=model,
+
+
+def _fallback_result(description_text):
+    """Result used when a description is not (or cannot be) parsed"""
+    return {
+        'trailer_color': '',
+        'trailer_serial': '',
+        'trailer_details': '',
+        'repair_notes': '',
+        'quote': None,
+        'unparsed_notes': description_text
+    }
+
+
+def _clean_result(parsed_data):
+    """Validate and normalize one parsed object returned by a client"""
+    result = {
+        'trailer_color': str(parsed_data.get('trailer_color') or '').strip(),
+        'trailer_serial': str(parsed_data.get('trailer_serial') or '').strip(),
+        'trailer_details': str(parsed_data.get('trailer_details') or '').strip(),
+        'repair_notes': str(parsed_data.get('repair_notes') or '').strip(),
+        'quote': None,
+        'unparsed_notes': str(parsed_data.get('unparsed_notes') or '').strip()
+    }
+
+    # Quote can be text or number, store as string
+    quote_value = parsed_data.get('quote')
+    if quote_value is not None:
+        result['quote'] = str(quote_value)
+    return result
+
+
+def _strip_code_fences(response_text):
+    """Remove markdown code fences a model may wrap JSON in"""
+    response_text = response_text.strip()
+    if response_text.startswith('```json'):
+        response_text = response_text[7:]
+    if response_text.startswith('```'):
+        response_text = response_text[3:]
+    if response_text.endswith('```'):
+        response_text = response_text[:-3]
+    return response_text.strip()
+
+
+def normalize_description(description_text):
+    """Collapse whitespace so formatting-only differences share a cache entry"""
+    return re.sub(r'\s+', ' ', description_text or '').strip()
+
+
+def description_cache_key(description_text, model_name):
+    """Cache key for a description parsed by a given model and prompt version"""
+    raw = f"{PROMPT_VERSION}\x00{model_name}\x00{normalize_description(description_text)}"
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+# ============================================================================
+# Parser clients
+# ============================================================================
+
+class DescriptionParserClient:
+    """
+    Base class for description parsing backends.
+
+    Subclasses implement ``parse_many``, which receives a pack of descriptions
+    and returns one dict per description in the same order (or None for a
+    description that could not be parsed).
+    """
+    model_name = ''
+
+    def is_available(self):
+        """Whether the backend can be used (configured, package installed)"""
+        return True
+
+    def parse_many(self, descriptions):
+        raise NotImplementedError
+
+
+class OpenAIDescriptionClient(DescriptionParserClient):
+    """Parses packs of descriptions with one OpenAI chat completion per pack"""
+
+    def __init__(self, api_key=None, model=None):
+        self.api_key = api_key if api_key is not None else getattr(settings, 'OPENAI_API_KEY', '')
+        self.model_name = model or getattr(settings, 'OPENAI_MODEL', 'gpt-4o-mini')
+        self._client = None
+        self._lock = threading.Lock()
+
+    def is_available(self):
+        if not self.api_key:
+            logger.warning("OpenAI API key not configured - falling back to raw description")
+            return False
+        try:
+            import openai  # noqa: F401
+        except ImportError:
+            logger.error("OpenAI package not installed - run: pip install openai")
+            return False
+        return True
+
+    def _get_client(self):
+        with self._lock:
+            if self._client is None:
+                from openai import OpenAI
+                self._client = OpenAI(api_key=self.api_key)
+            return self._client
+
+    def _build_prompt(self, descriptions):
+        numbered = "\n\n".join(
+            f"[{index}]\n{description}" for index, description in enumerate(descriptions)
+        )
+        return f"""You are an expert at parsing trailer repair job descriptions. Extract structured information from each of the following {len(descriptions)} descriptions.
+
+Descriptions:
+{numbered}
+
+Return ONLY a valid JSON object of the form {{"results": [...]}} with exactly {len(descriptions)} objects, in the same order as the numbered descriptions. Each object has these exact fields:
+{FIELD_INSTRUCTIONS}"""
+
+    def parse_many(self, descriptions):
+        logger.debug(f"Sending {len(descriptions)} description(s) to OpenAI for parsing")
+
+        response = self._get_client().chat.completions.create(
+            model=self.model_name,
             messages=[
                 {"role": "system", "content": "You are a data extraction assistant that returns only valid JSON."},
-                {"role": "user", "content": prompt}
+                {"role": "user", "content": self._build_prompt(descriptions)}
             ],
             temperature=0.1,  # Low temperature for consistent extraction
-            max_tokens=500,
-            timeout=10.0  # 10 second timeout
+            max_tokens=300 + 300 * len(descriptions),
+            timeout=10.0 + 5.0 * len(descriptions),
         )
-        
-        # Extract the response
-        response_text = response.choices[0].message.content.strip()
-        logger.debug(f"OpenAI response: {response_text}")
-        
-        # Try to parse JSON (handle potential markdown code blocks)
-        response_text = response_text.strip()
-        if response_text.startswith('```json'):
-            response_text = response_text[7:]
-        if response_text.startswith('```'):
-            response_text = response_text[3:]
-        if response_text.endswith('```'):
-            response_text = response_text[:-3]
-        response_text = response_text.strip()
-        
-        parsed_data = json.loads(response_text)
-        
-        # Validate and clean the response
-        result = {
-            'trailer_color': str(parsed_data.get('trailer_color', '')).strip(),
-            'trailer_serial': str(parsed_data.get('trailer_serial', '')).strip(),
-            'trailer_details': str(parsed_data.get('trailer_details', '')).strip(),
-            'repair_notes': str(parsed_data.get('repair_notes', '')).strip(),
-            'quote': None,
-            'unparsed_notes': str(parsed_data.get('unparsed_notes', '')).strip()
-        }
-        
-        # Quote can be text or number, store as string
-        quote_value = parsed_data.get('quote')
-        if quote_value is not None:
-            result['quote'] = str(quote_value)
-        
-        logger.info(f"Successfully parsed description with AI - extracted {sum(1 for v in result.values() if v)} fields")
-        return result
-        
-    except ImportError:
-        logger.error("OpenAI package not installed - run: pip install openai")
-        return fallback_result
-        
-    except json.JSONDecodeError as e:
-        logger.error(f"Failed to parse OpenAI JSON response: {e}")
-        logger.error(f"Response was: {response_text[:500]}")
-        return fallback_result
-        
+
+        response_text = _strip_code_fences(response.choices[0].message.content or '')
+        logger.debug(f"OpenAI response: {response_text[:500]}")
+
+        results = json.loads(response_text).get('results')
+        if not isinstance(results, list) or len(results) != len(descriptions):
+            raise ValueError(
+                f"Expected {len(descriptions)} results, got "
+                f"{len(results) if isinstance(results, list) else type(results).__name__}"
+            )
+        return [item if isinstance(item, dict) else None for item in results]
+
+
+class StubDescriptionClient(DescriptionParserClient):
+    """
+    Local, deterministic parser that needs no network.
+
+    Pulls the first dollar amount out as the quote and keeps the remaining
+    text as unparsed notes. Intended for tests and offline imports.
+    """
+    model_name = 'local-stub'
+
+    QUOTE_RE = re.compile(r'\$\s*([\d,]+(?:\.\d{1,2})?)')
+
+    def parse_many(self, descriptions):
+        results = []
+        for description in descriptions:
+            quote = None
+            notes = description
+            match = self.QUOTE_RE.search(description)
+            if match:
+                quote = match.group(1).replace(',', '')
+                notes = (description[:match.start()] + description[match.end():]).strip()
+            results.append({
+                'trailer_color': '',
+                'trailer_serial': '',
+                'trailer_details': '',
+                'repair_notes': '',
+                'quote': quote,
+                'unparsed_notes': notes,
+            })
+        return results
+
+
+def get_description_client():
+    """Instantiate the configured parser backend (settings.AI_PARSER_CLIENT)"""
+    client_path = getattr(settings, 'AI_PARSER_CLIENT', 'rental_scheduler.utils.ai_parser.OpenAIDescriptionClient')
+    return import_string(client_path)()
+
+
+class RateLimiter:
+    """Thread-safe limiter spacing request starts evenly (requests per minute)"""
+
+    def __init__(self, requests_per_minute):
+        self.interval = 60.0 / requests_per_minute if requests_per_minute and requests_per_minute > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+# ============================================================================
+# Batch parsing
+# ============================================================================
+
+def _parse_pack(client, pack, rate_limiter):
+    """Parse one pack; a failed multi-description pack is retried one by one"""
+    try:
+        rate_limiter.wait()
+        return client.parse_many(pack)
     except Exception as e:
-        logger.error(f"Error during AI parsing: {type(e).__name__}: {str(e)}")
-        return fallback_result
+        logger.error(f"Error during AI parsing of {len(pack)} description(s): {type(e).__name__}: {str(e)}")
+        if len(pack) == 1:
+            return [None]
+    return [_parse_pack(client, [description], rate_limiter)[0] for description in pack]
 
 
-def parse_description_batch(descriptions):
+def parse_description_batch(descriptions, *, client=None, max_workers=None, pack_size=None,
+                            requests_per_minute=None):
     """
-    Parse multiple descriptions in batch (for future optimization).
-    Currently just calls parse_description_with_ai for each item.
-    
+    Parse many job descriptions with AI, reusing cached results.
+
+    Identical descriptions (after whitespace normalization) are parsed once.
+    Cached results are read in one query; the misses are packed
+    ``pack_size`` per request and sent from a pool of ``max_workers`` threads
+    under a shared rate limit. New results are written back to the cache.
+    Descriptions that cannot be parsed get the raw-text fallback and are not cached.
+
     Args:
         descriptions (list): List of description texts
-        
+        client: Parser backend (defaults to settings.AI_PARSER_CLIENT)
+        max_workers: Concurrent requests (defaults to settings.AI_PARSER_MAX_WORKERS)
+        pack_size: Descriptions per request (defaults to settings.AI_PARSER_PACK_SIZE)
+        requests_per_minute: Rate limit (defaults to settings.AI_PARSER_REQUESTS_PER_MINUTE)
+
     Returns:
-        list: List of parsed result dicts
+        list: Parsed result dicts, in the same order as ``descriptions``
     """
-    return [parse_description_with_ai(desc) for desc in descriptions]
+    from rental_scheduler.models import ParsedDescriptionCache
+
+    results = [_fallback_result(description) for description in descriptions]
+
+    if not getattr(settings, 'AI_PARSING_ENABLED', False):
+        logger.info("AI parsing is disabled in settings")
+        return results
 
+    # Group positions by description text; empty descriptions keep the fallback
+    positions_by_text = {}
+    for index, description in enumerate(descriptions):
+        if description and description.strip():
+            positions_by_text.setdefault(description, []).append(index)
+    if not positions_by_text:
+        return results
 
+    client = client or get_description_client()
+    if not client.is_available():
+        return results
 
+    key_by_text = {text: description_cache_key(text, client.model_name) for text in positions_by_text}
+    cached = dict(
+        ParsedDescriptionCache.objects.filter(key__in=set(key_by_text.values()))
+        .values_list('key', 'result')
+    )
 
+    parsed_by_key = {}
+    misses = []
+    missing_keys = set()
+    for text, key in key_by_text.items():
+        if key in cached:
+            parsed_by_key[key] = cached[key]
+        elif key not in missing_keys:
+            # Texts differing only in whitespace share a key; send one of them
+            missing_keys.add(key)
+            misses.append(text)
 
+    if misses:
+        pack_size = max(1, pack_size or getattr(settings, 'AI_PARSER_PACK_SIZE', 10))
+        max_workers = max(1, max_workers or getattr(settings, 'AI_PARSER_MAX_WORKERS', 4))
+        if requests_per_minute is None:
+            requests_per_minute = getattr(settings, 'AI_PARSER_REQUESTS_PER_MINUTE', 60)
+        rate_limiter = RateLimiter(requests_per_minute)
+        packs = [misses[i:i + pack_size] for i in range(0, len(misses), pack_size)]
+
+        logger.info(
+            f"AI parsing {len(misses)} description(s) in {len(packs)} request(s) "
+            f"({len(cached)} cached, {len(descriptions)} total)"
+        )
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(packs)), thread_name_prefix='ai-parser') as pool:
+            pack_results = list(pool.map(lambda pack: _parse_pack(client, pack, rate_limiter), packs))
+
+        new_entries = []
+        for pack, parsed_pack in zip(packs, pack_results):
+            for text, parsed in zip(pack, parsed_pack):
+                if parsed is None:
+                    continue
+                key = key_by_text[text]
+                parsed_by_key[key] = _clean_result(parsed)
+                new_entries.append(ParsedDescriptionCache(
+                    key=key,
+                    model_name=client.model_name,
+                    result=parsed_by_key[key],
+                ))
+        if new_entries:
+            ParsedDescriptionCache.objects.bulk_create(new_entries, ignore_conflicts=True)
+
+    for text, indexes in positions_by_text.items():
+        parsed = parsed_by_key.get(key_by_text[text])
+        if parsed is None:
+            continue
+        for index in indexes:
+            results[index] = dict(parsed)
+    return results
 
 
+def parse_description_with_ai(description_text):
+    """
+    Parse a job description using AI to extract structured fields.
 
+    Single-description wrapper around ``parse_description_batch`` (cached).
+
+    Args:
+        description_text (str): The raw description text from calendar event
+
+    Returns:
+        dict: Extracted fields with keys:
+            - trailer_color (str): Color of the trailer
+            - trailer_serial (str): Serial number or model identifier
+            - trailer_details (str): Specifications like dimensions, features
+            - repair_notes (str): Specific repair work to be done
+            - quote (str or None): Quote amount (can be number or text like "TBD")
+            - unparsed_notes (str): Any text that doesn't fit other categories
+    """
+    return parse_description_batch([description_text])[0]
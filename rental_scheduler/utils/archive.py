@@ -0,0 +1,124 @@
+"""
+Archival of long-deleted and long-completed jobs.
+
+Archived jobs are copied into ``ArchivedJob`` (with their call reminders and
+status history as JSON) and removed from the hot ``Job`` table in the same
+transaction. What may be archived:
+
+- Standalone jobs that were soft-deleted before the deleted cutoff, or that
+  are completed and ended before the completed cutoff.
+- Deleted instances of a series whose parent was deleted before the cutoff.
+  Once a dead series has no instances left, its parent is archived as a
+  standalone job.
+
+Never archived: jobs with a work order (the work order cascades with the
+job), and any row of a live series. Deleted occurrences of a live forever
+series are what suppress its virtual occurrences, and a completed one would
+turn back into an open virtual occurrence.
+"""
+
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q
+
+
+def archivable_jobs_filter(deleted_before, completed_before=None):
+    """
+    Q selecting jobs that may be archived.
+
+    Args:
+        deleted_before: Soft-deleted jobs last updated before this are archived
+        completed_before: Completed jobs that ended before this are archived
+            (None to keep completed jobs)
+    """
+    from rental_scheduler.models import Job
+
+    stale = Q(is_deleted=True, updated_at__lt=deleted_before)
+    if completed_before is not None:
+        stale |= Q(is_deleted=False, status='completed', end_dt__lt=completed_before)
+
+    standalone = Q(recurrence_parent__isnull=True) & ~Exists(
+        Job.objects.filter(recurrence_parent=OuterRef('pk'))
+    )
+    dead_series_instance = Q(
+        is_deleted=True,
+        recurrence_parent__is_deleted=True,
+        recurrence_parent__updated_at__lt=deleted_before,
+    )
+    return Q(work_order_v2__isnull=True) & ((standalone & stale) | dead_series_instance)
+
+
+def _group_by_job(queryset):
+    grouped = defaultdict(list)
+    for row in queryset.values():
+        grouped[row.pop('job_id')].append(row)
+    return grouped
+
+
+def archive_jobs_chunk(job_ids, candidates):
+    """
+    Move one chunk of jobs into the archive.
+
+    Rows are locked and re-checked against ``candidates`` so a job restored
+    or edited since it was selected is left alone.
+
+    Returns:
+        Dict with 'jobs', 'call_reminders' and 'status_changes' archived
+    """
+    from rental_scheduler.models import ArchivedJob, CallReminder, Job, StatusChange
+
+    with transaction.atomic():
+        ids = list(
+            Job.objects.select_for_update(of=('self',))
+            .filter(candidates, pk__in=job_ids)
+            .values_list('pk', flat=True)
+        )
+        if not ids:
+            return {'jobs': 0, 'call_reminders': 0, 'status_changes': 0}
+
+        rows = Job.objects.filter(pk__in=ids).select_related('calendar')
+        reminders = _group_by_job(CallReminder.objects.filter(job_id__in=ids))
+        changes = _group_by_job(StatusChange.objects.filter(job_id__in=ids))
+
+        archived = []
+        for job in rows:
+            job_data = {field.attname: getattr(job, field.attname) for field in Job._meta.concrete_fields}
+            archived.append(ArchivedJob(
+                original_id=job.pk,
+                calendar_id=job.calendar_id,
+                calendar_name=job.calendar.name if job.calendar_id else '',
+                business_name=job.business_name or '',
+                contact_name=job.contact_name or '',
+                phone=job.phone or '',
+                start_dt=job.start_dt,
+                end_dt=job.end_dt,
+                status=job.status,
+                reason=ArchivedJob.REASON_DELETED if job.is_deleted else ArchivedJob.REASON_COMPLETED,
+                job_data=job_data,
+                call_reminders=reminders.get(job.pk, []),
+                status_changes=changes.get(job.pk, []),
+            ))
+        ArchivedJob.objects.bulk_create(archived)
+        # Reminders and status changes cascade with the job
+        Job.objects.filter(pk__in=ids).delete()
+
+    return {
+        'jobs': len(archived),
+        'call_reminders': sum(len(items) for items in reminders.values()),
+        'status_changes': sum(len(items) for items in changes.values()),
+    }
+
+
+def get_archived_job(pk):
+    """Read-only Job rebuilt from the archive, or None if the job was never archived."""
+    from rental_scheduler.models import ArchivedJob, Calendar
+
+    archived = ArchivedJob.objects.select_related('calendar').filter(original_id=pk).first()
+    if archived is None:
+        return None
+    job = archived.as_job()
+    # Use the archived calendar name if the calendar has since been deleted
+    job.calendar = archived.calendar or Calendar(name=archived.calendar_name)
+    job.archived_job = archived
+    return job
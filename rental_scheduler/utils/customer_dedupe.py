@@ -0,0 +1,319 @@
+"""
+Duplicate detection for new Classic customers.
+
+A new customer is a possible duplicate of an existing one when the phone
+matches, the BILLTO street (and zip, or city/state) matches, or the name is
+similar. Candidates come from a blocking index held in memory and built from
+the local customer index (``ClassicCustomer``):
+
+- phone block: last 7 phone digits (any phone match shares them)
+- address block: normalized street line (an address match requires it)
+- name block: character trigrams of the normalized name; candidates are
+  ranked by shared trigrams (Dice coefficient) and only the best are scored.
+  A name containing the new name (or contained in it) anywhere is always a
+  candidate: its unpadded trigrams are all shared, however low the Dice.
+
+So a check looks at a handful of customers however large the customer list
+is. Customers synced since the last check are applied to the index in place;
+it is rebuilt only when customers were removed.
+
+Scoring uses a cheap upper bound (``SequenceMatcher.quick_ratio``) to rule
+out most names before computing the full ratio, which is only needed for
+near matches and for the customers that end up in the results.
+"""
+
+import difflib
+import threading
+from collections import Counter, defaultdict
+
+from rental_scheduler.utils.customer_index import (
+    normalize_name,
+    normalize_phone_tail,
+    normalize_simple_text,
+    normalize_zip,
+)
+
+DUPLICATE_NAME_THRESHOLD = 0.82
+DUPLICATE_MAX_RESULTS = 10
+DUPLICATE_CANDIDATE_LIMIT = 200
+
+# Name candidates sharing fewer trigrams than this (Dice) are not scored
+_NAME_BLOCK_MIN_DICE = 0.3
+
+_index_lock = threading.Lock()
+_index = None  # (version, CustomerBlockingIndex)
+
+
+def phone_matches(target_digits: str, candidate_digits: str) -> bool:
+    if not target_digits or not candidate_digits:
+        return False
+    if len(target_digits) >= 10 and len(candidate_digits) >= 10:
+        return target_digits[-10:] == candidate_digits[-10:]
+    return target_digits[-7:] == candidate_digits[-7:]
+
+
+def _normalize_state(value: str) -> str:
+    return (value or "").strip().upper()
+
+
+def address_matches(target: dict, candidate: dict) -> bool:
+    target_line = normalize_simple_text(target.get("address_line1") or "")
+    candidate_line = normalize_simple_text(candidate.get("address_line1") or "")
+    if not target_line or not candidate_line or target_line != candidate_line:
+        return False
+
+    target_zip = normalize_zip(target.get("zip") or "")
+    candidate_zip = normalize_zip(candidate.get("zip") or "")
+    if target_zip and candidate_zip:
+        return target_zip == candidate_zip
+
+    target_city = normalize_simple_text(target.get("city") or "")
+    candidate_city = normalize_simple_text(candidate.get("city") or "")
+    target_state = _normalize_state(target.get("state") or "")
+    candidate_state = _normalize_state(candidate.get("state") or "")
+
+    return bool(target_city and target_state and target_city == candidate_city and target_state == candidate_state)
+
+
+def name_grams(normalized_name: str) -> set:
+    """Character trigrams of a normalized name, padded so short names still have some."""
+    if not normalized_name:
+        return set()
+    padded = f"  {normalized_name} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def inner_grams(normalized_name: str) -> set:
+    """Unpadded character trigrams: every one is shared by any name containing this one."""
+    return {normalized_name[i:i + 3] for i in range(len(normalized_name) - 2)}
+
+
+def _names_contain(a: str, b: str) -> bool:
+    return (a in b or b in a) and min(len(a), len(b)) >= 4
+
+
+class CustomerBlockingIndex:
+    """In-memory blocking keys over indexed customers (see module docstring)."""
+
+    def __init__(self, customers=()):
+        self.customers = {}
+        self.by_phone = defaultdict(set)
+        self.by_street = defaultdict(set)
+        self.by_gram = defaultdict(set)
+        self.by_inner_gram = defaultdict(set)
+        self.gram_counts = {}
+        self.inner_gram_counts = {}
+        self._keys = {}  # org_id -> (phone key, street, grams, inner grams), for removal
+        for customer in customers:
+            self.add(customer)
+
+    def add(self, customer):
+        """Add a customer, replacing its previous entry."""
+        org_id = customer["org_id"]
+        self.remove(org_id)
+        self.customers[org_id] = customer
+        phone_tail = normalize_phone_tail(customer["phone"])
+        phone_key = phone_tail[-7:] if phone_tail else ""
+        if phone_key:
+            self.by_phone[phone_key].add(org_id)
+        street = normalize_simple_text(customer["address_line1"])
+        if street:
+            self.by_street[street].add(org_id)
+        normalized_name = normalize_name(customer["name"])
+        grams = name_grams(normalized_name)
+        for gram in grams:
+            self.by_gram[gram].add(org_id)
+        inner = inner_grams(normalized_name)
+        for gram in inner:
+            self.by_inner_gram[gram].add(org_id)
+        self.gram_counts[org_id] = len(grams)
+        self.inner_gram_counts[org_id] = len(inner)
+        self._keys[org_id] = (phone_key, street, grams, inner)
+
+    def remove(self, org_id):
+        keys = self._keys.pop(org_id, None)
+        if keys is None:
+            return
+        phone_key, street, grams, inner = keys
+        self.by_phone[phone_key].discard(org_id)
+        self.by_street[street].discard(org_id)
+        for gram in grams:
+            self.by_gram[gram].discard(org_id)
+        for gram in inner:
+            self.by_inner_gram[gram].discard(org_id)
+        del self.customers[org_id]
+        del self.gram_counts[org_id]
+        del self.inner_gram_counts[org_id]
+
+    def __len__(self):
+        return len(self.customers)
+
+    def name_candidates(self, normalized_name, limit=DUPLICATE_CANDIDATE_LIMIT):
+        """Org IDs whose names share enough trigrams with the name, best first."""
+        grams = name_grams(normalized_name)
+        if not grams:
+            return []
+        shared = Counter()
+        for gram in grams:
+            shared.update(self.by_gram.get(gram, ()))
+
+        # Containment ("Acme" in "The Acme Trailer Co") can score a low Dice.
+        # Names under 4 characters never count as contained (see _names_contain).
+        inner = inner_grams(normalized_name)
+        contains_target = Counter()
+        if len(inner) >= 2:
+            for gram in inner:
+                contains_target.update(self.by_gram.get(gram, ()))
+        contained_in_target = Counter()
+        for gram in grams:
+            contained_in_target.update(self.by_inner_gram.get(gram, ()))
+
+        ranked = []
+        for org_id, count in shared.items():
+            dice = 2 * count / (len(grams) + self.gram_counts[org_id])
+            inner_count = self.inner_gram_counts[org_id]
+            contained = (
+                contains_target[org_id] == len(inner) >= 2
+                or contained_in_target[org_id] == inner_count >= 2
+            )
+            if dice >= _NAME_BLOCK_MIN_DICE or contained:
+                ranked.append((contained, dice, org_id))
+        ranked.sort(reverse=True)
+        return [org_id for _contained, _dice, org_id in ranked[:limit]]
+
+    def candidates(self, *, normalized_name="", phone_tail="", street="", limit=DUPLICATE_CANDIDATE_LIMIT):
+        """Customer dicts sharing a phone, street or name block with the target."""
+        org_ids = set()
+        if phone_tail:
+            org_ids |= self.by_phone.get(phone_tail[-7:], set())
+        if street:
+            org_ids |= self.by_street.get(street, set())
+        org_ids.update(self.name_candidates(normalized_name, limit))
+        return [self.customers[org_id] for org_id in org_ids]
+
+
+def _index_version():
+    from django.db.models import Count, Max
+
+    from rental_scheduler.models import ClassicCustomer
+
+    stats = ClassicCustomer.objects.aggregate(count=Count("pk"), synced=Max("synced_at"))
+    return stats["count"], stats["synced"]
+
+
+def _indexed_customers(queryset):
+    return queryset.values(
+        "org_id", "name", "phone", "contact", "email",
+        "address_line1", "address_line2", "city", "state", "zip",
+    )
+
+
+def get_blocking_index():
+    """
+    The blocking index for the current customer index.
+
+    Rows synced since the last check are applied in place; a full rebuild only
+    happens on first use and after customers were removed from the index.
+    """
+    global _index
+
+    from rental_scheduler.models import ClassicCustomer
+
+    count, synced = _index_version()
+    with _index_lock:
+        if _index is not None and _index[0] != (count, synced) and _index[0][1] and synced:
+            index = _index[1]
+            for customer in _indexed_customers(ClassicCustomer.objects.filter(synced_at__gt=_index[0][1])):
+                index.add(customer)
+            if len(index) == count:
+                _index = ((count, synced), index)
+        if _index is None or _index[0] != (count, synced):
+            _index = ((count, synced), CustomerBlockingIndex(_indexed_customers(ClassicCustomer.objects.all())))
+        return _index[1]
+
+
+def reset_blocking_index():
+    global _index
+
+    with _index_lock:
+        _index = None
+
+
+def score_duplicates(target: dict, candidates) -> list[dict]:
+    """
+    Score candidate customers against a new customer payload.
+
+    Args:
+        target: Customer payload (name, phone, address_line1, city, state, zip)
+        candidates: Customer dicts (``ClassicCustomer.as_customer_dict`` shape)
+
+    Returns:
+        Up to DUPLICATE_MAX_RESULTS matches, best first, each with
+        ``match_reasons``, ``name_score`` and ``score``
+    """
+    normalized_name = normalize_name(target.get("name") or "")
+    target_phone_digits = normalize_phone_tail(target.get("phone") or "")
+    target_address = {
+        "address_line1": target.get("address_line1") or "",
+        "city": target.get("city") or "",
+        "state": target.get("state") or "",
+        "zip": target.get("zip") or "",
+    }
+    # Target first, as before, so reported scores are unchanged
+    matcher = difflib.SequenceMatcher(None, normalized_name, "")
+
+    results: list[dict] = []
+    for candidate in candidates:
+        reasons: list[str] = []
+        org_phone_digits = normalize_phone_tail(candidate["phone"])
+        if target_phone_digits and org_phone_digits and phone_matches(target_phone_digits, org_phone_digits):
+            reasons.append("phone")
+
+        org_name_norm = normalize_name(candidate["name"])
+        name_score = None
+        if normalized_name and org_name_norm:
+            matcher.set_seq2(org_name_norm)
+            if _names_contain(normalized_name, org_name_norm):
+                reasons.append("name")
+            elif matcher.quick_ratio() >= DUPLICATE_NAME_THRESHOLD:
+                name_score = matcher.ratio()
+                if name_score >= DUPLICATE_NAME_THRESHOLD:
+                    reasons.append("name")
+
+        if address_matches(target_address, candidate):
+            reasons.append("address")
+
+        if not reasons:
+            continue
+
+        if name_score is None:
+            name_score = matcher.ratio() if normalized_name and org_name_norm else 0.0
+
+        score = 0.0
+        if "phone" in reasons:
+            score += 1.2
+        if "address" in reasons:
+            score += 0.9
+        if "name" in reasons:
+            score += 0.5 + (name_score * 0.5)
+
+        results.append(
+            {
+                "org_id": candidate["org_id"],
+                "name": candidate["name"],
+                "phone": candidate["phone"],
+                "contact": candidate["contact"],
+                "email": candidate["email"],
+                "address_line1": candidate.get("address_line1", ""),
+                "address_line2": candidate.get("address_line2", ""),
+                "city": candidate.get("city", ""),
+                "state": candidate.get("state", ""),
+                "zip": candidate.get("zip", ""),
+                "match_reasons": reasons,
+                "name_score": round(name_score, 3) if name_score else 0.0,
+                "score": round(score, 3),
+            }
+        )
+
+    results.sort(key=lambda item: (item.get("score", 0), item.get("name", "")), reverse=True)
+    return results[:DUPLICATE_MAX_RESULTS]
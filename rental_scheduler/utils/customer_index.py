@@ -0,0 +1,355 @@
+"""
+Local search index of Classic Accounting customers.
+
+Customer typeahead and duplicate detection used to query the remote Classic
+``org``/``org_address`` tables on every keystroke. ``ClassicCustomer`` mirrors
+each customer (``CUST`` org) with its best BILLTO address plus normalized
+search columns, so both are served from the local database.
+
+The mirror is refreshed incrementally:
+
+- Classic org IDs are compared with the mirrored ones, so new customers are
+  added and removed ones deleted on every run.
+- Customers whose org or BILLTO address ``moddate``/``createdate`` is at or
+  after the watermark are re-read. The watermark is the newest Classic
+  version read at the start of the last completed sync
+  (``ClassicCustomerIndexState``). It is never taken from mirrored rows, which
+  in-app refreshes and partial syncs also write.
+- ``full=True`` re-reads every customer.
+
+Syncs run from the ``sync_customer_index`` management command or from an
+in-process thread (``CUSTOMER_INDEX_SYNC_INTERVAL``, started by serve.py).
+Customers created or edited through this app are refreshed right away. Until
+a sync has run to completion (``ClassicCustomerIndexState``), callers fall
+back to querying Classic.
+"""
+
+import logging
+import re
+import threading
+import time
+
+from django.conf import settings
+from django.db import close_old_connections, models
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from accounting_integration.router import accounting_is_configured
+from rental_scheduler.constants import CUSTOMER_INDEX_SYNC_BATCH
+
+logger = logging.getLogger(__name__)
+
+_sync_lock = threading.Lock()
+_sync_thread = None
+
+SEARCH_RESULT_LIMIT = 20
+
+_MIRRORED_FIELDS = (
+    "name", "phone", "contact", "email", "taxable",
+    "address_line1", "address_line2", "city", "state", "zip",
+    "name_normalized", "phone_digits", "zip_digits", "street_normalized",
+    "search_text", "classic_version", "synced_at",
+)
+
+
+# =============================================================================
+# Normalization (shared with duplicate detection)
+# =============================================================================
+
+def normalize_simple_text(value: str) -> str:
+    text = (value or "").strip().lower()
+    if not text:
+        return ""
+    text = re.sub(r"[^a-z0-9]+", " ", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def strip_classic_name_suffix(value: str) -> str:
+    if not value:
+        return ""
+    value = str(value).strip()
+    value = re.sub(r"\s*\(\d+\)\s*$", "", value)
+    value = re.sub(r"\s*#\d+\s*$", "", value)
+    return value.strip()
+
+
+def normalize_name(value: str) -> str:
+    return normalize_simple_text(strip_classic_name_suffix(value))
+
+
+def normalize_phone_digits(value: str) -> str:
+    return re.sub(r"\D", "", value or "")
+
+
+def normalize_phone_tail(value: str) -> str:
+    digits = normalize_phone_digits(value)
+    if not digits:
+        return ""
+    if len(digits) == 11 and digits.startswith("1"):
+        digits = digits[1:]
+    if len(digits) > 10:
+        digits = digits[-10:]
+    if len(digits) < 7:
+        return ""
+    return digits
+
+
+def normalize_zip(value: str) -> str:
+    return re.sub(r"\D", "", value or "")
+
+
+def search_text(*values) -> str:
+    """Lowercased fields joined by newlines, so one match never spans two fields."""
+    return "\n".join((value or "").lower() for value in values)
+
+
+# =============================================================================
+# Sync
+# =============================================================================
+
+def customer_index_ready() -> bool:
+    """True once a sync has run to completion (a partial first sync is not enough)."""
+    from rental_scheduler.models import ClassicCustomerIndexState
+
+    return ClassicCustomerIndexState.objects.filter(pk=1, completed_at__isnull=False).exists()
+
+
+def _mirror_row(snapshot, version, now):
+    from rental_scheduler.models import ClassicCustomer
+
+    return ClassicCustomer(
+        org_id=snapshot.org_id,
+        name=snapshot.name,
+        phone=snapshot.phone,
+        contact=snapshot.contact,
+        email=snapshot.email,
+        taxable=snapshot.taxable,
+        address_line1=snapshot.address_line1,
+        address_line2=snapshot.address_line2,
+        city=snapshot.city,
+        state=snapshot.state,
+        zip=snapshot.zip,
+        name_normalized=normalize_name(snapshot.name)[:60],
+        phone_digits=normalize_phone_digits(snapshot.phone)[:45],
+        zip_digits=normalize_zip(snapshot.zip)[:45],
+        street_normalized=normalize_simple_text(snapshot.address_line1)[:60],
+        search_text=search_text(snapshot.name, snapshot.contact, snapshot.email, snapshot.phone),
+        classic_version=version,
+        synced_at=now,
+    )
+
+
+def _versions(org_ids, using):
+    """{org_id: newest moddate/createdate over the org and its BILLTO addresses}."""
+    from accounting_integration.models import Org, OrgAddress
+
+    versions = dict(
+        Org.objects.using(using)
+        .filter(org_id__in=org_ids)
+        .values_list("org_id", Coalesce("moddate", "createdate"))
+    )
+    addresses = (
+        OrgAddress.objects.using(using)
+        .filter(orgid_id__in=org_ids, addresstype="BILLTO")
+        .values("orgid_id")
+        .annotate(version=models.Max(Coalesce("moddate", "createdate")))
+    )
+    for row in addresses:
+        current = versions.get(row["orgid_id"])
+        if row["version"] is not None and (current is None or row["version"] > current):
+            versions[row["orgid_id"]] = row["version"]
+    return versions
+
+
+def _upsert(org_ids, using):
+    """Re-read customers from Classic and write them to the index; returns the count."""
+    from accounting_integration.services.customer_snapshot import load_customer_snapshots
+    from rental_scheduler.models import ClassicCustomer
+
+    written = 0
+    org_ids = sorted(org_ids)
+    for start in range(0, len(org_ids), CUSTOMER_INDEX_SYNC_BATCH):
+        chunk = org_ids[start:start + CUSTOMER_INDEX_SYNC_BATCH]
+        snapshots = load_customer_snapshots(chunk, using)
+        versions = _versions(chunk, using)
+        now = timezone.now()
+        rows = [_mirror_row(snapshot, versions.get(org_id), now) for org_id, snapshot in snapshots.items()]
+        ClassicCustomer.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=["org_id"],
+            update_fields=list(_MIRRORED_FIELDS),
+        )
+        ClassicCustomer.objects.filter(org_id__in=set(chunk) - snapshots.keys()).delete()
+        written += len(rows)
+    return written
+
+
+def _classic_watermark(using):
+    """Newest moddate/createdate over Classic customers and BILLTO addresses."""
+    from accounting_integration.models import Org, OrgAddress
+
+    versions = [
+        Org.objects.using(using).filter(orgdiscriminator="CUST")
+        .aggregate(version=models.Max(Coalesce("moddate", "createdate")))["version"],
+        OrgAddress.objects.using(using).filter(addresstype="BILLTO")
+        .aggregate(version=models.Max(Coalesce("moddate", "createdate")))["version"],
+    ]
+    return max((version for version in versions if version), default=None)
+
+
+def _changed_since(watermark, org_ids, using):
+    from accounting_integration.models import Org, OrgAddress
+
+    changed = set(
+        Org.objects.using(using)
+        .filter(orgdiscriminator="CUST")
+        .filter(models.Q(moddate__gte=watermark) | models.Q(createdate__gte=watermark))
+        .values_list("org_id", flat=True)
+    )
+    changed.update(
+        OrgAddress.objects.using(using)
+        .filter(addresstype="BILLTO")
+        .filter(models.Q(moddate__gte=watermark) | models.Q(createdate__gte=watermark))
+        .values_list("orgid_id", flat=True)
+    )
+    return changed & org_ids
+
+
+def sync_customer_index(*, full=False, using="accounting"):
+    """
+    Bring the local customer index up to date with Classic.
+
+    Args:
+        full: Re-read every customer instead of only changed ones
+
+    Returns:
+        Dict with customers (in Classic), updated and deleted counts
+    """
+    from accounting_integration.models import Org
+    from rental_scheduler.models import ClassicCustomer, ClassicCustomerIndexState
+
+    state = ClassicCustomerIndexState.objects.filter(pk=1).first()
+    watermark = state.classic_watermark if state else None
+    # Read before any customer is: changes made during this sync are at or past it
+    next_watermark = _classic_watermark(using)
+
+    classic_ids = set(
+        Org.objects.using(using).filter(orgdiscriminator="CUST").values_list("org_id", flat=True)
+    )
+    mirrored = set(ClassicCustomer.objects.values_list("org_id", flat=True))
+
+    removed = mirrored - classic_ids
+    if removed:
+        ClassicCustomer.objects.filter(org_id__in=removed).delete()
+
+    if full or watermark is None:
+        changed = classic_ids
+    else:
+        changed = (classic_ids - mirrored) | _changed_since(watermark, classic_ids, using)
+
+    updated = _upsert(changed, using) if changed else 0
+    ClassicCustomerIndexState.objects.update_or_create(
+        pk=1,
+        defaults={
+            "completed_at": timezone.now(),
+            "customers": len(classic_ids),
+            "classic_watermark": next_watermark,
+        },
+    )
+    stats = {"customers": len(classic_ids), "updated": updated, "deleted": len(removed)}
+    logger.info(
+        f"Customer index sync: {stats['customers']} customers, "
+        f"{stats['updated']} updated, {stats['deleted']} deleted"
+    )
+    return stats
+
+
+def refresh_customer_index(*org_ids, using="accounting"):
+    """Re-read specific customers after an edit made through this app."""
+    if not org_ids or not customer_index_ready():
+        return
+    try:
+        _upsert({int(org_id) for org_id in org_ids}, using)
+    except Exception:
+        # The next sync picks the change up
+        logger.exception(f"Customer index refresh failed for {org_ids}")
+
+
+def _sync_loop(interval):
+    while True:
+        close_old_connections()
+        try:
+            if accounting_is_configured():
+                sync_customer_index()
+        except Exception:
+            logger.exception("Customer index sync failed")
+        finally:
+            close_old_connections()
+        time.sleep(interval)
+
+
+def start_customer_index_sync(interval=None):
+    """
+    Start the in-process customer index sync thread (idempotent).
+
+    Args:
+        interval: Seconds between syncs (defaults to
+            settings.CUSTOMER_INDEX_SYNC_INTERVAL; 0 disables)
+
+    Returns:
+        The running thread, or None when disabled
+    """
+    global _sync_thread
+
+    if interval is None:
+        interval = getattr(settings, 'CUSTOMER_INDEX_SYNC_INTERVAL', 0)
+    if not interval or interval <= 0:
+        return None
+
+    with _sync_lock:
+        if _sync_thread is None or not _sync_thread.is_alive():
+            _sync_thread = threading.Thread(
+                target=_sync_loop,
+                args=(interval,),
+                name='customer-index-sync',
+                daemon=True,
+            )
+            _sync_thread.start()
+            logger.info(f"Started customer index sync (every {interval}s)")
+    return _sync_thread
+
+
+# =============================================================================
+# Queries
+# =============================================================================
+
+def search_customer_index(q, limit=SEARCH_RESULT_LIMIT):
+    """
+    Typeahead search: name, contact, email or phone contains ``q``.
+
+    Phone matching also ignores punctuation ("6155551" finds 615-555-1234).
+    Results have the same shape as the Classic customer search.
+    """
+    from rental_scheduler.models import ClassicCustomer
+
+    qs = ClassicCustomer.objects.all()
+    q = (q or "").strip()
+    if q:
+        match = models.Q(search_text__contains=q.lower())
+        digits = normalize_phone_digits(q)
+        if len(digits) >= 3:
+            match |= models.Q(phone_digits__contains=digits)
+        qs = qs.filter(match)
+
+    return [
+        {
+            "org_id": customer.org_id,
+            "name": customer.name,
+            "phone": customer.phone,
+            "contact": customer.contact,
+            "email": customer.email,
+            "taxable": customer.taxable,
+        }
+        for customer in qs.order_by("name")[:limit]
+    ]
@@ -0,0 +1,349 @@
+"""
+Rolling materialization horizon for "forever" recurring series.
+
+Forever series are normally expanded virtually on every request (see
+``generate_occurrences_for_parents``). The horizon maintainer keeps the next
+``RECURRENCE_HORIZON_WEEKS`` of every forever series stored as real Job rows,
+so typical calendar views are plain index reads and virtual generation is only
+needed beyond the horizon.
+
+Each parent records its covered window in ``recurrence_materialized_from`` /
+``recurrence_materialized_until``. Inside that window every occurrence exists
+as a row (horizon-created, user-materialized, or soft-deleted). Rows created
+by the maintainer carry ``recurrence_auto_materialized=True`` until they are
+first saved through the ORM, so user edits are never trimmed.
+"""
+
+import logging
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from rental_scheduler.constants import FOREVER_HORIZON_WEEKS
+from rental_scheduler.utils.events import get_call_reminder_sunday
+from rental_scheduler.utils.recurrence import (
+    RecurrenceGenerator,
+    generate_occurrences_for_parents,
+    is_forever_series,
+)
+
+logger = logging.getLogger(__name__)
+
+_scheduler_lock = threading.Lock()
+_scheduler_thread = None
+
+
+def get_horizon_weeks():
+    """Configured horizon length in weeks."""
+    return getattr(settings, 'RECURRENCE_HORIZON_WEEKS', FOREVER_HORIZON_WEEKS)
+
+
+def _start_of_day(day):
+    return timezone.make_aware(datetime.combine(day, datetime.min.time()))
+
+
+def uncovered_windows(parent, window_start, window_end):
+    """
+    Split a date window into the parts not covered by the parent's horizon.
+
+    Args:
+        parent: Forever-series parent Job
+        window_start: First date of the requested window
+        window_end: Last date of the requested window
+
+    Returns:
+        List of (start_date, end_date) tuples that still need virtual generation
+    """
+    if window_start > window_end:
+        return []
+
+    covered_from = parent.recurrence_materialized_from
+    covered_until = parent.recurrence_materialized_until
+    if covered_from is None or covered_until is None or covered_until < covered_from:
+        return [(window_start, window_end)]
+
+    windows = []
+    if window_start < covered_from:
+        windows.append((window_start, min(window_end, covered_from - timedelta(days=1))))
+    if window_end > covered_until:
+        windows.append((max(window_start, covered_until + timedelta(days=1)), window_end))
+    return windows
+
+
+def generate_uncovered_occurrences_for_parents(parents, window_start, window_end, safety_cap=100):
+    """
+    Generate virtual occurrences only for the parts of a window outside each horizon.
+
+    Inside the horizon every occurrence is already a Job row, so fully covered
+    parents are skipped. Parents are grouped by their uncovered sub-windows (series maintained by the
+    same horizon run share them), and each group is expanded in one
+    ``generate_occurrences_for_parents`` pass.
+
+    Returns:
+        Dict mapping parent id -> list of occurrence dicts
+    """
+    parents_by_windows = defaultdict(list)
+    for parent in parents:
+        windows = tuple(uncovered_windows(parent, window_start, window_end))
+        if windows:
+            parents_by_windows[windows].append(parent)
+
+    occurrences_by_parent = defaultdict(list)
+    for windows, group in parents_by_windows.items():
+        for start, end in windows:
+            batch = generate_occurrences_for_parents(group, start, end, safety_cap=safety_cap)
+            for parent_id, occurrences in batch.items():
+                occurrences_by_parent[parent_id].extend(occurrences)
+    return occurrences_by_parent
+
+
+def release_series_horizon(parent):
+    """
+    Drop a parent's horizon after the parent itself changed.
+
+    Untouched horizon instances are copies of the parent, so they are removed
+    and the series falls back to virtual generation until the next maintainer
+    run re-materializes it. User-edited and soft-deleted rows are kept.
+
+    Returns:
+        Number of instances removed
+    """
+    from rental_scheduler.models import Job
+
+    with transaction.atomic():
+        _, deleted_by_model = Job.objects.filter(
+            recurrence_parent_id=parent.pk,
+            recurrence_auto_materialized=True,
+            is_deleted=False,
+            status='uncompleted',
+        ).delete()
+        deleted = deleted_by_model.get(Job._meta.label, 0)
+        Job.objects.filter(pk=parent.pk).update(
+            recurrence_materialized_from=None,
+            recurrence_materialized_until=None,
+        )
+
+    parent.recurrence_materialized_from = None
+    parent.recurrence_materialized_until = None
+    if deleted:
+        logger.info(f"Released recurrence horizon for parent {parent.pk} ({deleted} rows removed)")
+    return deleted
+
+
+def maintain_recurrence_horizon(weeks=None, today=None, dry_run=False):
+    """
+    Keep the next ``weeks`` of every forever series materialized.
+
+    Untouched horizon rows that fell behind today, or lie beyond the horizon
+    end, are trimmed; missing occurrences up to the horizon end are
+    bulk-inserted along with their call reminders.
+
+    Args:
+        weeks: Horizon length (defaults to settings.RECURRENCE_HORIZON_WEEKS)
+        today: Reference date (defaults to the local date)
+        dry_run: Count the work without writing anything
+
+    Returns:
+        Dict with 'series', 'created', 'trimmed' and 'horizon_end'
+    """
+    from rental_scheduler.models import Job, CallReminder, invalidate_calendar_events_cache
+
+    weeks = get_horizon_weeks() if weeks is None else weeks
+    today = today or timezone.localdate()
+    horizon_end = today + timedelta(weeks=weeks)
+    window_start_dt = _start_of_day(today)
+    window_end_dt = _start_of_day(horizon_end + timedelta(days=1))
+
+    parents = [
+        parent for parent in Job.objects.select_related('calendar').filter(
+            is_deleted=False,
+            recurrence_parent__isnull=True,
+            recurrence_rule__isnull=False,
+        ).exclude(status='canceled')
+        if is_forever_series(parent)
+    ]
+    parent_ids = [parent.pk for parent in parents]
+    stats = {'series': len(parents), 'created': 0, 'trimmed': 0, 'horizon_end': horizon_end}
+    if not parents:
+        return stats
+
+    stale = Job.objects.filter(
+        recurrence_parent_id__in=parent_ids,
+        recurrence_auto_materialized=True,
+        is_deleted=False,
+        status='uncompleted',
+    ).filter(
+        Q(recurrence_original_start__lt=window_start_dt) |
+        Q(recurrence_original_start__gte=window_end_dt)
+    )
+
+    # One query for every stored start in the window (including soft-deleted rows)
+    existing_starts = set(
+        Job.objects.filter(
+            recurrence_parent_id__in=parent_ids,
+            recurrence_original_start__gte=window_start_dt,
+            recurrence_original_start__lt=window_end_dt,
+        ).values_list('recurrence_parent_id', 'recurrence_original_start')
+    )
+
+    if dry_run:
+        stats['trimmed'] = stale.count()
+    else:
+        _, deleted_by_model = stale.delete()
+        stats['trimmed'] = deleted_by_model.get(Job._meta.label, 0)
+
+    # Series extend from the end of their current coverage (or today); those
+    # sharing a fill start are expanded together
+    parents_by_fill_start = defaultdict(list)
+    for parent in parents:
+        covered_until = parent.recurrence_materialized_until
+        if (
+            parent.recurrence_materialized_from is not None
+            and covered_until is not None
+            and covered_until >= today - timedelta(days=1)
+        ):
+            parents_by_fill_start[covered_until + timedelta(days=1)].append(parent)
+        else:
+            parents_by_fill_start[today].append(parent)
+
+    occurrences_by_parent = {}
+    for fill_start, group in parents_by_fill_start.items():
+        if fill_start <= horizon_end:
+            occurrences_by_parent.update(generate_occurrences_for_parents(
+                group,
+                fill_start,
+                horizon_end,
+                safety_cap=weeks * 7 + 7,
+            ))
+
+    for parent in parents:
+        instances = []
+        generator = RecurrenceGenerator(parent)
+        for occ in occurrences_by_parent.get(parent.pk, []):
+            if occ.get('is_parent') or (parent.pk, occ['start_dt']) in existing_starts:
+                continue
+            instance = generator._create_instance(
+                occ['start_dt'], occ['end_dt'], occ['occurrence_number']
+            )
+            instance.recurrence_auto_materialized = True
+            instances.append(instance)
+
+        stats['created'] += len(instances)
+        if dry_run:
+            continue
+        if not instances and (
+            parent.recurrence_materialized_from == today
+            and parent.recurrence_materialized_until == horizon_end
+        ):
+            continue
+
+        with transaction.atomic():
+            # Lock the parent and make sure it was not edited since it was read;
+            # an edit releases the horizon and must not be overwritten here.
+            unchanged = Job.objects.select_for_update().filter(
+                pk=parent.pk,
+                updated_at=parent.updated_at,
+            ).exists()
+            if not unchanged:
+                stats['created'] -= len(instances)
+                continue
+
+            # The snapshot above predates the lock: re-read this series' starts,
+            # since materialize_occurrence may have stored some of them since.
+            starts = [instance.recurrence_original_start for instance in instances]
+            stored = set(
+                Job.objects.filter(
+                    recurrence_parent_id=parent.pk,
+                    recurrence_original_start__in=starts,
+                ).values_list('recurrence_original_start', flat=True)
+            )
+            instances = [instance for instance in instances if instance.recurrence_original_start not in stored]
+            Job.objects.bulk_create(instances, batch_size=500, ignore_conflicts=True)
+            # ignore_conflicts leaves pks unset, so re-select the inserted rows
+            created = list(
+                Job.objects.select_related('calendar').filter(
+                    recurrence_parent_id=parent.pk,
+                    recurrence_auto_materialized=True,
+                    recurrence_original_start__in=[instance.recurrence_original_start for instance in instances],
+                )
+            )
+            stats['created'] -= len(starts) - len(created)
+            reminders = [
+                CallReminder(
+                    job=instance,
+                    calendar=instance.calendar,
+                    reminder_date=get_call_reminder_sunday(
+                        instance.start_dt,
+                        instance.call_reminder_weeks_prior,
+                    ).date(),
+                    notes='',
+                    completed=False,
+                )
+                for instance in created
+                if instance.has_call_reminder and instance.call_reminder_weeks_prior
+            ]
+            if reminders:
+                CallReminder.objects.bulk_create(reminders, batch_size=500)
+            Job.objects.filter(pk=parent.pk).update(
+                recurrence_materialized_from=today,
+                recurrence_materialized_until=horizon_end,
+            )
+
+    if not dry_run and (stats['created'] or stats['trimmed']):
+        # bulk_create bypasses the post_save signal, so bump the feed cache once
+        invalidate_calendar_events_cache()
+
+    logger.info(
+        f"Recurrence horizon to {horizon_end}: {stats['series']} series, "
+        f"{stats['created']} created, {stats['trimmed']} trimmed"
+    )
+    return stats
+
+
+def _scheduler_loop(interval):
+    while True:
+        close_old_connections()
+        try:
+            maintain_recurrence_horizon()
+        except Exception:
+            logger.exception("Recurrence horizon maintenance failed")
+        finally:
+            close_old_connections()
+        time.sleep(interval)
+
+
+def start_horizon_scheduler(interval=None):
+    """
+    Start the in-process horizon maintainer thread (idempotent).
+
+    Args:
+        interval: Seconds between runs (defaults to
+            settings.RECURRENCE_HORIZON_SCHEDULER_INTERVAL; 0 disables)
+
+    Returns:
+        The running thread, or None when disabled
+    """
+    global _scheduler_thread
+
+    if interval is None:
+        interval = getattr(settings, 'RECURRENCE_HORIZON_SCHEDULER_INTERVAL', 0)
+    if not interval or interval <= 0:
+        return None
+
+    with _scheduler_lock:
+        if _scheduler_thread is None or not _scheduler_thread.is_alive():
+            _scheduler_thread = threading.Thread(
+                target=_scheduler_loop,
+                args=(interval,),
+                name='recurrence-horizon',
+                daemon=True,
+            )
+            _scheduler_thread.start()
+            logger.info(f"Started recurrence horizon scheduler (every {interval}s)")
+    return _scheduler_thread
@@ -0,0 +1,226 @@
+"""
+iCalendar (.ics) feed export for one calendar.
+
+The feed mirrors what the calendar page shows:
+
+- Standalone jobs and the materialized rows of finite series are one VEVENT each.
+- Forever series are one VEVENT with an RRULE, never expanded. Deleted or
+  canceled occurrences become EXDATEs. Materialized occurrences that were
+  edited (moved or changed) are emitted as RECURRENCE-ID overrides; untouched
+  ones are left to the RRULE.
+
+Output is produced one VEVENT at a time from a chunked queryset iterator, so a
+feed of any size is streamed in constant memory.
+"""
+
+from datetime import date, datetime, time as dt_time, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from icalendar import Calendar as ICalendar, Event, Timezone, vRecur
+
+from rental_scheduler.constants import MAX_VALID_YEAR, MIN_VALID_YEAR
+from rental_scheduler.utils.phone import format_phone
+from rental_scheduler.utils.recurrence import is_forever_series
+
+FEED_CHUNK_SIZE = 2000
+"""Rows fetched per round trip while streaming a feed."""
+
+PRODID = '-//GTS Shop Scheduler//Calendar Feed//EN'
+
+FEED_FIELDS = (
+    'id', 'recurrence_parent_id', 'recurrence_original_start', 'recurrence_rule', 'end_recurrence_date',
+    'business_name', 'contact_name', 'phone',
+    'address_line1', 'address_line2', 'city', 'state', 'postal_code',
+    'start_dt', 'end_dt', 'all_day', 'status', 'is_deleted',
+    'trailer_color', 'trailer_serial', 'trailer_details', 'notes',
+    'created_at', 'updated_at',
+)
+
+# Fields an override must differ in (besides its times) to be emitted
+_CONTENT_FIELDS = (
+    'business_name', 'contact_name', 'phone',
+    'address_line1', 'address_line2', 'city', 'state', 'postal_code',
+    'all_day', 'trailer_color', 'trailer_serial', 'trailer_details', 'notes',
+)
+
+_WEEKDAYS = ('MO', 'TU', 'WE', 'TH', 'FR', 'SA', 'SU')
+_FREQUENCIES = {'daily': 'DAILY', 'weekly': 'WEEKLY', 'monthly': 'MONTHLY', 'yearly': 'YEARLY'}
+
+
+def _uid(job_id, host):
+    return f"job-{job_id}@{host}"
+
+
+def _title(row):
+    business_name = row['business_name'] or ''
+    contact_name = row['contact_name'] or ''
+    if business_name and contact_name:
+        title = f"{business_name} ({contact_name})"
+    else:
+        title = business_name or contact_name or 'No Name Provided'
+    if row['phone']:
+        title += f" - {format_phone(row['phone'])}"
+    return title
+
+
+def _description(row):
+    trailer = ' '.join(part for part in (row['trailer_color'], row['trailer_serial']) if part)
+    lines = [
+        f"Contact: {row['contact_name']}" if row['contact_name'] else '',
+        f"Phone: {format_phone(row['phone'])}" if row['phone'] else '',
+        f"Trailer: {trailer}" if trailer else '',
+        row['trailer_details'] or '',
+        row['notes'] or '',
+    ]
+    return '\n'.join(line for line in lines if line)
+
+
+def _location(row):
+    city_line = ' '.join(part for part in (row['city'], row['state'], row['postal_code']) if part)
+    parts = (row['address_line1'], row['address_line2'], city_line)
+    return ', '.join(part for part in parts if part)
+
+
+def build_rrule(row):
+    """
+    RRULE for a forever series row.
+
+    Monthly rules repeat on the parent's nth weekday and yearly rules on its
+    ISO week and weekday, like ``_series_starts``. A 5th weekday (or ISO week
+    53) is written as the last one of the period; the app settles on the
+    4th (or week 52) instead, so those months can differ by a week.
+    """
+    rule = row['recurrence_rule']
+    start = timezone.localtime(row['start_dt'])
+    recur = {'FREQ': _FREQUENCIES[rule['type']], 'INTERVAL': rule.get('interval') or 1}
+    weekday = _WEEKDAYS[start.weekday()]
+
+    if rule['type'] == 'monthly':
+        occurrence = (start.day - 1) // 7 + 1
+        recur['BYDAY'] = f"{-1 if occurrence == 5 else occurrence}{weekday}"
+    elif rule['type'] == 'yearly':
+        iso_week = start.isocalendar()[1]
+        recur['BYWEEKNO'] = -1 if iso_week == 53 else iso_week
+        recur['BYDAY'] = weekday
+
+    if row['end_recurrence_date']:
+        if row['all_day']:
+            recur['UNTIL'] = row['end_recurrence_date']
+        else:
+            # UNTIL must be UTC when DTSTART carries a TZID
+            local_end = timezone.make_aware(datetime.combine(row['end_recurrence_date'], dt_time.max))
+            recur['UNTIL'] = local_end.astimezone(dt_timezone.utc).replace(microsecond=0)
+    return vRecur(recur)
+
+
+def _add_times(event, name, value, all_day, *, is_end=False):
+    local = timezone.localtime(value)
+    if all_day:
+        # All-day DTEND is exclusive: the day after the last day
+        event.add(name, local.date() + timedelta(days=1) if is_end else local.date())
+    else:
+        event.add(name, local)
+
+
+def build_event(row, host, *, uid=None, recurrence_id=None, rrule=None, exdates=()):
+    """Build one VEVENT for a job row (a dict with FEED_FIELDS)."""
+    event = Event()
+    event.add('uid', uid or _uid(row['id'], host))
+    event.add('dtstamp', row['updated_at'])
+    event.add('created', row['created_at'])
+    event.add('last-modified', row['updated_at'])
+    event.add('summary', _title(row))
+    _add_times(event, 'dtstart', row['start_dt'], row['all_day'])
+    _add_times(event, 'dtend', row['end_dt'], row['all_day'], is_end=True)
+    if recurrence_id is not None:
+        _add_times(event, 'recurrence-id', recurrence_id, row['all_day'])
+    if rrule is not None:
+        event.add('rrule', rrule)
+    for exdate in exdates:
+        _add_times(event, 'exdate', exdate, row['all_day'])
+    description = _description(row)
+    if description:
+        event.add('description', description)
+    location = _location(row)
+    if location:
+        event.add('location', location)
+    return event
+
+
+def _is_edited(instance, parent):
+    """Whether a materialized occurrence differs from what the RRULE produces."""
+    if instance['start_dt'] != instance['recurrence_original_start']:
+        return True
+    if instance['end_dt'] - instance['start_dt'] != parent['end_dt'] - parent['start_dt']:
+        return True
+    return any(instance[field] != parent[field] for field in _CONTENT_FIELDS)
+
+
+def iter_calendar_feed(calendar, host, chunk_size=FEED_CHUNK_SIZE):
+    """
+    Yield the .ics document for a calendar as byte chunks.
+
+    Args:
+        calendar: Calendar to export
+        host: Domain used in event UIDs (keeps UIDs stable per server)
+        chunk_size: Rows fetched per database round trip
+    """
+    from rental_scheduler.models import Job
+
+    jobs = Job.objects.filter(calendar=calendar)
+
+    # Forever series: few rows, loaded up front so their instances can be matched
+    forever_ids = [
+        parent.pk
+        for parent in jobs.filter(
+            is_deleted=False, recurrence_parent__isnull=True, recurrence_rule__isnull=False,
+        ).exclude(status='canceled').only('id', 'recurrence_rule')
+        if parent.recurrence_rule.get('type') in _FREQUENCIES and is_forever_series(parent)
+    ]
+    forever = {row['id']: row for row in jobs.filter(pk__in=forever_ids).values(*FEED_FIELDS)}
+    exdates = {}
+    removed = jobs.filter(
+        Q(is_deleted=True) | Q(status='canceled'),
+        recurrence_parent_id__in=forever_ids,
+        recurrence_original_start__isnull=False,
+    ).values_list('recurrence_parent_id', 'recurrence_original_start')
+    for parent_id, original_start in removed:
+        exdates.setdefault(parent_id, []).append(original_start)
+
+    header = ICalendar()
+    header.add('prodid', PRODID)
+    header.add('version', '2.0')
+    header.add('calscale', 'GREGORIAN')
+    header.add('method', 'PUBLISH')
+    header.add('x-wr-calname', calendar.name)
+    header.add('x-wr-timezone', settings.TIME_ZONE)
+    # Header lines only: drop the END:VCALENDAR the serializer appends
+    yield header.to_ical()[:-len(b'END:VCALENDAR\r\n')]
+    # Cover every year a job may fall in (the default ends in 2038)
+    yield Timezone.from_tzid(
+        settings.TIME_ZONE, first_date=date(MIN_VALID_YEAR, 1, 1), last_date=date(MAX_VALID_YEAR, 12, 31),
+    ).to_ical()
+
+    rows = (
+        jobs.filter(is_deleted=False).exclude(status='canceled')
+        .order_by('start_dt', 'id').values(*FEED_FIELDS).iterator(chunk_size=chunk_size)
+    )
+    for row in rows:
+        if row['id'] in forever:
+            event = build_event(
+                row, host, rrule=build_rrule(row), exdates=sorted(exdates.get(row['id'], [])),
+            )
+        elif row['recurrence_parent_id'] in forever and row['recurrence_original_start']:
+            parent = forever[row['recurrence_parent_id']]
+            if not _is_edited(row, parent):
+                continue
+            event = build_event(
+                row, host, uid=_uid(parent['id'], host), recurrence_id=row['recurrence_original_start'],
+            )
+        else:
+            event = build_event(row, host)
+        yield event.to_ical()
+
+    yield b'END:VCALENDAR\r\n'
@@ -0,0 +1,501 @@
+"""
+Streaming import pipeline for iCalendar (.ics) files.
+
+Events are read one VEVENT block at a time instead of parsing the whole file
+into memory, converted to unsaved Job rows, validated a batch at a time and
+inserted with ``bulk_create``. Each batch commits in its own transaction and
+bumps the calendar cache once, so multi-thousand-event exports import in
+seconds and a progress callback can report after every batch.
+
+Every imported job stores its source event key (ICS UID) and a content hash.
+In sync (upsert) mode a re-import of the same export skips unchanged events,
+bulk-updates changed ones and inserts only new ones.
+"""
+
+import hashlib
+import json
+import logging
+import re
+from datetime import date, datetime
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+from icalendar import Event, Timezone
+from icalendar.timezone import tzp
+
+from rental_scheduler.constants import IMPORT_BATCH_SIZE
+from rental_scheduler.utils.ai_parser import parse_description_batch
+
+logger = logging.getLogger(__name__)
+
+MAX_ERROR_DETAILS = 20
+"""Number of per-event error messages kept in the import result."""
+
+SYNC_FIELDS = [
+    'business_name', 'phone', 'start_dt', 'end_dt', 'all_day', 'notes',
+    'repair_notes', 'trailer_color', 'trailer_serial', 'trailer_details', 'quote',
+    'date_call_received', 'recurrence_rule', 'status', 'import_content_hash', 'updated_at',
+]
+"""Job columns rewritten when a re-imported event changed at the source."""
+
+def extract_phone_from_text(text):
+    """
+    Extract phone number from text using regex patterns.
+    Handles formats like: 740-501-9004, 231-6407, (330) 265-4243, etc.
+    """
+    if not text:
+        return None
+    
+    # Common phone patterns
+    patterns = [
+        r'\b\d{3}-\d{3}-\d{4}\b',  # 740-501-9004
+        r'\b\d{3}-\d{4}\b',        # 231-6407
+        r'\(\d{3}\)\s*\d{3}-\d{4}', # (330) 265-4243
+        r'\b\d{3}\s+\d{3}-\d{4}\b', # 330 265-4243
+        r'\b\d{10}\b',             # 7405019004
+    ]
+    
+    for pattern in patterns:
+        match = re.search(pattern, text)
+        if match:
+            return match.group(0)
+    
+    return None
+
+
+def parse_ics_datetime(dt_value, is_all_day=False):
+    """
+    Convert iCalendar datetime to timezone-aware datetime.
+    Handles both DATE and DATETIME formats.
+    """
+    if dt_value is None:
+        return None
+    
+    # If it's already a datetime object
+    if isinstance(dt_value, datetime):
+        # Make it timezone-aware if it isn't
+        if timezone.is_naive(dt_value):
+            return timezone.make_aware(dt_value)
+        return dt_value
+    
+    # If it's a date object (all-day event)
+    if isinstance(dt_value, date):
+        # Convert to datetime at midnight
+        dt = datetime.combine(dt_value, datetime.min.time())
+        return timezone.make_aware(dt)
+    
+    return None
+
+
+def convert_rrule_to_json(rrule_str):
+    """
+    Convert iCalendar RRULE string to our JSON format.
+    Example: "FREQ=YEARLY;UNTIL=20280128" -> {"type": "yearly", "interval": 1, "until_date": "2028-01-28"}
+    """
+    if not rrule_str:
+        return None
+    
+    try:
+        # Parse RRULE components
+        parts = {}
+        for part in rrule_str.split(';'):
+            if '=' in part:
+                key, value = part.split('=', 1)
+                parts[key] = value
+        
+        # Extract frequency
+        freq = parts.get('FREQ', '').lower()
+        if freq not in ['yearly', 'monthly', 'weekly', 'daily']:
+            return None
+        
+        # Build JSON rule
+        rule = {
+            'type': freq,
+            'interval': int(parts.get('INTERVAL', 1))
+        }
+        
+        # Add count if present
+        if 'COUNT' in parts:
+            rule['count'] = int(parts['COUNT'])
+        
+        # Add until date if present
+        if 'UNTIL' in parts:
+            until_str = parts['UNTIL']
+            # Parse UNTIL date (format: YYYYMMDD or YYYYMMDDTHHMMSSZ)
+            if 'T' in until_str:
+                until_str = until_str.split('T')[0]
+            # Format as YYYY-MM-DD
+            if len(until_str) >= 8:
+                rule['until_date'] = f"{until_str[:4]}-{until_str[4:6]}-{until_str[6:8]}"
+        
+        return rule
+    
+    except Exception as e:
+        logger.error(f"Error parsing RRULE: {rrule_str}, Error: {str(e)}")
+        return None
+
+
+
+
+class SkippedEvent(Exception):
+    """Raised for events that are skipped rather than counted as errors."""
+
+
+def iter_vevent_blocks(lines):
+    """
+    Yield the raw text of each VEVENT in an .ics stream.
+
+    Only one event is held in memory at a time. VTIMEZONE definitions are
+    registered with icalendar as they are read so events that reference a
+    custom TZID still resolve to an aware datetime (exports list them first).
+
+    Args:
+        lines: Iterable of bytes or str lines (e.g. an uploaded file)
+
+    Yields:
+        bytes: One complete ``BEGIN:VEVENT`` ... ``END:VEVENT`` block
+    """
+    block = None
+    block_name = None
+    for line in lines:
+        if isinstance(line, str):
+            line = line.encode('utf-8')
+        line = line.rstrip(b'\r\n')
+
+        if block is None:
+            upper = line.upper()
+            if upper in (b'BEGIN:VEVENT', b'BEGIN:VTIMEZONE'):
+                block = [line]
+                block_name = upper[6:]
+            continue
+
+        block.append(line)
+        if line.upper() != b'END:' + block_name:
+            continue
+
+        raw = b'\r\n'.join(block) + b'\r\n'
+        block = None
+        if block_name == b'VEVENT':
+            yield raw
+            continue
+        try:
+            component = Timezone.from_ical(raw)
+            if 'TZID' in component:
+                tzp.cache_timezone_component(component)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable VTIMEZONE in import: {e}")
+
+
+def build_job_from_event(component, *, calendar, batch_id, created_by=None):
+    """
+    Convert a parsed VEVENT into an unsaved Job.
+
+    The raw description is kept in ``notes``; AI extraction is applied per
+    batch afterwards by ``apply_parsed_description``.
+
+    The job also records the source event key (``import_source_uid``) and a
+    hash of the source content so a later sync import can match it.
+
+    Raises:
+        SkippedEvent: The event has no usable start/end dates
+    """
+    from rental_scheduler.models import Job
+
+    summary = str(component.get('summary', ''))
+    description = str(component.get('description', ''))
+    dtstart = component.get('dtstart')
+    dtend = component.get('dtend')
+    created = component.get('created')
+    rrule = component.get('rrule')
+    status = component.get('status')
+
+    # Determine job status - map CANCELLED to completed
+    job_status = 'uncompleted'
+    if status and str(status).upper() == 'CANCELLED':
+        job_status = 'completed'
+
+    if not dtstart or not dtend:
+        raise SkippedEvent(f"Event '{summary}' skipped: missing start or end date")
+
+    dtstart_val = dtstart.dt if hasattr(dtstart, 'dt') else dtstart
+    dtend_val = dtend.dt if hasattr(dtend, 'dt') else dtend
+
+    is_all_day = isinstance(dtstart_val, date) and not isinstance(dtstart_val, datetime)
+
+    start_dt = parse_ics_datetime(dtstart_val, is_all_day)
+    end_dt = parse_ics_datetime(dtend_val, is_all_day)
+    if not start_dt or not end_dt:
+        raise SkippedEvent(f"Event '{summary}' skipped: invalid date format")
+
+    # For all-day events, adjust end time
+    if is_all_day:
+        end_dt = end_dt.replace(hour=23, minute=59, second=59)
+
+    # Extract phone from summary and remove it from the business name
+    phone = extract_phone_from_text(summary)
+    business_name = summary
+    if phone:
+        business_name = re.sub(r'\s*' + re.escape(phone) + r'\s*', ' ', business_name).strip()
+
+    date_call_received = None
+    if created:
+        created_val = created.dt if hasattr(created, 'dt') else created
+        date_call_received = parse_ics_datetime(created_val)
+
+    recurrence_rule = None
+    rrule_str = ''
+    if rrule:
+        rrule_str = rrule.to_ical().decode('utf-8')
+        recurrence_rule = convert_rrule_to_json(rrule_str)
+
+    content_hash = hashlib.sha256(json.dumps([
+        summary, description, start_dt.isoformat(), end_dt.isoformat(), is_all_day,
+        date_call_received.isoformat() if date_call_received else None,
+        rrule_str, job_status,
+    ]).encode('utf-8')).hexdigest()
+
+    return Job(
+        calendar=calendar,
+        status=job_status,
+        business_name=business_name[:150] if business_name else '',  # Limit to field max_length
+        phone=phone[:25] if phone else '',
+        start_dt=start_dt,
+        end_dt=end_dt,
+        all_day=is_all_day,
+        notes=description,
+        date_call_received=date_call_received,
+        recurrence_rule=recurrence_rule,
+        import_batch_id=batch_id,
+        import_source_uid=event_source_key(component),
+        import_content_hash=content_hash,
+        created_by=created_by,
+    )
+
+
+def event_source_key(component):
+    """
+    Stable key of a source event: its UID, plus RECURRENCE-ID for an
+    overridden occurrence of a recurring event (which shares the UID).
+
+    Returns:
+        str or None when the event has no UID
+    """
+    uid = str(component.get('uid', '')).strip()
+    if not uid:
+        return None
+    recurrence_id = component.get('recurrence-id')
+    if recurrence_id is not None:
+        value = recurrence_id.dt if hasattr(recurrence_id, 'dt') else recurrence_id
+        uid = f"{uid}#{value.isoformat() if hasattr(value, 'isoformat') else value}"
+    if len(uid) > 255:
+        uid = 'sha256:' + hashlib.sha256(uid.encode('utf-8')).hexdigest()
+    return uid
+
+
+def apply_parsed_description(job, parsed_description):
+    """Copy AI-extracted description fields onto an imported job"""
+    job.notes = parsed_description.get('unparsed_notes', job.notes)
+    job.repair_notes = parsed_description.get('repair_notes', '')
+    job.trailer_color = parsed_description.get('trailer_color', '')[:60]  # Limit to field max_length
+    job.trailer_serial = parsed_description.get('trailer_serial', '')[:120]
+    job.trailer_details = parsed_description.get('trailer_details', '')[:200]
+    job.quote = str(parsed_description.get('quote') or '')[:100]  # Column is NOT NULL
+
+
+def _record_error(result, message):
+    result['errors_count'] += 1
+    if len(result['error_details']) < MAX_ERROR_DETAILS:
+        result['error_details'].append(message)
+
+
+def _match_existing(pending, result, calendar, seen_keys):
+    """
+    Split a batch into inserts and updates against previously imported jobs.
+
+    Events whose source key matches a job in the calendar are skipped when
+    the content hash is unchanged (or the job was deleted in the app);
+    otherwise the new values are applied to the existing row. Duplicate keys
+    within one file are only applied once.
+
+    Returns:
+        (to_insert, to_update) lists of (label, job) pairs
+    """
+    from rental_scheduler.models import Job
+
+    keys = {job.import_source_uid for _, job in pending if job.import_source_uid}
+    existing = {}
+    for row in (
+        Job.objects.filter(calendar=calendar, import_source_uid__in=keys)
+        .order_by('-id')
+        .values('id', 'import_source_uid', 'import_content_hash', 'is_deleted', 'status', 'import_batch_id')
+    ):
+        # The oldest matching job wins if an earlier plain import duplicated it
+        existing[row['import_source_uid']] = row
+
+    to_insert, to_update = [], []
+    for label, job in pending:
+        key = job.import_source_uid
+        if key and key in seen_keys:
+            result['unchanged'] += 1
+            continue
+        if key:
+            seen_keys.add(key)
+
+        row = existing.get(key) if key else None
+        if row is None:
+            to_insert.append((label, job))
+        elif row['is_deleted'] or row['import_content_hash'] == job.import_content_hash:
+            result['unchanged'] += 1
+        else:
+            job.pk = row['id']
+            job.import_batch_id = row['import_batch_id']
+            if job.status == 'uncompleted':
+                # Only a cancellation at the source overrides the status set in the app
+                job.status = row['status']
+            job._previous_status = row['status']
+            to_update.append((label, job))
+    return to_insert, to_update
+
+
+def _apply_updates(jobs):
+    """Bulk-write changed events onto their existing rows."""
+    from rental_scheduler.models import Job, StatusChange
+    from rental_scheduler.utils.horizon import release_series_horizon
+
+    now = timezone.now()
+    for job in jobs:
+        job.updated_at = now
+    Job.objects.bulk_update(jobs, SYNC_FIELDS, batch_size=len(jobs))
+
+    StatusChange.objects.bulk_create([
+        StatusChange(job=job, old_status=job._previous_status, new_status=job.status,
+                     notes='Updated by calendar sync import')
+        for job in jobs
+        if job.status != job._previous_status
+    ])
+
+    # Horizon rows are copies of their parent; drop them when the parent changed
+    for parent in Job.objects.filter(
+        pk__in=[job.pk for job in jobs],
+        recurrence_materialized_until__isnull=False,
+    ):
+        release_series_horizon(parent)
+
+
+def _flush_batch(pending, result, use_ai_parsing, *, calendar=None, upsert=False, seen_keys=None):
+    """Parse, validate and bulk insert (or sync) a batch of (label, job) pairs."""
+    from rental_scheduler.models import Job, invalidate_calendar_events_cache
+
+    to_update = []
+    if upsert:
+        pending, to_update = _match_existing(pending, result, calendar, seen_keys)
+    batch = pending + to_update
+
+    if use_ai_parsing and batch:
+        # One concurrent, cached parse for the whole batch
+        parsed = parse_description_batch([job.notes for _, job in batch])
+        for (_, job), parsed_description in zip(batch, parsed):
+            apply_parsed_description(job, parsed_description)
+
+    valid_inserts, valid_updates = [], []
+    for label, job in batch:
+        try:
+            # calendar/created_by are resolved once by the caller; skipping them
+            # avoids one existence query per foreign key per row
+            job.full_clean(
+                exclude=['calendar', 'created_by'],
+                validate_unique=False,
+                validate_constraints=False,
+            )
+        except ValidationError as e:
+            _record_error(result, f"Event '{label}' error: {e}")
+            continue
+        (valid_updates if job.pk else valid_inserts).append(job)
+
+    if valid_inserts or valid_updates:
+        with transaction.atomic():
+            if valid_inserts:
+                Job.objects.bulk_create(valid_inserts, batch_size=len(valid_inserts))
+            if valid_updates:
+                _apply_updates(valid_updates)
+        # Bulk writes bypass the post_save signal: one cache bump per batch
+        invalidate_calendar_events_cache()
+        result['imported'] += len(valid_inserts)
+        result['updated'] += len(valid_updates)
+
+
+def import_ics_events(lines, calendar, *, batch_id, use_ai_parsing=True, created_by=None,
+                      upsert=False, batch_size=IMPORT_BATCH_SIZE, progress=None):
+    """
+    Import every VEVENT of an .ics stream into a calendar.
+
+    Args:
+        lines: Iterable of .ics lines (an uploaded file can be passed directly)
+        calendar: Target Calendar
+        batch_id: import_batch_id stamped on every created job
+        use_ai_parsing: Extract trailer fields from descriptions with the AI parser
+        created_by: User recorded as creator (or None)
+        upsert: Sync against earlier imports into the calendar by source UID:
+            unchanged events are skipped, changed ones updated, new ones inserted
+        batch_size: Jobs validated and inserted per bulk_create
+        progress: Optional callable receiving the result dict after each batch
+
+    Returns:
+        Dict with 'processed', 'imported', 'updated', 'unchanged', 'skipped',
+        'errors_count' and 'error_details' (first MAX_ERROR_DETAILS messages)
+    """
+    result = {
+        'processed': 0,
+        'imported': 0,
+        'updated': 0,
+        'unchanged': 0,
+        'skipped': 0,
+        'errors_count': 0,
+        'error_details': [],
+    }
+    pending = []
+    reported = [None]
+    seen_keys = set()
+
+    def flush():
+        _flush_batch(pending, result, use_ai_parsing, calendar=calendar, upsert=upsert, seen_keys=seen_keys)
+        pending.clear()
+        reported[0] = result['processed']
+        logger.info(
+            f"Import {batch_id}: {result['processed']} processed, {result['imported']} imported, "
+            f"{result['updated']} updated, {result['unchanged']} unchanged, "
+            f"{result['skipped']} skipped, {result['errors_count']} errors"
+        )
+        if progress:
+            progress(result)
+
+    for raw in iter_vevent_blocks(lines):
+        result['processed'] += 1
+        label = 'Unknown'
+        try:
+            component = Event.from_ical(raw)
+            label = str(component.get('summary', ''))
+            job = build_job_from_event(
+                component,
+                calendar=calendar,
+                batch_id=batch_id,
+                created_by=created_by,
+            )
+        except SkippedEvent as e:
+            result['skipped'] += 1
+            if len(result['error_details']) < MAX_ERROR_DETAILS:
+                result['error_details'].append(str(e))
+            continue
+        except Exception as e:
+            _record_error(result, f"Event '{label}' error: {e}")
+            logger.error(f"Import error for event '{label}': {e}")
+            continue
+
+        pending.append((label, job))
+        if len(pending) >= batch_size:
+            flush()
+
+    if pending or reported[0] != result['processed']:
+        flush()
+    return result
@@ -0,0 +1,312 @@
+"""
+Background runner for queued job imports.
+
+Uploads are stored as ``ImportBatch`` rows, which double as the queue, and
+processed by a daemon worker thread inside the web process. A large import
+therefore never holds a request thread; the import page polls the batch for
+progress instead. When the in-process worker is disabled
+(``IMPORT_WORKER_ENABLED=False``), the ``process_imports`` management command
+drains the same queue from a scheduled task.
+"""
+
+import io
+import json
+import logging
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F, Max, Min
+from django.utils import timezone
+
+from rental_scheduler.constants import REVERT_CHUNK_SIZE
+from rental_scheduler.utils.ics_import import import_ics_events
+from rental_scheduler.utils.json_import import import_jobs_from_json
+
+logger = logging.getLogger(__name__)
+
+STALE_RUNNING_AFTER = timedelta(minutes=30)
+"""A running batch without progress for this long is treated as interrupted."""
+
+_worker_lock = threading.Lock()
+_worker_thread = None
+_wake_event = threading.Event()
+
+
+def enqueue_import(source, uploaded_file, calendar, *, options=None, created_by=None):
+    """
+    Queue an uploaded file for import and wake the worker.
+
+    Args:
+        source: ImportBatch.SOURCE_ICS or ImportBatch.SOURCE_JSON
+        uploaded_file: Django UploadedFile (read in chunks into the batch)
+        calendar: Target Calendar
+        options: Import options (e.g. {'use_ai_parsing': True})
+        created_by: Uploading user (or None)
+
+    Returns:
+        The queued ImportBatch
+    """
+    from rental_scheduler.models import ImportBatch
+
+    uploaded_file.seek(0)
+    batch = ImportBatch.objects.create(
+        source=source,
+        filename=(getattr(uploaded_file, 'name', '') or '')[:255],
+        calendar=calendar,
+        options=options or {},
+        payload=b''.join(uploaded_file.chunks()),
+        created_by=created_by,
+    )
+    logger.info(f"Queued {source} import {batch.batch_id} ({batch.filename})")
+    transaction.on_commit(wake_import_worker)
+    return batch
+
+
+def _record_progress(batch, result):
+    from rental_scheduler.models import ImportBatch
+
+    batch.processed_count = result['processed']
+    batch.imported_count = result['imported']
+    batch.skipped_count = result['skipped']
+    batch.error_count = result['errors_count']
+    batch.updated_count = result.get('updated', 0)
+    batch.unchanged_count = result.get('unchanged', 0)
+    batch.error_details = list(result['error_details'])
+    ImportBatch.objects.filter(pk=batch.pk).update(
+        processed_count=batch.processed_count,
+        imported_count=batch.imported_count,
+        updated_count=batch.updated_count,
+        unchanged_count=batch.unchanged_count,
+        skipped_count=batch.skipped_count,
+        error_count=batch.error_count,
+        error_details=batch.error_details,
+        updated_at=timezone.now(),
+    )
+
+
+def _run_ics_import(batch, progress):
+    return import_ics_events(
+        io.BytesIO(bytes(batch.payload)),
+        batch.calendar,
+        batch_id=batch.batch_id,
+        use_ai_parsing=batch.options.get('use_ai_parsing', True),
+        upsert=batch.options.get('upsert', False),
+        created_by=batch.created_by,
+        progress=progress,
+    )
+
+
+def _run_json_import(batch, progress):
+    return import_jobs_from_json(
+        bytes(batch.payload),
+        batch.calendar,
+        batch_id=batch.batch_id,
+        progress=progress,
+    )
+
+
+_HANDLERS = {
+    'ics': _run_ics_import,
+    'json': _run_json_import,
+}
+
+
+def _failure_message(error):
+    if isinstance(error, json.JSONDecodeError):
+        return f"Invalid JSON file: {error}"
+    if isinstance(error, KeyError):
+        return f"Missing required field in export data: {error}"
+    return str(error)
+
+
+def run_import_batch(batch):
+    """
+    Process one claimed batch and record its outcome.
+
+    Jobs are committed as the import goes, so a failed batch may still have
+    imported some rows; they can be reverted from the import history.
+    """
+    from rental_scheduler.models import ImportBatch, Job
+
+    try:
+        if batch.calendar_id is None:
+            raise ValueError("Target calendar no longer exists")
+        result = _HANDLERS[batch.source](batch, lambda r: _record_progress(batch, r))
+        _record_progress(batch, result)
+        batch.status = ImportBatch.STATUS_COMPLETED
+        batch.message = result.get('warning', '')
+    except Exception as e:
+        logger.error(f"Import {batch.batch_id} failed: {e}", exc_info=True)
+        batch.status = ImportBatch.STATUS_FAILED
+        batch.message = _failure_message(e)
+
+    # Summarize once here so the import history never aggregates jobs
+    date_range = Job.objects.filter(import_batch_id=batch.batch_id).aggregate(
+        first=Min('start_dt'), last=Max('start_dt'),
+    )
+    batch.first_start_dt = date_range['first']
+    batch.last_start_dt = date_range['last']
+    batch.payload = None
+    batch.finished_at = timezone.now()
+    batch.save(update_fields=[
+        'status', 'message', 'first_start_dt', 'last_start_dt', 'payload', 'finished_at', 'updated_at',
+    ])
+    logger.info(
+        f"Import {batch.batch_id} {batch.status}: {batch.imported_count} imported, "
+        f"{batch.updated_count} updated, {batch.unchanged_count} unchanged, {batch.skipped_count} skipped, {batch.error_count} errors"
+    )
+    return batch
+
+
+def revert_import_batch(batch, chunk_size=REVERT_CHUNK_SIZE):
+    """
+    Delete the jobs created by an import in bounded transactions.
+
+    Each chunk is deleted in its own short transaction and counted on the
+    batch, and the calendar cache is bumped once at the end. An interrupted
+    revert leaves the batch marked as reverting; running it again resumes
+    with whatever jobs are left.
+
+    Returns:
+        Number of jobs deleted by this call
+    """
+    from rental_scheduler.models import ImportBatch, Job, deferred_calendar_cache_invalidation
+
+    if batch.revert_started_at is None:
+        batch.revert_started_at = timezone.now()
+        ImportBatch.objects.filter(pk=batch.pk).update(revert_started_at=batch.revert_started_at)
+
+    jobs = Job.objects.filter(import_batch_id=batch.batch_id)
+    deleted_total = 0
+    with deferred_calendar_cache_invalidation():
+        while True:
+            chunk = list(jobs.order_by('pk').values_list('pk', flat=True)[:chunk_size])
+            if not chunk:
+                break
+            with transaction.atomic():
+                _, deleted_by_model = Job.objects.filter(pk__in=chunk).delete()
+                # Instances cascade with their parent, so count every deleted job
+                deleted = deleted_by_model.get(Job._meta.label, 0)
+                ImportBatch.objects.filter(pk=batch.pk).update(reverted_count=F('reverted_count') + deleted)
+            deleted_total += deleted
+
+    batch.reverted_count += deleted_total
+    batch.reverted_at = timezone.now()
+    ImportBatch.objects.filter(pk=batch.pk).update(reverted_at=batch.reverted_at, updated_at=batch.reverted_at)
+    logger.info(f"Reverted import {batch.batch_id}: {deleted_total} jobs deleted")
+    return deleted_total
+
+
+def claim_next_batch():
+    """
+    Atomically move the oldest queued batch to running.
+
+    ``skip_locked`` lets several workers (threads or processes) share the
+    queue without claiming the same batch.
+
+    Returns:
+        The claimed ImportBatch, or None when the queue is empty
+    """
+    from rental_scheduler.models import ImportBatch
+
+    with transaction.atomic():
+        batch = (
+            ImportBatch.objects.select_for_update(skip_locked=True, of=('self',))
+            .select_related('calendar', 'created_by')
+            .filter(status=ImportBatch.STATUS_QUEUED)
+            .order_by('created_at', 'id')
+            .first()
+        )
+        if batch is None:
+            return None
+        batch.status = ImportBatch.STATUS_RUNNING
+        batch.started_at = timezone.now()
+        batch.save(update_fields=['status', 'started_at', 'updated_at'])
+    return batch
+
+
+def fail_stale_batches():
+    """Mark running batches that stopped reporting progress as failed."""
+    from rental_scheduler.models import ImportBatch
+
+    return ImportBatch.objects.filter(
+        status=ImportBatch.STATUS_RUNNING,
+        updated_at__lt=timezone.now() - STALE_RUNNING_AFTER,
+    ).update(
+        status=ImportBatch.STATUS_FAILED,
+        message="Import was interrupted before finishing. Revert it from Import History and upload the file again.",
+        payload=None,
+        finished_at=timezone.now(),
+    )
+
+
+def process_import_queue(max_batches=None):
+    """
+    Run queued imports until the queue is empty.
+
+    Args:
+        max_batches: Stop after this many batches (None = drain the queue)
+
+    Returns:
+        List of the processed ImportBatch rows
+    """
+    fail_stale_batches()
+    processed = []
+    while max_batches is None or len(processed) < max_batches:
+        batch = claim_next_batch()
+        if batch is None:
+            break
+        processed.append(run_import_batch(batch))
+    return processed
+
+
+def _worker_loop(poll_interval):
+    while True:
+        close_old_connections()
+        try:
+            process_import_queue()
+        except Exception:
+            logger.exception("Import worker failed")
+        finally:
+            close_old_connections()
+        _wake_event.wait(poll_interval)
+        _wake_event.clear()
+
+
+def start_import_worker(poll_interval=None):
+    """
+    Start the in-process import worker thread (idempotent).
+
+    Args:
+        poll_interval: Seconds between queue checks when not woken
+            (defaults to settings.IMPORT_WORKER_POLL_INTERVAL)
+
+    Returns:
+        The running thread, or None when IMPORT_WORKER_ENABLED is off
+    """
+    global _worker_thread
+
+    if not getattr(settings, 'IMPORT_WORKER_ENABLED', True):
+        return None
+    if poll_interval is None:
+        poll_interval = getattr(settings, 'IMPORT_WORKER_POLL_INTERVAL', 30)
+
+    with _worker_lock:
+        if _worker_thread is None or not _worker_thread.is_alive():
+            _worker_thread = threading.Thread(
+                target=_worker_loop,
+                args=(poll_interval,),
+                name='import-worker',
+                daemon=True,
+            )
+            _worker_thread.start()
+            logger.info(f"Started import worker (polling every {poll_interval}s)")
+    return _worker_thread
+
+
+def wake_import_worker():
+    """Make the worker pick up newly queued batches right away."""
+    if start_import_worker() is not None:
+        _wake_event.set()
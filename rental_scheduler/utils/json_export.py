@@ -0,0 +1,128 @@
+"""
+Streaming export of jobs to the JSON format read by ``import_jobs_json``.
+
+Jobs are read with ``QuerySet.iterator(chunk_size=...)`` over only the
+exported columns (no model instances) and written out piece by piece, so the
+export runs in constant memory and the download starts immediately.
+
+Two layouts are produced:
+
+- ``json``: one compact object ``{"version", "exported_at", "export_source",
+  "jobs": [...], "job_count"}`` (``job_count`` comes last because it is only
+  known once every job was written).
+- ``ndjson``: a header line ``{"version", "exported_at", "export_source",
+  "format": "ndjson"}`` followed by one job object per line.
+"""
+
+import json
+import zlib
+
+from django.utils import timezone
+
+EXPORT_VERSION = '1.0'
+
+EXPORT_CHUNK_SIZE = 2000
+"""Rows fetched per round trip while streaming an export."""
+
+EXPORT_FORMATS = ('json', 'ndjson')
+
+EXPORT_FIELDS = (
+    'id', 'recurrence_parent_id',
+    # Basic info
+    'business_name', 'contact_name', 'phone',
+    # Address
+    'address_line1', 'address_line2', 'city', 'state', 'postal_code',
+    # Timing
+    'date_call_received', 'start_dt', 'end_dt', 'all_day',
+    # Call reminder
+    'has_call_reminder', 'call_reminder_weeks_prior', 'call_reminder_completed',
+    # Legacy repeat
+    'repeat_type', 'repeat_n_months',
+    # Recurring events
+    'recurrence_rule', 'recurrence_original_start', 'end_recurrence_date',
+    # Job details
+    'notes', 'repair_notes',
+    # Trailer info
+    'trailer_color', 'trailer_serial', 'trailer_details',
+    # Quote
+    'quote', 'trailer_color_overwrite', 'quote_text',
+    # Status
+    'status',
+)
+
+_DATE_FIELDS = ('date_call_received', 'start_dt', 'end_dt', 'recurrence_original_start', 'end_recurrence_date')
+
+
+def _dumps(value):
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+
+def serialize_job_row(row):
+    """
+    Convert one ``values(*EXPORT_FIELDS)`` row to its export dict.
+
+    Recurring parents get a ``_temp_id`` derived from their primary key and
+    instances reference it through ``_parent_temp_id``, so links survive
+    whatever order the rows are written in.
+    """
+    job_id = row.pop('id')
+    parent_id = row.pop('recurrence_parent_id')
+
+    for field in _DATE_FIELDS:
+        if row[field] is not None:
+            row[field] = row[field].isoformat()
+    row['quote'] = str(row['quote']) if row['quote'] else None
+
+    if row['recurrence_rule'] is not None and parent_id is None:
+        row['_is_recurring_parent'] = True
+        row['_temp_id'] = f"parent_{job_id}"
+    elif parent_id is not None:
+        row['_is_recurring_instance'] = True
+        row['_parent_temp_id'] = f"parent_{parent_id}"
+    return row
+
+
+def iter_job_export(jobs_qs, export_source, export_format='json', chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yield the export document for a queryset as text chunks.
+
+    Args:
+        jobs_qs: Job queryset (already filtered and ordered)
+        export_source: Name recorded in the export header
+        export_format: 'json' or 'ndjson'
+        chunk_size: Rows fetched per database round trip
+
+    Yields:
+        str pieces of the document
+    """
+    header = {
+        'version': EXPORT_VERSION,
+        'exported_at': timezone.now().isoformat(),
+        'export_source': export_source,
+    }
+    rows = jobs_qs.values(*EXPORT_FIELDS).iterator(chunk_size=chunk_size)
+
+    if export_format == 'ndjson':
+        header['format'] = 'ndjson'
+        yield _dumps(header) + '\n'
+        for row in rows:
+            yield _dumps(serialize_job_row(row)) + '\n'
+        return
+
+    # Open the object without its closing brace, then stream the jobs array
+    yield _dumps(header)[:-1] + ',"jobs":['
+    count = 0
+    for row in rows:
+        yield (',' if count else '') + _dumps(serialize_job_row(row))
+        count += 1
+    yield f'],"job_count":{count}}}'
+
+
+def gzip_stream(chunks, level=6):
+    """Gzip-compress a stream of text chunks on the fly."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits=31: gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode('utf-8'))
+        if data:
+            yield data
+    yield compressor.flush()
@@ -0,0 +1,277 @@
+"""
+Import of jobs from the JSON files written by ``export_jobs``.
+
+Both export layouts are read incrementally, so a large export never has to
+be decoded into one Python object tree:
+
+- ``json``: one object whose ``jobs`` array is decoded element by element
+- ``ndjson``: a header line followed by one job object per line
+
+Either may be gzip-compressed. Jobs are inserted with ``bulk_create`` in
+batches; recurring parents go in before the instances that reference them,
+so instances are created with ``recurrence_parent_id`` already set.
+"""
+
+import codecs
+import gzip
+import io
+import json
+import logging
+import re
+from datetime import date, datetime
+
+from django.db import transaction
+
+from rental_scheduler.constants import IMPORT_BATCH_SIZE
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_EXPORT_VERSION = '1.0'
+
+READ_CHUNK_SIZE = 64 * 1024
+"""Bytes read from the export per refill of the decode buffer."""
+
+_GZIP_MAGIC = b'\x1f\x8b'
+_WHITESPACE = re.compile(r'\s*')
+_decoder = json.JSONDecoder()
+
+_DATETIME_FIELDS = ('date_call_received', 'start_dt', 'end_dt', 'recurrence_original_start')
+
+
+def _open_binary(content):
+    """
+    Return a binary stream over bytes, str or a binary file, un-gzipping if needed.
+
+    Files are never closed here, so an uploaded file can still be read
+    after it has been validated.
+    """
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    if isinstance(content, (bytes, bytearray, memoryview)):
+        content = io.BytesIO(bytes(content))
+    else:
+        content.seek(0)
+    magic = content.read(2)
+    content.seek(0)
+    if magic == _GZIP_MAGIC:
+        content = gzip.GzipFile(fileobj=content)
+    return content
+
+
+class _StreamDecoder:
+    """Decode consecutive JSON values from a binary stream with a bounded buffer."""
+
+    def __init__(self, stream, chunk_size=READ_CHUNK_SIZE):
+        self._stream = stream
+        self._chunk_size = chunk_size
+        self._text = codecs.getincrementaldecoder('utf-8')()
+        self._buf = ''
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self):
+        if self._eof:
+            return False
+        chunk = self._stream.read(self._chunk_size)
+        self._eof = not chunk
+        text = self._text.decode(chunk, final=self._eof)
+        self._buf = self._buf[self._pos:] + text
+        self._pos = 0
+        return not self._eof
+
+    def peek(self):
+        """Return the next non-whitespace character ('' at end of input)."""
+        while True:
+            self._pos = _WHITESPACE.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise json.JSONDecodeError(f"Expecting '{char}'", self._buf, self._pos)
+        self._pos += 1
+
+    def value(self):
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self._buf, self._pos)
+                # A value ending exactly at the buffer end may be a truncated number
+                if end < len(self._buf) or self._eof:
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            self._fill()
+
+
+def iter_export_jobs(content, header):
+    """
+    Yield the job dicts of a JSON or NDJSON export one at a time.
+
+    Args:
+        content: Export as bytes, str or a binary file (optionally gzipped)
+        header: Dict filled with the top-level fields (version, export_source,
+            ...) as they are read
+
+    Raises:
+        json.JSONDecodeError: The file is not a valid export
+    """
+    reader = _StreamDecoder(_open_binary(content))
+    reader.expect('{')
+    if reader.peek() != '}':
+        while True:
+            key = reader.value()
+            reader.expect(':')
+            if key == 'jobs':
+                reader.expect('[')
+                if reader.peek() != ']':
+                    while True:
+                        yield reader.value()
+                        if reader.peek() != ',':
+                            break
+                        reader.expect(',')
+                reader.expect(']')
+            else:
+                header[key] = reader.value()
+            if reader.peek() != ',':
+                break
+            reader.expect(',')
+    reader.expect('}')
+
+    # NDJSON: the object above was the header line, every following line is a job
+    while reader.peek():
+        yield reader.value()
+
+
+def _build_job(job_data, calendar, batch_id):
+    """Return (job, temp_id, parent_temp_id) for one exported job dict."""
+    from rental_scheduler.models import Job
+
+    is_parent = job_data.pop('_is_recurring_parent', False)
+    is_instance = job_data.pop('_is_recurring_instance', False)
+    temp_id = job_data.pop('_temp_id', None)
+    parent_temp_id = job_data.pop('_parent_temp_id', None)
+
+    # Parse datetime fields
+    for field in _DATETIME_FIELDS:
+        if job_data.get(field):
+            job_data[field] = datetime.fromisoformat(job_data[field])
+    if job_data.get('end_recurrence_date'):
+        job_data['end_recurrence_date'] = date.fromisoformat(job_data['end_recurrence_date'])
+
+    # Quote is now a non-null CharField, keep as string (exports write null for empty)
+    job_data['quote'] = str(job_data.get('quote') or '')
+
+    job = Job(calendar=calendar, import_batch_id=batch_id, **job_data)
+    return job, (temp_id if is_parent else None), (parent_temp_id if is_instance else None)
+
+
+def _flush_batch(rows, parent_pks, orphans, result, *, final=False):
+    """
+    Insert a batch of built rows: roots first, then linked instances.
+
+    Instances whose parent has not been read yet are parked in ``orphans``
+    (keyed by parent temp ID) until that parent is inserted. On the final
+    flush any still-parked instances are inserted unlinked.
+
+    Returns:
+        Number of instances inserted without their parent
+    """
+    from rental_scheduler.models import Job, invalidate_calendar_events_cache
+
+    roots = [(job, temp_id) for job, temp_id, parent_temp_id in rows if not parent_temp_id]
+    children = []
+    for job, _, parent_temp_id in rows:
+        if parent_temp_id:
+            orphans.setdefault(parent_temp_id, []).append(job)
+
+    with transaction.atomic():
+        # bulk_create skips Job.save()/full_clean, as the per-row import did
+        Job.objects.bulk_create([job for job, _ in roots])
+        for job, temp_id in roots:
+            if temp_id:
+                parent_pks[temp_id] = job.pk
+        for parent_temp_id in [key for key in orphans if key in parent_pks]:
+            for child in orphans.pop(parent_temp_id):
+                child.recurrence_parent_id = parent_pks[parent_temp_id]
+                children.append(child)
+        unlinked = 0
+        if final:
+            # Instances whose parent never appeared are imported unlinked
+            for waiting in orphans.values():
+                children.extend(waiting)
+                unlinked += len(waiting)
+            orphans.clear()
+        Job.objects.bulk_create(children)
+
+    if roots or children:
+        # Bulk writes bypass the post_save signal: one cache bump per batch
+        invalidate_calendar_events_cache()
+    result['imported'] += len(roots) + len(children)
+    return unlinked
+
+
+def import_jobs_from_json(content, calendar, *, batch_id, batch_size=IMPORT_BATCH_SIZE, progress=None):
+    """
+    Import every job of a JSON or NDJSON export into a calendar.
+
+    Recurring instances are re-linked to their imported parents through the
+    ``_temp_id`` / ``_parent_temp_id`` markers written by the exporter.
+    Batches are committed as they are inserted.
+
+    Args:
+        content: Raw export (bytes, str or binary file; optionally gzipped)
+        calendar: Target Calendar
+        batch_id: import_batch_id stamped on every created job
+        batch_size: Jobs inserted per bulk_create
+        progress: Optional callable receiving the result dict after each batch
+
+    Returns:
+        Dict with 'processed', 'imported', 'skipped', 'errors_count',
+        'error_details' and 'warning'
+
+    Raises:
+        json.JSONDecodeError: The file is not a valid export
+        TypeError: A job has fields the Job model does not know
+    """
+    result = {
+        'processed': 0,
+        'imported': 0,
+        'skipped': 0,
+        'errors_count': 0,
+        'error_details': [],
+        'warning': '',
+    }
+    header = {}
+    parent_pks = {}  # Map temp IDs to new parent primary keys
+    orphans = {}  # Instances waiting for a parent that comes later in the file
+
+    rows = []
+    for job_data in iter_export_jobs(content, header):
+        result['processed'] += 1
+        rows.append(_build_job(job_data, calendar, batch_id))
+        if len(rows) >= batch_size:
+            _flush_batch(rows, parent_pks, orphans, result)
+            rows = []
+            if progress:
+                progress(result)
+    unlinked = _flush_batch(rows, parent_pks, orphans, result, final=True)
+
+    warnings = []
+    if header.get('version') != SUPPORTED_EXPORT_VERSION:
+        warnings.append(f"Export version {header.get('version')} may not be fully compatible.")
+    if not result['processed']:
+        warnings.append("No jobs found in the export file.")
+    if unlinked:
+        warnings.append(f"{unlinked} recurring instance(s) could not be linked to a parent.")
+    result['warning'] = ' '.join(warnings)
+
+    logger.info(f"Imported {result['imported']} jobs from JSON export into calendar '{calendar.name}' (batch: {batch_id})")
+    if progress:
+        progress(result)
+    return result
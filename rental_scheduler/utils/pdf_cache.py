@@ -0,0 +1,154 @@
+"""
+Content-addressed disk cache for rendered work order PDFs.
+
+The key is a hash of everything the PDF shows: the work order's fields, its
+lines, the customer snapshot fields and the template and stylesheet (source
+plus ``WORKORDER_PDF_TEMPLATE_VERSION``). The same key always means the same PDF,
+so it doubles as the response ETag and a stale entry can never be served.
+
+Files are named ``<work_order_id>-<key>.pdf``. Saving a work order removes its
+files; serving one refreshes its mtime, and the least recently served files
+are evicted once the directory exceeds ``WORKORDER_PDF_CACHE_MAX_MB``.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+
+from django.conf import settings
+from django.template.loader import get_template
+
+from rental_scheduler.constants import WORKORDER_PDF_TEMPLATE_VERSION
+
+logger = logging.getLogger(__name__)
+
+WORKORDER_PDF_TEMPLATE = "rental_scheduler/workorders_v2/workorder_pdf.html"
+WORKORDER_PDF_STYLESHEET = "rental_scheduler/workorders_v2/workorder_pdf.css"
+
+# Timestamps change on every save without changing the printout
+_IGNORED_FIELDS = ("created_at", "updated_at")
+
+
+def _cache_dir():
+    return Path(settings.WORKORDER_PDF_CACHE_DIR)
+
+
+def _max_bytes():
+    return settings.WORKORDER_PDF_CACHE_MAX_MB * 1024 * 1024
+
+
+def is_enabled():
+    return _max_bytes() > 0
+
+
+def template_source(template_name):
+    return getattr(get_template(template_name).template, "source", "")
+
+
+@lru_cache(maxsize=None)
+def _template_digest(template_name):
+    return hashlib.sha256(template_source(template_name).encode("utf-8")).hexdigest()
+
+
+def pdf_cache_key(context, base_url, template_name=WORKORDER_PDF_TEMPLATE):
+    """Return the content hash of a work order PDF context (see module docstring)."""
+    wo = context["work_order"]
+    payload = {
+        "template": [
+            WORKORDER_PDF_TEMPLATE_VERSION,
+            _template_digest(template_name),
+            _template_digest(WORKORDER_PDF_STYLESHEET),
+        ],
+        "base_url": base_url,
+        "work_order": {
+            field.attname: getattr(wo, field.attname)
+            for field in wo._meta.concrete_fields
+            if field.name not in _IGNORED_FIELDS
+        },
+        "lines": [
+            {
+                field.attname: getattr(line, field.attname)
+                for field in line._meta.concrete_fields
+                if field.name not in _IGNORED_FIELDS
+            }
+            for line in context["lines"]
+        ],
+        "customer": {key: value for key, value in context.items() if key.startswith("customer_")},
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _path(work_order_id, key):
+    return _cache_dir() / f"{work_order_id}-{key}.pdf"
+
+
+def get_cached_pdf(work_order_id, key):
+    """Return the cached PDF bytes, or None on a miss."""
+    if not is_enabled():
+        return None
+    path = _path(work_order_id, key)
+    try:
+        pdf = path.read_bytes()
+        os.utime(path)  # Mark as recently used for eviction
+    except FileNotFoundError:
+        return None
+    except OSError as e:
+        logger.warning(f"Work order PDF cache read failed for {path.name}: {e}")
+        return None
+    return pdf
+
+
+def store_pdf(work_order_id, key, pdf):
+    """Store a rendered PDF, replacing older versions of the same work order."""
+    if not is_enabled():
+        return
+    directory = _cache_dir()
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        invalidate_work_order_pdfs(work_order_id)
+        # Write then rename so readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as tmp:
+            tmp.write(pdf)
+        os.replace(tmp_path, _path(work_order_id, key))
+    except OSError as e:
+        logger.warning(f"Work order PDF cache write failed for work order {work_order_id}: {e}")
+        return
+    _evict(directory, _max_bytes())
+
+
+def invalidate_work_order_pdfs(work_order_id):
+    """Remove every cached PDF of one work order."""
+    for path in _cache_dir().glob(f"{work_order_id}-*.pdf"):
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def _evict(directory, max_bytes):
+    """Delete least recently used PDFs until the directory fits in max_bytes."""
+    entries = []
+    total = 0
+    for path in directory.glob("*.pdf"):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+        total += stat.st_size
+    if total <= max_bytes:
+        return
+    for _, size, path in sorted(entries):
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+        total -= size
+        if total <= max_bytes:
+            break
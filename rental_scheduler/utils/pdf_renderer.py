@@ -0,0 +1,329 @@
+"""
+Out-of-request PDF rendering.
+
+WeasyPrint holds the GIL for the whole render, so rendering inside a waitress
+request thread stalls every other request in the process. Renders are instead
+handed to a small process pool (``PDF_RENDER_WORKERS``); the request thread
+only waits on the result, which releases the GIL.
+
+- At most ``PDF_RENDER_QUEUE_SIZE`` renders are pending at once, batch
+  export renders included; past that, callers get ``PdfRenderBusy`` and the
+  view answers 503 with Retry-After.
+- Renders are keyed by the PDF cache key, so simultaneous prints of the same
+  work order share one render.
+- Finished PDFs are written to the PDF cache, so a request that stopped
+  waiting (timeout) finds the PDF there on retry.
+
+With ``PDF_RENDER_WORKERS = 0`` PDFs are rendered inline in the caller.
+
+Each process (or thread, when rendering inline) parses the work order
+stylesheet into a WeasyPrint ``CSS`` object and a ``FontConfiguration`` once
+and reuses them for every render. With ``PDF_WARMUP`` on, ``warm_up()`` runs
+at startup: it spawns the workers, which load WeasyPrint, the stylesheet and
+the fonts and then render one throwaway document, so the first real print is
+not the slow one.
+"""
+
+import logging
+import multiprocessing
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+
+from rental_scheduler.utils.pdf_cache import (
+    WORKORDER_PDF_STYLESHEET,
+    WORKORDER_PDF_TEMPLATE,
+    store_pdf,
+    template_source,
+)
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_lock = threading.Lock()
+_in_flight = {}  # PDF cache key -> Future
+_resources = threading.local()  # Pre-parsed stylesheet + font configuration
+
+
+class PdfRenderBusy(Exception):
+    """The render queue is full, or the render did not finish in time."""
+
+
+def render_pdf_html(context):
+    """Render the work order PDF template for WeasyPrint (stylesheet applied separately)."""
+    from django.template.loader import render_to_string
+
+    return render_to_string(WORKORDER_PDF_TEMPLATE, {**context, "pdf_stylesheet_linked": True})
+
+
+def _warmup_html():
+    from rental_scheduler.models import WorkOrderV2
+
+    return render_pdf_html({"work_order": WorkOrderV2(number=0), "lines": []})
+
+
+def _init_resources(stylesheet, warmup_html=None):
+    """Parse the stylesheet and fonts once; optionally render a throwaway document."""
+    from weasyprint import CSS, HTML
+    from weasyprint.text.fonts import FontConfiguration
+
+    font_config = FontConfiguration()
+    _resources.options = {
+        "stylesheets": [CSS(string=stylesheet, font_config=font_config)],
+        "font_config": font_config,
+    }
+    if warmup_html:
+        HTML(string=warmup_html).write_pdf(**_resources.options)
+
+
+def _render_options():
+    if getattr(_resources, "options", None) is None:
+        # Inline rendering: Django is set up in this process
+        _init_resources(template_source(WORKORDER_PDF_STYLESHEET))
+    return _resources.options
+
+
+def _noop():
+    return None
+
+
+def write_pdf(html, base_url):
+    """Render HTML to PDF bytes (runs in a worker process)."""
+    from weasyprint import HTML
+
+    return HTML(string=html, base_url=base_url).write_pdf(**_render_options())
+
+
+def write_merged_pdf(htmls, base_url):
+    """Render several HTML documents into one PDF (runs in a worker process)."""
+    from weasyprint import HTML
+
+    options = _render_options()
+    documents = [HTML(string=html, base_url=base_url).render(**options) for html in htmls]
+    pages = [page for document in documents for page in document.pages]
+    return documents[0].copy(pages).write_pdf()
+
+
+def _worker_count():
+    return getattr(settings, 'PDF_RENDER_WORKERS', 0)
+
+
+def pool_enabled():
+    return _worker_count() > 0
+
+
+def _get_executor():
+    global _executor
+
+    if _executor is None:
+        # spawn: forking a multi-threaded server process is not safe
+        warmup_html = _warmup_html() if getattr(settings, 'PDF_WARMUP', False) else None
+        _executor = ProcessPoolExecutor(
+            max_workers=_worker_count(),
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_resources,
+            initargs=(template_source(WORKORDER_PDF_STYLESHEET), warmup_html),
+        )
+        logger.info(f"Started PDF render pool ({_worker_count()} workers)")
+    return _executor
+
+
+def _reset_executor():
+    global _executor
+
+    with _lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+        _in_flight.clear()
+
+
+def _release(key, future):
+    """Free the queue slot ``future`` holds (a newer render may reuse the key)."""
+    with _lock:
+        if _in_flight.get(key) is future:
+            del _in_flight[key]
+
+
+def _submit(key, fn, *args):
+    """Submit to the pool in a free queue slot held under ``key`` (hold _lock)."""
+    if len(_in_flight) >= settings.PDF_RENDER_QUEUE_SIZE:
+        raise PdfRenderBusy("PDF render queue is full")
+    future = _get_executor().submit(fn, *args)
+    _in_flight[key] = future
+    return future
+
+
+def _finish(key, work_order_id, future):
+    _release(key, future)
+    if future.cancelled():
+        return
+    error = future.exception()
+    if error is not None:
+        logger.error(f"PDF render failed for work order {work_order_id}: {error}")
+        return
+    store_pdf(work_order_id, key, future.result())
+
+
+def submit_render(work_order_id, key, html, base_url):
+    """
+    Queue a render (or join the one already running for ``key``).
+
+    Returns:
+        Future resolving to the PDF bytes
+
+    Raises:
+        PdfRenderBusy: PDF_RENDER_QUEUE_SIZE renders are already pending
+    """
+    with _lock:
+        future = _in_flight.get(key)
+        if future is not None:
+            return future
+        future = _submit(key, write_pdf, html, base_url)
+    future.add_done_callback(lambda done: _finish(key, work_order_id, done))
+    return future
+
+
+def render_pdf(work_order_id, key, html, base_url, *, timeout=None):
+    """
+    Render a work order PDF and store it in the PDF cache.
+
+    Args:
+        timeout: Seconds to wait for the pool (defaults to PDF_RENDER_TIMEOUT)
+
+    Raises:
+        PdfRenderBusy: Queue full, or the render is still running at timeout
+    """
+    if not pool_enabled():
+        pdf = write_pdf(html, base_url)
+        store_pdf(work_order_id, key, pdf)
+        return pdf
+
+    if timeout is None:
+        timeout = settings.PDF_RENDER_TIMEOUT
+    try:
+        return submit_render(work_order_id, key, html, base_url).result(timeout=timeout)
+    except FutureTimeoutError:
+        raise PdfRenderBusy("PDF is still rendering")
+    except BrokenProcessPool:
+        # A worker died (e.g. out of memory); start a fresh pool next time
+        logger.error("PDF render pool broke; restarting it on next use")
+        _reset_executor()
+        raise PdfRenderBusy("PDF renderer restarted")
+
+
+def prerender_pdf(work_order_id, key, html, base_url):
+    """Start a background render without waiting (no-op when rendering inline)."""
+    if not pool_enabled():
+        return
+    try:
+        submit_render(work_order_id, key, html, base_url)
+    except PdfRenderBusy:
+        logger.debug(f"Skipped pre-render of work order {work_order_id}: queue full")
+    except BrokenProcessPool:
+        _reset_executor()
+
+
+def render_many(items, base_url, *, timeout=None):
+    """
+    Yield the PDF of each (work_order_id, key, html) item, in order.
+
+    Renders are admitted like prints: each pending one takes a
+    PDF_RENDER_QUEUE_SIZE slot (or joins a print of the same PDF), and a batch
+    keeps at most PDF_RENDER_WORKERS of them pending. Every result is stored
+    in the PDF cache, including renders still running when the caller stops.
+
+    Args:
+        timeout: Seconds to wait for each PDF (None waits indefinitely)
+
+    Raises:
+        PdfRenderBusy: No queue slot is free, or a PDF did not finish in time
+    """
+    if not pool_enabled():
+        for work_order_id, key, html in items:
+            pdf = write_pdf(html, base_url)
+            store_pdf(work_order_id, key, pdf)
+            yield pdf
+        return
+
+    window = deque()
+    try:
+        for work_order_id, key, html in items:
+            while True:
+                try:
+                    window.append((key, submit_render(work_order_id, key, html, base_url)))
+                    break
+                except PdfRenderBusy:
+                    if not window:
+                        raise
+                    # Queue full: wait for one of this batch's own renders
+                    yield _collect(*window.popleft(), timeout)
+            if len(window) >= _worker_count():
+                yield _collect(*window.popleft(), timeout)
+        while window:
+            yield _collect(*window.popleft(), timeout)
+    except BrokenProcessPool:
+        _reset_executor()
+        raise PdfRenderBusy("PDF renderer restarted")
+
+
+def _collect(key, future, timeout):
+    try:
+        pdf = future.result(timeout=timeout)
+    except FutureTimeoutError:
+        raise PdfRenderBusy("PDF is still rendering")
+    # Free the slot now; _finish may run after this waiter wakes up
+    _release(key, future)
+    return pdf
+
+
+def render_merged_pdf(htmls, base_url, *, timeout=None):
+    """
+    Render HTML documents into one merged PDF, in the pool when enabled.
+
+    The merged render takes one PDF_RENDER_QUEUE_SIZE slot until it finishes.
+
+    Args:
+        timeout: Seconds to wait for the PDF (None waits indefinitely)
+
+    Raises:
+        PdfRenderBusy: Queue full, or the PDF did not finish in time
+    """
+    if not htmls:
+        raise ValueError("Nothing to render")
+    if not pool_enabled():
+        return write_merged_pdf(htmls, base_url)
+
+    key = object()  # Merged PDFs are not cached; the key only holds the slot
+    try:
+        with _lock:
+            future = _submit(key, write_merged_pdf, htmls, base_url)
+        future.add_done_callback(lambda done: _release(key, done))
+        return future.result(timeout=timeout)
+    except FutureTimeoutError:
+        # Drops it if no worker picked it up yet; a running render finishes
+        future.cancel()
+        raise PdfRenderBusy("Batch PDF is still rendering")
+    except BrokenProcessPool:
+        _reset_executor()
+        raise PdfRenderBusy("PDF renderer restarted")
+
+
+def warm_up():
+    """
+    Load WeasyPrint, the PDF stylesheet and fonts ahead of the first print.
+
+    With the pool, every worker is spawned now and warms up in its
+    initializer. When rendering inline, the calling thread warms up.
+    """
+    if pool_enabled():
+        with _lock:
+            executor = _get_executor()
+        for future in [executor.submit(_noop) for _ in range(_worker_count())]:
+            future.result()
+    else:
+        _init_resources(template_source(WORKORDER_PDF_STYLESHEET), _warmup_html())
+    logger.info("PDF renderer warmed up")
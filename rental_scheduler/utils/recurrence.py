@@ -3,7 +3,10 @@ Recurring event utilities for the rental scheduler.
 Provides functionality similar to Google Calendar's recurring events.
 """
 
+import calendar
+from collections import defaultdict
 from datetime import datetime, timedelta, date
+from functools import lru_cache
 from dateutil.relativedelta import relativedelta
 from django.utils import timezone
 from django.db import transaction
@@ -241,12 +244,27 @@ def create_recurring_instances(parent_job, count=None, until_date=None):
     Returns:
         List of created Job instances
     """
+    from rental_scheduler.models import Job
+    
     generator = RecurrenceGenerator(parent_job)
     instances = generator.generate_instances(max_count=count, end_date=until_date)
     
     if not instances:
         return []
     
+    # Occurrences kept from an earlier generation (e.g. completed instances when
+    # regenerating) already own their slot in the series
+    existing_starts = set(
+        Job.objects.filter(
+            recurrence_parent=parent_job,
+            recurrence_original_start__in=[instance.recurrence_original_start for instance in instances],
+        ).values_list('recurrence_original_start', flat=True)
+    )
+    instances = [
+        instance for instance in instances
+        if instance.recurrence_original_start not in existing_starts
+    ]
+    
     # Bulk create for efficiency
     with transaction.atomic():
         created_instances = []
@@ -295,7 +313,7 @@ def delete_recurring_instances(parent_job, after_date=None):
         queryset = queryset.filter(recurrence_original_start__gte=after_date)
         
     count = queryset.count()
-    queryset.update(is_deleted=True)
+    queryset.update(is_deleted=True, updated_at=timezone.now())
     
     logger.info(f"Soft deleted {count} recurring instances for job {parent_job.id}")
     return count
@@ -327,7 +345,7 @@ def update_recurring_instances(parent_job, update_type='all', after_date=None, f
     # Don't update completed or canceled instances (preserve user actions)
     queryset = queryset.exclude(status__in=['completed', 'canceled'])
     
-    count = queryset.update(**fields_to_update)
+    count = queryset.update(**{'updated_at': timezone.now(), **fields_to_update})
     
     logger.info(f"Updated {count} recurring instances for job {parent_job.id}")
     return count
@@ -386,12 +404,57 @@ def cancel_future_recurrences(parent_job, from_date):
             recurrence_original_start__gte=from_date
         ).exclude(status='completed')  # Don't change completed instances
         
-        count = instances.update(status='canceled')
+        count = instances.update(status='canceled', updated_at=timezone.now())
         
     logger.info(f"Canceled {count} future instances for job {parent_job.id} from {from_date}")
     return count, True
 
 
+@lru_cache(maxsize=4096)
+def _month_table(year, month):
+    """
+    Lookup table entry keyed by (year, month): (weekday of the 1st, days in month).
+
+    Shared by every series, so nth-weekday resolution is a couple of integer
+    operations once a month has been seen.
+    """
+    return calendar.monthrange(year, month)
+
+
+@lru_cache(maxsize=16384)
+def _nth_weekday_day(year, month, weekday, occurrence):
+    """
+    Day-of-month of the Nth weekday in a month (last occurrence if N overflows).
+
+    Returns None if the date is not resolvable.
+    """
+    first_weekday, days_in_month = _month_table(year, month)
+    day = 1 + (weekday - first_weekday) % 7 + (occurrence - 1) * 7
+    if day > days_in_month:
+        day -= 7
+        if day > days_in_month:
+            return None
+    return day
+
+
+@lru_cache(maxsize=1024)
+def _iso_weeks_in_year(iso_year):
+    """Lookup table keyed by ISO year: number of ISO weeks (52 or 53)."""
+    return date(iso_year, 12, 28).isocalendar()[1]
+
+
+def _combine_local(target_date, time_obj, tz):
+    naive = datetime.combine(target_date, time_obj)
+    if not tz:
+        return naive
+
+    try:
+        return timezone.make_aware(naive, tz)
+    except Exception:
+        # Fall back to setting tzinfo directly if make_aware can't resolve.
+        return naive.replace(tzinfo=tz)
+
+
 def get_nth_weekday_of_month(year, month, weekday, occurrence, time_obj, tz):
     """
     Find the Nth occurrence of a weekday in a given month.
@@ -407,30 +470,12 @@ def get_nth_weekday_of_month(year, month, weekday, occurrence, time_obj, tz):
     Returns:
         datetime (timezone-aware if tz provided), or None if not resolvable
     """
-    first_day = datetime(year, month, 1)
-
-    # First occurrence of weekday in the month
-    days_until_weekday = (weekday - first_day.weekday()) % 7
-    first_occurrence = first_day + timedelta(days=days_until_weekday)
-
-    # Nth occurrence
-    target_date = first_occurrence + timedelta(weeks=(occurrence - 1))
-
     # If the Nth occurrence doesn't exist (e.g., 5th Monday), use the last occurrence.
-    if target_date.month != month:
-        target_date = target_date - timedelta(weeks=1)
-        if target_date.month != month:
-            return None
-
-    naive = datetime.combine(target_date.date(), time_obj)
-    if not tz:
-        return naive
+    day = _nth_weekday_day(year, month, weekday, occurrence)
+    if day is None:
+        return None
 
-    try:
-        return timezone.make_aware(naive, tz)
-    except Exception:
-        # Fall back to setting tzinfo directly if make_aware can't resolve.
-        return naive.replace(tzinfo=tz)
+    return _combine_local(date(year, month, day), time_obj, tz)
 
 
 def get_date_from_iso_week(year, week, weekday, time_obj, tz):
@@ -448,27 +493,16 @@ def get_date_from_iso_week(year, week, weekday, time_obj, tz):
     if iso_weekday > 7:
         iso_weekday = 7
 
+    # Week 53 doesn't exist in every ISO year; fall back to week 52
+    if week > _iso_weeks_in_year(year):
+        week = 52
+
     try:
         target_date = date.fromisocalendar(year, week, iso_weekday)
     except ValueError:
-        # Week might not exist in this year (e.g., week 53 doesn't always exist)
-        for fallback_week in (52, 51):
-            try:
-                target_date = date.fromisocalendar(year, fallback_week, iso_weekday)
-                break
-            except ValueError:
-                continue
-        else:
-            return None
-
-    naive = datetime.combine(target_date, time_obj)
-    if not tz:
-        return naive
+        return None
 
-    try:
-        return timezone.make_aware(naive, tz)
-    except Exception:
-        return naive.replace(tzinfo=tz)
+    return _combine_local(target_date, time_obj, tz)
 
 
 def is_forever_series(parent_job):
@@ -500,113 +534,105 @@ def is_forever_series(parent_job):
     return not has_count and not has_until
 
 
-def _fast_forward_to_window(parent_start, window_start, recurrence_type, interval):
+def _month_index(value):
+    return value.year * 12 + value.month - 1
+
+
+def _interval_range(first_offset, last_offset, interval):
+    """Occurrence numbers k >= 1 whose offset k * interval lies in [first_offset, last_offset]."""
+    first_k = max(1, -(-first_offset // interval))
+    last_k = last_offset // interval
+    return first_k, last_k
+
+
+def _series_starts(parent_start, recurrence_type, interval, window_start, window_end, limit):
     """
-    Calculate the first occurrence on or after window_start by fast-forwarding.
-    
-    For daily/weekly recurrences, we can compute this directly using integer math.
-    For monthly/yearly, we use month/year calculation but stay conservative to preserve
-    the correct weekday pattern (e.g., "3rd Friday of month").
-    
-    Args:
-        parent_start: datetime - the parent job's start datetime
-        window_start: date - the start of the window we need to reach
-        recurrence_type: str - 'daily', 'weekly', 'monthly', or 'yearly'
-        interval: int - the interval between occurrences
-        
+    Occurrence starts (excluding the parent) for one series within a date window.
+
+    Daily/weekly rules are closed-form offsets from the parent start. Monthly
+    (nth weekday) and yearly (ISO week) rules resolve each target period through
+    the shared lookup tables, so the cost is proportional to the output rather
+    than to the distance between the parent and the window.
+
+    Stepping semantics match ``RecurrenceGenerator``: a 5th-weekday (or ISO
+    week 53) series falls back to the last occurrence the first time a period
+    lacks it and keeps that position from then on.
+
     Returns:
-        tuple: (fast_forward_start: datetime, occurrence_number: int)
-               The datetime of the occurrence at or before window_start,
-               and the occurrence number (0 = parent)
+        List of (occurrence_number, start_datetime) tuples
     """
     parent_date = parent_start.date()
-    
-    # If parent is already at or after window_start, no fast-forward needed
-    if parent_date >= window_start:
-        return parent_start, 0
-    
-    days_to_window = (window_start - parent_date).days
-    
-    if recurrence_type == 'daily':
-        # Calculate how many intervals to jump
-        # We want the occurrence just before or at window_start
-        intervals_to_jump = days_to_window // interval
-        if intervals_to_jump > 0:
-            new_start = parent_start + timedelta(days=intervals_to_jump * interval)
-            return new_start, intervals_to_jump
-        return parent_start, 0
-        
-    elif recurrence_type == 'weekly':
-        # Calculate weeks to jump
-        weeks_to_window = days_to_window // 7
-        intervals_to_jump = weeks_to_window // interval
-        if intervals_to_jump > 0:
-            new_start = parent_start + timedelta(weeks=intervals_to_jump * interval)
-            return new_start, intervals_to_jump
-        return parent_start, 0
-        
-    elif recurrence_type == 'monthly':
-        # For monthly, we need to be more careful because the pattern is
-        # "nth weekday of month" not "same date each month".
-        # Calculate the number of whole months to jump.
-        # We use year/month difference rather than days to preserve the pattern.
-        parent_year = parent_start.year
-        parent_month = parent_start.month
-        window_year = window_start.year
-        window_month = window_start.month
-        
-        # Total months difference
-        months_diff = (window_year - parent_year) * 12 + (window_month - parent_month)
-        
-        # How many intervals fit in that difference (conservative: subtract 1)
-        intervals_to_jump = max(0, (months_diff // interval) - 1)
-        
-        if intervals_to_jump > 0:
-            # Jump forward in months - the loop will recalculate the correct weekday
-            new_start = parent_start + relativedelta(months=intervals_to_jump * interval)
-            return new_start, intervals_to_jump
-        return parent_start, 0
-        
-    elif recurrence_type == 'yearly':
-        # Calculate years to window
-        years_diff = window_start.year - parent_start.year
-        intervals_to_jump = max(0, (years_diff // interval) - 1)  # Conservative
-        if intervals_to_jump > 0:
-            new_start = parent_start + relativedelta(years=intervals_to_jump * interval)
-            return new_start, intervals_to_jump
-        return parent_start, 0
-        
-    return parent_start, 0
+    tz = parent_start.tzinfo if timezone.is_aware(parent_start) else None
+    time_obj = parent_start.time()
+    starts = []
+
+    if recurrence_type in ('daily', 'weekly'):
+        step_days = interval * 7 if recurrence_type == 'weekly' else interval
+        first_k, last_k = _interval_range(
+            (window_start - parent_date).days,
+            (window_end - parent_date).days,
+            step_days,
+        )
+        for k in range(first_k, min(last_k, first_k + limit - 1) + 1):
+            # Wall-clock arithmetic, same as repeatedly adding timedelta(days=...)
+            starts.append((k, parent_start + timedelta(days=k * step_days)))
+        return starts
+
+    if recurrence_type == 'monthly':
+        weekday = parent_start.weekday()
+        occurrence = (parent_date.day - 1) // 7 + 1
+        base_index = _month_index(parent_date)
+        first_k, last_k = _interval_range(
+            _month_index(window_start) - base_index,
+            _month_index(window_end) - base_index,
+            interval,
+        )
+        k = 1
+        while k <= last_k and len(starts) < limit:
+            year, month_zero = divmod(base_index + k * interval, 12)
+            day = _nth_weekday_day(year, month_zero + 1, weekday, occurrence)
+            if day is None:
+                return starts
+            if occurrence == 5 and day <= 28:
+                # First month without a 5th weekday: the series settles on the 4th
+                occurrence = 4
+            if k < first_k:
+                # Only needed to find the fallback month; skip straight ahead once settled
+                k = k + 1 if occurrence == 5 else first_k
+                continue
+            target = date(year, month_zero + 1, day)
+            if window_start <= target <= window_end:
+                starts.append((k, _combine_local(target, time_obj, tz)))
+            k += 1
+        return starts
+
+    if recurrence_type == 'yearly':
+        iso_year, iso_week, iso_weekday = parent_date.isocalendar()
+        # ISO years straddle calendar years by a few days on either side
+        first_k, last_k = _interval_range(
+            window_start.year - 1 - iso_year,
+            window_end.year + 1 - iso_year,
+            interval,
+        )
+        k = 1
+        while k <= last_k and len(starts) < limit:
+            target_year = iso_year + k * interval
+            if iso_week > _iso_weeks_in_year(target_year):
+                iso_week = 52
+            if k < first_k:
+                k = k + 1 if iso_week == 53 else first_k
+                continue
+            target = date.fromisocalendar(target_year, iso_week, iso_weekday)
+            if window_start <= target <= window_end:
+                starts.append((k, _combine_local(target, time_obj, tz)))
+            k += 1
+        return starts
 
+    logger.warning(f"Unknown recurrence type: {recurrence_type}")
+    return starts
 
-def generate_occurrences_in_window(parent_job, window_start, window_end, safety_cap=200, max_iterations=2000):
-    """
-    Generate occurrence datetimes for a recurring parent within a date window.
-    
-    This is used for "forever" series where we don't store instances in the DB,
-    but instead generate them on-the-fly for calendar display.
-    
-    OPTIMIZED: Uses fast-forward to jump close to window_start for distant windows,
-    avoiding thousands of sequential steps for far-future date ranges.
-    
-    Args:
-        parent_job: Parent Job with recurrence_rule set
-        window_start: Start date (date object) of the window
-        window_end: End date (date object) of the window
-        safety_cap: Maximum occurrences to generate per call (prevents runaway output)
-        max_iterations: Maximum loop iterations (prevents runaway loops)
-        
-    Returns:
-        List of dicts with occurrence info:
-        [
-            {
-                'start_dt': datetime,  # Occurrence start (timezone-aware)
-                'end_dt': datetime,    # Occurrence end (timezone-aware)
-                'occurrence_number': int,  # Which occurrence (0=parent, 1+=instances)
-            },
-            ...
-        ]
-    """
+
+def _window_occurrences(parent_job, window_start, window_end, safety_cap):
     rule = parent_job.recurrence_rule
     if not rule:
         return []
@@ -615,12 +641,6 @@ def generate_occurrences_in_window(parent_job, window_start, window_end, safety_
     if recurrence_type == 'none':
         return []
     
-    # Coerce window bounds to date objects
-    if isinstance(window_start, datetime):
-        window_start = window_start.date() if not timezone.is_aware(window_start) else timezone.localtime(window_start).date()
-    if isinstance(window_end, datetime):
-        window_end = window_end.date() if not timezone.is_aware(window_end) else timezone.localtime(window_end).date()
-    
     # Determine recurrence end limits
     until_date = _coerce_to_date(rule.get('until_date'))
     end_recurrence = parent_job.end_recurrence_date
@@ -629,21 +649,18 @@ def generate_occurrences_in_window(parent_job, window_start, window_end, safety_
     candidates = [d for d in [until_date, end_recurrence] if d]
     effective_end = min(candidates) if candidates else None
     
-    # If the effective end is before window start, no occurrences
-    if effective_end and effective_end < window_start:
-        return []
-    
     # Clamp window_end to effective_end
     if effective_end and effective_end < window_end:
         window_end = effective_end
     
-    interval = rule.get('interval', 1)
+    if window_end < window_start:
+        return []
     
-    # Start from parent's start datetime
-    parent_start = parent_job.start_dt
-    parent_end = parent_job.end_dt
+    interval = rule.get('interval', 1) or 1
     
     # Work in local time for recurrence math
+    parent_start = parent_job.start_dt
+    parent_end = parent_job.end_dt
     if timezone.is_aware(parent_start):
         parent_start = timezone.localtime(parent_start)
         parent_end = timezone.localtime(parent_end)
@@ -661,96 +678,134 @@ def generate_occurrences_in_window(parent_job, window_start, window_end, safety_
             'is_parent': True,
         })
     
-    # Fast-forward to near the window start to avoid stepping through years of dates
-    current_start, occurrence_number = _fast_forward_to_window(
-        parent_start, window_start, recurrence_type, interval
+    limit = safety_cap - len(occurrences)
+    if limit <= 0:
+        return occurrences
+    
+    for occurrence_number, start_dt in _series_starts(
+        parent_start, recurrence_type, interval, window_start, window_end, limit
+    ):
+        occurrences.append({
+            'start_dt': start_dt,
+            'end_dt': start_dt + duration,
+            'occurrence_number': occurrence_number,
+            'is_parent': False,
+        })
+    
+    return occurrences
+
+
+def _coerce_window_bound(value):
+    if isinstance(value, datetime):
+        return value.date() if not timezone.is_aware(value) else timezone.localtime(value).date()
+    return value
+
+
+def generate_occurrences_in_window(parent_job, window_start, window_end, safety_cap=200, max_iterations=2000):
+    """
+    Generate occurrence datetimes for a recurring parent within a date window.
+    
+    This is used for "forever" series where we don't store instances in the DB,
+    but instead generate them on-the-fly for calendar display.
+    
+    Occurrences are computed directly for the window (closed-form offsets for
+    daily/weekly, lookup tables for monthly/yearly), so far-future windows cost
+    the same as near ones. For many parents at once use
+    ``generate_occurrences_for_parents``.
+    
+    Args:
+        parent_job: Parent Job with recurrence_rule set
+        window_start: Start date (date object) of the window
+        window_end: End date (date object) of the window
+        safety_cap: Maximum occurrences to generate per call (prevents runaway output)
+        max_iterations: Kept for backwards compatibility; generation no longer
+            steps from the parent, so there is no iteration budget to exhaust
+        
+    Returns:
+        List of dicts with occurrence info:
+        [
+            {
+                'start_dt': datetime,  # Occurrence start (timezone-aware)
+                'end_dt': datetime,    # Occurrence end (timezone-aware)
+                'occurrence_number': int,  # Which occurrence (0=parent, 1+=instances)
+            },
+            ...
+        ]
+    """
+    return _window_occurrences(
+        parent_job,
+        _coerce_window_bound(window_start),
+        _coerce_window_bound(window_end),
+        safety_cap,
     )
+
+
+def generate_occurrences_for_parents(parents, window_start, window_end, safety_cap=200):
+    """
+    Generate window occurrences for many recurring parents in one pass.
     
-    # Track iterations to prevent runaway loops
-    iteration_count = 0
+    The month and ISO-week lookup tables are shared across every series in the
+    batch, and each series costs time proportional to the occurrences it
+    contributes, so feed cost grows with output size rather than parent count.
     
-    # Generate forward from the fast-forwarded position
-    while len(occurrences) < safety_cap and iteration_count < max_iterations:
-        iteration_count += 1
+    Args:
+        parents: Iterable of parent Jobs with recurrence_rule set
+        window_start: Start date of the window
+        window_end: End date of the window
+        safety_cap: Maximum occurrences per parent
         
-        # Calculate next occurrence
-        if recurrence_type == 'monthly':
-            original_weekday = current_start.weekday()
-            original_date = current_start.date()
-            first_of_month = original_date.replace(day=1)
-            days_into_month = (original_date - first_of_month).days
-            week_occurrence = (days_into_month // 7) + 1
-            
-            target_month_date = current_start + relativedelta(months=interval)
-            tz = current_start.tzinfo if timezone.is_aware(current_start) else None
-            
-            next_start = get_nth_weekday_of_month(
-                target_month_date.year,
-                target_month_date.month,
-                original_weekday,
-                week_occurrence,
-                current_start.time(),
-                tz,
-            )
-            if next_start is None:
-                next_start = current_start + relativedelta(months=interval)
-                
-        elif recurrence_type == 'yearly':
-            iso_year, iso_week, iso_weekday = current_start.isocalendar()
-            target_iso_year = iso_year + interval
-            tz = current_start.tzinfo if timezone.is_aware(current_start) else None
-            
-            next_start = get_date_from_iso_week(
-                target_iso_year,
-                iso_week,
-                iso_weekday - 1,
-                current_start.time(),
-                tz,
+    Returns:
+        Dict mapping parent id -> list of occurrence dicts (same shape as
+        ``generate_occurrences_in_window``). Parents without occurrences in the
+        window are omitted.
+    """
+    window_start = _coerce_window_bound(window_start)
+    window_end = _coerce_window_bound(window_end)
+    
+    occurrences_by_parent = {}
+    for parent in parents:
+        try:
+            occurrences = _window_occurrences(parent, window_start, window_end, safety_cap)
+        except Exception as parent_err:
+            # One malformed rule must not take down the whole feed
+            logger.error(
+                f"Error generating occurrences for parent job {parent.pk} "
+                f"(window: {window_start} to {window_end}): {parent_err}"
             )
-            if next_start is None:
-                next_start = current_start + relativedelta(years=interval)
-                
-        elif recurrence_type == 'weekly':
-            next_start = current_start + timedelta(weeks=interval)
-            
-        elif recurrence_type == 'daily':
-            next_start = current_start + timedelta(days=interval)
-            
-        else:
-            logger.warning(f"Unknown recurrence type: {recurrence_type}")
-            break
-        
-        occurrence_number += 1
-        next_end = next_start + duration
-        
-        # Check if we've gone past the window end
-        if next_start.date() > window_end:
-            break
-        
-        # Check if we've gone past the effective end date
-        if effective_end and next_start.date() > effective_end:
-            break
-        
-        # Only include if within window
-        if next_start.date() >= window_start:
-            occurrences.append({
-                'start_dt': next_start,
-                'end_dt': next_end,
-                'occurrence_number': occurrence_number,
-                'is_parent': False,
-            })
-        
-        current_start = next_start
+            continue
+        if occurrences:
+            occurrences_by_parent[parent.pk] = occurrences
+    return occurrences_by_parent
+
+
+def get_materialized_starts(parent_ids, window_start, window_end):
+    """
+    Stored ``recurrence_original_start`` values per parent within a date window.
     
-    # Log if we hit iteration limit (shouldn't happen in normal use)
-    if iteration_count >= max_iterations:
-        logger.warning(
-            f"generate_occurrences_in_window hit max_iterations ({max_iterations}) for "
-            f"parent_job={parent_job.id}, window={window_start} to {window_end}, "
-            f"recurrence_type={recurrence_type}, interval={interval}"
-        )
+    One query for the whole batch (soft-deleted instances included, since they
+    suppress their virtual occurrence).
     
-    return occurrences
+    Returns:
+        Dict mapping parent id -> set of datetimes
+    """
+    from rental_scheduler.models import Job
+    
+    starts = defaultdict(set)
+    if not parent_ids:
+        return starts
+    
+    window_start_dt = timezone.make_aware(datetime.combine(window_start, datetime.min.time()))
+    window_end_dt = timezone.make_aware(
+        datetime.combine(window_end + timedelta(days=1), datetime.min.time())
+    )
+    rows = Job.objects.filter(
+        recurrence_parent_id__in=parent_ids,
+        recurrence_original_start__gte=window_start_dt,
+        recurrence_original_start__lt=window_end_dt,
+    ).values_list('recurrence_parent_id', 'recurrence_original_start')
+    for parent_id, original_start in rows:
+        starts[parent_id].add(original_start)
+    return starts
 
 
 def materialize_occurrence(parent_job, original_start):
@@ -767,8 +822,7 @@ def materialize_occurrence(parent_job, original_start):
     Returns:
         Tuple of (job_instance, created: bool)
     """
-    from rental_scheduler.models import Job, CallReminder
-    from rental_scheduler.utils.events import get_call_reminder_sunday
+    from rental_scheduler.models import Job
     
     # Normalize original_start to timezone-aware datetime
     if isinstance(original_start, str):
@@ -783,7 +837,7 @@ def materialize_occurrence(parent_job, original_start):
     if not timezone.is_aware(original_start):
         original_start = timezone.make_aware(original_start, timezone.get_current_timezone())
     
-    # Check if instance already exists (including soft-deleted)
+    # Fast path: already materialized (including soft-deleted)
     existing = Job.objects.filter(
         recurrence_parent=parent_job,
         recurrence_original_start=original_start
@@ -792,41 +846,122 @@ def materialize_occurrence(parent_job, original_start):
     if existing:
         return existing, False
     
-    # Calculate end_dt based on parent's duration
+    jobs, created_starts = _materialize_starts(parent_job, [original_start])
+    created = original_start in created_starts
+    if created:
+        logger.info(f"Materialized occurrence for parent {parent_job.id} at {original_start}")
+    return jobs[0], created
+
+
+def materialize_occurrences(parent_job, window_start, window_end, limit=None):
+    """
+    Materialize every occurrence of a series between two dates in one statement.
+    
+    Used for "edit this and the next N" flows. Existing rows (including
+    soft-deleted ones) are returned as-is; missing ones are bulk-inserted with
+    their call reminders.
+    
+    Args:
+        parent_job: Parent Job instance
+        window_start: First date (inclusive)
+        window_end: Last date (inclusive)
+        limit: Maximum number of occurrences (defaults to 200)
+        
+    Returns:
+        Tuple of (jobs ordered by start, created_count)
+    """
+    limit = limit or 200
+    starts = [
+        occ['start_dt']
+        for occ in generate_occurrences_in_window(parent_job, window_start, window_end, safety_cap=limit + 1)
+        if not occ.get('is_parent')
+    ][:limit]
+    if not starts:
+        return [], 0
+    
+    jobs, created_starts = _materialize_starts(parent_job, starts)
+    if created_starts:
+        logger.info(
+            f"Materialized {len(created_starts)} occurrences for parent {parent_job.id} "
+            f"({window_start} to {window_end})"
+        )
+    return jobs, len(created_starts)
+
+
+def _materialize_starts(parent_job, starts):
+    """
+    Insert-or-get Job rows for the given occurrence starts of a series.
+    
+    The parent row is locked for the duration, so concurrent materializations of
+    the same series (including the horizon maintainer) are serialized, and the
+    insert itself is ``INSERT ... ON CONFLICT DO NOTHING`` against the
+    ``job_unique_recurrence_occurrence`` constraint so no other writer can create
+    a duplicate either. Rows are re-selected afterwards.
+    
+    Returns:
+        Tuple of (jobs in the order of ``starts``, set of starts that were created)
+    """
+    from rental_scheduler.models import Job, CallReminder, invalidate_calendar_events_cache
+    from rental_scheduler.utils.events import get_call_reminder_sunday
+    
     parent_start = parent_job.start_dt
     parent_end = parent_job.end_dt
     if timezone.is_aware(parent_start):
         parent_start = timezone.localtime(parent_start)
         parent_end = timezone.localtime(parent_end)
-    
     duration = parent_end - parent_start
-    start_dt = original_start
-    end_dt = start_dt + duration
     
-    # Create the instance using the generator's _create_instance logic
     generator = RecurrenceGenerator(parent_job)
-    instance = generator._create_instance(start_dt, end_dt, occurrence_number=0)
     
     with transaction.atomic():
-        instance.save()
+        list(Job.objects.select_for_update().filter(pk=parent_job.pk).values_list('pk', flat=True))
         
-        # Create CallReminder if needed
-        if instance.has_call_reminder and instance.call_reminder_weeks_prior:
-            reminder_date = get_call_reminder_sunday(
-                instance.start_dt,
-                instance.call_reminder_weeks_prior,
-            ).date()
-            
-            CallReminder.objects.create(
-                job=instance,
-                calendar=instance.calendar,
-                reminder_date=reminder_date,
-                notes='',
-                completed=False,
+        existing_starts = set(
+            Job.objects.filter(
+                recurrence_parent=parent_job,
+                recurrence_original_start__in=starts,
+            ).values_list('recurrence_original_start', flat=True)
+        )
+        missing = [start for start in starts if start not in existing_starts]
+        
+        if missing:
+            Job.objects.bulk_create(
+                [generator._create_instance(start, start + duration, occurrence_number=0) for start in missing],
+                ignore_conflicts=True,
+            )
+        
+        jobs_by_start = {
+            job.recurrence_original_start: job
+            for job in Job.objects.select_related('calendar').filter(
+                recurrence_parent=parent_job,
+                recurrence_original_start__in=starts,
             )
+        }
+        created_starts = {start for start in missing if start in jobs_by_start}
+        
+        # Create CallReminders for the new rows
+        reminders = []
+        for start in created_starts:
+            instance = jobs_by_start[start]
+            if instance.has_call_reminder and instance.call_reminder_weeks_prior:
+                reminders.append(CallReminder(
+                    job=instance,
+                    calendar=instance.calendar,
+                    reminder_date=get_call_reminder_sunday(
+                        instance.start_dt,
+                        instance.call_reminder_weeks_prior,
+                    ).date(),
+                    notes='',
+                    completed=False,
+                ))
+        if reminders:
+            CallReminder.objects.bulk_create(reminders)
+    
+    if created_starts:
+        # bulk_create bypasses the post_save signal
+        invalidate_calendar_events_cache()
     
-    logger.info(f"Materialized occurrence for parent {parent_job.id} at {original_start}")
-    return instance, True
+    return [jobs_by_start[start] for start in starts], created_starts
 
 
 def compute_occurrence_number(parent_job, original_start_dt, safety_cap=500):
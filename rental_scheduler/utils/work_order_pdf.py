@@ -0,0 +1,211 @@
+"""
+Work order PDF contexts and batch export.
+
+Contexts for any number of work orders are built with a fixed number of
+queries: the work orders with their lines, then one joined query against
+Classic Accounting for all their customers (see
+``accounting_integration.services.customer_snapshot``).
+The single-PDF view and the batch export share this code.
+"""
+
+import io
+import re
+import zipfile
+from datetime import date
+
+from django.utils.text import slugify
+
+from accounting_integration.router import accounting_is_configured
+from rental_scheduler.constants import WORKORDER_PDF_BATCH_MAX
+from rental_scheduler.utils.pdf_cache import get_cached_pdf, pdf_cache_key
+from rental_scheduler.utils.pdf_renderer import render_many, render_merged_pdf, render_pdf_html
+
+BATCH_FORMATS = ("pdf", "zip")
+
+CUSTOMER_FIELDS = (
+    "customer_name",
+    "customer_phone",
+    "customer_contact",
+    "customer_email",
+    "customer_address",
+    "customer_city",
+    "customer_state",
+    "customer_zip",
+)
+
+
+class BatchSelectionError(ValueError):
+    """The batch selection is missing, malformed or too large."""
+
+
+def load_customer_fields(org_ids):
+    """
+    Return {org_id: {customer_* field: value}} for Classic customers.
+
+    Read through the customer snapshot service (one joined query for all
+    customers, cached per process). Unknown orgs are left out.
+    """
+    if not accounting_is_configured():
+        return {}
+
+    from accounting_integration.services.customer_snapshot import get_customer_snapshots
+
+    return {
+        org_id: snapshot.as_pdf_context()
+        for org_id, snapshot in get_customer_snapshots(org_ids).items()
+    }
+
+
+def build_pdf_contexts(work_orders):
+    """
+    Return one template context per work order, in the given order.
+
+    ``work_orders`` should have ``lines`` prefetched.
+    """
+    work_orders = list(work_orders)
+    customers = load_customer_fields(wo.customer_org_id for wo in work_orders)
+    empty = dict.fromkeys(CUSTOMER_FIELDS, "")
+    return [
+        {
+            "work_order": wo,
+            "lines": list(wo.lines.all()),
+            **customers.get(wo.customer_org_id, empty),
+        }
+        for wo in work_orders
+    ]
+
+
+def parse_batch_selection(ids=None, start=None, end=None):
+    """
+    Validate a batch selection from request/command input.
+
+    Args:
+        ids: Iterable of work order IDs (strings or ints; comma lists allowed)
+        start, end: Inclusive ISO dates on the work order date
+
+    Returns:
+        (ids list or None, start date or None, end date or None)
+
+    Raises:
+        BatchSelectionError: Nothing selected, or a value does not parse
+    """
+    parsed_ids = None
+    if ids:
+        parsed_ids = []
+        for raw in ids:
+            for part in re.split(r"[,\s]+", str(raw).strip()):
+                if not part:
+                    continue
+                try:
+                    parsed_ids.append(int(part))
+                except ValueError:
+                    raise BatchSelectionError(f"Invalid work order ID: {part}")
+
+    dates = []
+    for label, raw in (("start", start), ("end", end)):
+        if not raw:
+            dates.append(None)
+            continue
+        try:
+            dates.append(raw if isinstance(raw, date) else date.fromisoformat(str(raw)))
+        except ValueError:
+            raise BatchSelectionError(f"Invalid {label} date: {raw}")
+
+    if not parsed_ids and not any(dates):
+        raise BatchSelectionError("Select work orders by ID or by date range.")
+    return parsed_ids, dates[0], dates[1]
+
+
+def select_work_orders(ids=None, start=None, end=None, *, limit=WORKORDER_PDF_BATCH_MAX):
+    """
+    Work orders for a batch, ordered by date then number, with lines prefetched.
+
+    Raises:
+        BatchSelectionError: More than ``limit`` work orders match
+    """
+    from rental_scheduler.models import WorkOrderV2
+
+    queryset = WorkOrderV2.objects.prefetch_related("lines")
+    if ids:
+        queryset = queryset.filter(pk__in=ids)
+    if start:
+        queryset = queryset.filter(date__gte=start)
+    if end:
+        queryset = queryset.filter(date__lte=end)
+    queryset = queryset.order_by("date", "number")
+
+    if limit is None:
+        return list(queryset)
+    work_orders = list(queryset[:limit + 1])
+    if len(work_orders) > limit:
+        raise BatchSelectionError(
+            f"More than {limit} work orders selected; narrow the selection."
+        )
+    return work_orders
+
+
+def pdf_filename(work_order):
+    return f"work-order-{slugify(str(work_order.number))}.pdf"
+
+
+def render_batch_pdf(contexts, base_url, *, timeout=None):
+    """
+    Render all work orders into one merged PDF document.
+
+    Raises:
+        PdfRenderBusy: The render queue is full or ``timeout`` passed
+    """
+    htmls = [render_pdf_html(context) for context in contexts]
+    return render_merged_pdf(htmls, base_url, timeout=timeout)
+
+
+def iter_batch_pdfs(contexts, base_url, *, timeout=None):
+    """
+    Yield (filename, pdf bytes) per work order, in order.
+
+    Cached PDFs are reused; the rest are rendered in parallel by the PDF
+    render pool (and cached for later single prints). ``timeout`` bounds the
+    wait for each PDF; see ``render_many``.
+    """
+    items = []
+    for context in contexts:
+        wo = context["work_order"]
+        key = pdf_cache_key(context, base_url)
+        cached = get_cached_pdf(wo.pk, key)
+        html = None if cached is not None else render_pdf_html(context)
+        items.append((wo, key, html, cached))
+
+    to_render = [(wo.pk, key, html) for wo, key, html, cached in items if cached is None]
+    rendered = render_many(to_render, base_url, timeout=timeout)
+    for wo, _, _, cached in items:
+        yield pdf_filename(wo), cached if cached is not None else next(rendered)
+
+
+class _ZipBuffer(io.RawIOBase):
+    """Unseekable sink that hands written bytes back to a generator."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def take(self):
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def iter_zip(entries):
+    """Stream a ZIP archive of (filename, bytes) entries chunk by chunk."""
+    buffer = _ZipBuffer()
+    # PDFs are already compressed
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_STORED) as archive:
+        for filename, data in entries:
+            archive.writestr(filename, data)
+            yield buffer.take()
+    yield buffer.take()
@@ -6,7 +6,7 @@ Optimized for performance:
 - Calendar feed endpoint is read-only (no DB writes)
 - Payloads minimized with .only() where appropriate
 """
-import difflib
+import itertools
 import json
 import logging
 import re
@@ -18,7 +18,7 @@ from django.contrib import messages
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.db import models, transaction
-from django.http import HttpResponse, JsonResponse
+from django.http import Http404, HttpResponse, JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.template.loader import render_to_string
 from django.urls import reverse, reverse_lazy
@@ -26,7 +26,7 @@ from django.utils import timezone
 from django.utils.decorators import method_decorator
 from django.utils.http import url_has_allowed_host_and_scheme
 from django.views.decorators.csrf import csrf_protect
-from django.views.decorators.http import require_http_methods
+from django.views.decorators.http import condition, require_http_methods
 from django.views.generic import (
     CreateView,
     DeleteView,
@@ -35,19 +35,50 @@ from django.views.generic import (
     UpdateView,
 )
 
-from rental_scheduler.utils.ai_parser import parse_description_with_ai
+from accounting_integration.router import accounting_is_configured
 from rental_scheduler.utils.events import (
     event_to_calendar_json,
     get_call_reminder_sunday,
     normalize_event_datetimes,
 )
+from rental_scheduler.utils.import_runner import enqueue_import, revert_import_batch
+from rental_scheduler.utils.archive import get_archived_job
+from rental_scheduler.utils.ics_export import iter_calendar_feed
+from rental_scheduler.utils.json_export import EXPORT_FORMATS, gzip_stream, iter_job_export
+from rental_scheduler.utils.pdf_cache import get_cached_pdf, pdf_cache_key
+from rental_scheduler.utils.pdf_renderer import PdfRenderBusy, prerender_pdf, render_pdf, render_pdf_html
+from rental_scheduler.utils.pdf_renderer import pool_enabled as pdf_pool_enabled
+from rental_scheduler.utils.work_order_pdf import (
+    BATCH_FORMATS,
+    BatchSelectionError,
+    build_pdf_contexts,
+    iter_batch_pdfs,
+    iter_zip,
+    parse_batch_selection,
+    render_batch_pdf,
+    select_work_orders,
+)
+from rental_scheduler.utils.customer_dedupe import (
+    DUPLICATE_CANDIDATE_LIMIT,
+    get_blocking_index,
+    score_duplicates,
+)
+from rental_scheduler.utils.customer_index import (
+    customer_index_ready,
+    normalize_name,
+    normalize_phone_tail,
+    normalize_simple_text,
+    normalize_zip,
+    refresh_customer_index,
+    search_customer_index,
+)
 from rental_scheduler.utils.phone import format_phone
 
 from .forms import CalendarImportForm, JobForm
 from .models import (
     Calendar,
+    ImportBatch,
     Job,
-    WorkOrderLineV2,
     WorkOrderNumberSequence,
     WorkOrderV2,
 )
@@ -57,20 +88,8 @@ from .models import (
 # ============================================================================
 
 
-def _accounting_is_configured() -> bool:
-    """
-    Return True when Classic Accounting DB is configured for real use.
-
-    In tests/CI/dev without Classic env vars, we configure a placeholder SQLite
-    DB for the alias; in that case we must not attempt to query Classic tables.
-    """
-
-    accounting_db = (settings.DATABASES or {}).get("accounting") or {}
-    return accounting_db.get("ENGINE") == "django.db.backends.postgresql"
-
-
 def _get_tax_rate_for_customer(customer_org_id) -> Decimal:
-    if not customer_org_id or not _accounting_is_configured():
+    if not customer_org_id or not accounting_is_configured():
         return Decimal("0.0000")
     try:
         from accounting_integration.services.tax_applicability import get_effective_tax_rate
@@ -81,148 +100,46 @@ def _get_tax_rate_for_customer(customer_org_id) -> Decimal:
         return Decimal("0.0000")
 
 
-_DUPLICATE_NAME_THRESHOLD = 0.82
-_DUPLICATE_MAX_RESULTS = 10
-_DUPLICATE_CANDIDATE_LIMIT = 200
-
-
-def _normalize_simple_text(value: str) -> str:
-    text = (value or "").strip().lower()
-    if not text:
-        return ""
-    text = re.sub(r"[^a-z0-9]+", " ", text)
-    return re.sub(r"\s+", " ", text).strip()
-
-
-def _strip_classic_name_suffix(value: str) -> str:
-    if not value:
-        return ""
-    value = str(value).strip()
-    value = re.sub(r"\s*\(\d+\)\s*$", "", value)
-    value = re.sub(r"\s*#\d+\s*$", "", value)
-    return value.strip()
-
-
-def _normalize_name(value: str) -> str:
-    return _normalize_simple_text(_strip_classic_name_suffix(value))
-
-
-def _normalize_phone_digits(value: str) -> str:
-    return re.sub(r"\D", "", value or "")
-
-
-def _normalize_phone_tail(value: str) -> str:
-    digits = _normalize_phone_digits(value)
-    if not digits:
-        return ""
-    if len(digits) == 11 and digits.startswith("1"):
-        digits = digits[1:]
-    if len(digits) > 10:
-        digits = digits[-10:]
-    if len(digits) < 7:
-        return ""
-    return digits
-
-
-def _phone_matches(target_digits: str, candidate_digits: str) -> bool:
-    if not target_digits or not candidate_digits:
-        return False
-    if len(target_digits) >= 10 and len(candidate_digits) >= 10:
-        return target_digits[-10:] == candidate_digits[-10:]
-    return target_digits[-7:] == candidate_digits[-7:]
-
-
-def _normalize_zip(value: str) -> str:
-    return re.sub(r"\D", "", value or "")
-
-
-def _normalize_state(value: str) -> str:
-    return (value or "").strip().upper()
-
-
-def _name_similarity(a: str, b: str) -> float:
-    if not a or not b:
-        return 0.0
-    return difflib.SequenceMatcher(None, a, b).ratio()
-
-
-def _address_matches(target: dict, candidate: dict) -> bool:
-    target_line = _normalize_simple_text(target.get("address_line1") or "")
-    candidate_line = _normalize_simple_text(candidate.get("address_line1") or "")
-    if not target_line or not candidate_line or target_line != candidate_line:
-        return False
-
-    target_zip = _normalize_zip(target.get("zip") or "")
-    candidate_zip = _normalize_zip(candidate.get("zip") or "")
-    if target_zip and candidate_zip:
-        return target_zip == candidate_zip
-
-    target_city = _normalize_simple_text(target.get("city") or "")
-    candidate_city = _normalize_simple_text(candidate.get("city") or "")
-    target_state = _normalize_state(target.get("state") or "")
-    candidate_state = _normalize_state(candidate.get("state") or "")
-
-    return bool(target_city and target_state and target_city == candidate_city and target_state == candidate_state)
-
-
-def _find_possible_customer_duplicates(payload: dict) -> list[dict]:
+def _classic_duplicate_candidates(name_tokens, target_phone_digits, target_zip, addr_token) -> list[dict]:
+    """Candidate customers read from Classic (used until the customer index is filled)."""
     from accounting_integration.models import Org, OrgAddress
 
-    name_raw = payload.get("name") or ""
-    phone_raw = payload.get("phone") or ""
-    address_line1 = payload.get("address_line1") or ""
-    city = payload.get("city") or ""
-    state = payload.get("state") or ""
-    zip_code = payload.get("zip") or ""
-
-    normalized_name = _normalize_name(name_raw)
-    target_phone_digits = _normalize_phone_tail(phone_raw)
-    target_zip = _normalize_zip(zip_code)
-
-    if not (normalized_name or target_phone_digits or address_line1 or target_zip):
-        return []
-
     candidate_ids: set[int] = set()
     org_qs = Org.objects.using("accounting").filter(orgdiscriminator="CUST")
 
-    if normalized_name:
-        name_tokens = [t for t in normalized_name.split(" ") if len(t) > 2][:3]
-        if name_tokens:
-            name_q = models.Q()
-            for token in name_tokens:
-                name_q |= models.Q(orgname__icontains=token)
-            candidate_ids.update(
-                list(
-                    org_qs.filter(name_q).values_list("org_id", flat=True)[:_DUPLICATE_CANDIDATE_LIMIT]
-                )
+    if name_tokens:
+        name_q = models.Q()
+        for token in name_tokens:
+            name_q |= models.Q(orgname__icontains=token)
+        candidate_ids.update(
+            list(
+                org_qs.filter(name_q).values_list("org_id", flat=True)[:DUPLICATE_CANDIDATE_LIMIT]
             )
+        )
 
     if target_phone_digits:
         last4 = target_phone_digits[-4:]
         if last4:
             candidate_ids.update(
                 list(
-                    org_qs.filter(phone1__icontains=last4).values_list("org_id", flat=True)[:_DUPLICATE_CANDIDATE_LIMIT]
+                    org_qs.filter(phone1__icontains=last4).values_list("org_id", flat=True)[:DUPLICATE_CANDIDATE_LIMIT]
                 )
             )
 
-    addr_token = []
-    if not target_zip:
-        addr_token = [token for token in _normalize_simple_text(address_line1).split(" ") if token]
     if target_zip or addr_token:
         addr_qs = OrgAddress.objects.using("accounting").filter(addresstype="BILLTO")
         if target_zip:
             addr_qs = addr_qs.filter(txtzip__icontains=target_zip)
         elif addr_token:
-            addr_qs = addr_qs.filter(streetone__icontains=addr_token[0])
+            addr_qs = addr_qs.filter(streetone__icontains=addr_token)
         candidate_ids.update(
-            list(addr_qs.values_list("orgid_id", flat=True)[:_DUPLICATE_CANDIDATE_LIMIT])
+            list(addr_qs.values_list("orgid_id", flat=True)[:DUPLICATE_CANDIDATE_LIMIT])
         )
 
     if not candidate_ids:
         return []
 
-    candidate_list = list(candidate_ids)[:_DUPLICATE_CANDIDATE_LIMIT]
+    candidate_list = list(candidate_ids)[:DUPLICATE_CANDIDATE_LIMIT]
     orgs = list(org_qs.filter(org_id__in=candidate_list))
     if not orgs:
         return []
@@ -246,65 +163,48 @@ def _find_possible_customer_duplicates(payload: dict) -> list[dict]:
             "zip": addr.txtzip or "",
         }
 
-    results: list[dict] = []
-    for org in orgs:
-        reasons: list[str] = []
-        org_phone_digits = _normalize_phone_tail(org.phone1 or "")
-        if target_phone_digits and org_phone_digits and _phone_matches(target_phone_digits, org_phone_digits):
-            reasons.append("phone")
-
-        org_name_norm = _normalize_name(org.orgname or "")
-        name_score = _name_similarity(normalized_name, org_name_norm)
-        if normalized_name and org_name_norm:
-            if name_score >= _DUPLICATE_NAME_THRESHOLD or (
-                (normalized_name in org_name_norm or org_name_norm in normalized_name)
-                and min(len(normalized_name), len(org_name_norm)) >= 4
-            ):
-                reasons.append("name")
-
-        addr_payload = address_map.get(org.org_id, {})
-        if _address_matches(
-            {
-                "address_line1": address_line1,
-                "city": city,
-                "state": state,
-                "zip": zip_code,
-            },
-            addr_payload,
-        ):
-            reasons.append("address")
-
-        if not reasons:
-            continue
+    return [
+        {
+            "org_id": org.org_id,
+            "name": org.orgname or "",
+            "phone": org.phone1 or "",
+            "contact": org.contact1 or "",
+            "email": org.email or "",
+            **address_map.get(org.org_id, {}),
+        }
+        for org in orgs
+    ]
 
-        score = 0.0
-        if "phone" in reasons:
-            score += 1.2
-        if "address" in reasons:
-            score += 0.9
-        if "name" in reasons:
-            score += 0.5 + (name_score * 0.5)
 
-        results.append(
-            {
-                "org_id": org.org_id,
-                "name": org.orgname or "",
-                "phone": org.phone1 or "",
-                "contact": org.contact1 or "",
-                "email": org.email or "",
-                "address_line1": addr_payload.get("address_line1", ""),
-                "address_line2": addr_payload.get("address_line2", ""),
-                "city": addr_payload.get("city", ""),
-                "state": addr_payload.get("state", ""),
-                "zip": addr_payload.get("zip", ""),
-                "match_reasons": reasons,
-                "name_score": round(name_score, 3) if name_score else 0.0,
-                "score": round(score, 3),
-            }
+def _find_possible_customer_duplicates(payload: dict) -> list[dict]:
+    name_raw = payload.get("name") or ""
+    phone_raw = payload.get("phone") or ""
+    address_line1 = payload.get("address_line1") or ""
+    zip_code = payload.get("zip") or ""
+
+    normalized_name = normalize_name(name_raw)
+    target_phone_digits = normalize_phone_tail(phone_raw)
+    target_zip = normalize_zip(zip_code)
+
+    if not (normalized_name or target_phone_digits or address_line1 or target_zip):
+        return []
+
+    if customer_index_ready():
+        # In-memory blocking index over the local customer index
+        candidates = get_blocking_index().candidates(
+            normalized_name=normalized_name,
+            phone_tail=target_phone_digits,
+            street=normalize_simple_text(address_line1),
         )
+    else:
+        name_tokens = [t for t in normalized_name.split(" ") if len(t) > 2][:3] if normalized_name else []
+        addr_tokens = []
+        if not target_zip:
+            addr_tokens = [token for token in normalize_simple_text(address_line1).split(" ") if token]
+        addr_token = addr_tokens[0] if addr_tokens else ""
+        candidates = _classic_duplicate_candidates(name_tokens, target_phone_digits, target_zip, addr_token)
 
-    results.sort(key=lambda item: (item.get("score", 0), item.get("name", "")), reverse=True)
-    return results[:_DUPLICATE_MAX_RESULTS]
+    return score_duplicates(payload, candidates)
 
 
 def _parse_decimal(value: str, *, field_name: str) -> Decimal:
@@ -444,7 +344,7 @@ def _render_workorder_v2_form(
     from rental_scheduler.constants import US_STATE_TERRITORY_CHOICES
     
     sales_reps = []
-    if _accounting_is_configured():
+    if accounting_is_configured():
         try:
             from accounting_integration.models import AcctSalesRep
             sales_reps = list(AcctSalesRep.objects.using("accounting").filter(active=True).order_by("rep_name"))
@@ -469,37 +369,13 @@ def _render_workorder_v2_form(
 
     if customer_org_id:
         initial_customer = {"org_id": customer_org_id}
-        if _accounting_is_configured():
+        if accounting_is_configured():
             try:
-                from accounting_integration.models import Org, OrgAddress
-
-                org = Org.objects.using("accounting").filter(org_id=customer_org_id).first()
-                if org:
-                    initial_customer.update(
-                        {
-                            "name": org.orgname or "",
-                            "phone": org.phone1 or "",
-                            "contact": org.contact1 or "",
-                            "email": org.email or "",
-                            "taxable": org.taxable,
-                        }
-                    )
-                    address = (
-                        OrgAddress.objects.using("accounting")
-                        .filter(orgid=org, addresstype="BILLTO")
-                        .order_by("-is_default", "-gen_addr_id")
-                        .first()
-                    )
-                    if address:
-                        initial_customer.update(
-                            {
-                                "address_line1": address.streetone or "",
-                                "address_line2": address.streettwo or "",
-                                "city": address.txtcity or "",
-                                "state": address.txtstate or "",
-                                "zip": address.txtzip or "",
-                            }
-                        )
+                from accounting_integration.services.customer_snapshot import get_customer_snapshot
+
+                snapshot = get_customer_snapshot(customer_org_id)
+                if snapshot:
+                    initial_customer.update(snapshot.as_customer_dict())
             except Exception:
                 pass
     from django.db.models import Max
@@ -624,7 +500,7 @@ def workorder_new(request):
 
     job_by_rep_id = ""
     job_by_name = ""
-    if job_by_rep_id_raw and _accounting_is_configured():
+    if job_by_rep_id_raw and accounting_is_configured():
         try:
             from accounting_integration.models import AcctSalesRep
             rep = AcctSalesRep.objects.using("accounting").get(pk=job_by_rep_id_raw)
@@ -639,22 +515,6 @@ def workorder_new(request):
         errors["discount_value"] = str(e)
         discount_value = Decimal("0.00")
 
-    if lines and _accounting_is_configured():
-        from accounting_integration.models import ItmItems
-        requested_ids = {l["itemid"] for l in lines}
-        try:
-            found_ids = set(
-                ItmItems.objects.using("accounting")
-                .filter(itemid__in=requested_ids)
-                .values_list("itemid", flat=True)
-            )
-        except Exception as e:
-            errors["lines"] = f"Unable to validate Classic items: {e}"
-            found_ids = requested_ids
-        missing = requested_ids - found_ids
-        if missing:
-            errors["lines"] = f"Items not found in Classic Accounting: {missing}"
-
     if errors:
         return _wo_error_response(
             request, job=job, work_order=None,
@@ -665,8 +525,6 @@ def workorder_new(request):
 
     try:
         with transaction.atomic():
-            from rental_scheduler.utils.work_orders import quantize_money
-
             create_kwargs = dict(
                 job=job,
                 customer_org_id=customer_org_id,
@@ -686,23 +544,10 @@ def workorder_new(request):
 
             wo = WorkOrderV2.objects.create(**create_kwargs)
 
-            line_objects = [
-                WorkOrderLineV2(
-                    work_order=wo,
-                    itemid=line["itemid"],
-                    qty=line["qty"],
-                    price=line["price"],
-                    amount=quantize_money(line["qty"] * line["price"]),
-                    itemnumber_snapshot=line["itemnumber_snapshot"],
-                    description_snapshot=line["description_snapshot"],
-                )
-                for line in lines
-            ]
-            WorkOrderLineV2.objects.bulk_create(line_objects)
-
-            wo.recalculate_totals(save=True)
+            # Validates items in one query and recalculates totals once
+            wo.set_lines(lines)
 
-            if _accounting_is_configured():
+            if accounting_is_configured():
                 try:
                     from accounting_integration.services.invoice import create_invoice_from_work_order
                     create_invoice_from_work_order(wo, strict=True)
@@ -718,6 +563,8 @@ def workorder_new(request):
             initial=request.POST.dict(), errors=error_dict,
         )
 
+    _prerender_workorder_pdf(request, wo.pk)
+
     msg = f"Work Order #{wo.number} created."
     after_save = request.POST.get("after_save", "").strip()
     next_url = request.POST.get("next") or request.GET.get("next") or ""
@@ -822,7 +669,7 @@ def workorder_edit(request, pk: int):
 
     job_by_rep_id = ""
     job_by_name = ""
-    if job_by_rep_id_raw and _accounting_is_configured():
+    if job_by_rep_id_raw and accounting_is_configured():
         try:
             from accounting_integration.models import AcctSalesRep
             rep = AcctSalesRep.objects.using("accounting").get(pk=job_by_rep_id_raw)
@@ -837,22 +684,6 @@ def workorder_edit(request, pk: int):
         errors["discount_value"] = str(e)
         discount_value = Decimal("0.00")
 
-    if lines and _accounting_is_configured():
-        from accounting_integration.models import ItmItems
-        requested_ids = {l["itemid"] for l in lines}
-        try:
-            found_ids = set(
-                ItmItems.objects.using("accounting")
-                .filter(itemid__in=requested_ids)
-                .values_list("itemid", flat=True)
-            )
-        except Exception as e:
-            errors["lines"] = f"Unable to validate Classic items: {e}"
-            found_ids = requested_ids
-        missing = requested_ids - found_ids
-        if missing:
-            errors["lines"] = f"Items not found in Classic Accounting: {missing}"
-
     if errors:
         return _wo_error_response(
             request, job=job, work_order=wo,
@@ -863,10 +694,6 @@ def workorder_edit(request, pk: int):
 
     try:
         with transaction.atomic():
-            from rental_scheduler.utils.work_orders import quantize_money
-
-            WorkOrderLineV2.objects.filter(work_order=wo).delete()
-
             wo.number = wo_number
             wo.customer_org_id = customer_org_id
             wo.job_by_rep_id = job_by_rep_id
@@ -881,23 +708,10 @@ def workorder_edit(request, pk: int):
             wo.tax_rate_snapshot = tax_rate
             wo.save()
 
-            line_objects = [
-                WorkOrderLineV2(
-                    work_order=wo,
-                    itemid=line["itemid"],
-                    qty=line["qty"],
-                    price=line["price"],
-                    amount=quantize_money(line["qty"] * line["price"]),
-                    itemnumber_snapshot=line["itemnumber_snapshot"],
-                    description_snapshot=line["description_snapshot"],
-                )
-                for line in lines
-            ]
-            WorkOrderLineV2.objects.bulk_create(line_objects)
-
-            wo.recalculate_totals(save=True)
+            # Validates items in one query and recalculates totals once
+            wo.set_lines(lines)
 
-            if _accounting_is_configured():
+            if accounting_is_configured():
                 try:
                     from accounting_integration.services.invoice import (
                         create_invoice_from_work_order,
@@ -920,6 +734,8 @@ def workorder_edit(request, pk: int):
             initial=request.POST.dict(), errors=error_dict,
         )
 
+    _prerender_workorder_pdf(request, wo.pk)
+
     msg = f"Work Order #{wo.number} saved."
     after_save = request.POST.get("after_save", "").strip()
     next_url = request.POST.get("next") or request.GET.get("next") or ""
@@ -955,11 +771,15 @@ def workorder_edit(request, pk: int):
 
 @require_http_methods(["GET"])
 def accounting_customers_search(request):
-    if not _accounting_is_configured():
+    if not accounting_is_configured():
         return JsonResponse({"error": "Classic Accounting is not configured."}, status=503)
 
     q = (request.GET.get("q") or "").strip()
 
+    # Served from the local customer index once it has been synced
+    if customer_index_ready():
+        return JsonResponse({"results": search_customer_index(q)})
+
     from accounting_integration.models import Org
 
     qs = Org.objects.using("accounting").filter(orgdiscriminator="CUST")
@@ -989,7 +809,7 @@ def accounting_customers_search(request):
 
 @require_http_methods(["GET"])
 def accounting_items_search(request):
-    if not _accounting_is_configured():
+    if not accounting_is_configured():
         return JsonResponse({"error": "Classic Accounting is not configured."}, status=503)
 
     q = (request.GET.get("q") or "").strip()
@@ -1017,7 +837,7 @@ def accounting_items_search(request):
 
 @require_http_methods(["GET"])
 def api_sales_reps(request):
-    if not _accounting_is_configured():
+    if not accounting_is_configured():
         return JsonResponse({"error": "Classic Accounting is not configured."}, status=503)
 
     from accounting_integration.models import AcctSalesRep
@@ -1032,10 +852,10 @@ def api_sales_reps(request):
     customer_org_id = (request.GET.get("customer_org_id") or "").strip()
     if customer_org_id:
         try:
-            from accounting_integration.models import Org
-            org = Org.objects.using("accounting").filter(org_id=int(customer_org_id)).first()
-            if org and org.def_sales_rep_id_id:
-                customer_default_rep_id = org.def_sales_rep_id_id
+            from accounting_integration.services.customer_snapshot import get_customer_snapshot
+            snapshot = get_customer_snapshot(int(customer_org_id))
+            if snapshot and snapshot.def_sales_rep_id:
+                customer_default_rep_id = snapshot.def_sales_rep_id
         except (ValueError, TypeError):
             pass
 
@@ -1053,7 +873,7 @@ def work_order_customer_tax_rate(request):
     except (TypeError, ValueError):
         return JsonResponse({"error": "customer_org_id must be an integer."}, status=400)
 
-    if not _accounting_is_configured():
+    if not accounting_is_configured():
         return JsonResponse({"tax_rate": "0.00", "exempt": True})
 
     from accounting_integration.services.tax_applicability import get_effective_tax_rate
@@ -1189,7 +1009,7 @@ def _create_unique_classic_orgname(name: str) -> str:
 @require_http_methods(["POST"])
 @csrf_protect
 def accounting_customers_create(request):
-    if not _accounting_is_configured():
+    if not accounting_is_configured():
         return JsonResponse({"error": "Classic Accounting is not configured."}, status=503)
 
     try:
@@ -1280,13 +1100,14 @@ def accounting_customers_create(request):
             orgid=org,
         )
 
+    refresh_customer_index(org.org_id)
     return JsonResponse({"org_id": org.org_id})
 
 
 @require_http_methods(["POST"])
 @csrf_protect
 def accounting_customers_update(request, orgid: int):
-    if not _accounting_is_configured():
+    if not accounting_is_configured():
         return JsonResponse({"error": "Classic Accounting is not configured."}, status=503)
 
     try:
@@ -1349,6 +1170,10 @@ def accounting_customers_update(request, orgid: int):
                 orgid=org,
             )
 
+    from accounting_integration.services.customer_snapshot import invalidate_customer_snapshots
+
+    invalidate_customer_snapshots(org.org_id)
+    refresh_customer_index(org.org_id)
     return JsonResponse({"org_id": org.org_id})
 
 
@@ -1357,67 +1182,107 @@ def _workorder_pdf_context(request, pk: int):
         WorkOrderV2.objects.select_related("job").prefetch_related("lines"),
         pk=pk,
     )
+    return build_pdf_contexts([wo])[0]
 
-    customer_name = ""
-    customer_phone = ""
-    customer_contact = ""
-    customer_email = ""
-    customer_address = ""
-    customer_city = ""
-    customer_state = ""
-    customer_zip = ""
-
-    if wo.customer_org_id and _accounting_is_configured():
-        from accounting_integration.models import Org, OrgAddress
-
-        org = Org.objects.using("accounting").filter(org_id=wo.customer_org_id).first()
-        if org:
-            customer_name = org.orgname or ""
-            customer_phone = org.phone1 or ""
-            customer_contact = org.contact1 or ""
-            customer_email = org.email or ""
-
-            addr = (
-                OrgAddress.objects.using("accounting")
-                .filter(orgid=org, addresstype="BILLTO")
-                .order_by("-is_default", "-gen_addr_id")
-                .first()
-            )
-            if addr:
-                customer_address = addr.streetone or ""
-                customer_city = addr.txtcity or ""
-                customer_state = addr.txtstate or ""
-                customer_zip = addr.txtzip or ""
 
-    return {
-        "work_order": wo,
-        "lines": list(wo.lines.all()),
-        "customer_name": customer_name,
-        "customer_phone": customer_phone,
-        "customer_contact": customer_contact,
-        "customer_email": customer_email,
-        "customer_address": customer_address,
-        "customer_city": customer_city,
-        "customer_state": customer_state,
-        "customer_zip": customer_zip,
-    }
+def _render_workorder_pdf(context, base_url, key) -> bytes:
+    return render_pdf(context["work_order"].pk, key, render_pdf_html(context), base_url)
+
+
+def _prerender_workorder_pdf(request, pk: int):
+    """Start rendering a saved work order's PDF in the background pool."""
+    if not pdf_pool_enabled():
+        return
+    try:
+        context = _workorder_pdf_context(request, pk)
+        base_url = request.build_absolute_uri("/")
+        key = pdf_cache_key(context, base_url)
+        if get_cached_pdf(pk, key) is None:
+            prerender_pdf(pk, key, render_pdf_html(context), base_url)
+    except Exception:
+        # Best effort: printing renders on demand anyway
+        logger.exception(f"Pre-render of work order {pk} PDF failed")
+
+
+def _pdf_busy_response(message="The PDF is being generated. Please try again in a moment."):
+    response = HttpResponse(message, status=503, content_type="text/plain")
+    response["Retry-After"] = "2"
+    return response
 
 
 def workorder_pdf(request, pk: int):
-    from django.template.loader import render_to_string
+    from django.utils.cache import get_conditional_response
     from django.utils.text import slugify
-    from weasyprint import HTML
 
     context = _workorder_pdf_context(request, pk)
-    html = render_to_string("rental_scheduler/workorders_v2/workorder_pdf.html", context)
-
     base_url = request.build_absolute_uri("/")
-    pdf = HTML(string=html, base_url=base_url).write_pdf()
-
     wo = context["work_order"]
+
+    # Same content, same key: reprints are served without re-rendering
+    key = pdf_cache_key(context, base_url)
+    etag = f'"{key}"'
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        return not_modified
+
+    pdf = get_cached_pdf(wo.pk, key)
+    if pdf is None:
+        try:
+            pdf = _render_workorder_pdf(context, base_url, key)
+        except PdfRenderBusy:
+            # The render keeps going in the pool and lands in the cache
+            return _pdf_busy_response()
+
     filename = f"work-order-{slugify(str(wo.number))}.pdf"
     response = HttpResponse(pdf, content_type="application/pdf")
     response["Content-Disposition"] = f'inline; filename="{filename}"'
+    response["ETag"] = etag
+    response["Cache-Control"] = "private, no-cache"
+    return response
+
+
+@require_http_methods(["GET"])
+def workorder_pdf_batch(request):
+    """
+    Export several work orders as one merged PDF or a ZIP of PDFs.
+
+    Query params: ``ids`` (comma list or repeated), ``start``/``end`` (ISO
+    dates on the work order date) and ``format`` (pdf or zip).
+    """
+    export_format = request.GET.get("format", "pdf")
+    if export_format not in BATCH_FORMATS:
+        return HttpResponse(f"Unsupported format: {export_format}", status=400, content_type="text/plain")
+    try:
+        ids, start, end = parse_batch_selection(
+            request.GET.getlist("ids"), request.GET.get("start"), request.GET.get("end"),
+        )
+        work_orders = select_work_orders(ids, start, end)
+    except BatchSelectionError as e:
+        return HttpResponse(str(e), status=400, content_type="text/plain")
+    if not work_orders:
+        return HttpResponse("No work orders match the selection.", status=404, content_type="text/plain")
+
+    contexts = build_pdf_contexts(work_orders)
+    base_url = request.build_absolute_uri("/")
+    label = "-".join(str(d) for d in (start, end) if d) or f"{len(work_orders)}"
+    busy = "The PDF renderer is busy. Please try again in a moment."
+    if export_format == "zip":
+        chunks = iter_zip(iter_batch_pdfs(contexts, base_url, timeout=settings.PDF_RENDER_TIMEOUT))
+        # Render the first PDF before answering, so a busy pool is still a 503
+        try:
+            first = next(chunks)
+        except PdfRenderBusy:
+            return _pdf_busy_response(busy)
+        response = StreamingHttpResponse(itertools.chain([first], chunks), content_type="application/zip")
+        response["Content-Disposition"] = f'attachment; filename="work-orders-{label}.zip"'
+        return response
+
+    try:
+        pdf = render_batch_pdf(contexts, base_url, timeout=settings.PDF_BATCH_RENDER_TIMEOUT)
+    except PdfRenderBusy:
+        return _pdf_busy_response(busy)
+    response = HttpResponse(pdf, content_type="application/pdf")
+    response["Content-Disposition"] = f'inline; filename="work-orders-{label}.pdf"'
     return response
 
 
@@ -1543,7 +1408,150 @@ def _build_normalized_search_annotation():
 
 
 
-def _build_series_collapsed_rows(jobs, now, *, date_filter='all', include_match_counts=False):
+def _forever_parent_q(prefix=''):
+    """
+    Q filter matching "forever" recurring parents.
+
+    Forever parents have a recurrence_rule with end='never' (or no count and no
+    until_date) and no recurrence_parent of their own. ``prefix`` allows the same
+    filter to be applied across a relation (e.g. ``'recurrence_parent__'``).
+    """
+    return (
+        models.Q(**{f'{prefix}recurrence_parent__isnull': True}) &
+        models.Q(**{f'{prefix}recurrence_rule__isnull': False}) &
+        (
+            models.Q(**{f'{prefix}recurrence_rule__end': 'never'}) |
+            (
+                models.Q(**{f'{prefix}recurrence_rule__count__isnull': True}) &
+                models.Q(**{f'{prefix}recurrence_rule__until_date__isnull': True})
+            )
+        )
+    )
+
+
+def _resolve_series_parents(job_list):
+    """
+    Load the recurrence parents needed to render a page of jobs.
+
+    Parents already present on the page are reused; any remaining parents are
+    fetched (with their calendars) in a single query. The resolved parent is
+    also cached on each instance so later ``job.recurrence_parent`` access
+    doesn't hit the database.
+
+    Returns:
+        dict mapping parent_id -> parent Job
+    """
+    parents = {job.id: job for job in job_list if job.recurrence_rule and not job.recurrence_parent_id}
+
+    missing_ids = {
+        job.recurrence_parent_id
+        for job in job_list
+        if job.recurrence_parent_id and job.recurrence_parent_id not in parents
+    }
+    if missing_ids:
+        parents.update(Job.objects.select_related('calendar').in_bulk(missing_ids))
+
+    for job in job_list:
+        parent = parents.get(job.recurrence_parent_id) if job.recurrence_parent_id else None
+        if parent is not None:
+            job.recurrence_parent = parent
+
+    return parents
+
+
+def _series_key_expression():
+    """SQL expression identifying a job's series: its parent's id, or its own id."""
+    from django.db.models.functions import Coalesce
+
+    return Coalesce('recurrence_parent_id', 'id')
+
+
+def _series_scope_expression(now, date_filter='all'):
+    """
+    SQL expression classifying a job as 'upcoming' or 'past'.
+
+    Mirrors ``determine_scope`` in ``_build_series_collapsed_rows``: for
+    future-oriented filters, rows belonging to a forever series are always
+    'upcoming' even if their start_dt is in the past.
+    """
+    scope_whens = []
+    if date_filter in ('future', 'two_years'):
+        scope_whens.append(
+            models.When(_forever_parent_q() | _forever_parent_q('recurrence_parent__'), then=models.Value('upcoming'))
+        )
+    scope_whens.append(models.When(start_dt__lt=now, then=models.Value('past')))
+    return models.Case(
+        *scope_whens,
+        default=models.Value('upcoming'),
+        output_field=models.CharField(),
+    )
+
+
+def _collapse_series_queryset(queryset, now, *, date_filter='all'):
+    """
+    Reduce a job queryset to one row per recurring series per scope.
+
+    Uses window functions so the database does the reduction before pagination:
+
+        ROW_NUMBER() OVER (PARTITION BY COALESCE(recurrence_parent_id, id), scope
+                           ORDER BY <current ordering>)
+
+    Only the first occurrence per (series, scope) is kept, so every page holds
+    distinct rows. Each surviving row is annotated with ``series_scope`` and
+    ``series_match_count`` (the number of filtered rows the header stands for).
+    Standalone jobs form their own partition and pass through unchanged.
+    """
+    from django.db.models.functions import RowNumber
+
+    ordering = []
+    for item in queryset.query.order_by or Job._meta.ordering:
+        if isinstance(item, str):
+            if item.startswith('-'):
+                ordering.append(models.F(item[1:]).desc())
+            else:
+                ordering.append(models.F(item.lstrip('+')).asc())
+        else:
+            ordering.append(item)
+    # Deterministic tiebreak so exactly one row ranks first
+    ordering.append(models.F('id').asc())
+
+    partition = [_series_key_expression(), _series_scope_expression(now, date_filter)]
+
+    return queryset.annotate(
+        series_scope=_series_scope_expression(now, date_filter),
+        series_rank=models.Window(RowNumber(), partition_by=partition, order_by=ordering),
+        series_match_count=models.Window(models.Count('id'), partition_by=partition),
+    ).filter(series_rank=1)
+
+
+def _count_series_matches(queryset, parent_ids, now, *, date_filter='all'):
+    """
+    Count matching rows per (series, scope) in SQL.
+
+    Groups the full filtered queryset by ``COALESCE(recurrence_parent_id, id)``
+    and upcoming/past scope, restricted to the series visible on the current
+    page. Scope rules mirror ``_build_series_collapsed_rows``.
+
+    Returns:
+        dict mapping (parent_id, scope) -> match count
+    """
+    if not parent_ids:
+        return {}
+
+    rows = (
+        queryset.order_by()
+        .annotate(
+            series_key=_series_key_expression(),
+            series_scope=_series_scope_expression(now, date_filter),
+        )
+        .filter(series_key__in=parent_ids)
+        .values('series_key', 'series_scope')
+        .annotate(match_count=models.Count('id'))
+    )
+    return {(row['series_key'], row['series_scope']): row['match_count'] for row in rows}
+
+
+def _build_series_collapsed_rows(jobs, now, *, date_filter='all', include_match_counts=False, match_queryset=None):
     """
     Unified helper to collapse recurring series into header rows.
     
@@ -1557,6 +1565,10 @@ def _build_series_collapsed_rows(jobs, now, *, date_filter='all', include_match_
         now: Current datetime (for upcoming/past classification)
         date_filter: Date filter ('all', 'future', 'past', 'two_years', 'custom')
         include_match_counts: If True, compute match_count for each series (for search mode)
+        match_queryset: Optional filtered queryset the page was sliced from. When
+            given, match counts are aggregated in SQL across the whole result set
+            instead of only the rows on this page. Not needed for pages produced by
+            ``_collapse_series_queryset``, which already carry ``series_match_count``.
         
     Returns:
         dict with structure:
@@ -1585,6 +1597,16 @@ def _build_series_collapsed_rows(jobs, now, *, date_filter='all', include_match_
     """
     from rental_scheduler.utils.recurrence import is_forever_series
     
+    # Convert to list if needed
+    job_list = list(jobs) if hasattr(jobs, '__iter__') and not isinstance(jobs, list) else jobs
+    
+    # Resolve all parents for this page up front (one query at most), and
+    # compute forever-ness once per parent rather than once per row.
+    parents = _resolve_series_parents(job_list)
+    forever_parent_ids = {
+        parent_id for parent_id, parent in parents.items() if is_forever_series(parent)
+    }
+    
     def get_parent_id(job):
         """Get the parent ID for a job (itself if parent, or its recurrence_parent)."""
         if job.recurrence_parent_id:
@@ -1593,60 +1615,64 @@ def _build_series_collapsed_rows(jobs, now, *, date_filter='all', include_match_
             return job.id
         return None
     
-    def get_parent(job):
-        """Get the parent job object."""
-        if job.recurrence_parent_id:
-            return job.recurrence_parent
-        elif job.recurrence_rule:
-            return job
-        return None
-    
-    def determine_scope(job, date_filter):
+    def determine_scope(job, parent_id):
         """
         Determine the scope for a job based on date filter and job timing.
         
         Forever parents included by future filters may have start_dt < now
         but should still appear under 'upcoming'.
         """
+        # Scope already computed in SQL (collapsed-query mode)
+        if hasattr(job, 'series_scope'):
+            return job.series_scope
+        
+        # For future-oriented filters, forever parents go to 'upcoming' even if start_dt is past
+        if date_filter in ('future', 'two_years') and parent_id in forever_parent_ids:
+            return 'upcoming'
+        
         # Use annotated is_past_event if available, else compute
         if hasattr(job, 'is_past_event'):
             job_is_past = bool(job.is_past_event)
         else:
             job_is_past = job.start_dt < now
         
-        # For future-oriented filters, forever parents go to 'upcoming' even if start_dt is past
-        if date_filter in ('future', 'two_years'):
-            parent = get_parent(job)
-            if parent and is_forever_series(parent):
-                return 'upcoming'
-        
         return 'past' if job_is_past else 'upcoming'
     
-    # Convert to list if needed
-    job_list = list(jobs) if hasattr(jobs, '__iter__') and not isinstance(jobs, list) else jobs
+    classified = []
+    for job in job_list:
+        parent_id = get_parent_id(job)
+        classified.append((job, parent_id, determine_scope(job, parent_id)))
     
-    # First pass: collect match counts if needed (for search mode)
+    # Collect match counts if needed (for search mode)
     series_match_counts = {}
     if include_match_counts:
-        for job in job_list:
-            scope = determine_scope(job, date_filter)
-            parent_id = get_parent_id(job)
-            if parent_id:
-                key = (parent_id, scope)
-                series_match_counts[key] = series_match_counts.get(key, 0) + 1
+        if match_queryset is not None:
+            series_match_counts = _count_series_matches(
+                match_queryset,
+                {parent_id for _job, parent_id, _scope in classified if parent_id},
+                now,
+                date_filter=date_filter,
+            )
+        elif any(hasattr(job, 'series_match_count') for job in job_list):
+            # Counts already computed by the window query (collapsed-query mode)
+            for job, parent_id, scope in classified:
+                if parent_id:
+                    series_match_counts.setdefault((parent_id, scope), job.series_match_count)
+        else:
+            for _job, parent_id, scope in classified:
+                if parent_id:
+                    key = (parent_id, scope)
+                    series_match_counts[key] = series_match_counts.get(key, 0) + 1
     
-    # Second pass: build rows, splitting into upcoming/past sections
+    # Build rows, splitting into upcoming/past sections
     upcoming_rows = []
     past_rows = []
-    seen_series = {}  # (parent_id, scope) -> True
+    seen_series = set()  # (parent_id, scope)
     has_recurring = False
     
-    for job in job_list:
-        scope = determine_scope(job, date_filter)
+    for job, parent_id, scope in classified:
         rows = past_rows if scope == 'past' else upcoming_rows
-        
-        parent_id = get_parent_id(job)
-        parent = get_parent(job)
+        parent = parents.get(parent_id) if parent_id else None
         
         if parent_id and parent:
             # Part of a recurring series
@@ -1654,17 +1680,17 @@ def _build_series_collapsed_rows(jobs, now, *, date_filter='all', include_match_
             
             if series_key not in seen_series:
                 # First occurrence - emit header
-                seen_series[series_key] = True
+                seen_series.add(series_key)
                 has_recurring = True
                 
                 series_info = {
                     'parent_id': parent_id,
-                    'display_name': parent.display_name if hasattr(parent, 'display_name') else parent.business_name,
-                    'phone': parent.get_phone() if hasattr(parent, 'get_phone') else (parent.phone or ''),
+                    'display_name': parent.display_name,
+                    'phone': parent.get_phone() or '',
                     'calendar_name': parent.calendar.name if parent.calendar else '',
                     'calendar_color': parent.calendar.color if parent.calendar else '#6366F1',
                     'recurrence_type': (parent.recurrence_rule or {}).get('type', 'recurring'),
-                    'is_forever': is_forever_series(parent) if parent.recurrence_rule else False,
+                    'is_forever': parent_id in forever_parent_ids,
                     'scope': scope,
                 }
                 
@@ -1792,10 +1818,15 @@ class JobListView(ListView):
     template_name = 'rental_scheduler/jobs/job_list.html'
     context_object_name = 'jobs'
     paginate_by = 25
+    # Collapse recurring series in SQL (one row per series per scope) before
+    # pagination, so each page holds distinct rows. When False, every matching
+    # occurrence is paginated and collapsing happens per page in Python.
+    collapse_series_in_db = True
 
     def get_queryset(self):
         """Filter and sort jobs based on query parameters"""
         queryset = Job.objects.select_related('calendar').filter(is_deleted=False)
+        now = timezone.now()
         
         # Calendar filter
         calendars = self.request.GET.getlist('calendars')
@@ -1811,17 +1842,7 @@ class JobListView(ListView):
         # Build a filter for forever recurring parents (for OR-combining with date filters)
         # Forever parents: have recurrence_rule with end='never' or no count/until_date,
         # and no recurrence_parent (they are the parent themselves)
-        forever_parent_filter = (
-            models.Q(recurrence_parent__isnull=True) &
-            models.Q(recurrence_rule__isnull=False) &
-            (
-                models.Q(recurrence_rule__end='never') |
-                (
-                    models.Q(recurrence_rule__count__isnull=True) &
-                    models.Q(recurrence_rule__until_date__isnull=True)
-                )
-            )
-        )
+        forever_parent_filter = _forever_parent_q()
         
         if date_filter == 'custom':
             start_date = self.request.GET.get('start_date')
@@ -1852,17 +1873,14 @@ class JobListView(ListView):
                 queryset = queryset.filter(date_range_filter)
                 
         elif date_filter == 'future':
-            now = timezone.now()
             # Include forever parents since they have future occurrences
             queryset = queryset.filter(
                 models.Q(start_dt__gte=now) | forever_parent_filter
             )
             self._includes_forever_parents = True
         elif date_filter == 'past':
-            now = timezone.now()
             queryset = queryset.filter(start_dt__lt=now)
         elif date_filter == 'two_years':
-            now = timezone.now()
             two_years_from_now = now + timedelta(days=730)  # 2 years = 730 days
             # Include forever parents since they have occurrences in this range
             queryset = queryset.filter(
@@ -1936,7 +1954,7 @@ class JobListView(ListView):
 
             self._effective_sort = sort_by.lstrip('-')
             queryset = queryset.order_by(sort_field)
-            return queryset
+            return self._collapse_series(queryset, now, date_filter)
 
         # Default sorting when the user hasn't selected a column sort.
         # Keep the experience consistent between the jobs page and the calendar search panel (which pulls from /jobs/).
@@ -1950,7 +1968,6 @@ class JobListView(ListView):
             self._effective_direction = 'desc'
         else:
             # "All Events": Upcoming first (soonest → latest), then Past (most recent → oldest)
-            now = timezone.now()
             queryset = queryset.annotate(
                 is_past_event=models.Case(
                     models.When(start_dt__lt=now, then=models.Value(1)),
@@ -1972,7 +1989,13 @@ class JobListView(ListView):
             self._effective_sort = 'smart'
             self._effective_direction = ''
 
-        return queryset
+        return self._collapse_series(queryset, now, date_filter)
+
+    def _collapse_series(self, queryset, now, date_filter):
+        """Apply collapsed-query mode (see ``collapse_series_in_db``)."""
+        if not self.collapse_series_in_db:
+            return queryset
+        return _collapse_series_queryset(queryset, now, date_filter=date_filter)
     
     def get_context_data(self, **kwargs):
         from django.utils import timezone
@@ -2030,6 +2053,7 @@ class JobListView(ListView):
                 now,
                 date_filter=date_filter,
                 include_match_counts=bool(search_query),
+                match_queryset=self.object_list if search_query and not self.collapse_series_in_db else None,
             )
             
             # Unified context for templates
@@ -2413,7 +2437,8 @@ def get_job_calendar_data(request):
                 _perf_virtual_start = perf_time.perf_counter()
                 
                 try:
-                    from rental_scheduler.utils.recurrence import is_forever_series, generate_occurrences_in_window
+                    from rental_scheduler.utils.recurrence import is_forever_series, get_materialized_starts
+                    from rental_scheduler.utils.horizon import generate_uncovered_occurrences_for_parents
                     
                     # Build filter datetime for cheap parent exclusion
                     # (series starting after the window can't contribute)
@@ -2441,24 +2466,22 @@ def get_job_calendar_data(request):
                             models.Q(trailer_color__icontains=search_filter)
                         )
                     
-                    for parent in forever_parents_qs:
-                        if not is_forever_series(parent):
-                            continue
-                        
-                        try:
-                            materialized_starts = set(
-                                Job.objects.filter(recurrence_parent=parent).values_list('recurrence_original_start', flat=True)
-                            )
-                            
-                            occurrences = generate_occurrences_in_window(
-                                parent, request_start_date, request_end_date, safety_cap=100
-                            )
-                        except Exception as parent_err:
-                            logger.error(
-                                f"Error generating virtual occurrences for parent job {parent.id} "
-                                f"(window: {request_start_date} to {request_end_date}): {parent_err}"
-                            )
+                    forever_parents = [parent for parent in forever_parents_qs if is_forever_series(parent)]
+                    
+                    # Expand every series in one pass; inside the materialized
+                    # horizon the rows already come from calendar_feed
+                    occurrences_by_parent = generate_uncovered_occurrences_for_parents(
+                        forever_parents, request_start_date, request_end_date, safety_cap=100
+                    )
+                    materialized_by_parent = get_materialized_starts(
+                        list(occurrences_by_parent), request_start_date, request_end_date
+                    )
+                    
+                    for parent in forever_parents:
+                        occurrences = occurrences_by_parent.get(parent.pk)
+                        if not occurrences:
                             continue
+                        materialized_starts = materialized_by_parent.get(parent.pk, set())
                         
                         for occ in occurrences:
                             if occ.get('is_parent') or occ['start_dt'] in materialized_starts:
@@ -3004,7 +3027,8 @@ def get_job_calendar_data(request):
         
         if request_start_date and request_end_date:
             try:
-                from rental_scheduler.utils.recurrence import is_forever_series, generate_occurrences_in_window
+                from rental_scheduler.utils.recurrence import is_forever_series, get_materialized_starts
+                from rental_scheduler.utils.horizon import generate_uncovered_occurrences_for_parents
                 
                 # Build calendar filter for recurring parents
                 virtual_calendar_ids = None
@@ -3050,32 +3074,28 @@ def get_job_calendar_data(request):
                         models.Q(trailer_color__icontains=search_filter)
                     )
                 
-                for parent in forever_parents_qs:
-                    # Skip if not a forever series
-                    if not is_forever_series(parent):
-                        continue
-                    
-                    try:
-                        # Get already-materialized instance starts for this parent (including soft-deleted)
-                        materialized_starts = set(
-                            Job.objects.filter(
-                                recurrence_parent=parent
-                            ).values_list('recurrence_original_start', flat=True)
-                        )
-                        
-                        # Generate virtual occurrences in the window
-                        occurrences = generate_occurrences_in_window(
-                            parent,
-                            request_start_date,
-                            request_end_date,
-                            safety_cap=100  # Limit per parent per request
-                        )
-                    except Exception as parent_err:
-                        logger.error(
-                            f"Error generating virtual occurrences for parent job {parent.id} "
-                            f"(window: {request_start_date} to {request_end_date}): {parent_err}"
-                        )
+                # Skip parents that are not forever series
+                forever_parents = [parent for parent in forever_parents_qs if is_forever_series(parent)]
+                
+                # Generate virtual occurrences for every series in one pass, only for
+                # the part of the window outside the materialized horizon
+                occurrences_by_parent = generate_uncovered_occurrences_for_parents(
+                    forever_parents,
+                    request_start_date,
+                    request_end_date,
+                    safety_cap=100  # Limit per parent per request
+                )
+                
+                # Already-materialized instance starts (including soft-deleted), one query
+                materialized_by_parent = get_materialized_starts(
+                    list(occurrences_by_parent), request_start_date, request_end_date
+                )
+                
+                for parent in forever_parents:
+                    occurrences = occurrences_by_parent.get(parent.pk)
+                    if not occurrences:
                         continue
+                    materialized_starts = materialized_by_parent.get(parent.pk, set())
                     
                     for occ in occurrences:
                         # Skip parent occurrence (already in real jobs query) and materialized ones
@@ -3578,9 +3598,17 @@ def job_create_partial(request):
     })
 
 
+def _get_job_or_archived(pk):
+    """Job by pk, falling back to a read-only copy from the archive"""
+    job = Job.objects.select_related('calendar').filter(pk=pk).first() or get_archived_job(pk)
+    if job is None:
+        raise Http404("No Job matches the given query.")
+    return job
+
+
 def job_detail_partial(request, pk):
     """Return job details partial for panel"""
-    job = get_object_or_404(Job, pk=pk)
+    job = _get_job_or_archived(pk)
     return render(request, 'rental_scheduler/jobs/_job_detail_partial.html', {'job': job})
 
 
@@ -4005,9 +4033,9 @@ def job_update_api(request, pk):
 
 @require_http_methods(["GET"])
 def job_detail_api(request, pk):
-    """API endpoint to get job details"""
+    """API endpoint to get job details (archived jobs are returned read-only)"""
     try:
-        job = get_object_or_404(Job, pk=pk)
+        job = _get_job_or_archived(pk)
         
         # Return job data
         return JsonResponse({
@@ -4026,117 +4054,21 @@ def job_detail_api(request, pk):
             'notes': job.notes,
             'repair_notes': job.repair_notes,
             'display_name': job.display_name,
+            'is_archived': job.is_archived,
         })
         
+    except Http404:
+        raise
     except Exception as e:
         return JsonResponse({'error': str(e)}, status=500)
 
 
-def extract_phone_from_text(text):
-    """
-    Extract phone number from text using regex patterns.
-    Handles formats like: 740-501-9004, 231-6407, (330) 265-4243, etc.
-    """
-    if not text:
-        return None
-    
-    # Common phone patterns
-    patterns = [
-        r'\b\d{3}-\d{3}-\d{4}\b',  # 740-501-9004
-        r'\b\d{3}-\d{4}\b',        # 231-6407
-        r'\(\d{3}\)\s*\d{3}-\d{4}', # (330) 265-4243
-        r'\b\d{3}\s+\d{3}-\d{4}\b', # 330 265-4243
-        r'\b\d{10}\b',             # 7405019004
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, text)
-        if match:
-            return match.group(0)
-    
-    return None
-
-
-def parse_ics_datetime(dt_value, is_all_day=False):
-    """
-    Convert iCalendar datetime to timezone-aware datetime.
-    Handles both DATE and DATETIME formats.
-    """
-    if dt_value is None:
-        return None
-    
-    # If it's already a datetime object
-    if isinstance(dt_value, datetime):
-        # Make it timezone-aware if it isn't
-        if timezone.is_naive(dt_value):
-            return timezone.make_aware(dt_value)
-        return dt_value
-    
-    # If it's a date object (all-day event)
-    if isinstance(dt_value, date):
-        # Convert to datetime at midnight
-        dt = datetime.combine(dt_value, datetime.min.time())
-        return timezone.make_aware(dt)
-    
-    return None
-
-
-def convert_rrule_to_json(rrule_str):
-    """
-    Convert iCalendar RRULE string to our JSON format.
-    Example: "FREQ=YEARLY;UNTIL=20280128" -> {"type": "yearly", "interval": 1, "until_date": "2028-01-28"}
-    """
-    if not rrule_str:
-        return None
-    
-    try:
-        # Parse RRULE components
-        parts = {}
-        for part in rrule_str.split(';'):
-            if '=' in part:
-                key, value = part.split('=', 1)
-                parts[key] = value
-        
-        # Extract frequency
-        freq = parts.get('FREQ', '').lower()
-        if freq not in ['yearly', 'monthly', 'weekly', 'daily']:
-            return None
-        
-        # Build JSON rule
-        rule = {
-            'type': freq,
-            'interval': int(parts.get('INTERVAL', 1))
-        }
-        
-        # Add count if present
-        if 'COUNT' in parts:
-            rule['count'] = int(parts['COUNT'])
-        
-        # Add until date if present
-        if 'UNTIL' in parts:
-            until_str = parts['UNTIL']
-            # Parse UNTIL date (format: YYYYMMDD or YYYYMMDDTHHMMSSZ)
-            if 'T' in until_str:
-                until_str = until_str.split('T')[0]
-            # Format as YYYY-MM-DD
-            if len(until_str) >= 8:
-                rule['until_date'] = f"{until_str[:4]}-{until_str[4:6]}-{until_str[6:8]}"
-        
-        return rule
-    
-    except Exception as e:
-        logger.error(f"Error parsing RRULE: {rrule_str}, Error: {str(e)}")
-        return None
-
-
 @csrf_protect
 def calendar_import(request):
     """
     View for importing calendar events from .ics files.
-    Displays upload form and processes imported events.
+    Displays upload form and queues the upload for the background import worker.
     """
-    results = None
-    
     logger.info(f"[DEBUG] calendar_import called - Method: {request.method}")
     
     if request.method == 'POST':
@@ -4154,176 +4086,30 @@ def calendar_import(request):
         
         if form.is_valid():
             try:
-                from icalendar import Calendar as ICalendar
-                import uuid
-                
-                # Get the uploaded file and selected calendar
                 ics_file = request.FILES['ics_file']
                 target_calendar = form.cleaned_data['calendar']
                 use_ai_parsing = form.cleaned_data.get('use_ai_parsing', True)
+                upsert = form.cleaned_data.get('sync_existing', False)
                 
-                # Generate unique batch ID for this import
-                batch_id = str(uuid.uuid4())
-                
-                logger.info(f"Starting calendar import - AI parsing: {use_ai_parsing}")
+                logger.info(f"Queueing calendar import - AI parsing: {use_ai_parsing}, sync: {upsert}")
                 
-                # Read and parse the .ics file
-                ics_content = ics_file.read()
-                cal = ICalendar.from_ical(ics_content)
-                
-                # Track results
-                imported_count = 0
-                skipped_count = 0
-                error_count = 0
-                errors = []
-                
-                # Process each event
-                for component in cal.walk():
-                    if component.name == "VEVENT":
-                        try:
-                            # Extract fields
-                            summary = str(component.get('summary', ''))
-                            description = str(component.get('description', ''))
-                            dtstart = component.get('dtstart')
-                            dtend = component.get('dtend')
-                            created = component.get('created')
-                            rrule = component.get('rrule')
-                            status = component.get('status')
-                            uid = str(component.get('uid', ''))
-                            
-                            # Determine job status - map CANCELLED to completed
-                            job_status = 'uncompleted'  # Default
-                            if status:
-                                status_str = str(status).upper()
-                                if status_str == 'CANCELLED':
-                                    job_status = 'completed'
-                            
-                            # Skip if missing required fields
-                            if not dtstart or not dtend:
-                                skipped_count += 1
-                                errors.append(f"Event '{summary}' skipped: missing start or end date")
-                                continue
-                            
-                            # Get datetime values
-                            dtstart_val = dtstart.dt if hasattr(dtstart, 'dt') else dtstart
-                            dtend_val = dtend.dt if hasattr(dtend, 'dt') else dtend
-                            
-                            # Check if all-day event
-                            is_all_day = isinstance(dtstart_val, date) and not isinstance(dtstart_val, datetime)
-                            
-                            # Parse dates
-                            start_dt = parse_ics_datetime(dtstart_val, is_all_day)
-                            end_dt = parse_ics_datetime(dtend_val, is_all_day)
-                            
-                            if not start_dt or not end_dt:
-                                skipped_count += 1
-                                errors.append(f"Event '{summary}' skipped: invalid date format")
-                                continue
-                            
-                            # For all-day events, adjust end time
-                            if is_all_day:
-                                end_dt = end_dt.replace(hour=23, minute=59, second=59)
-                            
-                            # Extract phone from summary
-                            phone = extract_phone_from_text(summary)
-                            
-                            # Remove phone from business_name if found
-                            business_name = summary
-                            if phone:
-                                business_name = re.sub(r'\s*' + re.escape(phone) + r'\s*', ' ', business_name).strip()
-                            
-                            # Parse date_call_received
-                            date_call_received = None
-                            if created:
-                                created_val = created.dt if hasattr(created, 'dt') else created
-                                date_call_received = parse_ics_datetime(created_val)
-                            
-                            # Convert RRULE if present
-                            recurrence_rule = None
-                            if rrule:
-                                rrule_str = str(rrule.to_ical().decode('utf-8'))
-                                recurrence_rule = convert_rrule_to_json(rrule_str)
-                            
-                            # Parse description with AI to extract structured fields (if enabled)
-                            if use_ai_parsing:
-                                parsed_description = parse_description_with_ai(description)
-                            else:
-                                # No AI parsing - use raw description in notes
-                                parsed_description = {
-                                    'trailer_color': '',
-                                    'trailer_serial': '',
-                                    'trailer_details': '',
-                                    'repair_notes': '',
-                                    'quote': None,
-                                    'unparsed_notes': description
-                                }
-                            
-                            # Create Job instance
-                            job = Job(
-                                calendar=target_calendar,
-                                status=job_status,
-                                business_name=business_name[:150] if business_name else '',  # Limit to field max_length
-                                phone=phone[:25] if phone else '',
-                                start_dt=start_dt,
-                                end_dt=end_dt,
-                                all_day=is_all_day,
-                                notes=parsed_description.get('unparsed_notes', description),
-                                repair_notes=parsed_description.get('repair_notes', ''),
-                                trailer_color=parsed_description.get('trailer_color', '')[:60],  # Limit to field max_length
-                                trailer_serial=parsed_description.get('trailer_serial', '')[:120],  # Limit to field max_length
-                                trailer_details=parsed_description.get('trailer_details', '')[:200],  # Limit to field max_length
-                                quote=parsed_description.get('quote'),
-                                date_call_received=date_call_received,
-                                recurrence_rule=recurrence_rule,
-                                import_batch_id=batch_id,  # Track import batch
-                                created_by=request.user if request.user.is_authenticated else None,
-                            )
-                            
-                            # Validate and save
-                            job.full_clean()
-                            job.save()
-                            
-                            imported_count += 1
-                            
-                        except Exception as e:
-                            error_count += 1
-                            event_name = summary if 'summary' in locals() else 'Unknown'
-                            error_msg = f"Event '{event_name}' error: {str(e)}"
-                            errors.append(error_msg)
-                            logger.error(f"Import error for UID {uid}: {str(e)}")
-                
-                # Prepare results
-                results = {
-                    'success': True,
-                    'imported': imported_count,
-                    'skipped': skipped_count,
-                    'errors_count': error_count,
-                    'error_details': errors[:20],  # Show first 20 errors
-                    'calendar_name': target_calendar.name
-                }
-                
-                # Debug logging
-                logger.info(f"Import complete: {imported_count} imported, {skipped_count} skipped, {error_count} errors")
-                
-                # Create comprehensive success message
-                message_parts = []
-                message_parts.append(f'✓ Import Complete: {imported_count} event(s) successfully imported to "{target_calendar.name}"')
-                
-                if skipped_count > 0:
-                    message_parts.append(f'{skipped_count} skipped')
-                if error_count > 0:
-                    message_parts.append(f'{error_count} had errors')
-                
-                messages.success(request, ' | '.join(message_parts))
+                # Large exports take minutes with AI parsing - run them in the
+                # background worker and let the page poll for progress
+                batch = enqueue_import(
+                    ImportBatch.SOURCE_ICS,
+                    ics_file,
+                    target_calendar,
+                    options={'use_ai_parsing': use_ai_parsing, 'upsert': upsert},
+                    created_by=request.user if request.user.is_authenticated else None,
+                )
                 
-                # Redirect to calendar to see imported events
-                return redirect('rental_scheduler:calendar')
+                messages.info(request, f'Import of "{ics_file.name}" into "{target_calendar.name}" has started.')
+                return redirect(f"{reverse('rental_scheduler:calendar_import')}?batch={batch.batch_id}")
                 
             except Exception as e:
                 messages.error(request, f'Failed to import calendar: {str(e)}')
                 logger.error(f"Calendar import error: {str(e)}")
                 # Keep the form with data so user can see what they selected
-                # form already has the POST data from line 1370
         else:
             # Form validation failed - show errors to user
             messages.error(request, 'Please correct the errors below.')
@@ -4332,27 +4118,69 @@ def calendar_import(request):
     
     return render(request, 'rental_scheduler/jobs/job_import.html', {
         'form': form,
-        'title': 'Import Calendar Events'
+        'title': 'Import Calendar Events',
+        'import_batch': _get_import_batch_from_query(request),
     })
 
 
+def _get_import_batch_from_query(request):
+    """Batch named by ?batch=<id> (the import page shows its progress)"""
+    batch_id = request.GET.get('batch')
+    if not batch_id:
+        return None
+    return ImportBatch.objects.defer('payload').filter(batch_id=batch_id).first()
+
+
+def _import_batch_payload(batch):
+    """JSON status of an import batch for the progress poller"""
+    return {
+        'batch_id': batch.batch_id,
+        'source': batch.source,
+        'filename': batch.filename,
+        'calendar_name': batch.calendar.name if batch.calendar_id else '',
+        'status': batch.status,
+        'status_display': batch.get_status_display(),
+        'finished': batch.is_finished,
+        'processed': batch.processed_count,
+        'imported': batch.imported_count,
+        'updated': batch.updated_count,
+        'unchanged': batch.unchanged_count,
+        'skipped': batch.skipped_count,
+        'errors_count': batch.error_count,
+        'error_details': batch.error_details,
+        'message': batch.message,
+        'created_at': batch.created_at.isoformat(),
+        'started_at': batch.started_at.isoformat() if batch.started_at else None,
+        'finished_at': batch.finished_at.isoformat() if batch.finished_at else None,
+    }
+
+
+@require_http_methods(["GET"])
+def import_batch_status(request, batch_id):
+    """
+    Progress of a queued import, polled by the import pages.
+    """
+    batch = get_object_or_404(
+        ImportBatch.objects.defer('payload').select_related('calendar'),
+        batch_id=batch_id,
+    )
+    return JsonResponse(_import_batch_payload(batch))
+
+
 def import_history(request):
     """
     View showing recent calendar imports with ability to revert them.
     """
-    from django.db.models import Count, Min, Max
-    
-    # Get all import batches with aggregated info
-    imports = (Job.objects
-               .filter(import_batch_id__isnull=False)
-               .values('import_batch_id', 'calendar__name', 'calendar__id')
-               .annotate(
-                   count=Count('id'),
-                   first_date=Min('start_dt'),
-                   last_date=Max('start_dt'),
-                   imported_at=Min('created_at')
+    # Counts and date ranges are recorded on the batch when the import finishes
+    imports = (ImportBatch.objects
+               .filter(
+                   status__in=[ImportBatch.STATUS_COMPLETED, ImportBatch.STATUS_FAILED],
+                   imported_count__gt=0,
+                   reverted_at__isnull=True,
                )
-               .order_by('-imported_at'))
+               .select_related('calendar')
+               .defer('payload', 'error_details')
+               .order_by('-created_at'))
     
     return render(request, 'rental_scheduler/jobs/import_history.html', {
         'imports': imports,
@@ -4365,21 +4193,20 @@ def import_history(request):
 def revert_import(request, batch_id):
     """
     Delete all jobs from a specific import batch.
+    Jobs are deleted in chunks; an interrupted revert can be resumed.
     """
+    batch = ImportBatch.objects.defer('payload').filter(batch_id=batch_id).first()
+    if batch is None or batch.reverted_at is not None:
+        messages.warning(request, 'No jobs found for this import batch.')
+        return redirect('rental_scheduler:import_history')
+    if not batch.is_finished:
+        messages.warning(request, 'This import is still running. Try again once it has finished.')
+        return redirect('rental_scheduler:import_history')
+    
     try:
-        # Get all jobs in this batch
-        jobs = Job.objects.filter(import_batch_id=batch_id)
-        count = jobs.count()
-        
-        if count == 0:
-            messages.warning(request, 'No jobs found for this import batch.')
-            return redirect('rental_scheduler:import_history')
-        
-        # Delete all jobs in the batch
-        jobs.delete()
-        
-        messages.success(request, f'Successfully reverted import: {count} job(s) deleted.')
-        logger.info(f"Reverted import batch {batch_id}: {count} jobs deleted")
+        revert_import_batch(batch)
+        # reverted_count includes jobs deleted by an earlier, interrupted attempt
+        messages.success(request, f'Successfully reverted import: {batch.reverted_count} job(s) deleted.')
         
     except Exception as e:
         messages.error(request, f'Failed to revert import: {str(e)}')
@@ -4394,10 +4221,20 @@ def export_jobs(request, calendar_id=None):
     """
     Export jobs to JSON format for importing into another instance.
     Optionally filter by calendar_id.
+    
+    The export is streamed in constant memory. Query parameters:
+    - format: 'json' (default) or 'ndjson' (one job per line)
+    - gzip: '1' to download a gzip-compressed file
     """
     try:
+        export_format = request.GET.get('format', 'json')
+        if export_format not in EXPORT_FORMATS:
+            messages.error(request, f"Unknown export format '{export_format}'.")
+            return redirect('rental_scheduler:job_list')
+        use_gzip = request.GET.get('gzip', '').lower() in ('1', 'true', 'yes')
+        
         # Get jobs to export
-        jobs_qs = Job.objects.filter(is_deleted=False).select_related('calendar')
+        jobs_qs = Job.objects.filter(is_deleted=False)
         
         export_source = "all"
         if calendar_id:
@@ -4406,109 +4243,95 @@ def export_jobs(request, calendar_id=None):
             export_source = calendar.name
         
         # Order by start_dt for consistent export
-        jobs_qs = jobs_qs.order_by('start_dt')
-        
-        # Build export data
-        jobs_data = []
-        parent_id_map = {}  # Map old parent IDs to temporary IDs for import
-        
-        for idx, job in enumerate(jobs_qs):
-            job_dict = {
-                # Basic info
-                'business_name': job.business_name,
-                'contact_name': job.contact_name,
-                'phone': job.phone,
-                
-                # Address
-                'address_line1': job.address_line1,
-                'address_line2': job.address_line2,
-                'city': job.city,
-                'state': job.state,
-                'postal_code': job.postal_code,
-                
-                # Timing
-                'date_call_received': job.date_call_received.isoformat() if job.date_call_received else None,
-                'start_dt': job.start_dt.isoformat(),
-                'end_dt': job.end_dt.isoformat(),
-                'all_day': job.all_day,
-                
-                # Call reminder
-                'has_call_reminder': job.has_call_reminder,
-                'call_reminder_weeks_prior': job.call_reminder_weeks_prior,
-                'call_reminder_completed': job.call_reminder_completed,
-                
-                # Legacy repeat
-                'repeat_type': job.repeat_type,
-                'repeat_n_months': job.repeat_n_months,
-                
-                # Recurring events
-                'recurrence_rule': job.recurrence_rule,
-                'recurrence_original_start': job.recurrence_original_start.isoformat() if job.recurrence_original_start else None,
-                'end_recurrence_date': job.end_recurrence_date.isoformat() if job.end_recurrence_date else None,
-                
-                # Job details
-                'notes': job.notes,
-                'repair_notes': job.repair_notes,
-                
-                # Trailer info
-                'trailer_color': job.trailer_color,
-                'trailer_serial': job.trailer_serial,
-                'trailer_details': job.trailer_details,
-                
-                # Quote
-                'quote': str(job.quote) if job.quote else None,
-                'trailer_color_overwrite': job.trailer_color_overwrite,
-                'quote_text': job.quote_text,
-                
-                # Status
-                'status': job.status,
-            }
-            
-            # Handle recurring parent relationships
-            if job.is_recurring_parent:
-                job_dict['_is_recurring_parent'] = True
-                job_dict['_temp_id'] = f"parent_{idx}"
-                parent_id_map[job.id] = f"parent_{idx}"
-            elif job.is_recurring_instance and job.recurrence_parent_id:
-                job_dict['_is_recurring_instance'] = True
-                # Will be resolved during import
-                if job.recurrence_parent_id in parent_id_map:
-                    job_dict['_parent_temp_id'] = parent_id_map[job.recurrence_parent_id]
-            
-            jobs_data.append(job_dict)
-        
-        # Build the export structure
-        export_data = {
-            'version': '1.0',
-            'exported_at': timezone.now().isoformat(),
-            'export_source': export_source,
-            'job_count': len(jobs_data),
-            'jobs': jobs_data
-        }
+        jobs_qs = jobs_qs.order_by('start_dt', 'id')
         
         # Generate filename
         timestamp = timezone.now().strftime('%Y-%m-%d_%H%M%S')
         if calendar_id:
-            filename = f"jobs_export_{export_source}_{timestamp}.json"
+            filename = f"jobs_export_{export_source}_{timestamp}.{export_format}"
         else:
-            filename = f"jobs_export_all_{timestamp}.json"
+            filename = f"jobs_export_all_{timestamp}.{export_format}"
         
-        # Create response
-        response = HttpResponse(
-            json.dumps(export_data, indent=2, ensure_ascii=False),
-            content_type='application/json'
-        )
+        chunks = iter_job_export(jobs_qs, export_source, export_format)
+        content_type = 'application/x-ndjson' if export_format == 'ndjson' else 'application/json'
+        if use_gzip:
+            chunks = gzip_stream(chunks)
+            content_type = 'application/gzip'
+            filename += '.gz'
+        
+        response = StreamingHttpResponse(chunks, content_type=content_type)
         response['Content-Disposition'] = f'attachment; filename="{filename}"'
         
-        logger.info(f"Exported {len(jobs_data)} jobs from '{export_source}'")
+        logger.info(f"Streaming {export_format} export of jobs from '{export_source}' (gzip: {use_gzip})")
         return response
         
+    except Http404:
+        raise
     except Exception as e:
         logger.error(f"Error exporting jobs: {str(e)}", exc_info=True)
         messages.error(request, f"Error exporting jobs: {str(e)}")
         return redirect('rental_scheduler:job_list')
 
 
+def _calendar_feed_state(request, calendar_id):
+    """
+    The calendar row plus its job count and newest job ``updated_at``, from the DB.
+
+    Read once per request. Works for writes made by any process (management
+    commands included). The count catches deletes; every other change moves
+    ``updated_at``.
+    """
+    if not hasattr(request, '_calendar_feed_state'):
+        request._calendar_feed_state = (
+            Calendar.objects.filter(pk=calendar_id)
+            .annotate(job_count=models.Count('jobs'), jobs_changed=models.Max('jobs__updated_at'))
+            .values('updated_at', 'job_count', 'jobs_changed')
+            .first()
+        )
+    return request._calendar_feed_state
+
+
+def _calendar_feed_etag(request, calendar_id):
+    state = _calendar_feed_state(request, calendar_id)
+    if state is None:
+        return None
+    changed = state['jobs_changed'].timestamp() if state['jobs_changed'] else 0
+    return (
+        f"calendar-{calendar_id}-{state['job_count']}-{int(changed * 1000000)}"
+        f"-{int(state['updated_at'].timestamp() * 1000000)}"
+    )
+
+
+def _calendar_feed_last_modified(request, calendar_id):
+    state = _calendar_feed_state(request, calendar_id)
+    if state is None:
+        return None
+    return max(filter(None, (state['updated_at'], state['jobs_changed'])))
+
+
+@require_http_methods(["GET", "HEAD"])
+@condition(etag_func=_calendar_feed_etag, last_modified_func=_calendar_feed_last_modified)
+def calendar_ics_feed(request, calendar_id):
+    """
+    Subscribable iCalendar feed of one calendar (for phone calendar apps).
+    
+    Forever series are sent as RRULEs rather than expanded occurrences. The
+    ETag/Last-Modified headers follow this calendar's rows in the database, so
+    clients polling an unchanged calendar get a 304 after one aggregate query.
+    """
+    calendar = get_object_or_404(Calendar, pk=calendar_id)
+    host = request.get_host().split(':')[0]
+    
+    response = StreamingHttpResponse(
+        iter_calendar_feed(calendar, host),
+        content_type='text/calendar; charset=utf-8',
+    )
+    response['Content-Disposition'] = f'inline; filename="calendar-{calendar.pk}.ics"'
+    # Always revalidate; the ETag makes that cheap
+    response['Cache-Control'] = 'no-cache'
+    return response
+
+
 @csrf_protect
 def import_jobs_json(request):
     """
@@ -4525,93 +4348,16 @@ def import_jobs_json(request):
                 json_file = form.cleaned_data['json_file']
                 target_calendar = form.cleaned_data['target_calendar']
                 
-                # Read and parse JSON
-                json_file.seek(0)
-                content = json_file.read()
-                data = json.loads(content)
-                
-                # Validate version
-                if data.get('version') != '1.0':
-                    messages.warning(request, f"Warning: Export version {data.get('version')} may not be fully compatible.")
-                
-                jobs_data = data.get('jobs', [])
-                if not jobs_data:
-                    messages.warning(request, "No jobs found in the export file.")
-                    return redirect('rental_scheduler:calendar_import')
-                
-                # Generate import batch ID for tracking
-                import uuid
-                batch_id = str(uuid.uuid4())
-                
-                # Import jobs within transaction
-                with transaction.atomic():
-                    imported_count = 0
-                    parent_map = {}  # Map temp IDs to new parent Job instances
-                    jobs_to_link = []  # Store (job, parent_temp_id) tuples for second pass
-                    
-                    # First pass: import all jobs
-                    for job_data in jobs_data:
-                        is_parent = job_data.pop('_is_recurring_parent', False)
-                        is_instance = job_data.pop('_is_recurring_instance', False)
-                        temp_id = job_data.pop('_temp_id', None)
-                        parent_temp_id = job_data.pop('_parent_temp_id', None)
-                        
-                        # Parse datetime fields
-                        if job_data.get('date_call_received'):
-                            job_data['date_call_received'] = datetime.fromisoformat(job_data['date_call_received'])
-                        if job_data.get('start_dt'):
-                            job_data['start_dt'] = datetime.fromisoformat(job_data['start_dt'])
-                        if job_data.get('end_dt'):
-                            job_data['end_dt'] = datetime.fromisoformat(job_data['end_dt'])
-                        if job_data.get('recurrence_original_start'):
-                            job_data['recurrence_original_start'] = datetime.fromisoformat(job_data['recurrence_original_start'])
-                        if job_data.get('end_recurrence_date'):
-                            job_data['end_recurrence_date'] = date.fromisoformat(job_data['end_recurrence_date'])
-                        
-                        # Quote is now a CharField, keep as string
-                        if job_data.get('quote'):
-                            job_data['quote'] = str(job_data['quote'])
-                        
-                        # Create the job
-                        job = Job(
-                            calendar=target_calendar,
-                            import_batch_id=batch_id,
-                            **job_data
-                        )
-                        
-                        # Bypass full_clean during import to avoid validation issues
-                        # Call the parent Model.save() directly instead of Job.save()
-                        models.Model.save(job, force_insert=True)
-                        
-                        imported_count += 1
-                        
-                        # Track parents for second pass
-                        if is_parent and temp_id:
-                            parent_map[temp_id] = job
-                        elif is_instance and parent_temp_id:
-                            # Store for second pass
-                            jobs_to_link.append((job, parent_temp_id))
-                    
-                    # Second pass: link recurring instances to parents
-                    for job, parent_temp_id in jobs_to_link:
-                        if parent_temp_id in parent_map:
-                            parent_job = parent_map[parent_temp_id]
-                            job.recurrence_parent = parent_job
-                            models.Model.save(job, update_fields=['recurrence_parent'])
-                
-                messages.success(
-                    request,
-                    f"Successfully imported {imported_count} job(s) into calendar '{target_calendar.name}'. "
-                    f"Import batch ID: {batch_id[:8]}..."
+                batch = enqueue_import(
+                    ImportBatch.SOURCE_JSON,
+                    json_file,
+                    target_calendar,
+                    created_by=request.user if request.user.is_authenticated else None,
                 )
-                logger.info(f"Imported {imported_count} jobs from JSON export into calendar '{target_calendar.name}' (batch: {batch_id})")
                 
-                return redirect('rental_scheduler:job_list')
+                messages.info(request, f"Import of '{json_file.name}' into calendar '{target_calendar.name}' has started.")
+                return redirect(f"{reverse('rental_scheduler:job_import_json')}?batch={batch.batch_id}")
                 
-            except json.JSONDecodeError as e:
-                messages.error(request, f"Invalid JSON file: {str(e)}")
-            except KeyError as e:
-                messages.error(request, f"Missing required field in export data: {str(e)}")
             except Exception as e:
                 logger.error(f"Error importing jobs from JSON: {str(e)}", exc_info=True)
                 messages.error(request, f"Error importing jobs: {str(e)}")
@@ -4621,7 +4367,8 @@ def import_jobs_json(request):
     context = {
         'title': 'Import Jobs from JSON',
         'form': form,
-        'import_type': 'json'
+        'import_type': 'json',
+        'import_batch': _get_import_batch_from_query(request),
     }
     
     return render(request, 'rental_scheduler/jobs/job_import_json.html', context)
@@ -509,7 +509,7 @@ def job_delete_api_recurring(request, pk):
                 # Count non-deleted instances before deleting
                 deleted_count = parent.recurrence_instances.filter(is_deleted=False).count()
                 # Soft delete all instances
-                parent.recurrence_instances.filter(is_deleted=False).update(is_deleted=True)
+                parent.recurrence_instances.filter(is_deleted=False).update(is_deleted=True, updated_at=timezone.now())
                 # Soft delete parent
                 if not parent.is_deleted:
                     parent.is_deleted = True
@@ -550,7 +550,7 @@ def job_delete_api_recurring(request, pk):
             elif job.is_recurring_parent:
                 # If this is the parent, delete all instances and truncate at parent date
                 deleted_count = job.recurrence_instances.filter(is_deleted=False).count()
-                job.recurrence_instances.filter(is_deleted=False).update(is_deleted=True)
+                job.recurrence_instances.filter(is_deleted=False).update(is_deleted=True, updated_at=timezone.now())
                 
                 # Truncate recurrence generation so it ends after the parent occurrence
                 job.end_recurrence_date = job.start_dt.date()
@@ -702,6 +702,86 @@ def materialize_occurrence_api(request):
         return JsonResponse({'error': str(e)}, status=500)
 
 
+@require_http_methods(["POST"])
+@csrf_protect
+def materialize_occurrence_range_api(request):
+    """
+    Materialize every occurrence of a series within a range in one bulk insert.
+    
+    Used for "edit this and the next N" flows.
+    
+    POST /api/recurrence/materialize-range/
+    {
+        "parent_id": 123,
+        "start_date": "2026-02-20",   // first occurrence date (inclusive)
+        "end_date": "2026-06-30",     // last date (inclusive), or:
+        "count": 11                   // number of occurrences from start_date
+    }
+    
+    Returns:
+    {
+        "job_ids": [456, 457, ...],   // ordered by start
+        "created_count": 9,           // rows that did not exist yet
+        "jobs": [ { ... }, ... ]
+    }
+    """
+    from rental_scheduler.utils.recurrence import materialize_occurrences
+    
+    MAX_RANGE_COUNT = 200
+    
+    try:
+        data = json.loads(request.body)
+    except json.JSONDecodeError:
+        return JsonResponse({'error': 'Invalid JSON'}, status=400)
+    
+    parent_id = data.get('parent_id')
+    if not parent_id:
+        return JsonResponse({'error': 'parent_id is required'}, status=400)
+    
+    try:
+        start_date = datetime.fromisoformat(str(data.get('start_date', ''))[:10]).date()
+    except ValueError:
+        return JsonResponse({'error': 'start_date must be a valid date (YYYY-MM-DD)'}, status=400)
+    
+    count = data.get('count')
+    end_date_raw = data.get('end_date')
+    if end_date_raw:
+        try:
+            end_date = datetime.fromisoformat(str(end_date_raw)[:10]).date()
+        except ValueError:
+            return JsonResponse({'error': 'end_date must be a valid date (YYYY-MM-DD)'}, status=400)
+        if end_date < start_date:
+            return JsonResponse({'error': 'end_date must be on or after start_date'}, status=400)
+        limit = MAX_RANGE_COUNT
+    elif count:
+        try:
+            limit = int(count)
+        except (TypeError, ValueError):
+            return JsonResponse({'error': 'count must be a whole number'}, status=400)
+        if limit < 1 or limit > MAX_RANGE_COUNT:
+            return JsonResponse({'error': f'count must be between 1 and {MAX_RANGE_COUNT}'}, status=400)
+        end_date = date(MAX_VALID_YEAR, 12, 31)
+    else:
+        return JsonResponse({'error': 'end_date or count is required'}, status=400)
+    
+    parent = get_object_or_404(Job, pk=parent_id)
+    if not parent.is_recurring_parent:
+        return JsonResponse({'error': 'Job is not a recurring parent'}, status=400)
+    
+    try:
+        jobs, created_count = materialize_occurrences(parent, start_date, end_date, limit=limit)
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        return JsonResponse({'error': str(e)}, status=500)
+    
+    return JsonResponse({
+        'job_ids': [job.id for job in jobs],
+        'created_count': created_count,
+        'jobs': [_format_job_response(job) for job in jobs],
+    })
+
+
 @require_http_methods(["GET"])
 def recurrence_preview_occurrences(request):
     """
@@ -776,10 +856,14 @@ def recurrence_preview_occurrences(request):
         safety_cap=count + 10  # A few extra in case some are materialized
     )
     
-    # Get already-materialized instance starts for this parent
+    # Get already-materialized instance starts for this parent. Untouched horizon
+    # rows stay in the preview: materializing them just opens the stored row.
     materialized_starts = set(
         Job.objects.filter(
             recurrence_parent=parent
+        ).exclude(
+            recurrence_auto_materialized=True,
+            is_deleted=False,
         ).values_list('recurrence_original_start', flat=True)
     )
     
@@ -992,11 +1076,16 @@ def series_occurrences_api(request):
         else:  # yearly
             window_days = gen_count * interval * 366 + 60
         
-        window_end = today + timedelta(days=window_days)
+        # Occurrences inside the materialized horizon are already in materialized_entries
+        virtual_start = today
+        covered_until = parent.recurrence_materialized_until
+        if parent.recurrence_materialized_from and covered_until and parent.recurrence_materialized_from <= today <= covered_until:
+            virtual_start = covered_until + timedelta(days=1)
+        window_end = virtual_start + timedelta(days=window_days)
         
         occurrences = generate_occurrences_in_window(
             parent,
-            today,
+            virtual_start,
             window_end,
             safety_cap=gen_count
         )
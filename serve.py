@@ -1,4 +1,23 @@
-from waitress import serve
-from gts_django.wsgi import application
+# Import-safe: PDF render workers are spawned processes that re-import this
+# script as __mp_main__, so everything runs behind the __main__ guard.
 
-serve(application, host='0.0.0.0', port=8000)
+
+def main():
+    from waitress import serve
+    from gts_django.wsgi import application
+    from rental_scheduler.utils.customer_index import start_customer_index_sync
+    from rental_scheduler.utils.horizon import start_horizon_scheduler
+    from rental_scheduler.utils.import_runner import start_import_worker
+
+    # No-op unless RECURRENCE_HORIZON_SCHEDULER_INTERVAL is set
+    start_horizon_scheduler()
+    # Picks up imports left queued by a previous run (no-op if IMPORT_WORKER_ENABLED is off)
+    start_import_worker()
+    # Keeps the local Classic customer index fresh (no-op if CUSTOMER_INDEX_SYNC_INTERVAL is 0)
+    start_customer_index_sync()
+
+    serve(application, host='0.0.0.0', port=8000)
+
+
+if __name__ == "__main__":
+    main()